@@ -8,7 +8,12 @@ import { Label } from "@/components/ui/label"
 import { Textarea } from "@/components/ui/textarea"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { AdminLayout } from "@/components/admin-layout"
+import { DeliveryZonesEditor } from "@/components/delivery-zones-editor"
 import { supabase } from "@/lib/supabase"
+import { invalidateMenuSnapshot } from "@/lib/menu-client"
+import { storagePathsFor, variantHashOf, type ImagePresetName } from "@/lib/image-variants"
+import { UploadQueue, type UploadTask } from "@/lib/upload-queue"
+import { reorder, updateFlags, useBatcher } from "@/lib/admin-batch"
 import { formatCurrency, formatCurrencyInput, parseCurrencyInput } from "@/lib/currency-utils"
 import { 
   Save, 
@@ -40,7 +45,8 @@ import {
   ImageIcon,
   RotateCcw,
   Eye,
-  EyeOff
+  EyeOff,
+  X
 } from "lucide-react"
 
 interface PizzariaConfig {
@@ -141,121 +147,26 @@ export default function AdminConfigPage() {
   const [uploadingCarousel, setUploadingCarousel] = useState(false)
   const [carouselMessage, setCarouselMessage] = useState("")
 
-  useEffect(() => {
-    loadConfig()
-    loadCarouselData()
-  }, [])
-
-  // Função para redimensionar imagem
-  const resizeImage = (file: File, maxWidth: number, maxHeight: number): Promise<Blob> => {
-    return new Promise((resolve, reject) => {
-      const canvas = document.createElement('canvas')
-      const ctx = canvas.getContext('2d')
-      const img = new window.Image()
-
-      if (!ctx) {
-        reject(new Error('Não foi possível obter contexto do canvas'))
-        return
-      }
-
-      img.onload = () => {
-        // Calcular novas dimensões mantendo proporção
-        let { width, height } = img
-        
-        if (width > height) {
-          if (width > maxWidth) {
-            height = (height * maxWidth) / width
-            width = maxWidth
-          }
-        } else {
-          if (height > maxHeight) {
-            width = (width * maxHeight) / height
-            height = maxHeight
-          }
-        }
-
-        canvas.width = width
-        canvas.height = height
+  // Fila de uploads (envios paralelos, em partes e retomáveis)
+  const [uploadTasks, setUploadTasks] = useState<UploadTask[]>([])
+  const uploadQueueRef = useRef<UploadQueue | null>(null)
+  const getUploadQueue = () =>
+    (uploadQueueRef.current ??= new UploadQueue({ concurrency: 3, onChange: setUploadTasks }))
 
-        // Desenhar imagem redimensionada
-        ctx.drawImage(img, 0, 0, width, height)
+  useEffect(() => () => uploadQueueRef.current?.cancelAll(), [])
 
-        canvas.toBlob((blob) => {
-          if (blob) {
-            resolve(blob)
-          } else {
-            reject(new Error('Erro ao processar imagem'))
-          }
-        }, 'image/jpeg', 0.9)
-      }
-
-      img.onerror = () => reject(new Error('Erro ao carregar imagem'))
-      img.src = URL.createObjectURL(file)
-    })
+  // Envia um arquivo pela fila e retorna a URL e as variantes geradas
+  const uploadImage = async (file: File, preset: ImagePresetName) => {
+    const queue = getUploadQueue()
+    const [task] = await queue.settled(queue.add([file], preset))
+    if (task.status !== 'done' || !task.result) throw new Error(task.error || 'Upload cancelado')
+    return task.result
   }
 
-  // Função para fazer upload da imagem
-  const uploadImage = async (file: File | Blob, folder: string, originalFileName?: string): Promise<string> => {
-    try {
-      // Verificar se temos um nome de arquivo válido
-      let baseName = 'image'
-      if (file instanceof File && file.name) {
-        baseName = file.name.replace(/[^a-zA-Z0-9.-]/g, '')
-      } else if (originalFileName) {
-        baseName = originalFileName.replace(/[^a-zA-Z0-9.-]/g, '')
-      }
-      
-      // Garantir que temos uma extensão
-      if (!baseName.includes('.')) {
-        baseName += '.jpg'
-      }
-      
-      const fileName = `${folder}/${Date.now()}-${baseName}`
-      
-      let uploadResult = await supabase.storage
-        .from('images')
-        .upload(fileName, file, {
-          cacheControl: '3600',
-          upsert: false
-        })
-
-      if (uploadResult.error) {
-        // Se o bucket não existir, tentar criar
-        if (uploadResult.error.message.includes('Bucket not found')) {
-          await supabase.storage.createBucket('images', {
-            public: true,
-            allowedMimeTypes: ['image/*'],
-            fileSizeLimit: 5242880 // 5MB
-          })
-          
-          // Tentar upload novamente
-          uploadResult = await supabase.storage
-            .from('images')
-            .upload(fileName, file, {
-              cacheControl: '3600',
-              upsert: false
-            })
-          
-          if (uploadResult.error) throw uploadResult.error
-        } else {
-          throw uploadResult.error
-        }
-      }
-
-      // Obter URL pública
-      const { data: urlData } = supabase.storage
-        .from('images')
-        .getPublicUrl(fileName)
-
-      return urlData.publicUrl
-    } catch (error) {
-      console.error('Erro no upload:', error)
-      if (error instanceof Error) {
-        throw new Error(`Falha no upload: ${error.message}`)
-      }
-      throw new Error('Falha ao carregar imagem. Verifique o formato e tente novamente.')
-    }
-  }
+  useEffect(() => {
+    loadConfig()
+    loadCarouselData()
+  }, [])
 
   // Função para processar upload da foto de capa
   const handleCapaUpload = async (event: React.ChangeEvent<HTMLInputElement>) => {
@@ -282,9 +193,8 @@ export default function AdminConfigPage() {
 
     setUploadingCapa(true)
     try {
-      // Redimensionar para 1200x675px (16:9)
-      const resizedFile = await resizeImage(file, 1200, 675)
-      const url = await uploadImage(resizedFile, 'capas', file.name)
+      // Variantes 16:9 em AVIF/WebP geradas no servidor
+      const { url } = await uploadImage(file, 'capa')
       
       setConfig({ ...config, foto_capa: url })
       setMessage("Foto de capa carregada com sucesso!")
@@ -324,9 +234,8 @@ export default function AdminConfigPage() {
 
     setUploadingPerfil(true)
     try {
-      // Redimensionar para 300x300px (1:1)
-      const resizedFile = await resizeImage(file, 300, 300)
-      const url = await uploadImage(resizedFile, 'perfis', file.name)
+      // Variantes 1:1 em AVIF/WebP geradas no servidor
+      const { url } = await uploadImage(file, 'perfil')
       
       setConfig({ ...config, foto_perfil: url })
       setMessage("Foto de perfil carregada com sucesso!")
@@ -371,7 +280,7 @@ export default function AdminConfigPage() {
         // Tentar remover do Supabase Storage
         const { error: storageError } = await supabase.storage
           .from('images')
-          .remove([filePath])
+          .remove(storagePathsFor(filePath))
         
         if (storageError) {
           console.warn('Aviso: Não foi possível remover arquivo do storage:', storageError.message)
@@ -391,6 +300,7 @@ export default function AdminConfigPage() {
         console.error('Erro ao atualizar banco:', dbError)
         setMessage("Erro ao excluir imagem. Tente novamente.")
       } else {
+        invalidateMenuSnapshot()
         setMessage("Imagem excluída com sucesso.")
       }
     } catch (error) {
@@ -414,7 +324,7 @@ export default function AdminConfigPage() {
         // Tentar remover do Supabase Storage
         const { error: storageError } = await supabase.storage
           .from('images')
-          .remove([filePath])
+          .remove(storagePathsFor(filePath))
         
         if (storageError) {
           console.warn('Aviso: Não foi possível remover arquivo do storage:', storageError.message)
@@ -434,6 +344,7 @@ export default function AdminConfigPage() {
         console.error('Erro ao atualizar banco:', dbError)
         setMessage("Erro ao excluir imagem. Tente novamente.")
       } else {
+        invalidateMenuSnapshot()
         setMessage("Imagem excluída com sucesso.")
       }
     } catch (error) {
@@ -542,54 +453,68 @@ export default function AdminConfigPage() {
       return
     }
 
+    const selected = Array.from(files).filter(file => {
+      if (!file.type.startsWith('image/')) {
+        console.warn(`Arquivo ${file.name} não é uma imagem válida`)
+        return false
+      }
+      return true
+    }).slice(0, 10 - carouselImages.length)
+
+    // Limpar input (a fila já tem os arquivos)
+    if (carouselInputRef.current) {
+      carouselInputRef.current.value = ""
+    }
+    if (selected.length === 0) return
+
     setUploadingCarousel(true)
     setCarouselMessage("")
 
     try {
-      for (let i = 0; i < files.length && carouselImages.length + i < 10; i++) {
-        const file = files[i]
-        
-        // Validar tipo de arquivo
-        if (!file.type.startsWith('image/')) {
-          console.warn(`Arquivo ${file.name} não é uma imagem válida`)
-          continue
-        }
-        
-        // Redimensionar imagem para otimizar
-        const resizedBlob = await resizeImage(file, 1200, 320)
-        
-        // Upload da imagem
-        const imageUrl = await uploadImage(resizedBlob, 'carousel', file.name)
-        
-        // Salvar no banco
-        const nextOrdem = carouselImages.length > 0 ? Math.max(...carouselImages.map(img => img.ordem)) + 1 : 1
-        
-        const { data, error } = await supabase
-          .from('carousel_images')
-          .insert({
-            url: imageUrl,
-            ordem: nextOrdem,
-            ativo: true
-          })
-          .select()
-          .single()
+      // Envio em paralelo; a ordem do carousel segue a ordem de seleção, não a de término
+      const queue = getUploadQueue()
+      const finished = await queue.settled(queue.add(selected, 'carousel'))
+      const uploaded = finished.filter(task => task.status === 'done' && task.result)
+      const failed = finished.filter(task => task.status === 'error').length
+
+      if (uploaded.length === 0) {
+        setCarouselMessage(failed > 0 ? "Erro ao enviar imagens do carousel" : "Envio cancelado")
+        return
+      }
 
-        if (error) {
-          console.error('Erro ao salvar imagem do carousel:', error)
-          setCarouselMessage(`Erro ao salvar imagem: ${error.message}`)
-          continue
-        }
+      // Uma única gravação com todas as novas imagens, já ordenadas
+      const baseOrdem = carouselImages.length > 0 ? Math.max(...carouselImages.map(img => img.ordem)) : 0
+      const rows = uploaded.map((task, index) => ({
+        url: task.result!.url,
+        variantes: task.result!.variants,
+        ordem: baseOrdem + index + 1,
+        ativo: true
+      }))
+
+      let { data, error } = await supabase
+        .from('carousel_images')
+        .insert(rows)
+        .select()
 
-        // Adicionar à lista local
-        setCarouselImages(prev => [...prev, data])
+      // Banco ainda sem a coluna variantes (script 20): salvar só as URLs
+      if (error && error.message.includes('variantes')) {
+        ({ data, error } = await supabase
+          .from('carousel_images')
+          .insert(rows.map(({ variantes, ...row }) => row))
+          .select())
       }
 
-      setCarouselMessage("Imagens do carousel enviadas com sucesso!")
-      
-      // Limpar input
-      if (carouselInputRef.current) {
-        carouselInputRef.current.value = ""
+      if (error) {
+        console.error('Erro ao salvar imagens do carousel:', error)
+        setCarouselMessage(`Erro ao salvar imagens: ${error.message}`)
+        return
       }
+
+      setCarouselImages(prev => [...prev, ...(data || [])].sort((a, b) => a.ordem - b.ordem))
+      setCarouselMessage(failed > 0
+        ? `${uploaded.length} imagem(ns) enviada(s); ${failed} falharam`
+        : "Imagens do carousel enviadas com sucesso!")
+      getUploadQueue().clearFinished()
     } catch (error) {
       console.error('Erro no upload do carousel:', error)
       setCarouselMessage("Erro ao enviar imagens do carousel")
@@ -611,12 +536,25 @@ export default function AdminConfigPage() {
         return
       }
 
-      // Deletar do storage
+      // Deletar do storage, salvo se outra imagem do carousel usa os mesmos
+      // objetos (mesmo arquivo enviado duas vezes gera o mesmo hash)
       const filePath = extractFilePathFromUrl(imageUrl)
-      if (filePath) {
+      const hash = filePath ? variantHashOf(filePath) : null
+      let shared = false
+      if (hash) {
+        const { data: others, error: othersError } = await supabase
+          .from('carousel_images')
+          .select('id')
+          .like('url', `%/${hash}/%`)
+          .limit(1)
+          .maybeSingle()
+        // Na dúvida, manter os arquivos: um objeto órfão custa menos que uma imagem quebrada
+        shared = Boolean(othersError) || Boolean(others)
+      }
+      if (filePath && !shared) {
         await supabase.storage
           .from('images')
-          .remove([filePath])
+          .remove(storagePathsFor(filePath))
       }
 
       // Remover da lista local
@@ -628,53 +566,49 @@ export default function AdminConfigPage() {
     }
   }
 
-  const handleToggleCarouselImage = async (imageId: string, currentStatus: boolean) => {
+  // Status e ordem das imagens: a lista muda na hora e cliques rápidos viram uma única gravação
+  const carouselStatusLote = useBatcher<boolean>(async changes => {
     try {
-      const { error } = await supabase
-        .from('carousel_images')
-        .update({ ativo: !currentStatus })
-        .eq('id', imageId)
-
-      if (error) {
-        console.error('Erro ao alterar status da imagem:', error)
-        return
-      }
-
-      // Atualizar lista local
-      setCarouselImages(prev => 
-        prev.map(img => 
-          img.id === imageId ? { ...img, ativo: !currentStatus } : img
-        )
-      )
-      
-      setCarouselMessage(`Imagem ${!currentStatus ? 'ativada' : 'desativada'} com sucesso!`)
+      await updateFlags({ tabela: 'carousel_images', coluna: 'ativo' }, Object.fromEntries(changes))
     } catch (error) {
       console.error('Erro ao alterar status da imagem:', error)
       setCarouselMessage("Erro ao alterar status da imagem")
+      loadCarouselData()
     }
-  }
+  })
 
-  const handleUpdateCarouselOrder = async (imageId: string, newOrder: number) => {
+  const carouselOrdemLote = useBatcher<string[]>(async changes => {
     try {
-      const { error } = await supabase
-        .from('carousel_images')
-        .update({ ordem: newOrder })
-        .eq('id', imageId)
-
-      if (error) {
-        console.error('Erro ao alterar ordem da imagem:', error)
-        return
-      }
-
-      // Atualizar lista local
-      setCarouselImages(prev => 
-        prev.map(img => 
-          img.id === imageId ? { ...img, ordem: newOrder } : img
-        ).sort((a, b) => a.ordem - b.ordem)
-      )
+      await reorder('carousel_images', changes.get('carousel_images') || [])
     } catch (error) {
       console.error('Erro ao alterar ordem da imagem:', error)
+      setCarouselMessage("Erro ao alterar ordem das imagens")
+      loadCarouselData()
     }
+  })
+
+  const handleToggleCarouselImage = (imageId: string, currentStatus: boolean) => {
+    setCarouselImages(prev => 
+      prev.map(img => 
+        img.id === imageId ? { ...img, ativo: !currentStatus } : img
+      )
+    )
+    carouselStatusLote.add(imageId, !currentStatus)
+    setCarouselMessage(`Imagem ${!currentStatus ? 'ativada' : 'desativada'} com sucesso!`)
+  }
+
+  // Troca a imagem de lugar com a vizinha e renumera a lista inteira (1, 2, 3...)
+  const handleUpdateCarouselOrder = (imageId: string, direcao: -1 | 1) => {
+    const images = [...carouselImages]
+    const index = images.findIndex(img => img.id === imageId)
+    const target = index + direcao
+    if (index < 0 || target < 0 || target >= images.length) return
+
+    const [moved] = images.splice(index, 1)
+    images.splice(target, 0, moved)
+    const reordered = images.map((img, position) => ({ ...img, ordem: position + 1 }))
+    setCarouselImages(reordered)
+    carouselOrdemLote.add('carousel_images', reordered.map(img => img.id))
   }
 
   const handleSaveCarouselConfig = async () => {
@@ -797,6 +731,7 @@ export default function AdminConfigPage() {
         setMessage("Erro ao salvar configurações")
       } else {
         setConfig(data)
+        invalidateMenuSnapshot()
         setMessage("Configurações salvas com sucesso!")
       }
     } catch (error) {
@@ -817,6 +752,7 @@ export default function AdminConfigPage() {
         setMessage("Erro ao salvar informações básicas")
       } else {
         setConfig(data)
+        invalidateMenuSnapshot()
         setMessage("Informações básicas salvas com sucesso!")
       }
     } catch (error) {
@@ -835,6 +771,7 @@ export default function AdminConfigPage() {
         setMessage("Erro ao salvar configurações de entrega")
       } else {
         setConfig(data)
+        invalidateMenuSnapshot()
         setMessage("Configurações de entrega salvas com sucesso!")
       }
     } catch (error) {
@@ -853,6 +790,7 @@ export default function AdminConfigPage() {
         setMessage("Erro ao salvar horários de funcionamento")
       } else {
         setConfig(data)
+        invalidateMenuSnapshot()
         setMessage("Horários de funcionamento salvos com sucesso!")
       }
     } catch (error) {
@@ -871,6 +809,7 @@ export default function AdminConfigPage() {
         setMessage("Erro ao salvar imagens")
       } else {
         setConfig(data)
+        invalidateMenuSnapshot()
         setMessage("Imagens salvas com sucesso!")
       }
     } catch (error) {
@@ -1490,6 +1429,9 @@ export default function AdminConfigPage() {
           </Card>
         </div>
 
+        {/* Delivery Zones */}
+        <DeliveryZonesEditor />
+
         {/* Operating Hours */}
         <Card className="shadow-lg border-0 bg-white rounded-2xl overflow-hidden">
           <CardHeader className="bg-gradient-to-r from-purple-50 to-violet-50 border-b border-purple-100 p-5">
@@ -1902,6 +1844,46 @@ export default function AdminConfigPage() {
                              <p className="text-xs text-gray-500 mt-2">
                  <strong>Tamanho recomendado:</strong> 1200x320px. As imagens serão redimensionadas automaticamente.
                </p>
+
+              {/* Progresso dos envios */}
+              {uploadTasks.some(task => task.preset === 'carousel') && (
+                <div className="mt-4 space-y-2">
+                  {uploadTasks.filter(task => task.preset === 'carousel').map(task => {
+                    const percent = task.total > 0 ? Math.round((task.sent / task.total) * 100) : 0
+                    const active = task.status === 'queued' || task.status === 'uploading' || task.status === 'processing'
+                    return (
+                      <div key={task.id} className="flex items-center gap-3 text-sm">
+                        <span className="flex-1 truncate text-gray-700">{task.file.name}</span>
+                        <div className="w-32 h-2 bg-gray-200 rounded-full overflow-hidden">
+                          <div
+                            className={`h-full transition-all ${task.status === 'error' ? 'bg-red-500' : 'bg-purple-600'}`}
+                            style={{ width: `${percent}%` }}
+                          />
+                        </div>
+                        <span className="w-24 text-xs text-gray-500">
+                          {task.status === 'queued' && 'Na fila'}
+                          {task.status === 'uploading' && `${percent}%`}
+                          {task.status === 'processing' && 'Processando'}
+                          {task.status === 'done' && 'Concluído'}
+                          {task.status === 'error' && 'Falhou'}
+                          {task.status === 'cancelled' && 'Cancelado'}
+                        </span>
+                        {active && (
+                          <Button
+                            type="button"
+                            variant="ghost"
+                            size="sm"
+                            className="h-6 w-6 p-0"
+                            onClick={() => getUploadQueue().cancel(task.id)}
+                          >
+                            <X className="h-4 w-4" />
+                          </Button>
+                        )}
+                      </div>
+                    )
+                  })}
+                </div>
+              )}
             </div>
 
             {/* Lista de Imagens */}
@@ -1943,7 +1925,7 @@ export default function AdminConfigPage() {
                         <Button
                           variant="ghost"
                           size="sm"
-                          onClick={() => handleUpdateCarouselOrder(image.id, image.ordem - 1)}
+                          onClick={() => handleUpdateCarouselOrder(image.id, -1)}
                           disabled={index === 0}
                           className="h-6 w-6 p-0"
                         >
@@ -1952,7 +1934,7 @@ export default function AdminConfigPage() {
                         <Button
                           variant="ghost"
                           size="sm"
-                          onClick={() => handleUpdateCarouselOrder(image.id, image.ordem + 1)}
+                          onClick={() => handleUpdateCarouselOrder(image.id, 1)}
                           disabled={index === carouselImages.length - 1}
                           className="h-6 w-6 p-0"
                         >
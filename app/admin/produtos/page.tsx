@@ -2,7 +2,7 @@
 
 import type React from "react"
 
-import { useEffect, useState } from "react"
+import { useEffect, useMemo, useState } from "react"
 import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
 import { Label } from "@/components/ui/label"
@@ -12,8 +12,21 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
 import { Badge } from "@/components/ui/badge"
 import { AdminLayout } from "@/components/admin-layout"
+import { VirtualList } from "@/components/virtual-list"
 import { supabase } from "@/lib/supabase"
 import { useConfig } from "@/lib/config-context"
+import { invalidateMenuSnapshot } from "@/lib/menu-client"
+import {
+  DEFAULT_PRODUCT_FILTERS,
+  fetchNextProductOrder,
+  fetchProductCountsByCategory,
+  useProductPages,
+  type ProductFilters,
+  type ProductSort,
+  type ProductStatus,
+} from "@/lib/product-query"
+import { repriceProducts, updateFlags, useBatcher, type FlagTarget } from "@/lib/admin-batch"
+import { uploadResponsiveImage, type ImageVariants } from "@/lib/image-variants"
 import { formatCurrency, formatCurrencyInput, formatCurrencyForInput, parseCurrencyInput } from '@/lib/currency-utils'
 import { 
   Plus, 
@@ -32,6 +45,7 @@ import {
   XCircle,
   ArrowUpDown,
   Filter,
+  Percent,
   Search
 } from "lucide-react"
 
@@ -54,6 +68,8 @@ interface Produto {
   promocao: boolean
   ordem: number
   adicionais?: Adicional[]
+  imagem_url?: string | null
+  imagem_variantes?: ImageVariants | null
 }
 
 interface Categoria {
@@ -80,8 +96,13 @@ interface BordaRecheada {
   ordem: number
 }
 
+// Lista virtualizada: altura fixa das linhas e da área rolável
+const PRODUCT_ROW_HEIGHT = 88
+const PRODUCT_LIST_HEIGHT = 640
+// Espera após a última tecla antes de buscar no banco
+const SEARCH_DEBOUNCE_MS = 300
+
 export default function AdminProdutosPage() {
-  const [produtos, setProdutos] = useState<Produto[]>([])
   const [categorias, setCategorias] = useState<Categoria[]>([])
   const [opcoesSabores, setOpcoesSabores] = useState<OpcaoSabor[]>([])
   const [bordasRecheadas, setBordasRecheadas] = useState<BordaRecheada[]>([])
@@ -93,31 +114,42 @@ export default function AdminProdutosPage() {
   const [isBordaDialogOpen, setIsBordaDialogOpen] = useState(false)
   const [searchTerm, setSearchTerm] = useState("")
   const [proximaOrdem, setProximaOrdem] = useState<number>(0)
+  const [produtosPorCategoria, setProdutosPorCategoria] = useState<Record<string, number>>({})
+  const [filters, setFilters] = useState<ProductFilters>(DEFAULT_PRODUCT_FILTERS)
   
   const { config, updateConfig } = useConfig()
 
+  // Produtos vêm em páginas, já filtrados e ordenados pelo banco
+  const produtosList = useProductPages<Produto>(filters)
+  const categoriasPorId = useMemo(() => new Map(categorias.map(categoria => [categoria.id, categoria])), [categorias])
+
   useEffect(() => {
     loadData()
   }, [])
 
+  // A busca só vai ao banco quando a digitação para
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setFilters(prev => (prev.search === searchTerm ? prev : { ...prev, search: searchTerm }))
+    }, SEARCH_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [searchTerm])
+
+  // Tabelas pequenas (categorias, opções de sabores, bordas) e a próxima ordem de produto
   const loadData = async () => {
     try {
-      const [produtosRes, categoriasRes, opcoesRes, bordasRes] = await Promise.all([
-        supabase.from("produtos").select("*").order("ordem"),
+      const [categoriasRes, opcoesRes, bordasRes, ordem] = await Promise.all([
         supabase.from("categorias").select("*").order("ordem"),
         supabase.from("opcoes_sabores").select("*").order("ordem"),
         supabase.from("bordas_recheadas").select("*").order("ordem"),
+        fetchNextProductOrder(),
       ])
 
-      if (produtosRes.data) {
-        setProdutos(produtosRes.data)
-        // Calcular próxima ordem disponível
-        const maiorOrdem = produtosRes.data.reduce((max, produto) => 
-          Math.max(max, produto.ordem || 0), 0
-        )
-        setProximaOrdem(maiorOrdem + 1)
+      setProximaOrdem(ordem)
+      if (categoriasRes.data) {
+        setCategorias(categoriasRes.data)
+        setProdutosPorCategoria(await fetchProductCountsByCategory(categoriasRes.data.map((categoria: Categoria) => categoria.id)))
       }
-      if (categoriasRes.data) setCategorias(categoriasRes.data)
       if (opcoesRes.data) setOpcoesSabores(opcoesRes.data)
       if (bordasRes.data) setBordasRecheadas(bordasRes.data)
     } catch (error) {
@@ -148,7 +180,9 @@ export default function AdminProdutosPage() {
         setProximaOrdem(prev => prev + 1)
       }
 
+      invalidateMenuSnapshot()
       loadData()
+      produtosList.reload()
       setIsDialogOpen(false)
       setEditingProduto(null)
     } catch (error) {
@@ -161,33 +195,43 @@ export default function AdminProdutosPage() {
       try {
         const { error } = await supabase.from("produtos").delete().eq("id", id)
         if (error) throw error
+        invalidateMenuSnapshot()
         loadData()
+        produtosList.reload()
       } catch (error) {
         console.error("Erro ao excluir produto:", error)
       }
     }
   }
 
-  const handleToggleOpcaoSabor = async (opcaoId: string, novoStatus: boolean) => {
+  // Toggles: a tela muda na hora e cliques rápidos viram uma única gravação em lote
+  const gravarFlags = async (target: FlagTarget, changes: Map<string, boolean>, descricao: string) => {
     try {
-      const { error } = await supabase
-        .from("opcoes_sabores")
-        .update({ ativo: novoStatus })
-        .eq("id", opcaoId)
-      
-      if (error) throw error
-      
-      // Atualizar estado local
-      setOpcoesSabores(prev => 
-        prev.map(opcao => 
-          opcao.id === opcaoId ? { ...opcao, ativo: novoStatus } : opcao
-        )
-      )
+      await updateFlags(target, Object.fromEntries(changes))
+      invalidateMenuSnapshot()
     } catch (error) {
-      console.error("Erro ao atualizar opcao de sabor:", error)
+      console.error(`Erro ao atualizar ${descricao}:`, error)
+      alert(`Erro ao atualizar ${descricao}. Tente novamente.`)
+      // Volta a tela ao estado gravado no banco
+      loadData()
+      produtosList.reload()
     }
   }
 
+  const disponibilidadeLote = useBatcher<boolean>(changes => gravarFlags({ tabela: "produtos", coluna: "ativo" }, changes, "disponibilidade"))
+  const promocaoLote = useBatcher<boolean>(changes => gravarFlags({ tabela: "produtos", coluna: "promocao" }, changes, "promoção"))
+  const opcoesSaboresLote = useBatcher<boolean>(changes => gravarFlags({ tabela: "opcoes_sabores", coluna: "ativo" }, changes, "opção de sabor"))
+  const bordasLote = useBatcher<boolean>(changes => gravarFlags({ tabela: "bordas_recheadas", coluna: "ativo" }, changes, "borda"))
+
+  const handleToggleOpcaoSabor = (opcaoId: string, novoStatus: boolean) => {
+    setOpcoesSabores(prev => 
+      prev.map(opcao => 
+        opcao.id === opcaoId ? { ...opcao, ativo: novoStatus } : opcao
+      )
+    )
+    opcoesSaboresLote.add(opcaoId, novoStatus)
+  }
+
   const handleToggleBroto = async (novoStatus: boolean) => {
     try {
       await updateConfig({ habilitar_broto: novoStatus })
@@ -206,33 +250,38 @@ export default function AdminProdutosPage() {
     }
   }
 
-  const handleToggleDisponibilidade = async (produtoId: string, novoStatus: boolean) => {
-    try {
-      const { error } = await supabase
-        .from('produtos')
-        .update({ ativo: novoStatus })
-        .eq('id', produtoId)
+  const handleToggleDisponibilidade = (produtoId: string, novoStatus: boolean) => {
+    produtosList.patchItem(produtoId, { ativo: novoStatus })
+    disponibilidadeLote.add(produtoId, novoStatus)
+  }
 
-      if (error) throw error
-      await loadData()
-    } catch (error) {
-      console.error('Erro ao atualizar disponibilidade:', error)
-      alert('Erro ao atualizar disponibilidade. Tente novamente.')
-    }
+  const handleTogglePromocao = (produtoId: string, novoStatus: boolean) => {
+    produtosList.patchItem(produtoId, { promocao: novoStatus })
+    promocaoLote.add(produtoId, novoStatus)
   }
 
-  const handleTogglePromocao = async (produtoId: string, novoStatus: boolean) => {
-    try {
-      const { error } = await supabase
-        .from('produtos')
-        .update({ promocao: novoStatus })
-        .eq('id', produtoId)
+  // Reajuste percentual dos produtos da categoria filtrada (ou de todos), em uma transação
+  const handleReajustarPrecos = async () => {
+    const categoria = categoriasPorId.get(filters.categoriaId)
+    const escopo = categoria ? `da categoria "${categoria.nome}"` : "de todos os produtos"
+    const resposta = prompt(`Reajuste percentual dos preços ${escopo} (ex.: 10 para +10%, -5 para -5%):`)
+    if (resposta === null) return
 
-      if (error) throw error
-      await loadData()
+    const percentual = Number(resposta.replace("%", "").replace(",", ".").trim())
+    if (!Number.isFinite(percentual) || percentual === 0 || percentual <= -100) {
+      alert("Informe um percentual válido (diferente de zero e maior que -100).")
+      return
+    }
+    if (!confirm(`Aplicar ${percentual > 0 ? "+" : ""}${percentual}% nos preços ${escopo}?`)) return
+
+    try {
+      const total = await repriceProducts(percentual, categoria ? { categoriaId: categoria.id } : {})
+      invalidateMenuSnapshot()
+      produtosList.reload()
+      alert(`${total} produto(s) reajustado(s).`)
     } catch (error) {
-      console.error('Erro ao atualizar promoção:', error)
-      alert('Erro ao atualizar promoção. Tente novamente.')
+      console.error("Erro ao reajustar preços:", error)
+      alert("Erro ao reajustar preços. Tente novamente.")
     }
   }
 
@@ -248,6 +297,7 @@ export default function AdminProdutosPage() {
         if (error) throw error
       }
 
+      invalidateMenuSnapshot()
       await loadData()
       setIsCategoriaDialogOpen(false)
       setEditingCategoria(null)
@@ -293,7 +343,10 @@ export default function AdminProdutosPage() {
       const { error } = await supabase.from("categorias").delete().eq("id", id)
       if (error) throw error
 
+      invalidateMenuSnapshot()
       await loadData()
+      setFilters(prev => (prev.categoriaId === id ? { ...prev, categoriaId: "" } : prev))
+      produtosList.reload()
     } catch (error) {
       console.error("Erro ao excluir categoria:", error)
       alert("Erro ao excluir categoria. Tente novamente.")
@@ -301,24 +354,13 @@ export default function AdminProdutosPage() {
   }
 
   // Funções para bordas recheadas
-  const handleToggleBorda = async (bordaId: string, novoStatus: boolean) => {
-    try {
-      const { error } = await supabase
-        .from("bordas_recheadas")
-        .update({ ativo: novoStatus })
-        .eq("id", bordaId)
-      
-      if (error) throw error
-      
-      setBordasRecheadas(prev => 
-        prev.map(borda => 
-          borda.id === bordaId ? { ...borda, ativo: novoStatus } : borda
-        )
+  const handleToggleBorda = (bordaId: string, novoStatus: boolean) => {
+    setBordasRecheadas(prev => 
+      prev.map(borda => 
+        borda.id === bordaId ? { ...borda, ativo: novoStatus } : borda
       )
-    } catch (error) {
-      console.error("Erro ao atualizar borda:", error)
-      alert("Erro ao atualizar borda. Tente novamente.")
-    }
+    )
+    bordasLote.add(bordaId, novoStatus)
   }
 
   const handleSaveBorda = async (borda: Partial<BordaRecheada>) => {
@@ -331,6 +373,7 @@ export default function AdminProdutosPage() {
         if (error) throw error
       }
 
+      invalidateMenuSnapshot()
       await loadData()
       setIsBordaDialogOpen(false)
       setEditingBorda(null)
@@ -345,6 +388,7 @@ export default function AdminProdutosPage() {
       try {
         const { error } = await supabase.from("bordas_recheadas").delete().eq("id", id)
         if (error) throw error
+        invalidateMenuSnapshot()
         await loadData()
       } catch (error) {
         console.error("Erro ao excluir borda:", error)
@@ -353,151 +397,6 @@ export default function AdminProdutosPage() {
     }
   }
 
-  const filteredProdutos = produtos.filter(produto =>
-    produto.nome.toLowerCase().includes(searchTerm.toLowerCase())
-  )
-
-  // Função para organizar produtos por categoria com prioridade
-  const organizeProductsByCategory = () => {
-    // Organizar produtos por categoria real do banco de dados
-    const produtosPorCategoria = categorias.reduce((acc, categoria) => {
-      const produtosDaCategoria = filteredProdutos.filter(p => p.categoria_id === categoria.id)
-      if (produtosDaCategoria.length > 0) {
-        acc[categoria.id] = {
-          categoria,
-          produtos: produtosDaCategoria
-        }
-      }
-      return acc
-    }, {} as Record<string, { categoria: any, produtos: Produto[] }>)
-
-    // Para compatibilidade com a interface existente, identificar categorias específicas
-    const pizzasTradicionaisCategoria = categorias.find(c => c.nome.toLowerCase().includes('pizzas tradicionais'))
-    const bebidasCategoria = categorias.find(c => c.nome.toLowerCase() === 'bebidas')
-    
-    // Pizzas Tradicionais (categoria "Pizzas Tradicionais") com numeração sequencial
-    const pizzasProdutos = pizzasTradicionaisCategoria ? produtosPorCategoria[pizzasTradicionaisCategoria.id]?.produtos || [] : []
-    const pizzasComNumeracao = pizzasProdutos.map((pizza, index) => ({
-      ...pizza,
-      numeroSequencial: String(index + 1).padStart(2, '0')
-    }))
-
-    // Bebidas (categoria "Bebidas") 
-    const bebidas = bebidasCategoria ? produtosPorCategoria[bebidasCategoria.id]?.produtos || [] : []
-
-    // IDs das categorias especiais que têm seções dedicadas
-    const categoriasEspeciais = new Set([
-      pizzasTradicionaisCategoria?.id,
-      bebidasCategoria?.id
-    ].filter(Boolean))
-
-    // Outras categorias (exceto Pizzas Tradicionais e Bebidas) com ordenação específica
-    const outrasCategoriasDataUnsorted = Object.values(produtosPorCategoria)
-      .filter(({ categoria }) => !categoriasEspeciais.has(categoria.id))
-
-    // Definir ordem específica das categorias
-    const ordemCategorias = [
-      'pizzas promocionais',
-      'mega promoção',
-      'maga promoção', // Incluir variação com erro de digitação
-      'pizzas veganas',
-      'pizzas doces',
-      'bordas recheadas'
-    ]
-
-    // Ordenar as categorias conforme a ordem especificada
-    const outrasCategoriasData = outrasCategoriasDataUnsorted.sort((a, b) => {
-      const nomeA = a.categoria.nome.toLowerCase()
-      const nomeB = b.categoria.nome.toLowerCase()
-      
-      const indexA = ordemCategorias.findIndex(ordem => nomeA.includes(ordem))
-      const indexB = ordemCategorias.findIndex(ordem => nomeB.includes(ordem))
-      
-      // Se ambas estão na lista de ordem, ordenar por índice
-      if (indexA !== -1 && indexB !== -1) {
-        return indexA - indexB
-      }
-      
-      // Se apenas uma está na lista, ela vem primeiro
-      if (indexA !== -1) return -1
-      if (indexB !== -1) return 1
-      
-      // Se nenhuma está na lista, manter ordem alfabética
-      return nomeA.localeCompare(nomeB)
-    })
-
-    // Para compatibilidade, flatten dos produtos de outras categorias
-    const outros = outrasCategoriasData.flatMap(({ produtos }) => produtos)
-
-    return {
-      pizzas: pizzasComNumeracao,
-      bebidas,
-      outros,
-      outrasCategoriasData // Nova propriedade para acessar categorias com seus produtos separadamente
-    }
-  }
-
-  const { pizzas, bebidas, outros, outrasCategoriasData } = organizeProductsByCategory()
-
-  const getCategoryAppearance = (categoryName: string) => {
-    const name = categoryName.toLowerCase()
-    if (name.includes('tradicionais')) {
-      return {
-        header: "bg-red-600 text-white",
-        card: "bg-red-50 border-red-100 hover:border-red-200",
-        iconContainer: "bg-red-100",
-        icon: "text-red-600",
-      }
-    }
-    if (name.includes('promoção')) {
-      return {
-        header: "bg-amber-500 text-white",
-        card: "bg-amber-50 border-amber-100 hover:border-amber-200",
-        iconContainer: "bg-amber-100",
-        icon: "text-amber-600",
-      }
-    }
-    if (name.includes('veganas')) {
-      return {
-        header: "bg-green-600 text-white",
-        card: "bg-green-50 border-green-100 hover:border-green-200",
-        iconContainer: "bg-green-100",
-        icon: "text-green-600",
-      }
-    }
-    if (name.includes('doces')) {
-      return {
-        header: "bg-pink-500 text-white",
-        card: "bg-pink-50 border-pink-100 hover:border-pink-200",
-        iconContainer: "bg-pink-100",
-        icon: "text-pink-600",
-      }
-    }
-     if (name.includes('bebidas')) {
-      return {
-        header: "bg-blue-600 text-white",
-        card: "bg-blue-50 border-blue-100 hover:border-blue-200",
-        iconContainer: "bg-blue-100",
-        icon: "text-blue-600",
-      }
-    }
-    if (name.includes('bordas')) {
-      return {
-        header: "bg-gray-700 text-white",
-        card: "bg-gray-100 border-gray-200 hover:border-gray-300",
-        iconContainer: "bg-gray-200",
-        icon: "text-gray-700",
-      }
-    }
-    // Default/fallback
-    return {
-      header: "bg-slate-600 text-white",
-      card: "bg-slate-50 border-slate-100 hover:border-slate-200",
-      iconContainer: "bg-slate-100",
-      icon: "text-slate-600",
-    }
-  }
-
   const getProductIcon = (tipo: string) => {
     switch (tipo) {
       case 'pizza':
@@ -512,6 +411,95 @@ export default function AdminProdutosPage() {
     }
   }
 
+  const totalEncontrados = produtosList.total ?? produtosList.items.length
+
+  // Linha da lista virtualizada (altura fixa: PRODUCT_ROW_HEIGHT)
+  const renderProdutoRow = (produto: Produto) => (
+    <div className="group flex items-center gap-4 h-full px-6 border-b border-border hover:bg-muted/30">
+      <div className="p-1.5 rounded-full bg-secondary flex-shrink-0">
+        {getProductIcon(produto.tipo)}
+      </div>
+      <div className="min-w-0 flex-1">
+        <div className="flex items-center gap-2">
+          <h3 className="font-semibold text-gray-900 truncate">{produto.nome}</h3>
+          <Badge
+            variant={produto.ativo ? "default" : "secondary"}
+            className={`text-xs font-medium ${produto.ativo ? 'bg-green-700 hover:bg-green-800 text-white' : 'bg-gray-200 text-gray-700'}`}
+          >
+            {produto.ativo ? "Disponível" : "Indisponível"}
+          </Badge>
+          {produto.promocao && <Badge variant="destructive" className="bg-orange-500 text-white">Promo</Badge>}
+        </div>
+        <div className="flex items-center gap-3 text-xs text-muted-foreground mt-1">
+          <span className="flex items-center gap-1">
+            <ArrowUpDown className="h-3 w-3" />
+            Ordem: {produto.ordem}
+          </span>
+          <span className="flex items-center gap-1 truncate">
+            <Tag className="h-3 w-3" />
+            {(produto.categoria_id && categoriasPorId.get(produto.categoria_id)?.nome) || 'Sem categoria'}
+          </span>
+        </div>
+      </div>
+      <div className="hidden md:flex flex-col items-end text-sm w-36 flex-shrink-0">
+        <span className="font-bold text-gray-800">{formatCurrency(produto.preco_tradicional)}</span>
+        {config.habilitar_broto && produto.preco_broto ? (
+          <span className="text-xs text-gray-600">Broto {formatCurrency(produto.preco_broto)}</span>
+        ) : null}
+        {produto.promocao && produto.preco_promocional_tradicional ? (
+          <span className="text-xs font-semibold text-orange-700">Promo {formatCurrency(produto.preco_promocional_tradicional)}</span>
+        ) : null}
+      </div>
+      <div className="flex flex-col gap-1 text-xs font-medium text-gray-600 flex-shrink-0">
+        <label className="flex items-center justify-between gap-2 cursor-pointer">
+          Disponível
+          <span className="relative inline-flex items-center">
+            <input
+              type="checkbox"
+              checked={produto.ativo}
+              onChange={(e) => handleToggleDisponibilidade(produto.id, e.target.checked)}
+              className="sr-only peer"
+            />
+            <span className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-2 peer-focus:ring-green-300 rounded-full peer peer-checked:after:translate-x-full after:content-[''] after:absolute after:top-[0.5px] after:left-[1px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-green-500"></span>
+          </span>
+        </label>
+        <label className="flex items-center justify-between gap-2 cursor-pointer">
+          Promoção
+          <span className="relative inline-flex items-center">
+            <input
+              type="checkbox"
+              checked={produto.promocao}
+              onChange={(e) => handleTogglePromocao(produto.id, e.target.checked)}
+              className="sr-only peer"
+            />
+            <span className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-2 peer-focus:ring-orange-300 rounded-full peer peer-checked:after:translate-x-full after:content-[''] after:absolute after:top-[0.5px] after:left-[1px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-orange-500"></span>
+          </span>
+        </label>
+      </div>
+      <div className="flex items-center gap-1 flex-shrink-0">
+        <Button
+          variant="ghost"
+          size="sm"
+          className="h-8 w-8 p-0 hover:bg-gray-100 text-gray-700 hover:text-gray-900 rounded-lg border border-gray-200"
+          onClick={() => {
+            setEditingProduto(produto)
+            setIsDialogOpen(true)
+          }}
+        >
+          <Edit className="h-4 w-4" />
+        </Button>
+        <Button
+          variant="ghost"
+          size="sm"
+          className="h-8 w-8 p-0 hover:bg-red-50 text-red-600 rounded-lg border border-gray-200"
+          onClick={() => handleDelete(produto.id)}
+        >
+          <Trash2 className="h-4 w-4" />
+        </Button>
+      </div>
+    </div>
+  )
+
   return (
     <AdminLayout>
       <div className="container mx-auto p-6 space-y-6">
@@ -532,7 +520,7 @@ export default function AdminProdutosPage() {
           </div>
         </div>
 
-        {/* 2. Lista de Produtos (exceto bebidas) */}
+        {/* 2. Lista de Produtos */}
         <Card className="border-border shadow-sm rounded-2xl overflow-hidden">
           <CardHeader className="bg-card border-b border-border p-6">
             <div className="flex flex-col lg:flex-row lg:items-center lg:justify-between gap-4">
@@ -545,7 +533,7 @@ export default function AdminProdutosPage() {
                     Lista de Produtos
                   </CardTitle>
                   <p className="text-sm text-muted-foreground mt-1">
-                    {filteredProdutos.filter(p => p.tipo !== 'bebida').length} produto{filteredProdutos.filter(p => p.tipo !== 'bebida').length !== 1 ? 's' : ''} encontrado{filteredProdutos.filter(p => p.tipo !== 'bebida').length !== 1 ? 's' : ''}
+                    {totalEncontrados} produto{totalEncontrados !== 1 ? 's' : ''} encontrado{totalEncontrados !== 1 ? 's' : ''}
                   </p>
                 </div>
               </div>
@@ -590,436 +578,102 @@ export default function AdminProdutosPage() {
                 </Dialog>
               </div>
             </div>
-          </CardHeader>
-          <CardContent className="p-6">
-            {filteredProdutos.filter(p => p.tipo !== 'bebida').length > 0 ? (
-              <div className="space-y-8">
-                {/* Seção de Pizzas Tradicionais */}
-                {pizzas.length > 0 && (() => {
-                  const appearance = getCategoryAppearance('Pizzas Tradicionais');
-                  return (
-                    <div>
-                      <div className={`${appearance.header} rounded-xl p-4 mb-6 shadow-md`}>
-                        <div className="flex items-center justify-between">
-                          <div className="flex items-center gap-3">
-                            <div className={`${appearance.iconContainer} p-2 rounded-xl`}>
-                              <Pizza className={`h-6 w-6 ${appearance.icon}`} />
-                            </div>
-                            <div>
-                              <h2 className="text-xl font-bold">Pizzas Tradicionais</h2>
-                              <p className="text-sm opacity-80">{pizzas.length} pizza{pizzas.length !== 1 ? 's' : ''} cadastrada{pizzas.length !== 1 ? 's' : ''}</p>
-                            </div>
-                          </div>
-                          <div className="flex items-center gap-3 bg-white/10 rounded-xl p-3">
-                            <div className="flex items-center gap-2">
-                              <Pizza className="h-4 w-4" />
-                              <span className="text-sm font-medium">Habilitar Pizza Broto</span>
-                            </div>
-                            <label className="relative inline-flex items-center cursor-pointer">
-                              <input
-                                type="checkbox"
-                                checked={config.habilitar_broto}
-                                onChange={(e) => handleToggleBroto(e.target.checked)}
-                                className="sr-only peer"
-                              />
-                              <div className="w-11 h-6 bg-white/30 peer-focus:outline-none peer-focus:ring-4 peer-focus:ring-white/30 rounded-full peer peer-checked:after:translate-x-full peer-checked:after:border-white after:content-[''] after:absolute after:top-[2px] after:left-[2px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-5 after:w-5 after:transition-all peer-checked:bg-green-400"></div>
-                            </label>
-                          </div>
-                        </div>
-                      </div>
-                      <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6">
-                        {pizzas.map((produto) => (
-                          <div
-                            key={produto.id}
-                            className={`group ${appearance.card} rounded-xl p-6 hover:shadow-lg transition-all duration-300 shadow-sm`}
-                          >
-                            <div className="flex items-start justify-between mb-4">
-                              <div className="flex items-center gap-3">
-                                <div className={`${appearance.iconContainer} p-1.5 rounded-full`}>
-                                  {getProductIcon(produto.tipo)}
-                                </div>
-                                <div>
-                                  <h3 className="font-semibold text-gray-900 text-lg leading-tight">
-                                    <span className={`inline-block ${appearance.iconContainer} ${appearance.icon} text-sm font-bold px-2 py-1 rounded-md mr-2`}>
-                                      {produto.numeroSequencial}
-                                    </span>
-                                    {produto.nome}
-                                  </h3>
-                                  <div className="flex items-center gap-2 mt-1">
-                                    <Badge 
-                                      variant={produto.ativo ? "default" : "secondary"}
-                                      className={`text-xs font-medium ${produto.ativo ? 'bg-green-700 hover:bg-green-800 text-white' : 'bg-gray-200 text-gray-700'}`}
-                                    >
-                                      {produto.ativo ? "Disponível" : "Indisponível"}
-                                    </Badge>
-                                    {produto.promocao && <Badge variant="destructive" className="bg-orange-500 text-white">Promo</Badge>}
-                                  </div>
-                                </div>
-                              </div>
-                              <div className="flex items-center gap-1 opacity-0 group-hover:opacity-100 transition-opacity">
-                                <Button
-                                  variant="ghost"
-                                  size="sm"
-                                  className="h-8 w-8 p-0 hover:bg-gray-100 text-gray-700 hover:text-gray-900 rounded-lg border border-gray-200"
-                                  onClick={() => {
-                                    setEditingProduto(produto)
-                                    setIsDialogOpen(true)
-                                  }}
-                                >
-                                  <Edit className="h-4 w-4" />
-                                </Button>
-                                <Button 
-                                  variant="ghost"
-                                  size="sm"
-                                  className="h-8 w-8 p-0 hover:bg-red-50 text-red-600 rounded-lg border border-gray-200"
-                                  onClick={() => handleDelete(produto.id)}
-                                >
-                                  <Trash2 className="h-4 w-4" />
-                                </Button>
-                              </div>
-                            </div>
-                          
-                            {produto.descricao && <p className="text-sm text-gray-600 mb-4">{produto.descricao}</p>}
-                            
-                            <div className="space-y-2 text-sm">
-                              <div className="flex justify-between items-center bg-white/60 p-2 rounded-lg">
-                                <span className="font-medium text-gray-600">Preço</span>
-                                <span className="font-bold text-gray-800">
-                                  {formatCurrency(produto.preco_tradicional)}
-                                </span>
-                              </div>
-                              {config.habilitar_broto && produto.preco_broto && (
-                                <div className="flex justify-between items-center bg-white/60 p-2 rounded-lg">
-                                  <span className="font-medium text-gray-600">Broto</span>
-                                  <span className="font-bold text-gray-800">
-                                    {formatCurrency(produto.preco_broto)}
-                                  </span>
-                                </div>
-                              )}
-                              {produto.promocao && produto.preco_promocional_tradicional && (
-                                <div className="flex justify-between items-center bg-orange-100 p-2 rounded-lg ring-1 ring-orange-300">
-                                  <span className="font-medium text-orange-700">Promo</span>
-                                  <span className="font-bold text-orange-800">
-                                    {formatCurrency(produto.preco_promocional_tradicional)}
-                                  </span>
-                                </div>
-                              )}
-                            </div>
-
-                            <div className="border-t border-gray-200 mt-4 pt-4 space-y-3">
-                              <div className="flex items-center justify-between">
-                                <span className="text-sm font-medium text-gray-600">Disponível</span>
-                                <label className="relative inline-flex items-center cursor-pointer">
-                                  <input
-                                    type="checkbox"
-                                    checked={produto.ativo}
-                                    onChange={(e) => handleToggleDisponibilidade(produto.id, e.target.checked)}
-                                    className="sr-only peer"
-                                  />
-                                  <div className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-2 peer-focus:ring-green-300 rounded-full peer peer-checked:after:translate-x-full after:content-[''] after:absolute after:top-[0.5px] after:left-[1px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-green-500"></div>
-                                </label>
-                              </div>
-                              <div className="flex items-center justify-between">
-                                <span className="text-sm font-medium text-gray-600">Promoção</span>
-                                <label className="relative inline-flex items-center cursor-pointer">
-                                  <input
-                                    type="checkbox"
-                                    checked={produto.promocao}
-                                    onChange={(e) => handleTogglePromocao(produto.id, e.target.checked)}
-                                    className="sr-only peer"
-                                  />
-                                  <div className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-2 peer-focus:ring-orange-300 rounded-full peer peer-checked:after:translate-x-full after:content-[''] after:absolute after:top-[0.5px] after:left-[1px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-orange-500"></div>
-                                </label>
-                              </div>
-
-                              <div className="flex items-center justify-between text-xs text-muted-foreground pt-2">
-                                <span className="flex items-center gap-1">
-                                  <ArrowUpDown className="h-3 w-3" />
-                                  Ordem: {produto.ordem}
-                                </span>
-                                {produto.categoria_id && (
-                                  <span className="flex items-center gap-1">
-                                    <Tag className="h-3 w-3" />
-                                    {categorias.find(c => c.id === produto.categoria_id)?.nome || 'Sem categoria'}
-                                  </span>
-                                )}
-                              </div>
-                            </div>
-                          </div>
-                        ))}
-                      </div>
-                    </div>
-                  )
-                })()}
-                
-                {/* Seção de Bebidas */}
-                {bebidas.length > 0 && (() => {
-                  const appearance = getCategoryAppearance('Bebidas');
-                  return (
-                    <Card className="border-border shadow-sm rounded-2xl overflow-hidden">
-                      <CardHeader className={`${appearance.header} p-6`}>
-                        <div className="flex items-center gap-3">
-                          <div className={`${appearance.iconContainer} p-2 rounded-xl`}>
-                            <Coffee className={`h-6 w-6 ${appearance.icon}`} />
-                          </div>
-                          <div>
-                            <CardTitle className="text-xl font-semibold">
-                              Bebidas
-                            </CardTitle>
-                            <p className="text-sm opacity-80 mt-1">
-                              {bebidas.length} bebida{bebidas.length !== 1 ? 's' : ''} cadastrada{bebidas.length !== 1 ? 's' : ''}
-                            </p>
-                          </div>
-                        </div>
-                      </CardHeader>
-                      <CardContent className="p-6 bg-gray-50">
-                        <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6">
-                          {bebidas.map((produto) => (
-                            <div
-                              key={produto.id}
-                              className={`group ${appearance.card} rounded-xl p-6 hover:shadow-lg transition-all duration-300 shadow-sm`}
-                            >
-                              <div className="flex items-start justify-between mb-4">
-                                <div className="flex items-center gap-3">
-                                  <div className={`${appearance.iconContainer} p-1.5 rounded-full`}>
-                                    {getProductIcon(produto.tipo)}
-                                  </div>
-                                  <div>
-                                    <h3 className="font-semibold text-gray-900 text-lg leading-tight">
-                                      {produto.nome}
-                                    </h3>
-                                    <div className="flex items-center gap-2 mt-1">
-                                      <Badge 
-                                        variant={produto.ativo ? "default" : "secondary"}
-                                        className={`text-xs font-medium ${produto.ativo ? 'bg-green-700 hover:bg-green-800 text-white' : 'bg-gray-200 text-gray-700'}`}
-                                      >
-                                        {produto.ativo ? "Ativo" : "Inativo"}
-                                      </Badge>
-                                    </div>
-                                  </div>
-                                </div>
-                                <div className="flex items-center gap-1 opacity-0 group-hover:opacity-100 transition-opacity">
-                                  <Button
-                                    variant="ghost"
-                                    size="sm"
-                                    className="h-8 w-8 p-0 hover:bg-gray-100 text-gray-700 hover:text-gray-900 rounded-lg border border-gray-200"
-                                    onClick={() => {
-                                      setEditingProduto(produto)
-                                      setIsDialogOpen(true)
-                                    }}
-                                  >
-                                    <Edit className="h-4 w-4" />
-                                  </Button>
-                                  <Button 
-                                    variant="ghost"
-                                    size="sm"
-                                    className="h-8 w-8 p-0 hover:bg-red-50 text-red-600 rounded-lg border border-gray-200"
-                                    onClick={() => handleDelete(produto.id)}
-                                  >
-                                    <Trash2 className="h-4 w-4" />
-                                  </Button>
-                                </div>
-                              </div>
-
-                              {produto.descricao && (
-                                <p className="text-sm text-gray-600 mb-4 leading-relaxed">
-                                  {produto.descricao}
-                                </p>
-                              )}
-
-                              <div className="space-y-3">
-                                <div className="bg-white/60 rounded-lg p-3 border border-gray-200">
-                                  <div className="flex justify-between items-center">
-                                    <span className="text-sm text-gray-700 flex items-center gap-2 font-medium">
-                                      <Coffee className="h-4 w-4" />
-                                      Preço
-                                    </span>
-                                    <span className="font-bold text-green-700 text-base">
-                                      {produto.promocao && produto.preco_promocional_tradicional 
-                                        ? formatCurrency(produto.preco_promocional_tradicional)
-                                        : formatCurrency(produto.preco_tradicional)
-                                      }
-                                    </span>
-                                  </div>
-                                </div>
-
-                                {/* Toggle de disponibilidade no card */}
-                                <div className="flex items-center justify-between p-3 bg-white rounded-lg border border-gray-200">
-                                  <span className="text-sm text-gray-800 font-medium">
-                                    {produto.ativo ? "Disponível" : "Indisponível"}
-                                  </span>
-                                  <label className="relative inline-flex items-center cursor-pointer">
-                                    <input
-                                      type="checkbox"
-                                      checked={produto.ativo}
-                                      onChange={(e) => handleToggleDisponibilidade(produto.id, e.target.checked)}
-                                      className="sr-only peer"
-                                    />
-                                    <div className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-4 peer-focus:ring-green-300 rounded-full peer peer-checked:after:translate-x-full peer-checked:after:border-white after:content-[''] after:absolute after:top-[2px] after:left-[2px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-green-600"></div>
-                                  </label>
-                                </div>
-
-                                {/* Toggle de promoção no card */}
-                                <div className="flex items-center justify-between p-3 bg-white rounded-lg border border-gray-200">
-                                  <span className="text-sm text-gray-800 font-medium">
-                                    {produto.promocao ? "Em Promoção" : "Preço Normal"}
-                                  </span>
-                                  <label className="relative inline-flex items-center cursor-pointer">
-                                    <input
-                                      type="checkbox"
-                                      checked={produto.promocao}
-                                      onChange={(e) => handleTogglePromocao(produto.id, e.target.checked)}
-                                      className="sr-only peer"
-                                    />
-                                    <div className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-4 peer-focus:ring-orange-300 rounded-full peer peer-checked:after:translate-x-full peer-checked:after:border-white after:content-[''] after:absolute after:top-[2px] after:left-[2px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-orange-600"></div>
-                                  </label>
-                                </div>
-
-                                <div className="flex items-center justify-between text-xs text-gray-600 pt-2">
-                                  <span className="flex items-center gap-1 font-medium">
-                                    <ArrowUpDown className="h-3 w-3" />
-                                    Ordem: {produto.ordem}
-                                  </span>
-                                  {produto.categoria_id && (
-                                    <span className="flex items-center gap-1 font-medium">
-                                      <Tag className="h-3 w-3" />
-                                      {categorias.find(c => c.id === produto.categoria_id)?.nome || 'Sem categoria'}
-                                    </span>
-                                  )}
-                                </div>
-                              </div>
-                            </div>
-                          ))}
-                        </div>
-                      </CardContent>
-                    </Card>
-                  )
-                })()}
-
-                {/* Seções Dinâmicas para Outras Categorias */}
-                {outrasCategoriasData && outrasCategoriasData.map(({ categoria, produtos }) => {
-                  const appearance = getCategoryAppearance(categoria.nome);
-                  return (
-                    <Card key={categoria.id} className="border-border shadow-sm rounded-2xl overflow-hidden">
-                      <CardHeader className={`${appearance.header} p-6`}>
-                        <div className="flex items-center gap-3">
-                          <div className={`${appearance.iconContainer} p-2 rounded-xl`}>
-                            <Package className={`h-6 w-6 ${appearance.icon}`} />
-                          </div>
-                          <div>
-                            <CardTitle className="text-xl font-semibold">
-                              {categoria.nome}
-                            </CardTitle>
-                            <p className="text-sm opacity-80 mt-1">
-                              {produtos.length} produto{produtos.length !== 1 ? 's' : ''} cadastrado{produtos.length !== 1 ? 's' : ''}
-                              {categoria.descricao && ` • ${categoria.descricao}`}
-                            </p>
-                          </div>
-                        </div>
-                      </CardHeader>
-                      <CardContent className="p-6 bg-gray-50">
-                        <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-6">
-                          {produtos.map((produto) => (
-                            <div
-                              key={produto.id}
-                              className={`group ${appearance.card} rounded-xl p-6 hover:shadow-lg transition-all duration-300 shadow-sm`}
-                            >
-                              <div className="flex items-start justify-between mb-4">
-                                <div className="flex items-center gap-3">
-                                  <div className={`${appearance.iconContainer} p-1.5 rounded-full`}>
-                                    {getProductIcon(produto.tipo)}
-                                  </div>
-                                  <div>
-                                    <h3 className="font-semibold text-gray-900 text-lg leading-tight">
-                                      {produto.nome}
-                                    </h3>
-                                    <div className="flex items-center gap-2 mt-1">
-                                      <Badge 
-                                        variant={produto.ativo ? "default" : "secondary"}
-                                        className={`text-xs font-medium ${produto.ativo ? 'bg-green-700 hover:bg-green-800 text-white' : 'bg-gray-200 text-gray-700'}`}
-                                      >
-                                        {produto.ativo ? "Ativo" : "Inativo"}
-                                      </Badge>
-                                      <span className="text-xs text-muted-foreground capitalize">
-                                        {produto.tipo}
-                                      </span>
-                                    </div>
-                                  </div>
-                                </div>
-                                <div className="flex items-center gap-1 opacity-0 group-hover:opacity-100 transition-opacity">
-                                  <Button
-                                    variant="ghost"
-                                    size="sm"
-                                    className="h-8 w-8 p-0 hover:bg-gray-100 text-gray-700 hover:text-gray-900 rounded-lg border border-gray-200"
-                                    onClick={() => {
-                                      setEditingProduto(produto)
-                                      setIsDialogOpen(true)
-                                    }}
-                                  >
-                                    <Edit className="h-4 w-4" />
-                                  </Button>
-                                  <Button 
-                                    variant="ghost"
-                                    size="sm"
-                                    className="h-8 w-8 p-0 hover:bg-red-50 text-red-600 rounded-lg border border-gray-200"
-                                    onClick={() => handleDelete(produto.id)}
-                                  >
-                                    <Trash2 className="h-4 w-4" />
-                                  </Button>
-                                </div>
-                              </div>
-                              {produto.descricao && <p className="text-sm text-gray-600 mb-4">{produto.descricao}</p>}
-                              <div className="space-y-2">
-                                <div className="bg-white/60 rounded-lg p-3 border border-gray-200">
-                                  <div className="flex justify-between items-center">
-                                    <span className="text-sm text-gray-700 flex items-center gap-2 font-medium">
-                                      <Package className="h-4 w-4" />
-                                      Preço
-                                    </span>
-                                    <span className="font-bold text-green-700 text-base">
-                                      {produto.promocao && produto.preco_promocional_tradicional 
-                                        ? formatCurrency(produto.preco_promocional_tradicional)
-                                        : formatCurrency(produto.preco_tradicional)
-                                      }
-                                    </span>
-                                  </div>
-                                </div>
-                                <div className="flex items-center justify-between p-3 bg-white rounded-lg border border-gray-200">
-                                  <span className="text-sm text-gray-800 font-medium">
-                                    {produto.ativo ? "Disponível" : "Indisponível"}
-                                  </span>
-                                  <label className="relative inline-flex items-center cursor-pointer">
-                                    <input
-                                      type="checkbox"
-                                      checked={produto.ativo}
-                                      onChange={(e) => handleToggleDisponibilidade(produto.id, e.target.checked)}
-                                      className="sr-only peer"
-                                    />
-                                    <div className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-4 peer-focus:ring-green-300 rounded-full peer peer-checked:after:translate-x-full peer-checked:after:border-white after:content-[''] after:absolute after:top-[2px] after:left-[2px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-green-600"></div>
-                                  </label>
-                                </div>
-                                <div className="flex items-center justify-between text-xs text-gray-600 pt-2">
-                                  <span className="flex items-center gap-1 font-medium">
-                                    <ArrowUpDown className="h-3 w-3" />
-                                    Ordem: {produto.ordem}
-                                  </span>
-                                </div>
-                              </div>
-                            </div>
-                          ))}
-                        </div>
-                      </CardContent>
-                    </Card>
-                  )
-                })}
+            <div className="flex flex-wrap items-center gap-3 mt-4">
+              <Filter className="h-4 w-4 text-muted-foreground" />
+              <Select
+                value={filters.categoriaId || "todas"}
+                onValueChange={(value) => setFilters(prev => ({ ...prev, categoriaId: value === "todas" ? "" : value }))}
+              >
+                <SelectTrigger className="w-52 rounded-xl">
+                  <SelectValue placeholder="Categoria" />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="todas">Todas as categorias</SelectItem>
+                  {categorias.map((categoria) => (
+                    <SelectItem key={categoria.id} value={categoria.id}>{categoria.nome}</SelectItem>
+                  ))}
+                  <SelectItem value="sem-categoria">Sem categoria</SelectItem>
+                </SelectContent>
+              </Select>
+              <Select
+                value={filters.status}
+                onValueChange={(value) => setFilters(prev => ({ ...prev, status: value as ProductStatus }))}
+              >
+                <SelectTrigger className="w-40 rounded-xl">
+                  <SelectValue placeholder="Situação" />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="todos">Todos</SelectItem>
+                  <SelectItem value="ativos">Disponíveis</SelectItem>
+                  <SelectItem value="inativos">Indisponíveis</SelectItem>
+                  <SelectItem value="promocao">Em promoção</SelectItem>
+                </SelectContent>
+              </Select>
+              <Select
+                value={filters.sort}
+                onValueChange={(value) => setFilters(prev => ({ ...prev, sort: value as ProductSort }))}
+              >
+                <SelectTrigger className="w-44 rounded-xl">
+                  <ArrowUpDown className="h-4 w-4 mr-2" />
+                  <SelectValue placeholder="Ordenar" />
+                </SelectTrigger>
+                <SelectContent>
+                  <SelectItem value="ordem">Ordem do cardápio</SelectItem>
+                  <SelectItem value="nome">Nome</SelectItem>
+                  <SelectItem value="preco">Preço</SelectItem>
+                  <SelectItem value="recentes">Mais recentes</SelectItem>
+                </SelectContent>
+              </Select>
+              <Button variant="outline" className="rounded-xl" onClick={handleReajustarPrecos}>
+                <Percent className="h-4 w-4 mr-2" />
+                Reajustar preços
+              </Button>
+              <div className="flex items-center gap-2 ml-auto bg-secondary rounded-xl px-3 py-2">
+                <Pizza className="h-4 w-4 text-primary" />
+                <span className="text-sm font-medium">Habilitar Pizza Broto</span>
+                <label className="relative inline-flex items-center cursor-pointer">
+                  <input
+                    type="checkbox"
+                    checked={config.habilitar_broto}
+                    onChange={(e) => handleToggleBroto(e.target.checked)}
+                    className="sr-only peer"
+                  />
+                  <div className="w-9 h-5 bg-gray-300 peer-focus:outline-none peer-focus:ring-2 peer-focus:ring-green-300 rounded-full peer peer-checked:after:translate-x-full after:content-[''] after:absolute after:top-[0.5px] after:left-[1px] after:bg-white after:border-gray-300 after:border after:rounded-full after:h-4 after:w-4 after:transition-all peer-checked:bg-green-500"></div>
+                </label>
               </div>
+            </div>
+          </CardHeader>
+          <CardContent className="p-0">
+            {produtosList.items.length > 0 ? (
+              <VirtualList
+                items={produtosList.items}
+                rowHeight={PRODUCT_ROW_HEIGHT}
+                height={PRODUCT_LIST_HEIGHT}
+                getKey={(produto) => produto.id}
+                onEndReached={produtosList.loadMore}
+                renderRow={(produto) => renderProdutoRow(produto)}
+                footer={produtosList.loading && (
+                  <p className="text-center text-sm text-muted-foreground py-3">Carregando produtos...</p>
+                )}
+              />
             ) : (
               <div className="text-center py-12">
                 <div className="w-16 h-16 bg-muted/20 rounded-full flex items-center justify-center mx-auto mb-4">
                   <Package className="h-8 w-8 text-muted-foreground" />
                 </div>
-                <h3 className="text-lg font-medium text-foreground mb-2">Nenhum produto encontrado</h3>
-                <p className="text-muted-foreground mb-4">Ajuste os filtros ou adicione novos produtos</p>
+                {produtosList.loading ? (
+                  <p className="text-muted-foreground">Carregando produtos...</p>
+                ) : produtosList.error ? (
+                  <>
+                    <h3 className="text-lg font-medium text-foreground mb-2">Erro ao carregar produtos</h3>
+                    <Button variant="outline" className="rounded-xl" onClick={produtosList.reload}>Tentar novamente</Button>
+                  </>
+                ) : (
+                  <>
+                    <h3 className="text-lg font-medium text-foreground mb-2">Nenhum produto encontrado</h3>
+                    <p className="text-muted-foreground mb-4">Ajuste os filtros ou adicione novos produtos</p>
+                  </>
+                )}
               </div>
             )}
           </CardContent>
@@ -1254,7 +908,7 @@ export default function AdminProdutosPage() {
                               </span>
                               <span className="flex items-center gap-1">
                                 <Package className="h-3 w-3" />
-                                {produtos.filter(p => p.categoria_id === categoria.id).length} produtos
+                                {produtosPorCategoria[categoria.id] || 0} produtos
                               </span>
                             </div>
                           </div>
@@ -1444,6 +1098,9 @@ function ProdutoForm({
     setFormData(prev => ({ ...prev, [name]: parsedValue }))
   }
 
+  const [uploadingImagem, setUploadingImagem] = useState(false);
+  const [imagemErro, setImagemErro] = useState("");
+
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault();
     const cleanedData = { ...formData };
@@ -1452,6 +1109,24 @@ function ProdutoForm({
     onSave(cleanedData);
   };
 
+  // Foto do produto: o servidor gera as variantes AVIF/WebP (POST /api/images)
+  const handleImagemChange = async (e: React.ChangeEvent<HTMLInputElement>) => {
+    const file = e.target.files?.[0];
+    if (!file) return;
+    setUploadingImagem(true);
+    setImagemErro("");
+    try {
+      const { url, variants } = await uploadResponsiveImage(file, "produto");
+      setFormData((prev) => ({ ...prev, imagem_url: url, imagem_variantes: variants }));
+    } catch (error) {
+      console.error("Erro ao enviar foto do produto:", error);
+      setImagemErro("Falha ao carregar imagem. Verifique o formato e tente novamente.");
+    } finally {
+      setUploadingImagem(false);
+      e.target.value = "";
+    }
+  };
+
   const adicionarAdicional = () => {
     setFormData((prev) => ({
       ...prev,
@@ -1526,6 +1201,35 @@ function ProdutoForm({
         />
       </div>
 
+      <div className="space-y-2">
+        <Label htmlFor="imagem" className="text-sm font-medium text-gray-700">Foto (opcional)</Label>
+        <div className="flex items-center gap-4">
+          {formData.imagem_url && (
+            <img src={formData.imagem_url} alt={formData.nome || "Foto do produto"} className="w-16 h-16 rounded-lg object-cover" />
+          )}
+          <Input
+            id="imagem"
+            type="file"
+            accept="image/*"
+            onChange={handleImagemChange}
+            disabled={uploadingImagem}
+            className="bg-white border border-gray-300 rounded-lg text-sm"
+          />
+          {formData.imagem_url && (
+            <Button
+              type="button"
+              variant="outline"
+              size="sm"
+              onClick={() => setFormData((prev) => ({ ...prev, imagem_url: null, imagem_variantes: null }))}
+            >
+              Remover
+            </Button>
+          )}
+        </div>
+        {uploadingImagem && <p className="text-xs text-gray-500">Gerando versões da imagem...</p>}
+        {imagemErro && <p className="text-xs text-red-600">{imagemErro}</p>}
+      </div>
+
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
         <div className="space-y-2">
           <Label htmlFor="preco_tradicional" className="text-sm font-medium text-gray-700">Preço Tradicional</Label>
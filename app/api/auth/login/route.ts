@@ -0,0 +1,29 @@
+import { NextResponse, type NextRequest } from "next/server"
+import { adminIdFrom, createAdminSessionToken, setAdminSessionCookie, verifyAdminCredentials } from "@/lib/admin-session"
+import { log } from "@/lib/logger"
+
+export const runtime = "nodejs"
+
+/**
+ * Abre a sessão de admin no servidor (cookie HttpOnly) para as rotas de API
+ * restritas. Corpo: { email, password } (ou { email, senha }).
+ */
+export async function POST(request: NextRequest) {
+  const body = await request.json().catch(() => null)
+  const email = typeof body?.email === "string" ? body.email.trim() : ""
+  const senha = typeof body?.password === "string" ? body.password : typeof body?.senha === "string" ? body.senha : ""
+
+  const admin = await verifyAdminCredentials(email, senha)
+  if (!admin) {
+    log.warn("Login de admin recusado no servidor", 'AUTH', { email })
+    return NextResponse.json({ error: "Credenciais inválidas" }, { status: 401 })
+  }
+
+  return setAdminSessionCookie(NextResponse.json({ admin }), createAdminSessionToken(admin.id))
+}
+
+// Diz se a requisição tem sessão de admin válida (o painel confere ao abrir)
+export async function GET(request: NextRequest) {
+  const adminId = adminIdFrom(request)
+  return NextResponse.json({ authenticated: adminId !== null }, { status: adminId ? 200 : 401 })
+}
@@ -0,0 +1,9 @@
+import { NextResponse } from "next/server"
+import { setAdminSessionCookie } from "@/lib/admin-session"
+
+export const runtime = "nodejs"
+
+// Encerra a sessão de admin do servidor
+export async function POST() {
+  return setAdminSessionCookie(NextResponse.json({ ok: true }), null)
+}
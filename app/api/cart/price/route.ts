@@ -0,0 +1,34 @@
+import { NextResponse, type NextRequest } from "next/server"
+import { getMenuSnapshot } from "@/lib/menu-snapshot"
+import { priceCart, priceTableFor } from "@/lib/pricing"
+import { isSupabaseConfigured } from "@/lib/supabase"
+
+export const runtime = "nodejs"
+
+// Mesmo limite de linhas de um pedido
+const MAX_ITEMS = 100
+
+/**
+ * Confere os preços do carrinho com o cardápio atual. Responde, na ordem das
+ * linhas recebidas, o preço unitário válido de cada uma e a versão do
+ * cardápio usada.
+ */
+export async function POST(request: NextRequest) {
+  const body = await request.json().catch(() => null)
+  const items = body?.items
+  const valid = Array.isArray(items) && items.length <= MAX_ITEMS && items.every((item: any) =>
+    typeof item?.id === "string" && Number.isInteger(item.quantidade) && item.quantidade > 0
+  )
+  if (!valid) {
+    return NextResponse.json({ error: `Envie items (até ${MAX_ITEMS}) com id e quantidade` }, { status: 400 })
+  }
+
+  const snapshot = await getMenuSnapshot()
+  // O cardápio de fallback não tem os produtos reais: conferir com ele recusaria tudo
+  if (isSupabaseConfigured() && snapshot.source === "fallback") {
+    return NextResponse.json({ error: "Cardápio indisponível no momento" }, { status: 503 })
+  }
+  return NextResponse.json(priceCart(priceTableFor(snapshot), items), {
+    headers: { "Cache-Control": "no-store" },
+  })
+}
@@ -0,0 +1,63 @@
+import { NextResponse, type NextRequest } from "next/server"
+import {
+  processImage,
+  MAX_SOURCE_BYTES,
+  ImagePipelineBusyError,
+  ImagePipelineUnavailableError,
+  InvalidImageError,
+} from "@/lib/image-pipeline"
+import { requireAdmin } from "@/lib/admin-session"
+import { fallbackImageUrl, isImagePreset } from "@/lib/image-variants"
+import { log } from "@/lib/logger"
+
+export const runtime = "nodejs"
+
+/**
+ * Recebe o original enviado pelo admin (multipart: "file" e "preset"), gera
+ * as variantes responsivas e retorna o descritor a ser salvo no banco.
+ * Exige sessão de admin: cada imagem ocupa a CPU do servidor.
+ */
+export async function POST(request: NextRequest) {
+  const denied = requireAdmin(request)
+  if (denied) return denied
+  // Recusa pelo Content-Length antes de ler o corpo
+  if (Number(request.headers.get("content-length")) > MAX_SOURCE_BYTES + 64 * 1024) {
+    return NextResponse.json({ error: "Imagem muito grande (máximo 10MB)" }, { status: 413 })
+  }
+
+  let form: FormData
+  try {
+    form = await request.formData()
+  } catch {
+    return NextResponse.json({ error: "Envie a imagem como multipart/form-data" }, { status: 400 })
+  }
+
+  const file = form.get("file")
+  const preset = form.get("preset")
+  if (!(file instanceof Blob) || !isImagePreset(preset)) {
+    return NextResponse.json({ error: "Campos obrigatórios: file e preset" }, { status: 400 })
+  }
+  if (!file.type.startsWith("image/")) {
+    return NextResponse.json({ error: "Arquivo não é uma imagem" }, { status: 415 })
+  }
+  if (file.size > MAX_SOURCE_BYTES) {
+    return NextResponse.json({ error: "Imagem muito grande (máximo 10MB)" }, { status: 413 })
+  }
+
+  try {
+    const variants = await processImage(Buffer.from(await file.arrayBuffer()), preset)
+    return NextResponse.json({ variants, url: fallbackImageUrl(variants) }, { status: 201 })
+  } catch (error) {
+    if (error instanceof InvalidImageError) {
+      return NextResponse.json({ error: error.message }, { status: 422 })
+    }
+    if (error instanceof ImagePipelineBusyError) {
+      return NextResponse.json({ error: error.message }, { status: 503, headers: { "Retry-After": "5" } })
+    }
+    if (error instanceof ImagePipelineUnavailableError) {
+      return NextResponse.json({ error: error.message }, { status: 503 })
+    }
+    log.error("Erro ao processar imagem", 'IMAGES', { preset }, error instanceof Error ? error : new Error(String(error)))
+    return NextResponse.json({ error: "Erro ao processar imagem" }, { status: 500 })
+  }
+}
@@ -0,0 +1,132 @@
+import { NextResponse, type NextRequest } from "next/server"
+import {
+  processImage,
+  ImagePipelineBusyError,
+  ImagePipelineUnavailableError,
+  InvalidImageError,
+} from "@/lib/image-pipeline"
+import { adminIdFrom, requireAdmin } from "@/lib/admin-session"
+import { fallbackImageUrl, isImagePreset } from "@/lib/image-variants"
+import {
+  appendUploadChunk,
+  getUploadSession,
+  readUploadSession,
+  removeUploadSession,
+  UploadOffsetError,
+  UploadSessionNotFoundError,
+  UPLOAD_CHUNK_BYTES,
+} from "@/lib/upload-sessions"
+import { log } from "@/lib/logger"
+
+export const runtime = "nodejs"
+
+type Params = { params: Promise<{ id: string }> }
+
+function sessionError(error: unknown) {
+  if (error instanceof UploadSessionNotFoundError) {
+    return NextResponse.json({ error: error.message }, { status: 404 })
+  }
+  if (error instanceof UploadOffsetError) {
+    return NextResponse.json({ error: error.message, received: error.received }, { status: 409 })
+  }
+  return null
+}
+
+/**
+ * Offset já recebido, para retomar depois de uma falha
+ */
+export async function GET(request: NextRequest, { params }: Params) {
+  const denied = requireAdmin(request)
+  if (denied) return denied
+  // Cada admin só vê e altera as próprias sessões
+  const owner = adminIdFrom(request)!
+  try {
+    const session = await getUploadSession((await params).id, owner)
+    return NextResponse.json({ ...session, chunkSize: UPLOAD_CHUNK_BYTES }, { headers: { "Cache-Control": "no-store" } })
+  } catch (error) {
+    const response = sessionError(error)
+    if (response) return response
+    throw error
+  }
+}
+
+/**
+ * Acrescenta um pedaço; o header Upload-Offset deve ser igual aos bytes já recebidos
+ */
+export async function PATCH(request: NextRequest, { params }: Params) {
+  const denied = requireAdmin(request)
+  if (denied) return denied
+  const owner = adminIdFrom(request)!
+  // Tamanho conferido pelo Content-Length antes de ler o corpo para a memória
+  const length = Number(request.headers.get("content-length"))
+  if (!request.headers.get("content-length") || !Number.isInteger(length)) {
+    return NextResponse.json({ error: "Header Content-Length obrigatório" }, { status: 411 })
+  }
+  if (length === 0 || length > UPLOAD_CHUNK_BYTES) {
+    return NextResponse.json({ error: "Pedaço vazio ou maior que o permitido" }, { status: 413 })
+  }
+  const offset = Number(request.headers.get("upload-offset"))
+  if (!Number.isInteger(offset) || offset < 0) {
+    return NextResponse.json({ error: "Header Upload-Offset obrigatório" }, { status: 400 })
+  }
+  const chunk = Buffer.from(await request.arrayBuffer())
+  if (chunk.length === 0 || chunk.length > UPLOAD_CHUNK_BYTES) {
+    return NextResponse.json({ error: "Pedaço vazio ou maior que o permitido" }, { status: 413 })
+  }
+
+  try {
+    const session = await appendUploadChunk((await params).id, owner, offset, chunk)
+    return NextResponse.json({ received: session.received, size: session.size })
+  } catch (error) {
+    const response = sessionError(error)
+    if (response) return response
+    throw error
+  }
+}
+
+/**
+ * Finaliza: { preset } -> gera as variantes do arquivo montado e encerra a sessão
+ */
+export async function POST(request: NextRequest, { params }: Params) {
+  const denied = requireAdmin(request)
+  if (denied) return denied
+  const owner = adminIdFrom(request)!
+  const { id } = await params
+  const body = await request.json().catch(() => null)
+  if (!isImagePreset(body?.preset)) {
+    return NextResponse.json({ error: "Preset inválido" }, { status: 400 })
+  }
+
+  try {
+    const variants = await processImage(await readUploadSession(id, owner), body.preset)
+    await removeUploadSession(id, owner)
+    return NextResponse.json({ variants, url: fallbackImageUrl(variants) }, { status: 201 })
+  } catch (error) {
+    const response = sessionError(error)
+    if (response) return response
+    if (error instanceof InvalidImageError) {
+      await removeUploadSession(id, owner)
+      return NextResponse.json({ error: error.message }, { status: 422 })
+    }
+    if (error instanceof ImagePipelineBusyError) {
+      return NextResponse.json({ error: error.message }, { status: 503, headers: { "Retry-After": "5" } })
+    }
+    if (error instanceof ImagePipelineUnavailableError) {
+      return NextResponse.json({ error: error.message }, { status: 503 })
+    }
+    // A sessão fica: o cliente pode tentar finalizar de novo sem reenviar
+    log.error("Erro ao processar imagem enviada em partes", 'IMAGES', { id }, error instanceof Error ? error : new Error(String(error)))
+    return NextResponse.json({ error: "Erro ao processar imagem" }, { status: 500 })
+  }
+}
+
+/**
+ * Cancela o upload e descarta os bytes recebidos
+ */
+export async function DELETE(request: NextRequest, { params }: Params) {
+  const denied = requireAdmin(request)
+  if (denied) return denied
+  const owner = adminIdFrom(request)!
+  await removeUploadSession((await params).id, owner)
+  return new NextResponse(null, { status: 204 })
+}
@@ -0,0 +1,39 @@
+import { NextResponse, type NextRequest } from "next/server"
+import { adminIdFrom, requireAdmin } from "@/lib/admin-session"
+import { MAX_SOURCE_BYTES } from "@/lib/image-pipeline"
+import { createUploadSession, UploadSessionLimitError, UPLOAD_CHUNK_BYTES } from "@/lib/upload-sessions"
+
+export const runtime = "nodejs"
+
+/**
+ * Abre uma sessão de upload em partes: { size, type } -> { id, received, chunkSize }
+ * Exige sessão de admin: cada sessão reserva espaço no disco do servidor.
+ */
+export async function POST(request: NextRequest) {
+  const denied = requireAdmin(request)
+  if (denied) return denied
+  const body = await request.json().catch(() => null)
+  const size = Number(body?.size)
+  const type = typeof body?.type === "string" ? body.type : ""
+
+  if (!Number.isInteger(size) || size <= 0) {
+    return NextResponse.json({ error: "Informe o tamanho do arquivo" }, { status: 400 })
+  }
+  if (!type.startsWith("image/")) {
+    return NextResponse.json({ error: "Arquivo não é uma imagem" }, { status: 415 })
+  }
+  if (size > MAX_SOURCE_BYTES) {
+    return NextResponse.json({ error: "Imagem muito grande (máximo 10MB)" }, { status: 413 })
+  }
+
+  let session
+  try {
+    session = await createUploadSession(size, type, adminIdFrom(request)!)
+  } catch (error) {
+    if (error instanceof UploadSessionLimitError) {
+      return NextResponse.json({ error: error.message }, { status: 429, headers: { "Retry-After": "30" } })
+    }
+    throw error
+  }
+  return NextResponse.json({ ...session, chunkSize: UPLOAD_CHUNK_BYTES }, { status: 201 })
+}
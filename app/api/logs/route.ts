@@ -0,0 +1,79 @@
+import { NextResponse, type NextRequest } from "next/server"
+import { appendLogLines } from "@/lib/log-segments"
+import { log } from "@/lib/logger"
+import { clientIp, RateLimiter } from "@/lib/rate-limit"
+
+export const runtime = "nodejs"
+
+// Limites por requisição: um lote do navegador tem no máximo algumas dezenas de linhas
+const MAX_BODY_BYTES = 256 * 1024
+const MAX_LINES = 500
+const LEVELS = new Set(["debug", "info", "warn", "error"])
+
+// A rota é pública (logs de clientes anônimos): sem limite, um flood
+// rotacionaria os segmentos e apagaria os logs reais. Por IP, lotes e bytes
+// por minuto; no total do servidor, bytes por minuto, contra floods de
+// muitos IPs. 2MB/min levam horas para encher os 50 segmentos de 10MB.
+const WINDOW_MS = 60_000
+const state = globalThis as typeof globalThis & {
+  __logRateLimits?: { requests: RateLimiter; bytes: RateLimiter; total: RateLimiter }
+}
+const limits = (state.__logRateLimits ??= {
+  requests: new RateLimiter(30, WINDOW_MS),
+  bytes: new RateLimiter(512 * 1024, WINDOW_MS),
+  total: new RateLimiter(2 * 1024 * 1024, WINDOW_MS),
+})
+
+const tooMany = (seconds: number) =>
+  NextResponse.json({ error: "Muitos logs enviados; tente mais tarde" }, { status: 429, headers: { "Retry-After": String(seconds) } })
+
+/**
+ * Recebe lotes NDJSON enviados pelo logger do navegador (sendBeacon ou
+ * fetch com keepalive) e os grava nos segmentos de log do servidor.
+ */
+export async function POST(request: NextRequest) {
+  // Tamanho conferido pelo Content-Length antes de ler o corpo
+  const length = Number(request.headers.get("content-length"))
+  if (!request.headers.get("content-length") || !Number.isInteger(length) || length < 0) {
+    return NextResponse.json({ error: "Header Content-Length obrigatório" }, { status: 411 })
+  }
+  if (length > MAX_BODY_BYTES) {
+    return NextResponse.json({ error: "Lote de logs muito grande" }, { status: 413 })
+  }
+
+  const ip = clientIp(request)
+  const wait = limits.requests.take(ip) || limits.bytes.take(ip, length) || limits.total.take("*", length)
+  if (wait > 0) return tooMany(wait)
+
+  const body = await request.text()
+  if (Buffer.byteLength(body) > MAX_BODY_BYTES) {
+    return NextResponse.json({ error: "Lote de logs muito grande" }, { status: 413 })
+  }
+
+  const receivedAt = new Date().toISOString()
+  const lines: string[] = []
+  let rejected = 0
+
+  for (const raw of body.split("\n").slice(0, MAX_LINES)) {
+    if (!raw.trim()) continue
+    try {
+      const entry = JSON.parse(raw)
+      if (!entry || !LEVELS.has(entry.level) || typeof entry.message !== "string") {
+        rejected++
+        continue
+      }
+      lines.push(JSON.stringify({ ...entry, source: "browser", receivedAt }))
+    } catch {
+      rejected++
+    }
+  }
+
+  try {
+    await appendLogLines(lines)
+  } catch (error) {
+    log.error("Erro ao gravar logs recebidos", 'LOGS', { lines: lines.length }, error instanceof Error ? error : new Error(String(error)))
+    return NextResponse.json({ error: "Erro ao gravar logs" }, { status: 500 })
+  }
+
+  return NextResponse.json({ accepted: lines.length, rejected })
+}
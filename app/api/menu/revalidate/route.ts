@@ -0,0 +1,51 @@
+import { timingSafeEqual } from "crypto"
+import { NextResponse, type NextRequest } from "next/server"
+import { revalidatePath, revalidateTag } from "next/cache"
+import { adminIdFrom } from "@/lib/admin-session"
+import { MENU_CACHE_TAG } from "@/lib/menu-snapshot"
+import { log } from "@/lib/logger"
+
+export const runtime = "nodejs"
+
+// Intervalo mínimo entre invalidações: cada uma regenera a página inicial
+const MIN_INTERVAL_MS = 2000
+
+// Guardado em globalThis para sobreviver ao recarregamento de módulos em desenvolvimento
+const state = globalThis as typeof globalThis & { __menuRevalidatedAt?: number }
+
+/**
+ * Sessão de admin ou, para chamadas de fora do painel (webhooks, scripts),
+ * o header x-revalidate-secret igual a REVALIDATE_SECRET
+ */
+function authorized(request: NextRequest): boolean {
+  if (adminIdFrom(request)) return true
+  const expected = process.env.REVALIDATE_SECRET
+  const received = request.headers.get("x-revalidate-secret")
+  if (!expected || !received) return false
+  const a = Buffer.from(expected)
+  const b = Buffer.from(received)
+  return a.length === b.length && timingSafeEqual(a, b)
+}
+
+// Chamado pelo admin após salvar produtos, categorias, sabores, bordas ou configuração
+export async function POST(request: NextRequest) {
+  if (!authorized(request)) {
+    return NextResponse.json({ error: "Sessão de admin obrigatória" }, { status: 401 })
+  }
+
+  const now = Date.now()
+  const wait = (state.__menuRevalidatedAt ?? 0) + MIN_INTERVAL_MS - now
+  if (wait > 0) {
+    return NextResponse.json(
+      { error: "Invalidação recente; tente novamente em instantes" },
+      { status: 429, headers: { "Retry-After": String(Math.ceil(wait / 1000)) } }
+    )
+  }
+  state.__menuRevalidatedAt = now
+
+  revalidateTag(MENU_CACHE_TAG)
+  // Regenera a página inicial estática na próxima visita
+  revalidatePath("/")
+  log.info("Snapshot do cardápio invalidado", 'MENU')
+  return NextResponse.json({ revalidated: true, at: new Date(now).toISOString() })
+}
@@ -0,0 +1,26 @@
+import { NextResponse, type NextRequest } from "next/server"
+import { getMenuSnapshot } from "@/lib/menu-snapshot"
+import { menuRequestDuration } from "@/lib/metrics"
+
+// Navegadores revalidam sempre via ETag; a CDN serve a mesma resposta por
+// alguns segundos e continua servindo a anterior enquanto busca a nova
+const CACHE_CONTROL = "public, max-age=0, must-revalidate, s-maxage=10, stale-while-revalidate=60"
+
+export async function GET(request: NextRequest) {
+  const startedAt = performance.now()
+  const snapshot = await getMenuSnapshot()
+  const etag = `"menu-${snapshot.version}"`
+  const headers = { ETag: etag, "Cache-Control": CACHE_CONTROL }
+
+  const ifNoneMatch = request.headers.get("if-none-match")
+  const notModified = !!ifNoneMatch && ifNoneMatch.split(",").some(tag => tag.trim() === etag)
+  menuRequestDuration.observe(
+    { status: notModified ? "304" : "200", source: snapshot.source },
+    (performance.now() - startedAt) / 1000
+  )
+  if (notModified) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+
+  return NextResponse.json(snapshot, { headers })
+}
@@ -0,0 +1,32 @@
+import { NextResponse, type NextRequest } from "next/server"
+import { createOrder, IDEMPOTENCY_KEY_PATTERN, OrderValidationError } from "@/lib/orders"
+import { log } from "@/lib/logger"
+
+export const runtime = "nodejs"
+
+/**
+ * Grava o pedido do checkout. Exige o header Idempotency-Key (UUID gerado no
+ * navegador): repetir o envio com a mesma chave devolve o pedido já gravado
+ * (200) em vez de criar outro (201).
+ */
+export async function POST(request: NextRequest) {
+  const idempotencyKey = request.headers.get("idempotency-key") || ""
+  if (!IDEMPOTENCY_KEY_PATTERN.test(idempotencyKey)) {
+    return NextResponse.json({ error: "Header Idempotency-Key (UUID) obrigatório" }, { status: 400 })
+  }
+
+  const body = await request.json().catch(() => null)
+  try {
+    const receipt = await createOrder(body, idempotencyKey)
+    if (!receipt.duplicado) {
+      log.info("Pedido gravado", 'ORDERS', { id: receipt.id, numero: receipt.numero, itens: body.items.length })
+    }
+    return NextResponse.json(receipt, { status: receipt.duplicado ? 200 : 201 })
+  } catch (error) {
+    if (error instanceof OrderValidationError) {
+      return NextResponse.json({ error: error.message, problems: error.problems }, { status: 400 })
+    }
+    log.error("Erro ao gravar pedido", 'ORDERS', { idempotencyKey }, error instanceof Error ? error : new Error(String(error)))
+    return NextResponse.json({ error: "Erro ao gravar pedido" }, { status: 503 })
+  }
+}
@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useEffect } from "react"
+import { useState, useEffect, useMemo, useRef } from "react"
 import { useRouter } from "next/navigation"
 import { ArrowLeft, ShoppingBag, MapPin, Phone, User, CreditCard, DollarSign, Smartphone, Loader2, Plus, Minus, QrCode, Banknote, UtensilsCrossed, Bike, Pizza, MessageCircle, ScanLine, Wallet, ArrowDownToLine, ChevronUp, ChevronDown } from "lucide-react"
 import { Button } from "@/components/ui/button"
@@ -10,11 +10,16 @@ import { Label } from "@/components/ui/label"
 import { Textarea } from "@/components/ui/textarea"
 import { RadioGroup, RadioGroupItem } from "@/components/ui/radio-group"
 import { Checkbox } from "@/components/ui/checkbox"
-import { useCart } from "@/lib/cart-context"
+import { cartLineKey, useCart } from "@/lib/cart-context"
 import { useConfig } from "@/lib/config-context"
 import { useClientes } from "@/lib/clientes-context"
 import { formatCurrency } from "@/lib/currency-utils"
+import { formatCep, searchCep as searchCepAddress } from "@/lib/cep-service"
+import { compileDeliveryZones, findDeliveryZone, loadDeliveryZones, type DeliveryZone } from "@/lib/delivery-zones"
 import { supabase, isSupabaseConfigured } from "@/lib/supabase"
+import { fetchCartPrices, OrderRequestError, submitOrder } from "@/lib/order-client"
+import type { OrderInput, OrderReceipt } from "@/lib/orders"
+import { buildWhatsAppLink, type WhatsAppOrder } from "@/lib/whatsapp-message"
 
 interface StoreConfig {
   nome: string
@@ -30,6 +35,7 @@ interface StoreConfig {
 }
 
 interface AddressData {
+  cep?: string
   logradouro: string
   bairro: string
   localidade: string
@@ -65,12 +71,16 @@ interface BordaRecheada {
 
 export default function CheckoutPage() {
   const router = useRouter()
-  const { state, dispatch } = useCart()
+  const { state, dispatch, hydrated } = useCart()
   const { config } = useConfig()
   
   // Estados principais
   const [loading, setLoading] = useState(true)
   const [submitting, setSubmitting] = useState(false)
+  // Motivos da recusa do pedido pelo servidor (item indisponível, fora da área, abaixo do mínimo)
+  const [orderProblems, setOrderProblems] = useState<string[]>([])
+  // Linhas que o servidor não conseguiu precificar, por chave de linha
+  const [unavailableLines, setUnavailableLines] = useState<Record<string, string[]>>({})
   const [storeConfig, setStoreConfig] = useState<StoreConfig | null>(null)
   const [produtos, setProdutos] = useState<Produto[]>([])
   const [bordasRecheadas, setBordasRecheadas] = useState<BordaRecheada[]>([])
@@ -97,6 +107,25 @@ export default function CheckoutPage() {
   const [searchingCep, setSearchingCep] = useState(false)
   const [cepError, setCepError] = useState("")
   
+  // Zonas de entrega: compiladas uma vez, a taxa sai do índice sem ida ao servidor
+  const [deliveryZones, setDeliveryZones] = useState<DeliveryZone[]>([])
+  const [customerCoords, setCustomerCoords] = useState<{ latitude: number; longitude: number } | null>(null)
+  const zoneIndex = useMemo(() => compileDeliveryZones(deliveryZones), [deliveryZones])
+  const hasDeliveryZones = zoneIndex.size > 0
+  const deliveryQuote = useMemo(
+    () => hasDeliveryZones
+      ? findDeliveryZone(zoneIndex, { cep: customerCep, bairro: addressData?.bairro, ...customerCoords })
+      : null,
+    [zoneIndex, hasDeliveryZones, customerCep, addressData, customerCoords]
+  )
+  // Com zonas cadastradas, CEP completo sem zona (e sem busca pendente) está fora da área
+  const outsideDeliveryArea = hasDeliveryZones && !deliveryQuote && !searchingCep &&
+    customerCep.replace(/\D/g, "").length === 8
+  // Sem zonas cadastradas vale a taxa única da configuração
+  const currentDeliveryFee = deliveryType !== "delivery"
+    ? 0
+    : deliveryQuote ? deliveryQuote.taxa : (storeConfig?.taxa_entrega || 0)
+  
   // Observações e pagamento
   const [orderNotes, setOrderNotes] = useState("")
   const [paymentMethod, setPaymentMethod] = useState<"pix" | "dinheiro" | "debito" | "credito" | "ticket_alimentacao">("pix")
@@ -104,7 +133,12 @@ export default function CheckoutPage() {
     // Carregar configurações da loja e produtos
   useEffect(() => {
     const loadData = async () => {
-      await Promise.all([loadStoreConfig(), loadProdutos(), loadBordasRecheadas()])
+      await Promise.all([
+        loadStoreConfig(),
+        loadProdutos(),
+        loadBordasRecheadas(),
+        loadDeliveryZones().then(setDeliveryZones)
+      ])
     }
     loadData()
   }, [])
@@ -141,7 +175,7 @@ export default function CheckoutPage() {
   
   // Verificar carrinho vazio e redirecionar se necessário
   useEffect(() => {
-    if (!loading && (!state.items || state.items.length === 0)) {
+    if (!loading && hydrated && (!state.items || state.items.length === 0)) {
       // Aguardar um momento antes de redirecionar para evitar conflitos
       const timer = setTimeout(() => {
         router.push("/")
@@ -149,7 +183,26 @@ export default function CheckoutPage() {
       
       return () => clearTimeout(timer)
     }
-  }, [state.items?.length, router, loading])
+  }, [state.items?.length, router, loading, hydrated])
+
+  // Uma alteração no pedido pode resolver a recusa anterior
+  useEffect(() => {
+    setOrderProblems([])
+  }, [state.items, deliveryType, customerCep, addressNumber])
+
+  // Conferir os preços do carrinho com o servidor uma vez por visita ao
+  // checkout: promoções e preços podem ter mudado desde que os itens entraram
+  const pricesChecked = useRef(false)
+  useEffect(() => {
+    if (!hydrated || pricesChecked.current || state.items.length === 0) return
+    pricesChecked.current = true
+    fetchCartPrices(state.items)
+      .then(({ precos, unavailable }) => {
+        dispatch({ type: "REPRICE", payload: { precos } })
+        setUnavailableLines(unavailable)
+      })
+      .catch(error => console.error("❌ Erro ao conferir preços do carrinho:", error))
+  }, [hydrated, state.items, dispatch])
 
   const loadStoreConfig = async () => {
     try {
@@ -311,9 +364,9 @@ export default function CheckoutPage() {
     setDeliveryType(type)
   }
   
-  // Buscar CEP
+  // Buscar CEP (com cache; um endereço vencido aparece na hora e é revalidado)
   const searchCep = async (cep: string) => {
-    const cleanCep = cep.replace(/\D/g, "")
+    const cleanCep = formatCep(cep)
     
     if (cleanCep.length !== 8) {
       setCepError("CEP deve ter 8 dígitos")
@@ -323,23 +376,23 @@ export default function CheckoutPage() {
     setSearchingCep(true)
     setCepError("")
     
-    try {
-      const response = await fetch(`https://viacep.com.br/ws/${cleanCep}/json/`)
-      const data = await response.json()
-      
-      if (data.erro) {
-        setCepError("CEP não encontrado")
-        setAddressData(null)
-      } else {
-        setAddressData(data)
-        setCepError("")
+    const result = await searchCepAddress(cleanCep, {
+      onUpdate: (updated) => {
+        // Ignorar se o cliente já trocou de CEP enquanto revalidava
+        setAddressData((current) =>
+          current && formatCep(current.cep || "") === cleanCep && updated.success && updated.data ? updated.data : current
+        )
       }
-    } catch (error) {
-      setCepError("Erro ao buscar CEP")
+    })
+    
+    if (result.success && result.data) {
+      setAddressData(result.data)
+      setCepError("")
+    } else {
+      setCepError(result.error === "CEP não encontrado" ? result.error : "Erro ao buscar CEP")
       setAddressData(null)
-    } finally {
-      setSearchingCep(false)
     }
+    setSearchingCep(false)
   }
   
   // Máscara de CEP
@@ -359,6 +412,18 @@ export default function CheckoutPage() {
     }
   }
   
+  // Localização do cliente para zonas por raio
+  const handleUseLocation = () => {
+    if (!navigator.geolocation) {
+      setCepError("Localização indisponível neste navegador")
+      return
+    }
+    navigator.geolocation.getCurrentPosition(
+      ({ coords }) => setCustomerCoords({ latitude: coords.latitude, longitude: coords.longitude }),
+      () => setCepError("Não foi possível obter sua localização")
+    )
+  }
+  
   // Máscara de telefone
   const handlePhoneChange = (value: string) => {
     const masked = value
@@ -378,6 +443,7 @@ export default function CheckoutPage() {
         telefone: customerPhone.replace(/\D/g, "").length >= 10,
         cep: customerCep.replace(/\D/g, "").length === 8,
         endereco: addressData !== null,
+        zona: !hasDeliveryZones || deliveryQuote !== null,
         numero: addressNumber.trim() !== ""
       }
       
@@ -388,6 +454,7 @@ export default function CheckoutPage() {
         validacoes.telefone &&
         validacoes.cep &&
         validacoes.endereco &&
+        validacoes.zona &&
         validacoes.numero
       )
     } else {
@@ -406,85 +473,43 @@ export default function CheckoutPage() {
     }
   }
   
-  // Gerar mensagem para WhatsApp
-  const generateWhatsAppMessage = () => {
-    const deliveryFee = deliveryType === "delivery" ? (storeConfig?.taxa_entrega || 0) : 0
-    const subtotal = state.total || 0
-    const total = subtotal + deliveryFee
-    
-    let message = `*NOVO PEDIDO - ${storeConfig?.nome}*\n\n`
-    
-    // Resumo dos itens com formatação melhorada
-    message += `📋 *ITENS DO PEDIDO:*\n\n`
-    state.items?.forEach((item) => {
-      // Emoji baseado no tipo de item
-      const emoji = item.tipo === "bebida" ? "🥤" : "🍕"
-      
-      // Linha principal do item com quantidade clara
-      message += `${emoji} ${item.quantidade}x ${item.nome}`
-      
-      // Mostrar tamanho se for pizza
-      if (item.tipo !== "bebida") {
-        message += ` - ${item.tamanho === "broto" ? "Broto" : "Tradicional"}`
-      }
-      message += `\n`
-      
-      // Mostrar sabores se for pizza com múltiplos sabores (não mostrar para bebidas)
-      if (item.sabores && item.sabores.length > 0 && item.tipo !== "bebida") {
-        if (item.sabores.length === 1) {
-          message += `  • Sabor: ${item.sabores[0]}\n`
-        } else if (item.sabores.length === 2) {
-          message += `  • Sabores:\n    1/2 ${item.sabores[0]}\n    1/2 ${item.sabores[1]}\n`
-        } else {
-          message += `  • Sabores: ${item.sabores.join(', ')}\n`
-        }
-      }
-      
-      // Mostrar adicionais se existirem, organizados por sabor
-      if (item.adicionais && item.adicionais.length > 0) {
-        item.adicionais.forEach((adicionalGrupo) => {
-          if (adicionalGrupo.itens.length > 0) {
-            message += `  • Adicionais (${adicionalGrupo.sabor}): ${adicionalGrupo.itens.map(adic => `${adic.nome} (+${formatCurrency(adic.preco)})`).join(', ')}\n`
-          }
-        })
-      }
-      
-      // Mostrar borda recheada se existir
-      if (item.bordaRecheada) {
-        message += `  • Borda Recheada: ${item.bordaRecheada.nome} (+${formatCurrency(item.bordaRecheada.preco)})\n`
-      }
-      
-      // Total do item
-      message += `  • Total: ${formatCurrency(item.preco * item.quantidade)}\n\n`
-    })
-    
-    // Tipo de entrega
-    message += `🚚 *ENTREGA:* ${deliveryType === "delivery" ? "Delivery" : "Retirada no Balcão"}\n\n`
-    
-    // Dados do cliente
-    message += `👤 *DADOS DO CLIENTE:*\n`
-    message += `Nome: ${customerName}\n`
-    message += `Telefone: ${customerPhone}\n\n`
-    
-    // Dados do cliente (se delivery)
-    if (deliveryType === "delivery") {
-      message += `📍 *ENDEREÇO DE ENTREGA:*\n`
-      if (addressData) {
-        message += `${addressData.logradouro}, ${addressNumber}\n`
-        if (addressComplement) message += `${addressComplement}\n`
-        message += `${addressData.bairro} - ${addressData.localidade}/${addressData.uf}\n`
-        message += `CEP: ${customerCep}\n`
-        if (deliveryNotes) message += `Observações: ${deliveryNotes}\n`
-      }
-      message += `\n`
-    }
-    
-    // Observações do pedido
-    if (orderNotes) {
-      message += `📝 *OBSERVAÇÕES DO PEDIDO:*\n${orderNotes}\n\n`
-    }
-    
-    // Forma de pagamento
+  // Linhas do endereço de entrega (mensagem do WhatsApp e registro do pedido)
+  const deliveryAddressLines = (): string[] => {
+    if (deliveryType !== "delivery" || !addressData) return []
+    return [
+      `${addressData.logradouro}, ${addressNumber}`,
+      addressComplement,
+      `${addressData.bairro} - ${addressData.localidade}/${addressData.uf}`,
+      `CEP: ${customerCep}`,
+      deliveryNotes && `Observações: ${deliveryNotes}`,
+    ].filter((linha): linha is string => !!linha)
+  }
+
+  // Dados do pedido enviados para POST /api/pedidos
+  const buildOrderInput = (): OrderInput => ({
+    tipoEntrega: deliveryType,
+    cliente: { nome: customerName.trim(), telefone: customerPhone },
+    endereco: deliveryAddressLines().join(" - ") || null,
+    formaPagamento: paymentMethod,
+    observacoes: orderNotes || null,
+    taxaEntrega: currentDeliveryFee,
+    local: deliveryType === "delivery" ? { cep: customerCep, bairro: addressData?.bairro, ...customerCoords } : null,
+    items: state.items.map(item => ({
+      id: item.id,
+      nome: item.nome,
+      tamanho: item.tamanho,
+      sabores: item.sabores,
+      quantidade: item.quantidade,
+      preco: item.preco,
+      tipo: item.tipo,
+      adicionais: item.adicionais,
+      bordaRecheada: item.bordaRecheada ?? null,
+    })),
+  })
+
+  // Dados da mensagem do WhatsApp; o layout é escolhido em buildWhatsAppLink
+  // Com o pedido gravado, preços e totais são os do servidor (os mesmos do pedido salvo)
+  const buildWhatsAppOrder = (receipt?: OrderReceipt | null): WhatsAppOrder => {
     const paymentLabels = {
       pix: "PIX",
       dinheiro: "Dinheiro",
@@ -492,19 +517,26 @@ export default function CheckoutPage() {
       credito: "Cartão de Crédito",
       ticket_alimentacao: "Ticket Alimentação"
     }
-    message += `💳 *FORMA DE PAGAMENTO:*\n${paymentLabels[paymentMethod]}\n\n`
-    
-    // Resumo financeiro
-    message += `💰 *VALORES:*\n`
-    message += `Subtotal: ${formatCurrency(subtotal)}\n`
-    if (deliveryType === "delivery") {
-      message += `Taxa de entrega: ${formatCurrency(deliveryFee)}\n`
+    const items = (state.items || []).map((item, index) =>
+      receipt?.itens[index] ? { ...item, preco: receipt.itens[index].preco } : item
+    )
+    const subtotal = receipt ? receipt.subtotal : state.total || 0
+    const taxaEntrega = receipt ? receipt.taxaEntrega : currentDeliveryFee
+
+    return {
+      loja: storeConfig?.nome || "",
+      numero: receipt?.numero,
+      pedidoUrl: receipt ? `${window.location.origin}/pedido/${receipt.id}` : null,
+      items,
+      entrega: deliveryType,
+      cliente: { nome: customerName, telefone: customerPhone },
+      endereco: deliveryAddressLines(),
+      observacoes: orderNotes || null,
+      pagamento: paymentLabels[paymentMethod],
+      subtotal,
+      taxaEntrega,
+      total: receipt ? receipt.total : subtotal + taxaEntrega,
     }
-    message += `*TOTAL: ${formatCurrency(total)}*\n\n`
-    
-    message += `⏳ Aguardando confirmação!`
-    
-    return message
   }
   
   // Buscar adicionais de um sabor específico
@@ -616,16 +648,6 @@ export default function CheckoutPage() {
     return cleaned
   }
 
-  // Limpar caracteres problemáticos da mensagem
-  const sanitizeMessage = (message: string): string => {
-    return message
-      .replace(/[\u200B-\u200D\uFEFF]/g, '') // Remove zero-width characters
-      .replace(/[\uFFFD]/g, '') // Remove replacement characters
-      // Remove control characters, exceto \n (0x0A)
-      .replace(/[\u0000-\u0009\u000B-\u001F\u007F-\u009F]/g, '')
-      .trim()
-  }
-
   // Finalizar pedido
   const handleFinishOrder = async () => {
     console.log("🔄 Iniciando processo de finalização do pedido...")
@@ -642,6 +664,11 @@ export default function CheckoutPage() {
       return
     }
 
+    // A aba do WhatsApp é aberta ainda no clique: depois dos awaits abaixo o
+    // bloqueador de pop-ups (Safari) recusaria window.open sem lançar erro
+    const whatsappWindow = window.open("", "_blank")
+    if (whatsappWindow) whatsappWindow.opener = null
+
     setSubmitting(true)
     
     // Salvar cliente se solicitado
@@ -664,50 +691,57 @@ export default function CheckoutPage() {
       }
     }
     
+    // Gravar o pedido antes de abrir o WhatsApp, para a mensagem levar o número
+    let receipt: OrderReceipt | null = null
+    if (isSupabaseConfigured()) {
+      try {
+        receipt = await submitOrder(buildOrderInput())
+        console.log("✅ Pedido gravado:", { id: receipt.id, numero: receipt.numero, duplicado: receipt.duplicado })
+      } catch (error) {
+        if (error instanceof OrderRequestError && error.rejected) {
+          // Pedido recusado pelo servidor: mostrar os motivos e não enviar
+          console.warn("⚠️ Pedido recusado:", error.problems)
+          whatsappWindow?.close()
+          setOrderProblems(error.problems.length > 0 ? error.problems : [error.message])
+          setSubmitting(false)
+          return
+        }
+        // Falha de rede ou do servidor: sem o registro o pedido ainda segue pelo WhatsApp
+        console.error("❌ Erro ao gravar pedido:", error)
+      }
+    }
+    
     try {
-      const message = generateWhatsAppMessage()
-      console.log("📝 Mensagem gerada:", message.length > 0 ? "✅ OK" : "❌ Vazia")
-      
       const rawWhatsappNumber = storeConfig.whatsapp
       const whatsappNumber = sanitizeWhatsappNumber(rawWhatsappNumber)
       console.log("📱 Número processado:", { original: rawWhatsappNumber, processado: whatsappNumber })
       
       if (!whatsappNumber) {
         console.error("❌ Erro: Número WhatsApp inválido")
+        whatsappWindow?.close()
         alert("Erro: Número WhatsApp inválido. Entre em contato com o administrador.")
         setSubmitting(false)
         return
       }
       
-      // Limpar caracteres problemáticos da mensagem
-      let mensagemFinal = sanitizeMessage(message)
-      
-      // Verificar tamanho da mensagem (WhatsApp tem limite de ~2048 caracteres na URL)
-      if (mensagemFinal.length > 1500) {
-        console.warn("⚠️ Mensagem muito longa, truncando...")
-        mensagemFinal = mensagemFinal.substring(0, 1400) + "\n\n... (mensagem truncada)"
-      }
-      
-      // Construir URL do WhatsApp (wa.me é mais compatível)
-      let whatsappWebUrl = `https://wa.me/${whatsappNumber}?text=${encodeURIComponent(mensagemFinal)}`
-      
-      // Verificar se a URL final não excede limites do navegador
-      if (whatsappWebUrl.length > 2000) {
-        console.warn("⚠️ URL muito longa, reduzindo mensagem...")
-        const reducedMessage = mensagemFinal.substring(0, 1000) + "\n\n... (mensagem reduzida)"
-        whatsappWebUrl = `https://wa.me/${whatsappNumber}?text=${encodeURIComponent(reducedMessage)}`
-      }
+      // Construir URL do WhatsApp (wa.me é mais compatível) no layout que cabe no limite da URL
+      const { url: whatsappWebUrl, message, layout } = buildWhatsAppLink(whatsappNumber, buildWhatsAppOrder(receipt))
       
       console.log("📱 Preparando envio para WhatsApp:", { 
         numeroProcessado: whatsappNumber, 
-        tamanhoMensagem: mensagemFinal.length,
+        layout,
+        tamanhoMensagem: message.length,
         urlLength: whatsappWebUrl.length 
       })
-      
       // Usar wa.me em todos os casos para máxima compatibilidade
       try {
         console.log("📱 Abrindo WhatsApp via wa.me...")
-        window.open(whatsappWebUrl, '_blank')
+        if (whatsappWindow && !whatsappWindow.closed) {
+          whatsappWindow.location.href = whatsappWebUrl
+        } else {
+          // Pop-up bloqueado (window.open devolveu null) ou aba fechada: segue na própria aba
+          window.location.href = whatsappWebUrl
+        }
       } catch (error) {
         console.error("❌ Erro ao abrir WhatsApp:", error)
         // Fallback: tentar com window.location
@@ -726,6 +760,7 @@ export default function CheckoutPage() {
       
     } catch (error) {
       console.error("❌ Erro ao processar pedido:", error)
+      whatsappWindow?.close()
       alert("Erro ao processar pedido. Tente novamente.")
       setSubmitting(false)
     }
@@ -750,10 +785,14 @@ export default function CheckoutPage() {
   }
   
   const subtotal = state.total || 0
-  const deliveryFee = deliveryType === "delivery" ? (storeConfig?.taxa_entrega || 0) : 0
+  const deliveryFee = currentDeliveryFee
   const total = subtotal + deliveryFee
-  const minimumValue = storeConfig?.valor_minimo || 0
+  const minimumValue = deliveryType === "delivery" && deliveryQuote
+    ? deliveryQuote.pedidoMinimo
+    : storeConfig?.valor_minimo || 0
   const isMinimumMet = subtotal >= minimumValue
+  // Itens fora do cardápio atual precisam sair do carrinho antes de finalizar
+  const blockedItems = state.items.filter(item => unavailableLines[cartLineKey(item)])
   
   return (
     <div className="min-h-screen bg-gray-50">
@@ -803,7 +842,11 @@ export default function CheckoutPage() {
                   </div>
                   <div>
                     <span className="font-semibold text-[15px] text-neutral-800 block">Delivery</span>
-                    <p className="text-sm text-neutral-500 mt-1">Taxa: {formatCurrency(storeConfig?.taxa_entrega || 0)}</p>
+                    <p className="text-sm text-neutral-500 mt-1">
+                      Taxa: {deliveryQuote
+                        ? formatCurrency(deliveryQuote.taxa)
+                        : hasDeliveryZones ? "conforme o CEP" : formatCurrency(storeConfig?.taxa_entrega || 0)}
+                    </p>
                   </div>
                 </div>
               </div>
@@ -954,6 +997,21 @@ export default function CheckoutPage() {
                         )}
                       </div>
                       {cepError && <p className="text-red-600 text-sm mt-1">{cepError}</p>}
+                      {deliveryQuote && (
+                        <p className="text-sm text-neutral-600 mt-1">
+                          Entrega {deliveryQuote.zone.nome}: {formatCurrency(deliveryQuote.taxa)}
+                        </p>
+                      )}
+                      {outsideDeliveryArea && (
+                        <div className="mt-2 p-3 bg-red-50 rounded-lg text-sm">
+                          <p className="text-red-700">Ainda não entregamos neste endereço.</p>
+                          {zoneIndex.rings.length > 0 && !customerCoords && (
+                            <button type="button" className="text-red-700 underline mt-1" onClick={handleUseLocation}>
+                              Calcular pela minha localização
+                            </button>
+                          )}
+                        </div>
+                      )}
                       {addressData && (
                         <div className="mt-2 p-3 bg-green-50 rounded-lg text-sm">
                           <p className="font-medium text-green-800">Endereço encontrado:</p>
@@ -1029,6 +1087,11 @@ export default function CheckoutPage() {
                       <h3 className="text-sm font-semibold text-gray-600 mt-4 mb-2 pt-4 border-t border-gray-200">Bebidas</h3>
                     )}
                     <div className="bg-white rounded-lg shadow-sm p-3">
+                  {unavailableLines[cartLineKey(item)] && (
+                    <p className="text-sm text-red-600 mb-2" role="alert">
+                      Indisponível: {unavailableLines[cartLineKey(item)].join("; ")}. Remova este item para continuar.
+                    </p>
+                  )}
                   {/* Header do item */}
                   <div className="flex items-center justify-between mb-3">
                     <div className="flex-1">
@@ -1398,6 +1461,26 @@ export default function CheckoutPage() {
                 </p>
               </div>
             )}
+
+            {blockedItems.length > 0 && (
+              <div className="mt-4 p-3 bg-red-50 rounded-lg">
+                <p className="text-red-800 text-sm">
+                  {blockedItems.length === 1
+                    ? "1 item do carrinho não está mais disponível."
+                    : `${blockedItems.length} itens do carrinho não estão mais disponíveis.`}
+                  {" "}Remova-os para finalizar o pedido.
+                </p>
+              </div>
+            )}
+
+            {orderProblems.length > 0 && (
+              <div className="mt-4 p-3 bg-red-50 rounded-lg" role="alert">
+                <p className="text-red-800 text-sm font-medium">Não foi possível registrar o pedido:</p>
+                <ul className="text-red-800 text-sm list-disc pl-5">
+                  {orderProblems.map(problem => <li key={problem}>{problem}</li>)}
+                </ul>
+              </div>
+            )}
           </div>
         </Card>
       </div>
@@ -1408,7 +1491,7 @@ export default function CheckoutPage() {
         
         <Button
           onClick={handleFinishOrder}
-          disabled={!isMinimumMet || !isFormValid() || submitting}
+          disabled={!isMinimumMet || !isFormValid() || submitting || blockedItems.length > 0}
           className="w-full h-12 text-lg rounded-full bg-green-600 hover:bg-green-700 disabled:bg-gray-300 font-bold py-3 flex items-center justify-center gap-2"
         >
           {submitting ? (
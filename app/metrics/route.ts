@@ -0,0 +1,23 @@
+import { NextResponse, type NextRequest } from "next/server"
+import { renderMetrics } from "@/lib/metrics"
+
+export const runtime = "nodejs"
+export const dynamic = "force-dynamic"
+
+/**
+ * Métricas do processo no formato de texto do Prometheus. Com METRICS_TOKEN
+ * definido, exige "Authorization: Bearer <token>".
+ */
+export async function GET(request: NextRequest) {
+  const token = process.env.METRICS_TOKEN
+  if (token && request.headers.get("authorization") !== `Bearer ${token}`) {
+    return new NextResponse("Unauthorized\n", { status: 401 })
+  }
+
+  return new NextResponse(renderMetrics(), {
+    headers: {
+      "Content-Type": "text/plain; version=0.0.4; charset=utf-8",
+      "Cache-Control": "no-store"
+    }
+  })
+}
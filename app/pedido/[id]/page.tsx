@@ -0,0 +1,76 @@
+import type { Metadata } from "next"
+import { notFound } from "next/navigation"
+import { getOrder } from "@/lib/orders"
+import { formatCurrency } from "@/lib/currency-utils"
+
+// Pedido completo, aberto pelo link da mensagem do WhatsApp quando os itens
+// não cabem na mensagem. O pedido só é lido pelo id (buscar_pedido; a tabela
+// não é legível com a chave anon), mas quem tiver o link vê a página: por isso
+// ela mostra só itens e valores. Nome, telefone e endereço já vão na mensagem.
+export const dynamic = "force-dynamic"
+
+export const metadata: Metadata = {
+  title: "Pedido",
+  robots: { index: false, follow: false },
+}
+
+export default async function PedidoPage({ params }: { params: Promise<{ id: string }> }) {
+  const { id } = await params
+  const pedido = await getOrder(id)
+  if (!pedido) notFound()
+
+  return (
+    <main className="min-h-screen bg-gray-50 py-6 px-4">
+      <div className="max-w-2xl mx-auto bg-white rounded-lg shadow-sm border p-5 space-y-5">
+        <header>
+          <h1 className="text-xl font-bold text-red-600">Pedido nº {pedido.numero}</h1>
+          <p className="text-sm text-gray-500">
+            {new Date(pedido.createdAt).toLocaleString("pt-BR", { timeZone: "America/Sao_Paulo" })}
+          </p>
+        </header>
+
+        <section>
+          <h2 className="font-semibold text-gray-800 mb-2">Itens</h2>
+          <ul className="divide-y">
+            {pedido.itens.map((item, index) => (
+              <li key={index} className="py-2 text-sm">
+                <div className="flex justify-between gap-3">
+                  <span className="font-medium">
+                    {item.quantidade}x {item.nome}
+                    {item.tamanho && ` - ${item.tamanho === "broto" ? "Broto" : "Tradicional"}`}
+                  </span>
+                  <span className="whitespace-nowrap">{formatCurrency(item.precoTotal)}</span>
+                </div>
+                {item.sabores.length > 1 && (
+                  <p className="text-gray-600">Sabores: {item.sabores.join(", ")}</p>
+                )}
+                {item.adicionais.filter(grupo => grupo.itens.length > 0).map(grupo => (
+                  <p key={grupo.sabor} className="text-gray-600">
+                    Adicionais ({grupo.sabor}): {grupo.itens.map(adicional => adicional.nome).join(", ")}
+                  </p>
+                ))}
+                {item.borda && <p className="text-gray-600">Borda recheada: {item.borda.nome}</p>}
+              </li>
+            ))}
+          </ul>
+        </section>
+
+        <section className="text-sm space-y-1">
+          <h2 className="font-semibold text-gray-800 mb-1">
+            {pedido.tipoEntrega === "delivery" ? "Delivery" : "Retirada no Balcão"}
+          </h2>
+          {pedido.observacoes && <p>Observações: {pedido.observacoes}</p>}
+          <p>Pagamento: {pedido.formaPagamento}</p>
+        </section>
+
+        <section className="text-sm border-t pt-3 space-y-1">
+          <div className="flex justify-between"><span>Subtotal</span><span>{formatCurrency(pedido.subtotal)}</span></div>
+          {pedido.tipoEntrega === "delivery" && (
+            <div className="flex justify-between"><span>Taxa de entrega</span><span>{formatCurrency(pedido.taxaEntrega)}</span></div>
+          )}
+          <div className="flex justify-between font-bold text-base"><span>Total</span><span>{formatCurrency(pedido.total)}</span></div>
+        </section>
+      </div>
+    </main>
+  )
+}
@@ -16,7 +16,7 @@ export function CartFooter() {
   const [isClearing, setIsClearing] = useState(false)
 
   // Verificação defensiva para evitar erros durante limpeza
-  const totalItems = state.items?.length ? state.items.reduce((sum, item) => sum + (item.quantidade || 0), 0) : 0
+  const totalItems = state.count || 0
   const cartTotal = state.total || 0
   const hasItems = state.items?.length > 0
 
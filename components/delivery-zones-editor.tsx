@@ -0,0 +1,306 @@
+"use client"
+import { useEffect, useState } from "react"
+import { Button } from "@/components/ui/button"
+import { Input } from "@/components/ui/input"
+import { Label } from "@/components/ui/label"
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
+import { Loader2, Map as MapIcon, Plus, Save, Trash2 } from "lucide-react"
+import { supabase } from "@/lib/supabase"
+import { maskCep, formatCep } from "@/lib/cep-service"
+import type { DeliveryZone, DeliveryZoneType } from "@/lib/delivery-zones"
+
+type EditableZone = Omit<DeliveryZone, "id"> & { id?: string; bairrosTexto?: string }
+
+const TIPO_LABEL: Record<DeliveryZoneType, string> = {
+  cep: "Faixa de CEP",
+  bairro: "Bairros",
+  raio: "Raio (km)",
+}
+
+const newZone = (tipo: DeliveryZoneType, ordem: number): EditableZone => ({
+  nome: "",
+  tipo,
+  cep_inicio: "",
+  cep_fim: "",
+  bairros: [],
+  bairrosTexto: "",
+  raio_min_km: 0,
+  raio_max_km: null,
+  taxa: 0,
+  pedido_minimo: 0,
+  ativo: true,
+  ordem,
+})
+
+// Converte a zona editada para as colunas de zonas_entrega
+const toRow = ({ bairrosTexto, ...zone }: EditableZone) => ({
+  ...zone,
+  cep_inicio: zone.tipo === "cep" ? formatCep(zone.cep_inicio || "") : null,
+  cep_fim: zone.tipo === "cep" ? formatCep(zone.cep_fim || zone.cep_inicio || "") : null,
+  bairros: zone.tipo === "bairro"
+    ? (bairrosTexto ?? "").split(",").map(bairro => bairro.trim()).filter(Boolean)
+    : [],
+})
+
+/**
+ * Cadastro das zonas de entrega (taxa e pedido mínimo por faixa de CEP,
+ * bairro ou raio). O checkout compila as zonas ativas em um índice local.
+ */
+export function DeliveryZonesEditor() {
+  const [zones, setZones] = useState<EditableZone[]>([])
+  const [loading, setLoading] = useState(true)
+  const [savingIndex, setSavingIndex] = useState<number | null>(null)
+  const [message, setMessage] = useState("")
+
+  const loadZones = async () => {
+    setLoading(true)
+    const { data, error } = await supabase.from("zonas_entrega").select("*").order("ordem")
+    if (error) {
+      console.error("Erro ao carregar zonas de entrega:", error)
+      setMessage("Erro ao carregar zonas de entrega")
+    } else {
+      setZones((data || []).map((zone: DeliveryZone) => ({ ...zone, bairrosTexto: (zone.bairros || []).join(", ") })))
+    }
+    setLoading(false)
+  }
+
+  useEffect(() => {
+    loadZones()
+  }, [])
+
+  const updateZone = (index: number, changes: Partial<EditableZone>) => {
+    setZones(current => current.map((zone, i) => (i === index ? { ...zone, ...changes } : zone)))
+  }
+
+  const handleSaveZone = async (index: number) => {
+    const zone = zones[index]
+    if (!zone.nome.trim()) {
+      setMessage("Informe o nome da zona")
+      return
+    }
+    if (zone.tipo === "cep" && formatCep(zone.cep_inicio || "").length !== 8) {
+      setMessage("Informe o CEP inicial da faixa")
+      return
+    }
+    if (zone.tipo === "raio" && (zone.centro_latitude == null || zone.centro_longitude == null || !zone.raio_max_km)) {
+      setMessage("Informe o centro e o raio máximo da zona")
+      return
+    }
+
+    setSavingIndex(index)
+    const { data, error } = await supabase.from("zonas_entrega").upsert(toRow(zone)).select().single()
+    if (error) {
+      console.error("Erro ao salvar zona de entrega:", error)
+      setMessage("Erro ao salvar zona de entrega")
+    } else {
+      updateZone(index, { ...data, bairrosTexto: (data.bairros || []).join(", ") })
+      setMessage("Zona de entrega salva com sucesso!")
+    }
+    setSavingIndex(null)
+  }
+
+  const handleDeleteZone = async (index: number) => {
+    const zone = zones[index]
+    if (zone.id) {
+      if (!confirm("Tem certeza que deseja excluir esta zona de entrega?")) return
+      const { error } = await supabase.from("zonas_entrega").delete().eq("id", zone.id)
+      if (error) {
+        console.error("Erro ao excluir zona de entrega:", error)
+        setMessage("Erro ao excluir zona de entrega")
+        return
+      }
+    }
+    setZones(current => current.filter((_, i) => i !== index))
+  }
+
+  const numberValue = (value: string) => (value === "" ? null : Number(value))
+
+  return (
+    <Card className="shadow-lg border-0 bg-white rounded-2xl overflow-hidden">
+      <CardHeader className="bg-gradient-to-r from-teal-50 to-cyan-50 border-b border-teal-100 p-5">
+        <div className="flex items-center gap-3">
+          <div className="p-2 bg-teal-100 rounded-lg">
+            <MapIcon className="h-6 w-6 text-teal-600" />
+          </div>
+          <div>
+            <CardTitle className="text-lg font-semibold text-gray-900">
+              Zonas de Entrega
+            </CardTitle>
+            <p className="text-sm text-gray-500 mt-1">
+              Taxa e pedido mínimo por faixa de CEP, bairro ou raio. Sem zonas, vale a taxa única acima.
+            </p>
+          </div>
+        </div>
+      </CardHeader>
+      <CardContent className="p-5 space-y-4">
+        {message && <p className="text-sm text-gray-600">{message}</p>}
+
+        {loading ? (
+          <div className="flex justify-center py-6">
+            <Loader2 className="h-6 w-6 animate-spin text-gray-400" />
+          </div>
+        ) : zones.length === 0 ? (
+          <p className="text-sm text-gray-500">Nenhuma zona cadastrada.</p>
+        ) : (
+          zones.map((zone, index) => (
+            <div key={zone.id || `nova-${index}`} className="border border-gray-200 rounded-xl p-4 space-y-3">
+              <div className="grid grid-cols-1 sm:grid-cols-4 gap-3">
+                <div className="sm:col-span-2">
+                  <Label className="text-sm font-medium text-gray-700">Nome ({TIPO_LABEL[zone.tipo]})</Label>
+                  <Input value={zone.nome} onChange={(e) => updateZone(index, { nome: e.target.value })} />
+                </div>
+                <div>
+                  <Label className="text-sm font-medium text-gray-700">Taxa (R$)</Label>
+                  <Input
+                    type="number"
+                    min="0"
+                    step="0.01"
+                    value={zone.taxa}
+                    onChange={(e) => updateZone(index, { taxa: Number(e.target.value) })}
+                  />
+                </div>
+                <div>
+                  <Label className="text-sm font-medium text-gray-700">Pedido mínimo (R$)</Label>
+                  <Input
+                    type="number"
+                    min="0"
+                    step="0.01"
+                    value={zone.pedido_minimo ?? 0}
+                    onChange={(e) => updateZone(index, { pedido_minimo: Number(e.target.value) })}
+                  />
+                </div>
+              </div>
+
+              {zone.tipo === "cep" && (
+                <div className="grid grid-cols-2 gap-3">
+                  <div>
+                    <Label className="text-sm font-medium text-gray-700">CEP inicial</Label>
+                    <Input
+                      placeholder="00000-000"
+                      value={maskCep(zone.cep_inicio || "")}
+                      onChange={(e) => updateZone(index, { cep_inicio: formatCep(e.target.value).slice(0, 8) })}
+                    />
+                  </div>
+                  <div>
+                    <Label className="text-sm font-medium text-gray-700">CEP final</Label>
+                    <Input
+                      placeholder="00000-000"
+                      value={maskCep(zone.cep_fim || "")}
+                      onChange={(e) => updateZone(index, { cep_fim: formatCep(e.target.value).slice(0, 8) })}
+                    />
+                  </div>
+                </div>
+              )}
+
+              {zone.tipo === "bairro" && (
+                <div>
+                  <Label className="text-sm font-medium text-gray-700">Bairros (separados por vírgula)</Label>
+                  <Input
+                    value={zone.bairrosTexto ?? ""}
+                    onChange={(e) => updateZone(index, { bairrosTexto: e.target.value })}
+                  />
+                </div>
+              )}
+
+              {zone.tipo === "raio" && (
+                <div className="grid grid-cols-2 sm:grid-cols-4 gap-3">
+                  <div>
+                    <Label className="text-sm font-medium text-gray-700">Latitude do centro</Label>
+                    <Input
+                      type="number"
+                      step="0.000001"
+                      value={zone.centro_latitude ?? ""}
+                      onChange={(e) => updateZone(index, { centro_latitude: numberValue(e.target.value) })}
+                    />
+                  </div>
+                  <div>
+                    <Label className="text-sm font-medium text-gray-700">Longitude do centro</Label>
+                    <Input
+                      type="number"
+                      step="0.000001"
+                      value={zone.centro_longitude ?? ""}
+                      onChange={(e) => updateZone(index, { centro_longitude: numberValue(e.target.value) })}
+                    />
+                  </div>
+                  <div>
+                    <Label className="text-sm font-medium text-gray-700">De (km)</Label>
+                    <Input
+                      type="number"
+                      min="0"
+                      step="0.1"
+                      value={zone.raio_min_km ?? 0}
+                      onChange={(e) => updateZone(index, { raio_min_km: Number(e.target.value) })}
+                    />
+                  </div>
+                  <div>
+                    <Label className="text-sm font-medium text-gray-700">Até (km)</Label>
+                    <Input
+                      type="number"
+                      min="0"
+                      step="0.1"
+                      value={zone.raio_max_km ?? ""}
+                      onChange={(e) => updateZone(index, { raio_max_km: numberValue(e.target.value) })}
+                    />
+                  </div>
+                </div>
+              )}
+
+              <div className="flex flex-wrap items-center justify-between gap-3">
+                <div className="flex items-center gap-4">
+                  <label className="flex items-center gap-2 text-sm text-gray-700">
+                    <input
+                      type="checkbox"
+                      checked={zone.ativo !== false}
+                      onChange={(e) => updateZone(index, { ativo: e.target.checked })}
+                    />
+                    Ativa
+                  </label>
+                  <label className="flex items-center gap-2 text-sm text-gray-700">
+                    Prioridade
+                    <Input
+                      type="number"
+                      className="w-20"
+                      value={zone.ordem ?? 0}
+                      onChange={(e) => updateZone(index, { ordem: Number(e.target.value) })}
+                    />
+                  </label>
+                </div>
+                <div className="flex gap-2">
+                  <Button variant="outline" size="sm" onClick={() => handleDeleteZone(index)}>
+                    <Trash2 className="h-4 w-4" />
+                  </Button>
+                  <Button
+                    size="sm"
+                    onClick={() => handleSaveZone(index)}
+                    disabled={savingIndex === index}
+                    className="bg-blue-600 hover:bg-blue-700 text-white"
+                  >
+                    {savingIndex === index ? (
+                      <Loader2 className="h-4 w-4 animate-spin" />
+                    ) : (
+                      <Save className="h-4 w-4" />
+                    )}
+                  </Button>
+                </div>
+              </div>
+            </div>
+          ))
+        )}
+
+        <div className="flex flex-wrap gap-2 pt-2">
+          {(Object.keys(TIPO_LABEL) as DeliveryZoneType[]).map(tipo => (
+            <Button
+              key={tipo}
+              variant="outline"
+              size="sm"
+              onClick={() => setZones(current => [...current, newZone(tipo, current.length)])}
+            >
+              <Plus className="h-4 w-4 mr-1" />
+              {TIPO_LABEL[tipo]}
+            </Button>
+          ))}
+        </div>
+      </CardContent>
+    </Card>
+  )
+}
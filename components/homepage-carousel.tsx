@@ -5,12 +5,15 @@ import Image from "next/image"
 import { supabase } from "@/lib/supabase"
 import { ChevronLeft, ChevronRight } from "lucide-react"
 import { Button } from "@/components/ui/button"
+import { ResponsiveImage } from "@/components/responsive-image"
+import { IMAGE_PRESETS, parseImageVariants, type ImageVariants } from "@/lib/image-variants"
 
 interface CarouselImage {
   id: string
   url: string
   ordem: number
   ativo: boolean
+  variantes?: ImageVariants | null
 }
 
 interface CarouselConfig {
@@ -55,12 +58,12 @@ export function HomepageCarousel() {
       // Carregar imagens ativas ordenadas
       const { data: imagesData } = await supabase
         .from('carousel_images')
-        .select('id, url, ordem, ativo')
+        .select('*') // '*' também funciona antes da coluna variantes existir (script 20)
         .eq('ativo', true)
         .order('ordem')
 
       if (imagesData && imagesData.length > 0) {
-        setImages(imagesData)
+        setImages(imagesData.map((image: CarouselImage) => ({ ...image, variantes: parseImageVariants(image.variantes) })))
       }
     } catch (error) {
       console.error('Erro ao carregar dados do carousel:', error)
@@ -97,14 +100,24 @@ export function HomepageCarousel() {
               index === currentIndex ? 'opacity-100' : 'opacity-0'
             }`}
           >
-            <Image
-              src={image.url}
-              alt={`Slide ${index + 1}`}
-              fill
-              className="object-cover"
-              sizes="(max-width: 768px) 100vw, 1200px"
-              priority={index === 0}
-            />
+            {image.variantes ? (
+              <ResponsiveImage
+                variants={image.variantes}
+                alt={`Slide ${index + 1}`}
+                className="absolute inset-0 w-full h-full object-cover"
+                sizes={IMAGE_PRESETS.carousel.sizes}
+                priority={index === 0}
+              />
+            ) : (
+              <Image
+                src={image.url}
+                alt={`Slide ${index + 1}`}
+                fill
+                className="object-cover"
+                sizes="(max-width: 768px) 100vw, 1200px"
+                priority={index === 0}
+              />
+            )}
           </div>
         ))}
       </div>
@@ -0,0 +1,43 @@
+import type { CSSProperties } from "react"
+import { buildSrcSet, fallbackImageUrl, type ImageVariants } from "@/lib/image-variants"
+
+interface ResponsiveImageProps {
+  variants: ImageVariants
+  alt: string
+  sizes: string
+  className?: string
+  style?: CSSProperties
+  // Primeira dobra: carrega já, sem lazy loading
+  priority?: boolean
+}
+
+/**
+ * <picture> com srcset AVIF e WebP gerados por POST /api/images. O
+ * navegador escolhe formato e largura; o placeholder borrado aparece como
+ * fundo até a imagem carregar.
+ */
+export function ResponsiveImage({ variants, alt, sizes, className, style, priority = false }: ResponsiveImageProps) {
+  return (
+    <picture>
+      {variants.formats.map(format => (
+        <source key={format} type={`image/${format}`} srcSet={buildSrcSet(variants, format)} sizes={sizes} />
+      ))}
+      <img
+        src={fallbackImageUrl(variants)}
+        alt={alt}
+        width={variants.width}
+        height={variants.height}
+        loading={priority ? "eager" : "lazy"}
+        fetchPriority={priority ? "high" : "auto"}
+        decoding="async"
+        className={className}
+        style={{
+          backgroundImage: `url(${variants.placeholder})`,
+          backgroundSize: "cover",
+          backgroundPosition: "center",
+          ...style,
+        }}
+      />
+    </picture>
+  )
+}
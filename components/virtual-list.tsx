@@ -0,0 +1,76 @@
+"use client"
+
+import { useEffect, useRef, useState, type ReactNode } from "react"
+
+interface VirtualListProps<T> {
+  items: T[]
+  // Altura fixa de cada linha, em pixels
+  rowHeight: number
+  // Altura da área rolável, em pixels
+  height: number
+  getKey: (item: T) => string
+  renderRow: (item: T, index: number) => ReactNode
+  // Linhas extras montadas acima e abaixo da área visível
+  overscan?: number
+  // Chamado quando faltam menos de ``endThreshold`` linhas para o fim
+  onEndReached?: () => void
+  endThreshold?: number
+  footer?: ReactNode
+}
+
+/**
+ * Lista com janela: só as linhas visíveis (mais ``overscan``) ficam no DOM,
+ * então milhares de itens rolam como algumas dezenas.
+ */
+export function VirtualList<T>({
+  items,
+  rowHeight,
+  height,
+  getKey,
+  renderRow,
+  overscan = 6,
+  onEndReached,
+  endThreshold = 10,
+  footer,
+}: VirtualListProps<T>) {
+  const containerRef = useRef<HTMLDivElement>(null)
+  const [scrollTop, setScrollTop] = useState(0)
+  const frame = useRef<number | null>(null)
+
+  const onScroll = () => {
+    // Um setState por quadro, mesmo com vários eventos de rolagem
+    if (frame.current !== null) return
+    frame.current = requestAnimationFrame(() => {
+      frame.current = null
+      setScrollTop(containerRef.current?.scrollTop || 0)
+    })
+  }
+
+  useEffect(() => () => {
+    if (frame.current !== null) cancelAnimationFrame(frame.current)
+  }, [])
+
+  const visible = Math.ceil(height / rowHeight)
+  const start = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan)
+  const end = Math.min(items.length, Math.floor(scrollTop / rowHeight) + visible + overscan)
+
+  useEffect(() => {
+    if (onEndReached && items.length > 0 && end >= items.length - endThreshold) onEndReached()
+  }, [end, items.length, endThreshold, onEndReached])
+
+  return (
+    <div ref={containerRef} onScroll={onScroll} style={{ height, overflowY: "auto" }}>
+      <div style={{ height: items.length * rowHeight, position: "relative" }}>
+        {items.slice(start, end).map((item, offset) => (
+          <div
+            key={getKey(item)}
+            style={{ position: "absolute", top: (start + offset) * rowHeight, left: 0, right: 0, height: rowHeight }}
+          >
+            {renderRow(item, start + offset)}
+          </div>
+        ))}
+      </div>
+      {footer}
+    </div>
+  )
+}
@@ -0,0 +1,104 @@
+/**
+ * Operações em lote do admin
+ *
+ * Cada função é uma única chamada às funções de scripts/23-admin-operacoes-em-lote.sql,
+ * que gravam todas as linhas em uma transação. ``useBatcher`` junta cliques
+ * rápidos (vários toggles, várias setas de ordenação) em uma dessas chamadas:
+ * a tela é atualizada na hora e o banco recebe só o estado final, depois de
+ * ``BATCH_DELAY_MS`` sem novos cliques.
+ */
+
+import { useCallback, useEffect, useRef } from "react"
+import { supabase } from "./supabase"
+
+export const BATCH_DELAY_MS = 400
+
+export type FlagTarget =
+  | { tabela: "produtos"; coluna: "ativo" | "promocao" }
+  | { tabela: "categorias" | "opcoes_sabores" | "bordas_recheadas" | "carousel_images"; coluna: "ativo" }
+
+export type OrderedTable = "produtos" | "categorias" | "opcoes_sabores" | "bordas_recheadas" | "carousel_images"
+
+/**
+ * Grava ``valores`` (id → novo valor) na coluna booleana do alvo.
+ * Devolve quantas linhas foram alteradas.
+ */
+export async function updateFlags(target: FlagTarget, valores: Record<string, boolean>): Promise<number> {
+  if (Object.keys(valores).length === 0) return 0
+  const { data, error } = await supabase.rpc("atualizar_flags_em_lote", {
+    p_tabela: target.tabela,
+    p_coluna: target.coluna,
+    p_valores: valores,
+  })
+  if (error) throw error
+  return Number(data) || 0
+}
+
+/**
+ * Reescreve ``ordem`` da tabela: ``ids[0]`` recebe 1, ``ids[1]`` recebe 2, ...
+ */
+export async function reorder(tabela: OrderedTable, ids: string[]): Promise<number> {
+  if (ids.length === 0) return 0
+  const { data, error } = await supabase.rpc("reordenar_em_lote", { p_tabela: tabela, p_ids: ids })
+  if (error) throw error
+  return Number(data) || 0
+}
+
+/**
+ * Reajusta todos os preços dos produtos em ``percentual`` (10 = +10%).
+ * Sem ``ids`` nem ``categoriaId``, vale para o cardápio inteiro.
+ */
+export async function repriceProducts(
+  percentual: number,
+  scope: { ids?: string[]; categoriaId?: string } = {}
+): Promise<number> {
+  if (!Number.isFinite(percentual) || percentual <= -100) throw new Error(`Percentual inválido: ${percentual}`)
+  const { data, error } = await supabase.rpc("reajustar_precos", {
+    p_percentual: percentual,
+    p_ids: scope.ids ?? null,
+    p_categoria_id: scope.categoriaId ?? null,
+  })
+  if (error) throw error
+  return Number(data) || 0
+}
+
+/**
+ * Fila que agrupa alterações por chave: ``add`` guarda o último valor de
+ * cada chave e ``flush`` recebe todas de uma vez após ``delayMs`` sem novas
+ * alterações. Lotes nunca rodam em paralelo, então um lote mais novo não é
+ * sobrescrito por um mais antigo que terminou depois. Pendências são
+ * enviadas ao desmontar o componente.
+ */
+export function useBatcher<V>(flush: (changes: Map<string, V>) => Promise<void>, delayMs = BATCH_DELAY_MS) {
+  const flushRef = useRef(flush)
+  flushRef.current = flush
+  const pending = useRef(new Map<string, V>())
+  const timer = useRef<ReturnType<typeof setTimeout> | null>(null)
+  const chain = useRef<Promise<void>>(Promise.resolve())
+
+  const run = useCallback(() => {
+    timer.current = null
+    const changes = pending.current
+    if (changes.size === 0) return chain.current
+    pending.current = new Map()
+    chain.current = chain.current.then(() => flushRef.current(changes)).catch(error => {
+      console.error("Erro ao gravar alterações em lote:", error)
+    })
+    return chain.current
+  }, [])
+
+  const add = useCallback((key: string, value: V) => {
+    pending.current.set(key, value)
+    if (timer.current) clearTimeout(timer.current)
+    timer.current = setTimeout(run, delayMs)
+  }, [run, delayMs])
+
+  useEffect(() => () => {
+    if (timer.current) {
+      clearTimeout(timer.current)
+      run()
+    }
+  }, [run])
+
+  return { add, flush: run }
+}
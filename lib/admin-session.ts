@@ -0,0 +1,106 @@
+/**
+ * Sessão de admin no servidor (uso exclusivo no servidor)
+ *
+ * O login do painel (lib/auth-context.tsx) confere a tabela admins no
+ * navegador, o que não protege as rotas de API. POST /api/auth/login confere
+ * as mesmas credenciais e grava um cookie HttpOnly assinado (HMAC-SHA256)
+ * com o id do admin e a validade; requireAdmin confere esse cookie nas rotas
+ * que gastam CPU ou disco do servidor ou invalidam o cache do cardápio.
+ *
+ * A chave de assinatura vem de ADMIN_SESSION_SECRET. Sem ela é usada uma
+ * chave aleatória por processo: as sessões caem quando o servidor reinicia
+ * e não valem entre instâncias, então defina a variável em produção.
+ */
+
+import { createHmac, randomBytes, timingSafeEqual } from "crypto"
+import { NextResponse, type NextRequest } from "next/server"
+import { supabase } from "./supabase"
+import { supabaseOperation } from "./error-handler"
+
+export const ADMIN_SESSION_COOKIE = "admin_session"
+export const ADMIN_SESSION_TTL_SECONDS = 7 * 24 * 60 * 60
+
+export interface SessionAdmin {
+  id: string
+  email: string
+  nome: string
+}
+
+// Guardada em globalThis para sobreviver ao recarregamento de módulos em desenvolvimento
+const state = globalThis as typeof globalThis & { __adminSessionSecret?: string }
+
+function secret(): string {
+  return process.env.ADMIN_SESSION_SECRET || (state.__adminSessionSecret ??= randomBytes(32).toString("hex"))
+}
+
+const sign = (payload: string) => createHmac("sha256", secret()).update(payload).digest("base64url")
+
+/**
+ * Token "<payload>.<assinatura>" com o id do admin e a validade
+ */
+export function createAdminSessionToken(adminId: string, now = Date.now()): string {
+  const payload = Buffer.from(JSON.stringify({ id: adminId, exp: now + ADMIN_SESSION_TTL_SECONDS * 1000 })).toString("base64url")
+  return `${payload}.${sign(payload)}`
+}
+
+/**
+ * Id do admin de um token válido e dentro da validade; null nos demais casos
+ */
+export function verifyAdminSessionToken(token: string | undefined | null, now = Date.now()): string | null {
+  const [payload, signature] = (token || "").split(".")
+  if (!payload || !signature) return null
+  const expected = Buffer.from(sign(payload))
+  const received = Buffer.from(signature)
+  if (expected.length !== received.length || !timingSafeEqual(expected, received)) return null
+  try {
+    const { id, exp } = JSON.parse(Buffer.from(payload, "base64url").toString("utf8"))
+    return typeof id === "string" && typeof exp === "number" && exp > now ? id : null
+  } catch {
+    return null
+  }
+}
+
+/**
+ * Confere e-mail e senha na tabela admins, com a mesma regra do login do painel
+ */
+export async function verifyAdminCredentials(email: string, senha: string): Promise<SessionAdmin | null> {
+  if (!email || !senha) return null
+  const result = await supabaseOperation(
+    () => supabase.from("admins").select("id, email, nome, senha").eq("email", email).eq("ativo", true).maybeSingle(),
+    undefined,
+    { maxRetries: 1, table: "admins" }
+  )
+  const admin: any = result.data
+  if (!result.success || !admin || admin.senha !== senha) return null
+  return { id: admin.id, email: admin.email, nome: admin.nome }
+}
+
+/**
+ * Id do admin da sessão da requisição, ou null
+ */
+export function adminIdFrom(request: NextRequest): string | null {
+  return verifyAdminSessionToken(request.cookies.get(ADMIN_SESSION_COOKIE)?.value)
+}
+
+/**
+ * Resposta 401 quando a requisição não tem sessão de admin; null quando tem.
+ * Uso: ``const denied = requireAdmin(request); if (denied) return denied``
+ */
+export function requireAdmin(request: NextRequest): NextResponse | null {
+  if (adminIdFrom(request)) return null
+  return NextResponse.json({ error: "Sessão de admin obrigatória" }, { status: 401 })
+}
+
+/**
+ * Grava (ou, com ``token`` null, apaga) o cookie da sessão na resposta
+ */
+export function setAdminSessionCookie(response: NextResponse, token: string | null) {
+  response.cookies.set(ADMIN_SESSION_COOKIE, token || "", {
+    httpOnly: true,
+    sameSite: "strict",
+    secure: process.env.NODE_ENV === "production",
+    path: "/",
+    maxAge: token ? ADMIN_SESSION_TTL_SECONDS : 0,
+  })
+  return response
+}
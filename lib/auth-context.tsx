@@ -30,6 +30,17 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     const savedAdmin = localStorage.getItem("admin")
     if (savedAdmin) {
       setAdmin(JSON.parse(savedAdmin))
+      // Sem a sessão do servidor (expirada, servidor reiniciado) as rotas de
+      // upload e cache recusariam o painel: pede novo login
+      fetch("/api/auth/login", { credentials: "same-origin" })
+        .then(response => {
+          if (response.status === 401) {
+            log.warn("Sessão de admin do servidor expirada", 'AUTH')
+            setAdmin(null)
+            localStorage.removeItem("admin")
+          }
+        })
+        .catch(() => {})
     }
     setLoading(false)
 
@@ -79,7 +90,9 @@ export function AuthProvider({ children }: { children: ReactNode }) {
           .select("*")
           .eq("email", email)
           .eq("ativo", true)
-          .maybeSingle()
+          .maybeSingle(),
+        undefined,
+        { table: "admins" }
       )
 
       log.info("Consulta de admin executada", 'AUTH', { hasData: !!result.data })
@@ -113,6 +126,18 @@ export function AuthProvider({ children }: { children: ReactNode }) {
         nome: adminData.nome,
       }
       
+      // Sessão no servidor (cookie HttpOnly) para as rotas de API restritas
+      const session = await fetch("/api/auth/login", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        credentials: "same-origin",
+        body: JSON.stringify({ email, password: senha }),
+      }).catch(() => null)
+      if (!session?.ok) {
+        log.error("Falha ao abrir a sessão de admin no servidor", 'AUTH', { status: session?.status })
+        return false
+      }
+
       setAdmin(responseAdminData)
       localStorage.setItem("admin", JSON.stringify(responseAdminData))
       log.info("Login realizado com sucesso", 'AUTH', { adminId: adminData.id })
@@ -156,6 +181,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
   const logout = () => {
     setAdmin(null)
     localStorage.removeItem("admin")
+    fetch("/api/auth/logout", { method: "POST", credentials: "same-origin" }).catch(() => {})
     log.info("Logout realizado", 'AUTH')
   }
 
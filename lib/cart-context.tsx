@@ -1,7 +1,8 @@
 "use client"
 
 import type React from "react"
-import { createContext, useContext, useReducer, useEffect, type ReactNode } from "react"
+import { createContext, useContext, useReducer, useEffect, useMemo, useRef, useState, type ReactNode } from "react"
+import { createCartPersister, loadCart, removeCart, type CartPersister } from "@/lib/cart-storage"
 
 export interface CartItem {
   id: string
@@ -25,6 +26,20 @@ export interface CartItem {
 interface CartState {
   items: CartItem[]
   total: number
+  count: number
+}
+
+// Estado interno do reducer: as linhas na ordem em que entraram no carrinho
+// (entregues como estão aos componentes), a posição de cada chave canônica e
+// total (em centavos) e quantidade de itens atualizados a cada ação em vez de
+// recalculados sobre todas as linhas. ``positions`` só é copiado quando o
+// conjunto de chaves muda; somar uma unidade a uma linha existente copia só
+// a lista, que o React precisa receber nova de qualquer forma.
+interface CartStore {
+  items: CartItem[]
+  positions: Map<string, number>
+  totalCents: number
+  count: number
 }
 
 type CartAction =
@@ -34,202 +49,256 @@ type CartAction =
   | { type: "UPDATE_ADICIONAIS"; payload: { id: string; adicionais: { sabor: string; itens: { nome: string; preco: number }[] }[] } }
   | { type: "UPDATE_BORDA"; payload: { id: string; bordaRecheada?: { id: string; nome: string; preco: number } } }
   | { type: "UPDATE_TAMANHO"; payload: { id: string; tamanho: "broto" | "tradicional"; novoPreco: number } }
+  | { type: "REPRICE"; payload: { precos: Record<string, number> } }
   | { type: "CLEAR_CART" }
+  | { type: "HYDRATE"; payload: { items: CartItem[] } }
 
 const CartContext = createContext<{
   state: CartState
   dispatch: React.Dispatch<CartAction>
   clearLocalStorage: () => void
+  hydrated: boolean
 } | null>(null)
 
-const cartReducer = (state: CartState, action: CartAction): CartState => {
-  switch (action.type) {
-    case "ADD_ITEM": {
-      const existingItemIndex = state.items.findIndex(
-        (item) =>
-          item.id === action.payload.id &&
-          item.tamanho === action.payload.tamanho &&
-          JSON.stringify(item.sabores.sort()) === JSON.stringify(action.payload.sabores.sort()) &&
-          JSON.stringify(item.adicionais || []) === JSON.stringify(action.payload.adicionais || []) &&
-          JSON.stringify(item.bordaRecheada || null) === JSON.stringify(action.payload.bordaRecheada || null),
-      )
-
-      let newItems: CartItem[]
-
-      if (existingItemIndex >= 0) {
-        newItems = state.items.map((item, index) =>
-          index === existingItemIndex ? { ...item, quantidade: item.quantidade + 1 } : item,
-        )
-      } else {
-        newItems = [...state.items, { ...action.payload, quantidade: 1 }]
-      }
+const EMPTY_STORE: CartStore = { items: [], positions: new Map(), totalCents: 0, count: 0 }
+
+const toCents = (value: number) => Math.round(value * 100)
+
+const lineCents = (item: CartItem) => toCents(item.preco) * item.quantidade
+
+const adicionaisTotal = (adicionais: CartItem["adicionais"]) =>
+  (adicionais || []).reduce((sum, grupo) =>
+    sum + grupo.itens.reduce((itemSum, adicional) => itemSum + adicional.preco, 0), 0
+  )
+
+/**
+ * Chave canônica de uma linha: produto, tamanho, sabores ordenados,
+ * adicionais e borda. Itens com a mesma chave são somados na mesma linha.
+ */
+export const cartLineKey = (item: Omit<CartItem, "quantidade">): string => {
+  const sabores = [...item.sabores].sort().join(",")
+  const adicionais = (item.adicionais || [])
+    .filter(grupo => grupo.itens.length > 0)
+    .map(grupo => `${grupo.sabor}:${grupo.itens.map(adicional => adicional.nome).sort().join("+")}`)
+    .sort()
+    .join(";")
+  return `${item.id}|${item.tamanho}|${sabores}|${adicionais}|${item.bordaRecheada?.id || ""}`
+}
 
-      const newTotal = newItems.reduce((sum, item) => sum + item.preco * item.quantidade, 0)
+// Posições das linhas de um produto; as ações da UI identificam linhas pelo id
+const positionsForId = (items: CartItem[], id: string): number[] => {
+  const positions: number[] = []
+  items.forEach((item, position) => {
+    if (item.id === id) positions.push(position)
+  })
+  return positions
+}
 
-      return {
-        items: newItems,
-        total: newTotal,
-      }
-    }
+/**
+ * Acrescenta ``item`` às linhas sendo montadas, somando-o à linha de mesma chave
+ */
+const mergeLine = (items: CartItem[], positions: Map<string, number>, key: string, item: CartItem) => {
+  const position = positions.get(key)
+  if (position === undefined) {
+    positions.set(key, items.length)
+    items.push(item)
+  } else {
+    items[position] = { ...items[position], quantidade: items[position].quantidade + item.quantidade }
+  }
+}
 
-    case "REMOVE_ITEM": {
-      const newItems = state.items.filter((item) => item.id !== action.payload)
-      const newTotal = newItems.reduce((sum, item) => sum + item.preco * item.quantidade, 0)
+const fromItems = (source: CartItem[]): CartStore => {
+  const items: CartItem[] = []
+  const positions = new Map<string, number>()
+  let totalCents = 0
+  let count = 0
+  for (const item of source) {
+    mergeLine(items, positions, cartLineKey(item), item)
+    totalCents += lineCents(item)
+    count += item.quantidade
+  }
+  return { items, positions, totalCents, count }
+}
 
-      return {
-        items: newItems,
-        total: newTotal,
-      }
-    }
+/**
+ * Substitui as linhas de ``id`` pelo resultado de ``update``, mantendo a
+ * posição no carrinho. Linhas que passam a ter a chave de outra linha são
+ * somadas a ela; quantidade zero remove a linha.
+ */
+const updateLines = (store: CartStore, id: string, update: (item: CartItem) => CartItem): CartStore => {
+  const targets = positionsForId(store.items, id)
+  if (targets.length === 0) return store
+
+  let { totalCents, count } = store
+  const updated = new Map<number, CartItem>()
+  let rekeyed = false
+  for (const position of targets) {
+    const item = store.items[position]
+    const next = update(item)
+    totalCents += lineCents(next) - lineCents(item)
+    count += next.quantidade - item.quantidade
+    // Linha removida também muda as chaves: as posições seguintes se deslocam
+    if (next.quantidade <= 0 || cartLineKey(next) !== cartLineKey(item)) rekeyed = true
+    updated.set(position, next)
+  }
 
-    case "UPDATE_QUANTITY": {
-      const newItems = state.items
-        .map((item) => (item.id === action.payload.id ? { ...item, quantidade: action.payload.quantidade } : item))
-        .filter((item) => item.quantidade > 0)
+  if (!rekeyed) {
+    // Caso comum (quantidade, preço): atualizar no lugar preserva a ordem e as posições
+    const items = store.items.slice()
+    updated.forEach((next, position) => { items[position] = next })
+    return { items, positions: store.positions, totalCents, count }
+  }
 
-      const newTotal = newItems.reduce((sum, item) => sum + item.preco * item.quantidade, 0)
+  const items: CartItem[] = []
+  const positions = new Map<string, number>()
+  // ``positions`` guarda as chaves na mesma ordem das linhas
+  store.positions.forEach((position, key) => {
+    const next = updated.get(position) || store.items[position]
+    if (next.quantidade <= 0) return
+    mergeLine(items, positions, updated.has(position) ? cartLineKey(next) : key, next)
+  })
+  return { items, positions, totalCents, count }
+}
 
-      return {
-        items: newItems,
-        total: newTotal,
+const cartReducer = (store: CartStore, action: CartAction): CartStore => {
+  switch (action.type) {
+    case "ADD_ITEM": {
+      const key = cartLineKey(action.payload)
+      const position = store.positions.get(key)
+      const totalCents = store.totalCents + toCents(action.payload.preco)
+      if (position !== undefined) {
+        // Mesma chave: só a linha muda, as posições continuam valendo
+        const items = store.items.slice()
+        items[position] = { ...items[position], quantidade: items[position].quantidade + 1 }
+        return { items, positions: store.positions, totalCents, count: store.count + 1 }
       }
-    }
-
-    case "UPDATE_ADICIONAIS": {
-      const newItems = state.items.map((item) => {
-        if (item.id === action.payload.id) {
-          // Calcular novo preço incluindo adicionais
-          const adicionaisPrice = action.payload.adicionais.reduce((sum, grupo) => 
-            sum + grupo.itens.reduce((itemSum, adicional) => itemSum + adicional.preco, 0), 0
-          )
-          
-          // O preço base do item (sem adicionais anteriores)
-          const basePrice = item.preco - (item.adicionais?.reduce((sum, grupo) => 
-            sum + grupo.itens.reduce((itemSum, adicional) => itemSum + adicional.preco, 0), 0
-          ) || 0)
-          
-          const newPrice = basePrice + adicionaisPrice
-          
-          return {
-            ...item,
-            adicionais: action.payload.adicionais,
-            preco: newPrice
-          }
-        }
-        return item
-      })
-
-      const newTotal = newItems.reduce((sum, item) => sum + item.preco * item.quantidade, 0)
 
+      const positions = new Map(store.positions).set(key, store.items.length)
       return {
-        items: newItems,
-        total: newTotal,
+        items: [...store.items, { ...action.payload, quantidade: 1 }],
+        positions,
+        totalCents,
+        count: store.count + 1,
       }
     }
 
-    case "UPDATE_BORDA": {
-      const newItems = state.items.map((item) => {
-        if (item.id === action.payload.id) {
-          // Calcular preço base (sem borda anterior)
-          const basePrice = item.preco - (item.bordaRecheada?.preco || 0)
-          
-          // Calcular novo preço com nova borda
-          const newPrice = basePrice + (action.payload.bordaRecheada?.preco || 0)
-          
-          return {
-            ...item,
-            bordaRecheada: action.payload.bordaRecheada,
-            preco: newPrice
-          }
-        }
-        return item
-      })
+    case "REMOVE_ITEM":
+      return updateLines(store, action.payload, (item) => ({ ...item, quantidade: 0 }))
 
-      const newTotal = newItems.reduce((sum, item) => sum + item.preco * item.quantidade, 0)
+    case "UPDATE_QUANTITY":
+      return updateLines(store, action.payload.id, (item) => ({ ...item, quantidade: Math.max(0, action.payload.quantidade) }))
 
-      return {
-        items: newItems,
-        total: newTotal,
-      }
-    }
-
-    case "UPDATE_TAMANHO": {
-      const newItems = state.items.map((item) => {
-        if (item.id === action.payload.id) {
-          // Atualizar o ID para refletir o novo tamanho
-          const newId = item.id.replace(/-tradicional$|-broto$/, `-${action.payload.tamanho}`)
-          
-          return {
-            ...item,
-            id: newId,
-            tamanho: action.payload.tamanho,
-            preco: action.payload.novoPreco
-          }
+    case "UPDATE_ADICIONAIS":
+      return updateLines(store, action.payload.id, (item) => {
+        // O preço base do item (sem adicionais anteriores) mais os novos adicionais
+        const basePrice = item.preco - adicionaisTotal(item.adicionais)
+        return {
+          ...item,
+          adicionais: action.payload.adicionais,
+          preco: basePrice + adicionaisTotal(action.payload.adicionais),
         }
-        return item
       })
 
-      const newTotal = newItems.reduce((sum, item) => sum + item.preco * item.quantidade, 0)
+    case "UPDATE_BORDA":
+      return updateLines(store, action.payload.id, (item) => {
+        // Calcular preço base (sem borda anterior) com a nova borda
+        const basePrice = item.preco - (item.bordaRecheada?.preco || 0)
+        return {
+          ...item,
+          bordaRecheada: action.payload.bordaRecheada,
+          preco: basePrice + (action.payload.bordaRecheada?.preco || 0),
+        }
+      })
 
-      return {
-        items: newItems,
-        total: newTotal,
+    case "UPDATE_TAMANHO":
+      return updateLines(store, action.payload.id, (item) => ({
+        ...item,
+        // Atualizar o ID para refletir o novo tamanho
+        id: item.id.replace(/-tradicional$|-broto$/, `-${action.payload.tamanho}`),
+        tamanho: action.payload.tamanho,
+        preco: action.payload.novoPreco,
+      }))
+
+    case "REPRICE": {
+      // Preços unitários conferidos no servidor, por chave de linha; linhas
+      // alteradas depois da consulta (chave diferente) ficam como estão
+      let totalCents = store.totalCents
+      let items: CartItem[] | null = null
+      for (const [key, preco] of Object.entries(action.payload.precos)) {
+        const position = store.positions.get(key)
+        if (position === undefined) continue
+        const item = store.items[position]
+        if (toCents(item.preco) === toCents(preco)) continue
+        items = items || store.items.slice()
+        items[position] = { ...item, preco }
+        totalCents += (toCents(preco) - toCents(item.preco)) * item.quantidade
       }
+      return items ? { ...store, items, totalCents } : store
     }
 
     case "CLEAR_CART":
-      return {
-        items: [],
-        total: 0,
-      }
+      return EMPTY_STORE
+
+    case "HYDRATE":
+      return fromItems(action.payload.items || [])
 
     default:
-      return state
+      return store
   }
 }
 
 export const CartProvider = ({ children }: { children: ReactNode }) => {
-  // Função para carregar estado do localStorage
-  const loadInitialState = (): CartState => {
-    if (typeof window !== "undefined") {
-      try {
-        const savedCart = localStorage.getItem("pizzaria-cart")
-        if (savedCart) {
-          const parsedCart = JSON.parse(savedCart)
-          return parsedCart
-        }
-      } catch (error) {
-        console.error("Erro ao carregar carrinho do localStorage:", error)
-      }
+  // O HTML da página inicial é gerado estaticamente com o carrinho vazio;
+  // o carrinho salvo só é restaurado após a montagem, evitando divergência
+  // entre o HTML do servidor e a primeira renderização no navegador
+  const [store, dispatch] = useReducer(cartReducer, EMPTY_STORE)
+  const [hydrated, setHydrated] = useState(false)
+  const persister = useRef<CartPersister | null>(null)
+  // Carrinhos vindos do armazenamento ou de outra aba não são gravados de volta
+  const skipSave = useRef(true)
+
+  // O reducer já mantém a lista: nada é recalculado sobre as linhas aqui
+  const state = useMemo<CartState>(() => ({
+    items: store.items,
+    total: store.totalCents / 100,
+    count: store.count,
+  }), [store])
+
+  // Restaurar o carrinho salvo e acompanhar alterações feitas em outras abas
+  useEffect(() => {
+    const savedItems = loadCart()
+    if (savedItems) {
+      dispatch({ type: "HYDRATE", payload: { items: savedItems } })
     }
-    return { items: [], total: 0 }
-  }
-
-  const [state, dispatch] = useReducer(cartReducer, { items: [], total: 0 }, loadInitialState)
+    persister.current = createCartPersister((items) => {
+      skipSave.current = true
+      dispatch({ type: "HYDRATE", payload: { items } })
+    })
+    setHydrated(true)
+
+    return () => {
+      persister.current?.dispose()
+      persister.current = null
+    }
+  }, [])
 
   // Função para limpar localStorage
   const clearLocalStorage = () => {
-    if (typeof window !== "undefined") {
-      try {
-        localStorage.removeItem("pizzaria-cart")
-      } catch (error) {
-        console.error("Erro ao limpar carrinho do localStorage:", error)
-      }
-    }
+    if (persister.current) persister.current.clear()
+    else removeCart()
   }
 
-  // Salvar no localStorage sempre que o estado mudar
+  // Agendar a gravação sempre que o carrinho mudar nesta aba
   useEffect(() => {
-    if (typeof window !== "undefined") {
-      try {
-        localStorage.setItem("pizzaria-cart", JSON.stringify(state))
-      } catch (error) {
-        console.error("Erro ao salvar carrinho no localStorage:", error)
-      }
+    if (!hydrated) return
+    if (skipSave.current) {
+      skipSave.current = false
+      return
     }
-  }, [state])
+    persister.current?.save(state.items)
+  }, [state, hydrated])
 
-  return <CartContext.Provider value={{ state, dispatch, clearLocalStorage }}>{children}</CartContext.Provider>
+  return <CartContext.Provider value={{ state, dispatch, clearLocalStorage, hydrated }}>{children}</CartContext.Provider>
 }
 
 export const useCart = () => {
@@ -0,0 +1,217 @@
+/**
+ * Persistência do carrinho no navegador
+ *
+ * - Gravações adiadas: toques rápidos nos botões de quantidade viram uma
+ *   única gravação, feita em tempo ocioso (requestIdleCallback) e forçada
+ *   quando a aba é escondida ou fechada.
+ * - Formato compacto e versionado sob "pizzaria-cart"; formatos antigos são
+ *   migrados na leitura.
+ * - Sincronização entre abas via BroadcastChannel, que entrega as linhas já
+ *   estruturadas; o evento "storage" (que exige reler o JSON) é usado apenas
+ *   onde BroadcastChannel não existe.
+ */
+
+import type { CartItem } from "@/lib/cart-context"
+
+export const CART_STORAGE_KEY = "pizzaria-cart"
+export const CART_SCHEMA_VERSION = 2
+
+// Espera após a última alteração antes de gravar
+const WRITE_DELAY_MS = 300
+// Prazo máximo para o navegador encontrar tempo ocioso
+const IDLE_TIMEOUT_MS = 1000
+
+// Linha compacta: [id, nome, tamanho, sabores, preco, quantidade, tipo, adicionais?, borda?]
+type CompactLine = [
+  string,
+  string,
+  "t" | "b",
+  string[],
+  number,
+  number,
+  string,
+  CartItem["adicionais"]?,
+  CartItem["bordaRecheada"]?,
+]
+
+interface StoredCartV2 {
+  v: 2
+  l: CompactLine[]
+}
+
+// Formato anterior: o estado do reducer serializado diretamente
+interface StoredCartV1 {
+  items: CartItem[]
+  total?: number
+}
+
+const compactLine = (item: CartItem): CompactLine => {
+  const line: CompactLine = [
+    item.id,
+    item.nome,
+    item.tamanho === "broto" ? "b" : "t",
+    item.sabores,
+    item.preco,
+    item.quantidade,
+    item.tipo,
+    item.adicionais?.length ? item.adicionais : undefined,
+    item.bordaRecheada,
+  ]
+  // Campos opcionais vazios no fim da linha não são gravados
+  while (line.length > 7 && line[line.length - 1] === undefined) line.pop()
+  return line
+}
+
+const expandLine = ([id, nome, tamanho, sabores, preco, quantidade, tipo, adicionais, borda]: CompactLine): CartItem => {
+  const item: CartItem = {
+    id,
+    nome,
+    tamanho: tamanho === "b" ? "broto" : "tradicional",
+    sabores,
+    preco,
+    quantidade,
+    tipo,
+  }
+  if (adicionais) item.adicionais = adicionais
+  if (borda) item.bordaRecheada = borda
+  return item
+}
+
+export function serializeCart(items: CartItem[]): string {
+  const stored: StoredCartV2 = { v: CART_SCHEMA_VERSION, l: items.map(compactLine) }
+  return JSON.stringify(stored)
+}
+
+/**
+ * Lê um carrinho salvo em qualquer versão conhecida.
+ * Retorna null para conteúdo vazio, inválido ou de versão futura.
+ */
+export function parseCart(raw: string | null): CartItem[] | null {
+  if (!raw) return null
+  try {
+    const stored = JSON.parse(raw) as StoredCartV2 | StoredCartV1
+    if ("v" in stored) {
+      return stored.v === CART_SCHEMA_VERSION && Array.isArray(stored.l) ? stored.l.map(expandLine) : null
+    }
+    // v1: { items, total }
+    return Array.isArray(stored.items) ? stored.items : null
+  } catch {
+    return null
+  }
+}
+
+export function loadCart(): CartItem[] | null {
+  try {
+    return parseCart(localStorage.getItem(CART_STORAGE_KEY))
+  } catch (error) {
+    console.error("Erro ao carregar carrinho do localStorage:", error)
+    return null
+  }
+}
+
+export function removeCart() {
+  try {
+    localStorage.removeItem(CART_STORAGE_KEY)
+  } catch (error) {
+    console.error("Erro ao limpar carrinho do localStorage:", error)
+  }
+}
+
+interface CartSyncMessage {
+  tab: string
+  items: CartItem[]
+}
+
+export interface CartPersister {
+  /** Agenda a gravação de ``items`` e avisa as outras abas. */
+  save: (items: CartItem[]) => void
+  /** Grava imediatamente a alteração pendente, se houver. */
+  flush: () => void
+  /** Descarta a gravação pendente e apaga o carrinho salvo. */
+  clear: () => void
+  dispose: () => void
+}
+
+/**
+ * Cria o persistidor do carrinho para esta aba. ``onRemoteChange`` recebe o
+ * carrinho alterado em outra aba.
+ */
+export function createCartPersister(onRemoteChange: (items: CartItem[]) => void): CartPersister {
+  const tab = Math.random().toString(36).slice(2)
+  let pending: CartItem[] | null = null
+  let timer: ReturnType<typeof setTimeout> | null = null
+  let idleHandle: number | null = null
+
+  const channel = typeof BroadcastChannel !== "undefined" ? new BroadcastChannel(CART_STORAGE_KEY) : null
+
+  const cancelScheduled = () => {
+    if (timer !== null) clearTimeout(timer)
+    if (idleHandle !== null && typeof cancelIdleCallback !== "undefined") cancelIdleCallback(idleHandle)
+    timer = null
+    idleHandle = null
+  }
+
+  const flush = () => {
+    cancelScheduled()
+    if (pending === null) return
+    const items = pending
+    pending = null
+    try {
+      localStorage.setItem(CART_STORAGE_KEY, serializeCart(items))
+    } catch (error) {
+      console.error("Erro ao salvar carrinho no localStorage:", error)
+    }
+  }
+
+  const save = (items: CartItem[]) => {
+    pending = items
+    channel?.postMessage({ tab, items } satisfies CartSyncMessage)
+    if (timer !== null) clearTimeout(timer)
+    timer = setTimeout(() => {
+      timer = null
+      if (typeof requestIdleCallback !== "undefined") {
+        if (idleHandle === null) idleHandle = requestIdleCallback(flush, { timeout: IDLE_TIMEOUT_MS })
+      } else {
+        flush()
+      }
+    }, WRITE_DELAY_MS)
+  }
+
+  const clear = () => {
+    cancelScheduled()
+    pending = null
+    removeCart()
+  }
+
+  const onMessage = (event: MessageEvent<CartSyncMessage>) => {
+    if (event.data?.tab !== tab) onRemoteChange(event.data.items)
+  }
+
+  const onStorage = (event: StorageEvent) => {
+    if (event.key !== CART_STORAGE_KEY) return
+    onRemoteChange(parseCart(event.newValue) || [])
+  }
+
+  // Garantir a gravação antes de a aba ser congelada ou fechada
+  const onVisibilityChange = () => {
+    if (document.visibilityState === "hidden") flush()
+  }
+
+  if (channel) channel.addEventListener("message", onMessage)
+  else window.addEventListener("storage", onStorage)
+  window.addEventListener("pagehide", flush)
+  document.addEventListener("visibilitychange", onVisibilityChange)
+
+  return {
+    save,
+    flush,
+    clear,
+    dispose: () => {
+      flush()
+      channel?.close()
+      window.removeEventListener("storage", onStorage)
+      window.removeEventListener("pagehide", flush)
+      document.removeEventListener("visibilitychange", onVisibilityChange)
+    },
+  }
+}
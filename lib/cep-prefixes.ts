@@ -0,0 +1,87 @@
+/**
+ * Tabela offline de faixas de CEP por UF e por algumas cidades
+ *
+ * Permite validar um CEP e decidir região/zona de entrega sem consultar a
+ * ViaCEP (sem rede ou enquanto a consulta não volta). As faixas são as
+ * publicadas pelos Correios, indicadas pelos cinco primeiros dígitos.
+ */
+
+export interface CepRegion {
+  uf: string
+  localidade?: string
+}
+
+// [início, fim, UF] - prefixos de 5 dígitos, ordenados pelo início
+const UF_RANGES: [number, number, string][] = [
+  [1000, 19999, "SP"],
+  [20000, 28999, "RJ"],
+  [29000, 29999, "ES"],
+  [30000, 39999, "MG"],
+  [40000, 48999, "BA"],
+  [49000, 49999, "SE"],
+  [50000, 56999, "PE"],
+  [57000, 57999, "AL"],
+  [58000, 58999, "PB"],
+  [59000, 59999, "RN"],
+  [60000, 63999, "CE"],
+  [64000, 64999, "PI"],
+  [65000, 65999, "MA"],
+  [66000, 68899, "PA"],
+  [68900, 68999, "AP"],
+  [69000, 69299, "AM"],
+  [69300, 69399, "RR"],
+  [69400, 69899, "AM"],
+  [69900, 69999, "AC"],
+  [70000, 72799, "DF"],
+  [72800, 72999, "GO"],
+  [73000, 73699, "DF"],
+  [73700, 76799, "GO"],
+  [76800, 76999, "RO"],
+  [77000, 77999, "TO"],
+  [78000, 78899, "MT"],
+  [79000, 79999, "MS"],
+  [80000, 87999, "PR"],
+  [88000, 89999, "SC"],
+  [90000, 99999, "RS"],
+]
+
+// [início, fim, cidade, UF] - ordenados pelo início
+const CITY_RANGES: [number, number, string, string][] = [
+  [1000, 5999, "São Paulo", "SP"],
+  [8000, 8499, "São Paulo", "SP"],
+  [12200, 12248, "São José dos Campos", "SP"],
+  [20000, 23799, "Rio de Janeiro", "RJ"],
+  [30000, 31999, "Belo Horizonte", "MG"],
+  [40000, 42599, "Salvador", "BA"],
+  [50000, 52999, "Recife", "PE"],
+  [60000, 61599, "Fortaleza", "CE"],
+  [70000, 72799, "Brasília", "DF"],
+  [80000, 82999, "Curitiba", "PR"],
+  [90000, 91999, "Porto Alegre", "RS"],
+]
+
+// Busca binária pela faixa que contém ``prefix``
+function findRange<T extends [number, number, ...string[]]>(ranges: T[], prefix: number): T | undefined {
+  let low = 0
+  let high = ranges.length - 1
+  while (low <= high) {
+    const middle = (low + high) >> 1
+    const range = ranges[middle]
+    if (prefix < range[0]) high = middle - 1
+    else if (prefix > range[1]) low = middle + 1
+    else return range
+  }
+  return undefined
+}
+
+/**
+ * Região de um CEP de 8 dígitos pela tabela offline, ou null quando o CEP
+ * não pertence a nenhuma faixa (e portanto não existe).
+ */
+export function cepRegion(cleanCep: string): CepRegion | null {
+  const prefix = parseInt(cleanCep.slice(0, 5), 10)
+  const uf = findRange(UF_RANGES, prefix)
+  if (!uf) return null
+  const city = findRange(CITY_RANGES, prefix)
+  return city ? { uf: uf[2], localidade: city[2] } : { uf: uf[2] }
+}
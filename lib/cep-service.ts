@@ -1,8 +1,13 @@
 /**
  * Serviço para integração com a API ViaCEP
  * Fornece funcionalidades para busca de endereços por CEP
+ *
+ * As consultas passam por um LRU em memória e por um cache em localStorage
+ * com validade; a tabela offline de cep-prefixes valida o CEP sem rede.
  */
 
+import { cepRegion, type CepRegion } from './cep-prefixes'
+
 export interface AddressData {
   cep: string
   logradouro: string
@@ -21,6 +26,16 @@ export interface CepSearchResult {
   success: boolean
   data?: AddressData
   error?: string
+  // Resultado vindo do cache e já vencido; uma nova consulta está em andamento
+  stale?: boolean
+  source?: 'network' | 'cache'
+  // UF/cidade pela tabela offline de faixas, disponível mesmo sem rede
+  region?: CepRegion | null
+}
+
+export interface CepSearchOptions {
+  /** Recebe o resultado atualizado quando um resultado vencido é revalidado. */
+  onUpdate?: (result: CepSearchResult) => void
 }
 
 /**
@@ -54,74 +69,228 @@ export const isValidCep = (cep: string): boolean => {
   return cleanCep.length === 8 && /^\d{8}$/.test(cleanCep)
 }
 
+// Endpoint da ViaCEP; NEXT_PUBLIC_CEP_API_URL aponta para um substituto local nos testes
+let cepApiUrl = (process.env.NEXT_PUBLIC_CEP_API_URL || 'https://viacep.com.br/ws').replace(/\/$/, '')
+
 /**
- * Busca informações de endereço através do CEP usando a API ViaCEP
- * @param cep - CEP a ser consultado
- * @returns Promise com resultado da busca
+ * Troca o endpoint consultado (formato ViaCEP: `${url}/${cep}/json/`)
+ * @param url - URL base, por exemplo http://127.0.0.1:54321/ws
  */
-export const searchCep = async (cep: string): Promise<CepSearchResult> => {
-  const cleanCep = formatCep(cep)
-  
-  // Validar formato do CEP
-  if (!isValidCep(cleanCep)) {
-    return {
-      success: false,
-      error: 'CEP deve ter 8 dígitos'
+export const setCepApiUrl = (url: string) => {
+  cepApiUrl = url.replace(/\/$/, '')
+}
+
+const CEP_STORAGE_KEY = 'pizzaria-cep-cache'
+const MEMORY_CACHE_SIZE = 200
+const STORAGE_CACHE_SIZE = 500
+const DAY_MS = 24 * 60 * 60 * 1000
+// Endereço é considerado atual por 7 dias e ainda exibível (revalidando) até 90
+const FRESH_MS = 7 * DAY_MS
+const STALE_MS = 90 * DAY_MS
+// CEP inexistente é lembrado por menos tempo
+const NOT_FOUND_MS = DAY_MS
+const REQUEST_TIMEOUT_MS = 5000
+
+// [endereço ou null para CEP inexistente, momento da consulta]
+type CacheEntry = [AddressData | null, number]
+
+// LRU em memória: o Map mantém a ordem de inserção, o primeiro é o mais antigo
+const memoryCache = new Map<string, CacheEntry>()
+const inFlight = new Map<string, Promise<CepSearchResult>>()
+let storageCache: Record<string, CacheEntry> | null = null
+
+const readStorage = (): Record<string, CacheEntry> => {
+  if (storageCache) return storageCache
+  storageCache = {}
+  try {
+    if (typeof localStorage !== 'undefined') {
+      storageCache = JSON.parse(localStorage.getItem(CEP_STORAGE_KEY) || '{}')
     }
+  } catch {
+    storageCache = {}
   }
-  
+  return storageCache!
+}
+
+const writeStorage = (cep: string, entry: CacheEntry) => {
+  const stored = readStorage()
+  delete stored[cep]
+  stored[cep] = entry
+  const keys = Object.keys(stored)
+  for (let i = 0; i < keys.length - STORAGE_CACHE_SIZE; i++) delete stored[keys[i]]
   try {
-    const response = await fetch(`https://viacep.com.br/ws/${cleanCep}/json/`, {
-      method: 'GET',
-      headers: {
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-      },
-      // Timeout de 10 segundos
-      signal: AbortSignal.timeout(10000)
-    })
-    
-    if (!response.ok) {
-      return {
-        success: false,
-        error: `Erro na requisição: ${response.status} ${response.statusText}`
+    if (typeof localStorage !== 'undefined') localStorage.setItem(CEP_STORAGE_KEY, JSON.stringify(stored))
+  } catch {
+    // Cota excedida ou modo privado: o cache em memória continua valendo
+  }
+}
+
+const rememberInMemory = (cep: string, entry: CacheEntry) => {
+  memoryCache.delete(cep)
+  memoryCache.set(cep, entry)
+  if (memoryCache.size > MEMORY_CACHE_SIZE) {
+    memoryCache.delete(memoryCache.keys().next().value!)
+  }
+}
+
+const getCached = (cep: string): CacheEntry | undefined => {
+  const entry = memoryCache.get(cep) ?? readStorage()[cep]
+  if (entry) rememberInMemory(cep, entry)
+  return entry
+}
+
+const isUsable = ([data, fetchedAt]: CacheEntry, now: number) =>
+  now - fetchedAt < (data ? STALE_MS : NOT_FOUND_MS)
+
+const isFresh = ([data, fetchedAt]: CacheEntry, now: number) =>
+  now - fetchedAt < (data ? FRESH_MS : NOT_FOUND_MS)
+
+const fromEntry = ([data]: CacheEntry, cep: string, stale: boolean): CepSearchResult => data
+  ? { success: true, data, source: 'cache', stale, region: cepRegion(cep) }
+  : { success: false, error: 'CEP não encontrado', source: 'cache', region: cepRegion(cep) }
+
+/**
+ * Limpa os caches de CEP (memória e localStorage)
+ */
+export const clearCepCache = () => {
+  memoryCache.clear()
+  storageCache = {}
+  try {
+    if (typeof localStorage !== 'undefined') localStorage.removeItem(CEP_STORAGE_KEY)
+  } catch {
+    // Ignorar: não há o que limpar
+  }
+}
+
+/**
+ * Consulta a ViaCEP, gravando endereços e CEPs inexistentes no cache.
+ * Consultas simultâneas ao mesmo CEP compartilham a mesma requisição.
+ */
+const fetchCep = (cleanCep: string): Promise<CepSearchResult> => {
+  const pending = inFlight.get(cleanCep)
+  if (pending) return pending
+
+  const request = (async (): Promise<CepSearchResult> => {
+    const region = cepRegion(cleanCep)
+    try {
+      const response = await fetch(`${cepApiUrl}/${cleanCep}/json/`, {
+        method: 'GET',
+        headers: {
+          'Accept': 'application/json'
+        },
+        signal: AbortSignal.timeout(REQUEST_TIMEOUT_MS)
+      })
+
+      if (!response.ok) {
+        return {
+          success: false,
+          error: `Erro na requisição: ${response.status} ${response.statusText}`,
+          region
+        }
       }
-    }
-    
-    const data: AddressData = await response.json()
-    
-    // Verificar se o CEP foi encontrado
-    if (data.erro) {
+
+      const data: AddressData = await response.json()
+      const entry: CacheEntry = [data.erro ? null : data, Date.now()]
+      rememberInMemory(cleanCep, entry)
+      writeStorage(cleanCep, entry)
+
+      // Verificar se o CEP foi encontrado
+      if (data.erro) {
+        return {
+          success: false,
+          error: 'CEP não encontrado',
+          source: 'network',
+          region
+        }
+      }
+
       return {
-        success: false,
-        error: 'CEP não encontrado'
+        success: true,
+        data,
+        source: 'network',
+        region
       }
-    }
-    
-    return {
-      success: true,
-      data
-    }
-    
-  } catch (error) {
-    if (error instanceof Error) {
-      if (error.name === 'AbortError') {
+    } catch (error) {
+      if (error instanceof Error) {
+        if (error.name === 'AbortError' || error.name === 'TimeoutError') {
+          return {
+            success: false,
+            error: 'Timeout na consulta do CEP',
+            region
+          }
+        }
         return {
           success: false,
-          error: 'Timeout na consulta do CEP'
+          error: `Erro na consulta: ${error.message}`,
+          region
         }
       }
+
       return {
         success: false,
-        error: `Erro na consulta: ${error.message}`
+        error: 'Erro desconhecido ao consultar CEP',
+        region
       }
+    } finally {
+      inFlight.delete(cleanCep)
     }
-    
+  })()
+
+  inFlight.set(cleanCep, request)
+  return request
+}
+
+/**
+ * Busca informações de endereço através do CEP usando a API ViaCEP
+ *
+ * Resultados recentes vêm do cache sem rede. Um resultado vencido é
+ * retornado na hora (`stale: true`) e revalidado em segundo plano, com o
+ * novo resultado entregue a `options.onUpdate`. Sem rede, usa qualquer
+ * resultado em cache ainda exibível.
+ * @param cep - CEP a ser consultado
+ * @param options - Callback para o resultado revalidado
+ * @returns Promise com resultado da busca
+ */
+export const searchCep = async (cep: string, options: CepSearchOptions = {}): Promise<CepSearchResult> => {
+  const cleanCep = formatCep(cep)
+
+  // Validar formato do CEP
+  if (!isValidCep(cleanCep)) {
     return {
       success: false,
-      error: 'Erro desconhecido ao consultar CEP'
+      error: 'CEP deve ter 8 dígitos'
     }
   }
+
+  // CEP fora de qualquer faixa dos Correios não existe: nem consultar
+  const region = cepRegion(cleanCep)
+  if (!region) {
+    return {
+      success: false,
+      error: 'CEP não encontrado',
+      region
+    }
+  }
+
+  const now = Date.now()
+  const cached = getCached(cleanCep)
+  if (cached && isFresh(cached, now)) {
+    return fromEntry(cached, cleanCep, false)
+  }
+
+  if (cached && isUsable(cached, now)) {
+    fetchCep(cleanCep).then(result => {
+      if (result.source === 'network') options.onUpdate?.(result)
+    })
+    return fromEntry(cached, cleanCep, true)
+  }
+
+  const result = await fetchCep(cleanCep)
+  // Falha de rede: um resultado antigo ainda é melhor que nenhum
+  if (!result.source && cached) {
+    return fromEntry(cached, cleanCep, true)
+  }
+  return result
 }
 
 /**
@@ -191,6 +360,8 @@ export const useCepSearch = () => {
 
 export default {
   searchCep,
+  clearCepCache,
+  setCepApiUrl,
   formatCep,
   maskCep,
   isValidCep,
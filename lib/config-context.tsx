@@ -4,6 +4,7 @@ import { createContext, useContext, useState, useEffect, ReactNode } from "react
 import { supabase } from "@/lib/supabase"
 import { supabaseOperation, fallbackData } from "@/lib/error-handler"
 import { log } from "@/lib/logger"
+import { invalidateMenuSnapshot } from "@/lib/menu-client"
 
 interface PizzariaConfig {
   habilitar_broto: boolean
@@ -29,7 +30,8 @@ export function ConfigProvider({ children }: { children: ReactNode }) {
   const loadConfig = async () => {
     const result = await supabaseOperation(
       () => supabase.from("pizzaria_config").select("id, habilitar_broto, habilitar_bordas_recheadas").maybeSingle(),
-      fallbackData.pizzariaConfig
+      fallbackData.pizzariaConfig,
+      { table: "pizzaria_config" }
     )
 
     if (result.success && result.data) {
@@ -60,6 +62,7 @@ export function ConfigProvider({ children }: { children: ReactNode }) {
 
       if (error) throw error
 
+      invalidateMenuSnapshot()
       setConfig(prev => ({ ...prev, ...newConfig }))
     } catch (error) {
       log.error("Erro ao atualizar configurações", 'CONFIG', {}, error)
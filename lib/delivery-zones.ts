@@ -0,0 +1,228 @@
+/**
+ * Zonas de entrega (tabela zonas_entrega)
+ *
+ * As zonas são compiladas uma vez em um índice de intervalos ordenados e
+ * disjuntos, de modo que cada consulta no checkout é uma busca binária
+ * (O(log n)) sem ida ao servidor:
+ * - faixas de CEP viram intervalos sobre o número do CEP;
+ * - bairros viram um Map pelo nome normalizado;
+ * - anéis de raio viram intervalos de distância em km por centro.
+ * Quando zonas do mesmo tipo se sobrepõem, vence a de menor `ordem`.
+ */
+
+import { supabase, isSupabaseConfigured } from "./supabase"
+import { supabaseOperation } from "./error-handler"
+
+export type DeliveryZoneType = "cep" | "bairro" | "raio"
+
+export interface DeliveryZone {
+  id: string
+  nome: string
+  tipo: DeliveryZoneType
+  cep_inicio?: string | null
+  cep_fim?: string | null
+  bairros?: string[] | null
+  centro_latitude?: number | null
+  centro_longitude?: number | null
+  raio_min_km?: number | null
+  raio_max_km?: number | null
+  taxa: number
+  pedido_minimo?: number | null
+  ativo?: boolean
+  ordem?: number
+}
+
+export interface DeliveryQuote {
+  zone: DeliveryZone
+  taxa: number
+  pedidoMinimo: number
+}
+
+export interface DeliveryLocation {
+  cep?: string
+  bairro?: string
+  latitude?: number
+  longitude?: number
+}
+
+// Intervalos semiabertos [starts[i], ends[i]) disjuntos e ordenados, cada um de zones[i]
+interface IntervalIndex {
+  starts: number[]
+  ends: number[]
+  zones: DeliveryZone[]
+}
+
+interface RingIndex extends IntervalIndex {
+  latitude: number
+  longitude: number
+}
+
+export interface DeliveryZoneIndex {
+  size: number
+  ceps: IntervalIndex
+  bairros: Map<string, DeliveryZone>
+  rings: RingIndex[]
+}
+
+interface Interval {
+  start: number
+  end: number
+  zone: DeliveryZone
+}
+
+const priority = (zone: DeliveryZone) => zone.ordem ?? 0
+
+/**
+ * Achata intervalos possivelmente sobrepostos em segmentos disjuntos, cada
+ * um atribuído à zona de maior prioridade que o cobre. Segmentos vizinhos da
+ * mesma zona são unidos. Roda só na compilação, nunca na consulta.
+ */
+function flattenIntervals(intervals: Interval[]): IntervalIndex {
+  const index: IntervalIndex = { starts: [], ends: [], zones: [] }
+  const points = [...new Set(intervals.flatMap(({ start, end }) => [start, end]))].sort((a, b) => a - b)
+  const byPriority = [...intervals].sort((a, b) => priority(a.zone) - priority(b.zone))
+
+  for (let i = 0; i < points.length - 1; i++) {
+    const start = points[i]
+    const end = points[i + 1]
+    const covering = byPriority.find(interval => interval.start <= start && interval.end >= end)
+    if (!covering) continue
+    const last = index.zones.length - 1
+    if (last >= 0 && index.zones[last] === covering.zone && index.ends[last] === start) {
+      index.ends[last] = end
+    } else {
+      index.starts.push(start)
+      index.ends.push(end)
+      index.zones.push(covering.zone)
+    }
+  }
+  return index
+}
+
+// Busca binária pelo último segmento que começa até ``value``
+function findInterval(index: IntervalIndex, value: number): DeliveryZone | null {
+  let low = 0
+  let high = index.starts.length - 1
+  let found = -1
+  while (low <= high) {
+    const middle = (low + high) >> 1
+    if (index.starts[middle] <= value) {
+      found = middle
+      low = middle + 1
+    } else {
+      high = middle - 1
+    }
+  }
+  return found >= 0 && value < index.ends[found] ? index.zones[found] : null
+}
+
+/**
+ * Normaliza o nome do bairro para comparação (sem acentos, caixa ou espaços extras)
+ */
+export const normalizeBairro = (bairro: string): string =>
+  bairro.normalize("NFD").replace(/[\u0300-\u036f]/g, "").toLowerCase().replace(/\s+/g, " ").trim()
+
+const cepNumber = (cep?: string | null): number => {
+  const digits = (cep || "").replace(/\D/g, "")
+  return digits.length === 8 ? parseInt(digits, 10) : NaN
+}
+
+/**
+ * Compila as zonas ativas no índice usado pelo checkout.
+ * Zonas com dados incompletos (faixa inválida, raio sem centro) são ignoradas.
+ */
+export function compileDeliveryZones(zones: DeliveryZone[]): DeliveryZoneIndex {
+  const cepIntervals: Interval[] = []
+  const bairros = new Map<string, DeliveryZone>()
+  const ringsByCenter = new Map<string, { latitude: number; longitude: number; intervals: Interval[] }>()
+  let size = 0
+
+  for (const zone of [...zones].sort((a, b) => priority(a) - priority(b))) {
+    if (zone.ativo === false) continue
+    if (zone.tipo === "cep") {
+      const start = cepNumber(zone.cep_inicio)
+      const end = zone.cep_fim ? cepNumber(zone.cep_fim) : start
+      if (isNaN(start) || isNaN(end) || end < start) continue
+      // Faixa fechada de CEPs vira o intervalo semiaberto [início, fim + 1)
+      cepIntervals.push({ start, end: end + 1, zone })
+    } else if (zone.tipo === "bairro") {
+      for (const bairro of zone.bairros || []) {
+        const key = normalizeBairro(bairro)
+        if (key && !bairros.has(key)) bairros.set(key, zone)
+      }
+    } else if (zone.tipo === "raio") {
+      const latitude = Number(zone.centro_latitude)
+      const longitude = Number(zone.centro_longitude)
+      const start = Number(zone.raio_min_km || 0)
+      const end = Number(zone.raio_max_km)
+      if (zone.centro_latitude == null || zone.centro_longitude == null || !(end > start)) continue
+      const key = `${latitude},${longitude}`
+      const center = ringsByCenter.get(key) || { latitude, longitude, intervals: [] }
+      center.intervals.push({ start, end, zone })
+      ringsByCenter.set(key, center)
+    } else {
+      continue
+    }
+    size++
+  }
+
+  return {
+    size,
+    ceps: flattenIntervals(cepIntervals),
+    bairros,
+    rings: [...ringsByCenter.values()].map(({ latitude, longitude, intervals }) => ({
+      latitude,
+      longitude,
+      ...flattenIntervals(intervals),
+    })),
+  }
+}
+
+/**
+ * Distância em km entre dois pontos (fórmula de haversine)
+ */
+export function distanceKm(lat1: number, lon1: number, lat2: number, lon2: number): number {
+  const toRad = (degrees: number) => (degrees * Math.PI) / 180
+  const dLat = toRad(lat2 - lat1)
+  const dLon = toRad(lon2 - lon1)
+  const a = Math.sin(dLat / 2) ** 2 + Math.cos(toRad(lat1)) * Math.cos(toRad(lat2)) * Math.sin(dLon / 2) ** 2
+  return 6371 * 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a))
+}
+
+/**
+ * Encontra a zona que atende o local. A faixa de CEP é conferida primeiro
+ * (disponível assim que o CEP é digitado), depois o bairro e por fim os anéis
+ * de raio, quando há coordenadas.
+ */
+export function findDeliveryZone(index: DeliveryZoneIndex, location: DeliveryLocation): DeliveryQuote | null {
+  let zone: DeliveryZone | null = null
+
+  const cep = cepNumber(location.cep)
+  if (!isNaN(cep)) zone = findInterval(index.ceps, cep)
+
+  if (!zone && location.bairro) zone = index.bairros.get(normalizeBairro(location.bairro)) || null
+
+  if (!zone && location.latitude != null && location.longitude != null) {
+    for (const ring of index.rings) {
+      const distance = distanceKm(ring.latitude, ring.longitude, location.latitude, location.longitude)
+      const found = findInterval(ring, distance)
+      if (found && (!zone || priority(found) < priority(zone))) zone = found
+    }
+  }
+
+  return zone ? { zone, taxa: Number(zone.taxa) || 0, pedidoMinimo: Number(zone.pedido_minimo) || 0 } : null
+}
+
+/**
+ * Carrega as zonas de entrega ativas. Retorna lista vazia quando a tabela não
+ * existe ou o Supabase não está configurado (vale a taxa única da configuração).
+ */
+export async function loadDeliveryZones(): Promise<DeliveryZone[]> {
+  if (!isSupabaseConfigured()) return []
+  const result = await supabaseOperation(
+    () => supabase.from("zonas_entrega").select("*").eq("ativo", true).order("ordem"),
+    [] as DeliveryZone[],
+    { maxRetries: 1, table: "zonas_entrega" }
+  )
+  return result.data || []
+}
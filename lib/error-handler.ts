@@ -1,9 +1,24 @@
 /**
  * Utilitário para tratamento robusto de erros de API
  * Fornece fallbacks e logging estruturado para operações que podem falhar
+ *
+ * Camada de resiliência:
+ * - erros permanentes (requisição inválida, registro inexistente, permissão)
+ *   não são repetidos;
+ * - novas tentativas esperam um tempo aleatório entre 0 e o teto exponencial
+ *   (full jitter), evitando rajadas sincronizadas;
+ * - um prazo (Deadline) limita o tempo total, inclusive entre várias
+ *   operações de um mesmo carregamento de página;
+ * - um circuit breaker por endpoint, compartilhado com ApiHealthMonitor,
+ *   falha na hora enquanto o backend está fora, em vez de esperar timeouts.
  */
 
 import { log } from './logger'
+import { apiHealthUp, circuitState, fallbackActivations, registry, retryAttempts, supabaseQueryDuration } from './metrics'
+
+// Métricas só valem no servidor: GET /metrics expõe o registro do processo do
+// Next.js, e o que o navegador registrasse nunca seria coletado
+const recordMetrics = typeof window === 'undefined'
 
 export interface ApiResponse<T> {
   data: T | null
@@ -13,8 +28,101 @@ export interface ApiResponse<T> {
 
 export interface RetryOptions {
   maxRetries?: number
+  // Base do backoff; a espera da tentativa n é aleatória entre 0 e delayMs * 2^n
   delayMs?: number
   exponentialBackoff?: boolean
+  // Teto de cada espera
+  maxDelayMs?: number
+  // Prazo total compartilhado; sem ele, cada chamada tem DEFAULT_DEADLINE_MS
+  deadline?: Deadline
+  // Circuit breaker usado (ex.: 'supabase'); sem endpoint não há breaker
+  endpoint?: string
+  // Classificação de erros; por padrão isRetryableError
+  isRetryable?: (error: unknown) => boolean
+}
+
+const DEFAULT_DEADLINE_MS = 8000
+
+/**
+ * Prazo absoluto para um conjunto de operações
+ */
+export class Deadline {
+  readonly expiresAt: number
+
+  constructor(budgetMs: number) {
+    this.expiresAt = Date.now() + budgetMs
+  }
+
+  remaining(): number {
+    return Math.max(0, this.expiresAt - Date.now())
+  }
+
+  get expired(): boolean {
+    return this.remaining() === 0
+  }
+}
+
+/**
+ * Cria um prazo de ``budgetMs`` a ser compartilhado pelas operações de um
+ * carregamento de página (ex.: as consultas do snapshot do cardápio)
+ */
+export const createDeadline = (budgetMs: number) => new Deadline(budgetMs)
+
+/**
+ * Erro de uma operação do Supabase com o código e o status HTTP originais
+ */
+export class SupabaseOperationError extends Error {
+  constructor(message: string, readonly code?: string, readonly status?: number) {
+    super(message)
+    this.name = 'SupabaseOperationError'
+  }
+}
+
+export class CircuitOpenError extends Error {
+  constructor(readonly endpoint: string) {
+    super(`Circuito aberto para ${endpoint}`)
+    this.name = 'CircuitOpenError'
+  }
+}
+
+export class DeadlineExceededError extends Error {
+  constructor() {
+    super('Prazo da operação esgotado')
+    this.name = 'DeadlineExceededError'
+  }
+}
+
+// Classes de SQLSTATE que não mudam ao repetir: dados, restrições, sintaxe/permissão
+const PERMANENT_SQLSTATE = /^(22|23|42)/
+
+/**
+ * Indica se vale repetir a operação: falhas de rede, timeouts, 5xx, 408 e 429
+ * sim; erros do PostgREST (PGRST*), de SQL e demais 4xx não.
+ */
+export function isRetryableError(error: unknown): boolean {
+  if (error instanceof CircuitOpenError || error instanceof DeadlineExceededError) return false
+  if (error instanceof SupabaseOperationError) {
+    if (error.status !== undefined && error.status > 0) {
+      return error.status >= 500 || error.status === 408 || error.status === 429
+    }
+    if (error.code && (error.code.startsWith('PGRST') || PERMANENT_SQLSTATE.test(error.code))) return false
+  }
+  return true
+}
+
+// Espera aleatória entre 0 e o teto exponencial (full jitter)
+const backoffDelay = (attempt: number, { delayMs, maxDelayMs, exponentialBackoff }: Required<Pick<RetryOptions, 'delayMs' | 'maxDelayMs' | 'exponentialBackoff'>>) =>
+  Math.random() * Math.min(maxDelayMs, exponentialBackoff ? delayMs * Math.pow(2, attempt) : delayMs)
+
+// Executa ``operation`` sem ultrapassar o prazo restante
+function withinDeadline<T>(operation: () => Promise<T>, deadline: Deadline): Promise<T> {
+  const remaining = deadline.remaining()
+  if (remaining === 0) return Promise.reject(new DeadlineExceededError())
+  let timer: ReturnType<typeof setTimeout> | undefined
+  const timeout = new Promise<never>((_, reject) => {
+    timer = setTimeout(() => reject(new DeadlineExceededError()), remaining)
+  })
+  return Promise.race([operation(), timeout]).finally(() => clearTimeout(timer))
 }
 
 /**
@@ -24,13 +132,31 @@ export async function withRetry<T>(
   operation: () => Promise<T>,
   options: RetryOptions = {}
 ): Promise<ApiResponse<T>> {
-  const { maxRetries = 3, delayMs = 1000, exponentialBackoff = true } = options
+  const {
+    maxRetries = 2,
+    delayMs = 100,
+    exponentialBackoff = true,
+    maxDelayMs = 1000,
+    deadline = new Deadline(DEFAULT_DEADLINE_MS),
+    endpoint,
+    isRetryable = isRetryableError
+  } = options
+  const breaker = endpoint ? ApiHealthMonitor.getInstance().breaker(endpoint) : null
   
   let lastError: any = null
   
   for (let attempt = 0; attempt <= maxRetries; attempt++) {
+    let trial = false
     try {
-      const result = await operation()
+      if (breaker) {
+        trial = breaker.getState() === 'half-open'
+        if (!breaker.allowRequest()) {
+          trial = false
+          throw new CircuitOpenError(endpoint!)
+        }
+      }
+      const result = await withinDeadline(operation, deadline)
+      breaker?.recordSuccess()
       return {
         data: result,
         error: null,
@@ -38,19 +164,35 @@ export async function withRetry<T>(
       }
     } catch (error) {
       lastError = error
+      const retryable = isRetryable(error)
+      if (breaker && !(error instanceof CircuitOpenError)) {
+        // Prazo esgotado é o backend travado: conta como falha. Erros
+        // permanentes (4xx) mostram que o backend respondeu: contam como sucesso.
+        if (retryable || error instanceof DeadlineExceededError) breaker.recordFailure()
+        else breaker.recordSuccess()
+      }
       
       // Log do erro
       log.warn(`Tentativa ${attempt + 1}/${maxRetries + 1} falhou`, 'RETRY', {
         error: error instanceof Error ? error.message : String(error),
         attempt: attempt + 1,
-        maxRetries: maxRetries + 1
+        maxRetries: maxRetries + 1,
+        retryable,
+        endpoint
       })
       
-      // Se não é a última tentativa, aguarda antes de tentar novamente
+      if (!retryable) break
+      
+      // Se não é a última tentativa, aguarda antes de tentar novamente (dentro do prazo)
       if (attempt < maxRetries) {
-        const delay = exponentialBackoff ? delayMs * Math.pow(2, attempt) : delayMs
+        const delay = backoffDelay(attempt, { delayMs, maxDelayMs, exponentialBackoff })
+        if (delay >= deadline.remaining()) break
         await new Promise(resolve => setTimeout(resolve, delay))
+        if (recordMetrics) retryAttempts.inc({ endpoint: endpoint || 'none' })
       }
+    } finally {
+      // Qualquer desfecho libera a requisição de teste do circuito meio aberto
+      if (trial) breaker!.releaseTrial()
     }
   }
   
@@ -62,26 +204,47 @@ export async function withRetry<T>(
   }
 }
 
+export interface SupabaseOperationOptions extends RetryOptions {
+  // Labels das métricas de latência (supabase_query_duration_seconds)
+  table?: string
+  operation?: string
+}
+
 /**
  * Wrapper para operações do Supabase com tratamento de erros
+ * Usa o circuit breaker 'supabase', salvo outro endpoint em retryOptions.
  */
 export async function supabaseOperation<T>(
-  operation: () => Promise<{ data: T | null; error: any }>,
+  operation: () => PromiseLike<{ data: T | null; error: any; status?: number }>,
   fallbackData?: T,
-  retryOptions?: RetryOptions
+  retryOptions: SupabaseOperationOptions = {}
 ): Promise<ApiResponse<T>> {
+  const { table = 'unknown', operation: operationName = 'select', ...options } = retryOptions
+  const startedAt = performance.now()
   const result = await withRetry(async () => {
-    const { data, error } = await operation()
+    const { data, error, status } = await operation()
     
     if (error) {
-      throw new Error(`Supabase Error: ${error.message || error.code || 'Unknown error'}`)
+      throw new SupabaseOperationError(
+        `Supabase Error: ${error.message || error.code || 'Unknown error'}`,
+        error.code,
+        status
+      )
     }
     
     return data
-  }, retryOptions)
+  }, { endpoint: 'supabase', ...options })
+  
+  if (recordMetrics) {
+    supabaseQueryDuration.observe(
+      { table, operation: operationName, outcome: result.success ? 'success' : 'error' },
+      (performance.now() - startedAt) / 1000
+    )
+  }
   
   // Se falhou e temos fallback, usar o fallback
   if (!result.success && fallbackData !== undefined) {
+    if (recordMetrics) fallbackActivations.inc({ table })
     log.warn('Usando dados de fallback devido a erro na API', 'SUPABASE', {
       error: result.error,
       fallbackUsed: true
@@ -192,28 +355,137 @@ export const fallbackData = {
   ]
 }
 
+export type CircuitState = 'closed' | 'open' | 'half-open'
+
+export interface CircuitBreakerOptions {
+  // Falhas seguidas que abrem o circuito
+  failureThreshold?: number
+  // Tempo aberto antes de deixar passar uma requisição de teste
+  cooldownMs?: number
+}
+
+/**
+ * Circuit breaker de um endpoint. Fechado, deixa tudo passar; após
+ * ``failureThreshold`` falhas seguidas abre e rejeita na hora; depois de
+ * ``cooldownMs`` deixa passar uma única requisição de teste (meio aberto),
+ * que fecha o circuito se der certo ou o reabre se falhar.
+ */
+export class CircuitBreaker {
+  private state: CircuitState = 'closed'
+  private failures = 0
+  private openedAt = 0
+  private trialInFlight = false
+  private readonly failureThreshold: number
+  private readonly cooldownMs: number
+
+  constructor(
+    readonly endpoint: string,
+    options: CircuitBreakerOptions = {},
+    private readonly onStateChange?: (endpoint: string, state: CircuitState) => void
+  ) {
+    this.failureThreshold = options.failureThreshold ?? 5
+    this.cooldownMs = options.cooldownMs ?? 30000
+  }
+
+  getState(): CircuitState {
+    if (this.state === 'open' && Date.now() - this.openedAt >= this.cooldownMs) {
+      this.transition('half-open')
+    }
+    return this.state
+  }
+
+  allowRequest(): boolean {
+    const state = this.getState()
+    if (state === 'closed') return true
+    if (state === 'half-open' && !this.trialInFlight) {
+      this.trialInFlight = true
+      return true
+    }
+    return false
+  }
+
+  recordSuccess() {
+    this.failures = 0
+    this.trialInFlight = false
+    if (this.state !== 'closed') this.transition('closed')
+  }
+
+  recordFailure() {
+    this.failures++
+    this.trialInFlight = false
+    if (this.state === 'half-open' || this.failures >= this.failureThreshold) {
+      this.openedAt = Date.now()
+      if (this.state !== 'open') this.transition('open')
+    }
+  }
+
+  // Libera a vaga da requisição de teste sem mudar o estado
+  releaseTrial() {
+    this.trialInFlight = false
+  }
+
+  private transition(state: CircuitState) {
+    this.state = state
+    this.onStateChange?.(this.endpoint, state)
+  }
+}
+
 /**
  * Hook para monitoramento de saúde da API
+ * Guarda também os circuit breakers: um circuito aberto torna o endpoint
+ * não saudável, e uma verificação de saúde bem-sucedida fecha o circuito.
  */
 export class ApiHealthMonitor {
   private static instance: ApiHealthMonitor
   private healthStatus: Map<string, boolean> = new Map()
   private lastCheck: Map<string, number> = new Map()
+  private breakers: Map<string, CircuitBreaker> = new Map()
   
   static getInstance(): ApiHealthMonitor {
     if (!ApiHealthMonitor.instance) {
       ApiHealthMonitor.instance = new ApiHealthMonitor()
+      if (recordMetrics) registry.onCollect(() => ApiHealthMonitor.instance.exportMetrics())
     }
     return ApiHealthMonitor.instance
   }
   
+  // Atualiza os gauges de saúde e de circuito antes de cada coleta de /metrics
+  private exportMetrics() {
+    const states: Record<CircuitState, number> = { closed: 0, 'half-open': 1, open: 2 }
+    for (const endpoint of new Set([...this.healthStatus.keys(), ...this.breakers.keys()])) {
+      apiHealthUp.set({ endpoint }, this.getStatus(endpoint) ? 1 : 0)
+    }
+    for (const [endpoint, breaker] of this.breakers) {
+      circuitState.set({ endpoint }, states[breaker.getState()])
+    }
+  }
+  
+  /**
+   * Circuit breaker do endpoint, criado na primeira chamada
+   */
+  breaker(endpoint: string, options?: CircuitBreakerOptions): CircuitBreaker {
+    let breaker = this.breakers.get(endpoint)
+    if (!breaker) {
+      breaker = new CircuitBreaker(endpoint, options, (name, state) => {
+        this.healthStatus.set(name, state === 'closed')
+        if (state === 'open') {
+          log.warn(`Circuito aberto: falhando rápido para ${name}`, 'HEALTH', { endpoint: name })
+        } else if (state === 'closed') {
+          log.info(`Circuito fechado: ${name} voltou a responder`, 'HEALTH', { endpoint: name })
+        }
+      })
+      this.breakers.set(endpoint, breaker)
+    }
+    return breaker
+  }
+  
   async checkHealth(endpoint: string, checkFn: () => Promise<boolean>): Promise<boolean> {
     const now = Date.now()
     const lastCheckTime = this.lastCheck.get(endpoint) || 0
     
     // Só verifica novamente se passou mais de 30 segundos
     if (now - lastCheckTime < 30000) {
-      return this.healthStatus.get(endpoint) || false
+      return this.getStatus(endpoint)
     }
     
     try {
@@ -221,8 +493,11 @@ export class ApiHealthMonitor {
       this.healthStatus.set(endpoint, isHealthy)
       this.lastCheck.set(endpoint, now)
       
-      if (!isHealthy) {
+      if (isHealthy) {
+        this.breakers.get(endpoint)?.recordSuccess()
+      } else {
         log.warn(`Endpoint não está saudável`, 'HEALTH', { endpoint })
+        this.breakers.get(endpoint)?.recordFailure()
       }
       
       return isHealthy
@@ -230,15 +505,22 @@ export class ApiHealthMonitor {
       log.error(`Erro ao verificar saúde do endpoint`, 'HEALTH', { endpoint }, error instanceof Error ? error : new Error(String(error)))
       this.healthStatus.set(endpoint, false)
       this.lastCheck.set(endpoint, now)
+      this.breakers.get(endpoint)?.recordFailure()
       return false
     }
   }
   
   getStatus(endpoint: string): boolean {
+    const breaker = this.breakers.get(endpoint)
+    if (breaker && breaker.getState() === 'open') return false
     return this.healthStatus.get(endpoint) || false
   }
   
   getAllStatus(): Record<string, boolean> {
     return Object.fromEntries(this.healthStatus)
   }
+  
+  getCircuitStates(): Record<string, CircuitState> {
+    return Object.fromEntries([...this.breakers].map(([endpoint, breaker]) => [endpoint, breaker.getState()]))
+  }
 }
\ No newline at end of file
@@ -0,0 +1,219 @@
+/**
+ * Processamento das imagens enviadas pelo admin (uso exclusivo no servidor)
+ *
+ * Decodifica o original uma única vez com sharp, corrige a orientação EXIF,
+ * recorta na proporção do preset e gera cada largura em AVIF e WebP, além de
+ * um placeholder borrado. As variantes vão para o bucket "images" em chaves
+ * derivadas do hash do conteúdo (ver lib/image-variants.ts): reenviar o
+ * mesmo arquivo não gera nem grava nada de novo.
+ *
+ * Cada imagem codifica várias variantes em paralelo, então só
+ * MAX_CONCURRENT_JOBS imagens são processadas ao mesmo tempo; as seguintes
+ * esperam em uma fila curta e, com a fila cheia, processImage lança
+ * ImagePipelineBusyError em vez de empilhar trabalho.
+ *
+ * sharp é dependência do projeto (package.json); quando não está disponível
+ * na plataforma, processImage lança ImagePipelineUnavailableError.
+ */
+
+import { createHash } from "crypto"
+import { supabase } from "./supabase"
+import { supabaseOperation, createDeadline } from "./error-handler"
+import { log } from "./logger"
+import {
+  IMAGE_FORMATS,
+  IMAGE_PRESETS,
+  variantKey,
+  type ImageFormat,
+  type ImagePresetName,
+  type ImageVariants,
+} from "./image-variants"
+
+export const IMAGE_BUCKET = "images"
+
+// Maior original aceito; as variantes geradas ficam bem abaixo do limite do bucket
+export const MAX_SOURCE_BYTES = 10 * 1024 * 1024
+
+// Imagens processadas ao mesmo tempo e quantas podem esperar a vez
+export const MAX_CONCURRENT_JOBS = 2
+const MAX_QUEUED_JOBS = 4
+
+// Prazo total para gravar todas as variantes, novas tentativas incluídas
+const UPLOAD_DEADLINE_MS = 20000
+
+const PLACEHOLDER_WIDTH = 16
+
+const ENCODERS: Record<ImageFormat, { contentType: string; options: Record<string, number> }> = {
+  avif: { contentType: "image/avif", options: { quality: 50, effort: 4 } },
+  webp: { contentType: "image/webp", options: { quality: 75, effort: 4 } },
+}
+
+export class ImagePipelineUnavailableError extends Error {
+  constructor() {
+    super("Processamento de imagens indisponível: sharp não está instalado")
+    this.name = "ImagePipelineUnavailableError"
+  }
+}
+
+export class ImagePipelineBusyError extends Error {
+  constructor() {
+    super("Processamento de imagens ocupado; tente novamente em instantes")
+    this.name = "ImagePipelineBusyError"
+  }
+}
+
+export class InvalidImageError extends Error {
+  constructor(message = "Arquivo não é uma imagem válida") {
+    super(message)
+    this.name = "InvalidImageError"
+  }
+}
+
+type Sharp = typeof import("sharp")
+
+let sharpModule: Promise<Sharp | null> | null = null
+
+function loadSharp(): Promise<Sharp | null> {
+  sharpModule ??= import("sharp").then(
+    module => (module as any).default ?? module,
+    () => null
+  )
+  return sharpModule
+}
+
+let runningJobs = 0
+const waitingJobs: (() => void)[] = []
+
+// Executa ``job`` quando houver vaga; ao terminar, a vaga passa para o próximo da fila
+async function withJobSlot<T>(job: () => Promise<T>): Promise<T> {
+  if (runningJobs < MAX_CONCURRENT_JOBS) {
+    runningJobs++
+  } else {
+    if (waitingJobs.length >= MAX_QUEUED_JOBS) throw new ImagePipelineBusyError()
+    await new Promise<void>(resolve => waitingJobs.push(resolve))
+  }
+  try {
+    return await job()
+  } finally {
+    const next = waitingJobs.shift()
+    if (next) next()
+    else runningJobs--
+  }
+}
+
+interface Geometry {
+  width: number
+  height: number
+  widths: number[]
+  heightFor: (width: number) => number
+}
+
+/**
+ * Larguras que o original comporta no recorte do preset (sem ampliar).
+ * Se o original é menor que a menor largura, gera só o tamanho dele.
+ */
+function planGeometry(sourceWidth: number, sourceHeight: number, presetName: ImagePresetName): Geometry {
+  const { widths, aspectRatio } = IMAGE_PRESETS[presetName]
+  const ratio = aspectRatio ?? sourceWidth / sourceHeight
+  const maxWidth = Math.min(sourceWidth, Math.floor(sourceHeight * ratio))
+  const fitting = widths.filter(width => width <= maxWidth)
+  const planned = fitting.length ? fitting : [maxWidth]
+  const heightFor = (width: number) => Math.max(1, Math.round(width / ratio))
+  const largest = planned[planned.length - 1]
+  return { width: largest, height: heightFor(largest), widths: planned, heightFor }
+}
+
+async function uploadVariant(key: string, body: Buffer, contentType: string, deadline: ReturnType<typeof createDeadline>) {
+  const result = await supabaseOperation(
+    () => supabase.storage
+      .from(IMAGE_BUCKET)
+      .upload(key, body, { contentType, cacheControl: "31536000", upsert: false })
+      .then(({ data, error }: { data: any; error: any }) => {
+        // Mesmo hash, mesmo conteúdo: a variante já gravada serve
+        if (error && /already exists|duplicate/i.test(error.message || "")) return { data: null, error: null }
+        return { data, error, status: error ? Number(error.statusCode ?? error.status) || undefined : undefined }
+      }),
+    undefined,
+    { endpoint: "supabase-storage", table: `storage.${IMAGE_BUCKET}`, operation: "upload", deadline }
+  )
+  if (!result.success) throw new Error(result.error || `Falha ao gravar ${key}`)
+}
+
+async function existingVariants(prefix: string): Promise<Set<string>> {
+  const { data, error } = await supabase.storage.from(IMAGE_BUCKET).list(prefix, { limit: 100 })
+  return new Set(error || !data ? [] : data.map((file: { name: string }) => file.name))
+}
+
+/**
+ * Gera e grava as variantes de ``input`` para o preset, retornando o
+ * descritor a ser salvo no banco.
+ */
+export async function processImage(input: Buffer, presetName: ImagePresetName): Promise<ImageVariants> {
+  const sharp = await loadSharp()
+  if (!sharp) throw new ImagePipelineUnavailableError()
+  return withJobSlot(() => encodeVariants(sharp, input, presetName))
+}
+
+async function encodeVariants(sharp: Sharp, input: Buffer, presetName: ImagePresetName): Promise<ImageVariants> {
+  const { folder, aspectRatio } = IMAGE_PRESETS[presetName]
+  const hash = createHash("sha256").update(input).digest("hex").slice(0, 20)
+
+  // rotate() sem argumentos aplica a orientação EXIF antes de qualquer recorte
+  const source = sharp(input, { failOn: "error", limitInputPixels: 50_000_000 }).rotate()
+  let metadata
+  try {
+    metadata = await source.metadata()
+  } catch {
+    throw new InvalidImageError()
+  }
+  if (!metadata.width || !metadata.height) throw new InvalidImageError()
+  const rotated = (metadata.orientation ?? 1) >= 5
+  const geometry = planGeometry(
+    rotated ? metadata.height : metadata.width,
+    rotated ? metadata.width : metadata.height,
+    presetName
+  )
+
+  const resized = (width: number) =>
+    source.clone().resize({
+      width,
+      height: aspectRatio ? geometry.heightFor(width) : undefined,
+      fit: "cover",
+      position: "attention",
+      withoutEnlargement: true,
+    })
+
+  const placeholder = await resized(PLACEHOLDER_WIDTH).blur(1).webp({ quality: 40 }).toBuffer()
+
+  const present = await existingVariants(`${folder}/${hash}`)
+  const deadline = createDeadline(UPLOAD_DEADLINE_MS)
+  const pending = geometry.widths.flatMap(width =>
+    IMAGE_FORMATS.map(format => ({ width, format, key: variantKey(folder, hash, width, format) }))
+  ).filter(({ width, format }) => !present.has(`${width}.${format}`))
+
+  // sharp distribui a codificação entre as threads do libuv
+  await Promise.all(pending.map(async ({ width, format, key }) => {
+    const { contentType, options } = ENCODERS[format]
+    const body = await resized(width)[format](options).toBuffer()
+    await uploadVariant(key, body, contentType, deadline)
+  }))
+
+  log.info("Variantes de imagem geradas", "IMAGES", {
+    preset: presetName,
+    hash,
+    widths: geometry.widths,
+    generated: pending.length,
+    reused: geometry.widths.length * IMAGE_FORMATS.length - pending.length,
+  })
+
+  const { data } = supabase.storage.from(IMAGE_BUCKET).getPublicUrl(`${folder}/${hash}/`)
+  return {
+    base: data.publicUrl.endsWith("/") ? data.publicUrl : `${data.publicUrl}/`,
+    hash,
+    width: geometry.width,
+    height: geometry.height,
+    widths: geometry.widths,
+    formats: IMAGE_FORMATS,
+    placeholder: `data:image/webp;base64,${placeholder.toString("base64")}`,
+  }
+}
@@ -0,0 +1,129 @@
+/**
+ * Variantes responsivas das imagens enviadas pelo admin
+ *
+ * O upload (POST /api/images) gera, a partir do original, várias larguras em
+ * AVIF e WebP e um placeholder borrado. Os arquivos ficam no bucket "images"
+ * sob chaves derivadas do hash do conteúdo:
+ *
+ *   <pasta>/<hash>/<largura>.<formato>
+ *
+ * de modo que o mesmo arquivo enviado duas vezes reaproveita as variantes e
+ * cada URL pode ser servida com cache imutável. O banco guarda apenas o
+ * descritor (ImageVariants); as URLs e o srcset são derivados dele.
+ *
+ * Este módulo não depende do servidor e é usado também nos componentes.
+ */
+
+export type ImageFormat = "avif" | "webp"
+
+// Ordem de preferência nas <source> do <picture>
+export const IMAGE_FORMATS: ImageFormat[] = ["avif", "webp"]
+
+export type ImagePresetName = "carousel" | "capa" | "perfil" | "produto"
+
+export interface ImagePreset {
+  // Pasta do bucket
+  folder: string
+  // Larguras geradas (nunca maiores que o original)
+  widths: number[]
+  // Proporção largura/altura do recorte; sem ela a imagem mantém a proporção original
+  aspectRatio?: number
+  // Valor padrão do atributo sizes
+  sizes: string
+}
+
+export const IMAGE_PRESETS: Record<ImagePresetName, ImagePreset> = {
+  carousel: { folder: "carousel", widths: [480, 800, 1200, 1920], aspectRatio: 1200 / 320, sizes: "(max-width: 1200px) 100vw, 1200px" },
+  capa: { folder: "capas", widths: [640, 1200, 1920], aspectRatio: 16 / 9, sizes: "100vw" },
+  perfil: { folder: "perfis", widths: [96, 192, 300], aspectRatio: 1, sizes: "96px" },
+  produto: { folder: "produtos", widths: [160, 320, 640], aspectRatio: 1, sizes: "80px" },
+}
+
+export const isImagePreset = (value: unknown): value is ImagePresetName =>
+  typeof value === "string" && value in IMAGE_PRESETS
+
+export interface ImageVariants {
+  // URL pública de <pasta>/<hash>/, com barra final
+  base: string
+  hash: string
+  // Dimensões da maior variante
+  width: number
+  height: number
+  widths: number[]
+  formats: ImageFormat[]
+  // Data URL de uma miniatura borrada (alguns centenas de bytes)
+  placeholder: string
+}
+
+export const variantKey = (folder: string, hash: string, width: number, format: ImageFormat) =>
+  `${folder}/${hash}/${width}.${format}`
+
+export const variantUrl = (variants: ImageVariants, width: number, format: ImageFormat) =>
+  `${variants.base}${width}.${format}`
+
+/**
+ * srcset de um formato, ex.: ".../480.webp 480w, .../800.webp 800w"
+ */
+export const buildSrcSet = (variants: ImageVariants, format: ImageFormat) =>
+  variants.widths.map(width => `${variantUrl(variants, width, format)} ${width}w`).join(", ")
+
+/**
+ * URL única para quem não entende srcset (e para colunas de texto legadas):
+ * a maior variante WebP.
+ */
+export const fallbackImageUrl = (variants: ImageVariants) =>
+  variantUrl(variants, variants.widths[variants.widths.length - 1], "webp")
+
+/**
+ * Valida um descritor vindo do banco (coluna JSONB) antes de usá-lo
+ */
+export function parseImageVariants(value: unknown): ImageVariants | null {
+  if (!value || typeof value !== "object") return null
+  const variants = value as ImageVariants
+  if (typeof variants.base !== "string" || !Array.isArray(variants.widths) || variants.widths.length === 0) return null
+  return {
+    ...variants,
+    formats: Array.isArray(variants.formats) && variants.formats.length ? variants.formats : ["webp"],
+  }
+}
+
+const VARIANT_PATH = /^([\w-]+)\/([0-9a-f]{20})\/(\d+)\.(?:avif|webp)$/
+
+/**
+ * Hash de conteúdo de um caminho de variante (null para arquivos antigos).
+ * Objetos são chaveados pelo hash: o mesmo arquivo enviado para duas linhas
+ * compartilha as variantes, então só remova quando nenhuma outra linha usa o hash.
+ */
+export function variantHashOf(path: string): string | null {
+  return VARIANT_PATH.exec(path)?.[2] ?? null
+}
+
+/**
+ * Caminhos no bucket a remover junto com ``path``: para uma variante, todas
+ * as larguras e formatos do mesmo hash; para arquivos antigos, só ele.
+ */
+export function storagePathsFor(path: string): string[] {
+  const match = VARIANT_PATH.exec(path)
+  const preset = match && Object.values(IMAGE_PRESETS).find(({ folder }) => folder === match[1])
+  if (!match || !preset) return [path]
+  // Originais pequenos geram uma largura fora do preset, a do próprio caminho
+  const widths = new Set([...preset.widths, Number(match[3])])
+  return [...widths].flatMap(width => IMAGE_FORMATS.map(format => variantKey(match[1], match[2], width, format)))
+}
+
+/**
+ * Envia o original para POST /api/images e retorna o descritor das variantes
+ * e a URL da maior delas (para colunas de texto).
+ */
+export async function uploadResponsiveImage(
+  file: Blob,
+  preset: ImagePresetName
+): Promise<{ variants: ImageVariants; url: string }> {
+  const form = new FormData()
+  form.append("file", file)
+  form.append("preset", preset)
+  const response = await fetch("/api/images", { method: "POST", body: form })
+  const body = await response.json().catch(() => ({}))
+  if (!response.ok) throw new Error(body.error || `Falha no upload (HTTP ${response.status})`)
+  return body
+}
@@ -0,0 +1,76 @@
+/**
+ * Gravação de logs recebidos em segmentos NDJSON com rotação
+ *
+ * Cada linha é um objeto JSON (formato de serializeLogEntry). O segmento
+ * atual recebe as linhas em append até atingir LOG_SEGMENT_MAX_BYTES ou
+ * virar o dia (UTC); então um novo arquivo é aberto. Apenas os
+ * LOG_SEGMENT_KEEP segmentos mais recentes são mantidos.
+ *
+ * Uso exclusivo no servidor (route handlers).
+ */
+
+import { appendFile, mkdir, readdir, stat, unlink } from "fs/promises"
+import path from "path"
+
+export const LOG_DIR = process.env.LOG_DIR || path.join(process.cwd(), ".logs")
+export const LOG_SEGMENT_MAX_BYTES = Number(process.env.LOG_SEGMENT_MAX_BYTES) || 10 * 1024 * 1024
+export const LOG_SEGMENT_KEEP = Number(process.env.LOG_SEGMENT_KEEP) || 50
+
+const SEGMENT_PATTERN = /^logs-\d{8}-\d{6}-\d{3}\.ndjson$/
+
+interface Segment {
+  file: string
+  day: string
+  bytes: number
+}
+
+let current: Segment | null = null
+// Gravações em fila: appends concorrentes não intercalam linhas nem corridas de rotação
+let queue: Promise<unknown> = Promise.resolve()
+
+const utcDay = (date: Date) => date.toISOString().slice(0, 10).replace(/-/g, "")
+
+function segmentName(date: Date, sequence: number): string {
+  const time = date.toISOString().slice(11, 19).replace(/:/g, "")
+  return `logs-${utcDay(date)}-${time}-${String(sequence).padStart(3, "0")}.ndjson`
+}
+
+// Remove os segmentos mais antigos, abrindo espaço para ``file``
+async function pruneSegments(file: string) {
+  const files = (await readdir(LOG_DIR)).filter(name => SEGMENT_PATTERN.test(name) && name !== path.basename(file)).sort()
+  for (const name of files.slice(0, Math.max(0, files.length - (LOG_SEGMENT_KEEP - 1)))) {
+    await unlink(path.join(LOG_DIR, name)).catch(() => {})
+  }
+}
+
+// Abre um segmento com espaço para ``size`` bytes
+async function openSegment(now: Date, size: number, sequence = 0): Promise<Segment> {
+  await mkdir(LOG_DIR, { recursive: true })
+  const file = path.join(LOG_DIR, segmentName(now, sequence))
+  const bytes = await stat(file).then(info => info.size, () => 0)
+  // Vários segmentos no mesmo segundo: avançar a sequência
+  if (bytes > 0 && bytes + size > LOG_SEGMENT_MAX_BYTES) return openSegment(now, size, sequence + 1)
+  await pruneSegments(file)
+  return { file, day: utcDay(now), bytes }
+}
+
+async function write(lines: string[]): Promise<void> {
+  const chunk = lines.join("\n") + "\n"
+  const size = Buffer.byteLength(chunk)
+  const now = new Date()
+  if (!current || current.day !== utcDay(now) || current.bytes + size > LOG_SEGMENT_MAX_BYTES) {
+    current = await openSegment(now, size)
+  }
+  await appendFile(current.file, chunk, "utf8")
+  current.bytes += size
+}
+
+/**
+ * Acrescenta linhas NDJSON já validadas ao segmento atual
+ */
+export function appendLogLines(lines: string[]): Promise<void> {
+  if (lines.length === 0) return Promise.resolve()
+  const next = queue.then(() => write(lines))
+  queue = next.catch(() => {})
+  return next
+}
@@ -12,16 +12,174 @@ export enum LogLevel {
 export interface LogEntry {
   level: LogLevel
   message: string
-  timestamp: string
+  // Milissegundos desde a época (Date.now()); convertido para ISO só na exibição
+  timestamp: number
   context?: string
   metadata?: Record<string, any>
   error?: Error
 }
 
+// Ordem de severidade, para filtros do tipo "a partir de WARN"
+const LEVEL_RANK: Record<LogLevel, number> = {
+  [LogLevel.DEBUG]: 0,
+  [LogLevel.INFO]: 1,
+  [LogLevel.WARN]: 2,
+  [LogLevel.ERROR]: 3
+}
+
+/**
+ * Buffer circular de capacidade fixa: inserir é O(1) e, quando cheio,
+ * sobrescreve a entrada mais antiga sem copiar o restante.
+ */
+export class RingBuffer<T> {
+  private items: (T | undefined)[]
+  private start = 0
+  private count = 0
+
+  constructor(readonly capacity: number) {
+    this.items = new Array(capacity)
+  }
+
+  get size(): number {
+    return this.count
+  }
+
+  /** Insere ``item`` e retorna a entrada sobrescrita, se houver. */
+  push(item: T): T | undefined {
+    const index = (this.start + this.count) % this.capacity
+    const evicted = this.count === this.capacity ? this.items[index] : undefined
+    this.items[index] = item
+    if (this.count === this.capacity) {
+      this.start = (this.start + 1) % this.capacity
+    } else {
+      this.count++
+    }
+    return evicted
+  }
+
+  /** Entrada na posição ``i``, da mais antiga (0) para a mais recente. */
+  at(i: number): T {
+    return this.items[(this.start + i) % this.capacity] as T
+  }
+
+  toArray(): T[] {
+    const result = new Array<T>(this.count)
+    for (let i = 0; i < this.count; i++) result[i] = this.at(i)
+    return result
+  }
+
+  clear() {
+    this.items = new Array(this.capacity)
+    this.start = 0
+    this.count = 0
+  }
+}
+
+export interface LogShippingOptions {
+  // Rota que recebe os lotes em NDJSON
+  endpoint: string
+  // Menor nível enviado ao servidor
+  minLevel?: LogLevel
+  // Envia assim que o lote atinge este tamanho
+  batchSize?: number
+  // Intervalo máximo entre envios
+  flushIntervalMs?: number
+  // Entradas aguardando envio além disso são descartadas (as mais antigas)
+  maxQueue?: number
+}
+
+/**
+ * Serializa uma entrada para uma linha NDJSON (Error vira nome/mensagem/stack)
+ */
+export function serializeLogEntry(entry: LogEntry): string {
+  return JSON.stringify({
+    timestamp: new Date(entry.timestamp).toISOString(),
+    level: entry.level,
+    context: entry.context,
+    message: entry.message,
+    metadata: entry.metadata,
+    error: entry.error
+      ? { name: entry.error.name, message: entry.error.message, stack: entry.error.stack?.slice(0, 2000) }
+      : undefined
+  })
+}
+
+/**
+ * Envia logs do navegador em lotes, fora do caminho crítico: as entradas
+ * entram numa fila e seguem por fetch com keepalive a cada intervalo, ou por
+ * sendBeacon quando a aba é escondida ou fechada. Falhas de envio são
+ * descartadas em silêncio para nunca gerar mais logs.
+ */
+class LogShipper {
+  private queue: RingBuffer<LogEntry>
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private readonly endpoint: string
+  private readonly minRank: number
+  private readonly batchSize: number
+  private readonly flushIntervalMs: number
+
+  constructor(options: LogShippingOptions) {
+    this.endpoint = options.endpoint
+    this.minRank = LEVEL_RANK[options.minLevel ?? LogLevel.WARN]
+    this.batchSize = options.batchSize ?? 20
+    this.flushIntervalMs = options.flushIntervalMs ?? 5000
+    this.queue = new RingBuffer(options.maxQueue ?? 200)
+
+    window.addEventListener('pagehide', () => this.flush(true))
+    document.addEventListener('visibilitychange', () => {
+      if (document.visibilityState === 'hidden') this.flush(true)
+    })
+  }
+
+  enqueue(entry: LogEntry) {
+    if (LEVEL_RANK[entry.level] < this.minRank) return
+    this.queue.push(entry)
+    if (this.queue.size >= this.batchSize) {
+      this.flush(false)
+    } else if (this.timer === null) {
+      this.timer = setTimeout(() => this.flush(false), this.flushIntervalMs)
+    }
+  }
+
+  flush(unloading: boolean) {
+    if (this.timer !== null) {
+      clearTimeout(this.timer)
+      this.timer = null
+    }
+    if (this.queue.size === 0) return
+    const body = this.queue.toArray().map(serializeLogEntry).join('\n') + '\n'
+    this.queue.clear()
+
+    // text/plain dispensa preflight de CORS e é aceito pelo sendBeacon
+    if (unloading && typeof navigator.sendBeacon === 'function') {
+      if (navigator.sendBeacon(this.endpoint, new Blob([body], { type: 'text/plain' }))) return
+    }
+    fetch(this.endpoint, {
+      method: 'POST',
+      headers: { 'Content-Type': 'text/plain' },
+      body,
+      keepalive: true
+    }).catch(() => {})
+  }
+}
+
 class Logger {
   private static instance: Logger
-  private logs: LogEntry[] = []
-  private maxLogs = 1000
+  private logs = new RingBuffer<LogEntry>(1000)
+  private counts: Record<LogLevel, number> = {
+    [LogLevel.DEBUG]: 0,
+    [LogLevel.INFO]: 0,
+    [LogLevel.WARN]: 0,
+    [LogLevel.ERROR]: 0
+  }
+  // Fração das entradas de cada nível que é registrada (1 = todas)
+  private sampleRates: Record<LogLevel, number> = {
+    [LogLevel.DEBUG]: 1,
+    [LogLevel.INFO]: 1,
+    [LogLevel.WARN]: 1,
+    [LogLevel.ERROR]: 1
+  }
+  private shipper: LogShipper | null = null
   private isDevelopment = process.env.NODE_ENV === 'development'
 
   static getInstance(): Logger {
@@ -31,6 +189,21 @@ class Logger {
     return Logger.instance
   }
 
+  /**
+   * Define a fração das entradas de ``level`` que é registrada, entre 0 e 1
+   */
+  setSampleRate(level: LogLevel, rate: number) {
+    this.sampleRates[level] = Math.min(1, Math.max(0, rate))
+  }
+
+  /**
+   * Liga o envio em lotes para o servidor. Só tem efeito no navegador.
+   */
+  enableShipping(options: LogShippingOptions) {
+    if (typeof window === 'undefined' || this.shipper) return
+    this.shipper = new LogShipper(options)
+  }
+
   private createLogEntry(
     level: LogLevel,
     message: string,
@@ -41,7 +214,7 @@ class Logger {
     return {
       level,
       message,
-      timestamp: new Date().toISOString(),
+      timestamp: Date.now(),
       context,
       metadata,
       error
@@ -49,12 +222,15 @@ class Logger {
   }
 
   private addLog(entry: LogEntry) {
-    this.logs.push(entry)
-    
-    // Manter apenas os últimos logs
-    if (this.logs.length > this.maxLogs) {
-      this.logs = this.logs.slice(-this.maxLogs)
-    }
+    const rate = this.sampleRates[entry.level]
+    if (rate < 1 && Math.random() >= rate) return
+
+    // Manter apenas os últimos logs; a entrada sobrescrita sai das estatísticas
+    const evicted = this.logs.push(entry)
+    this.counts[entry.level]++
+    if (evicted) this.counts[evicted.level]--
+
+    this.shipper?.enqueue(entry)
 
     // Log no console em desenvolvimento
     if (this.isDevelopment) {
@@ -63,7 +239,7 @@ class Logger {
   }
 
   private logToConsole(entry: LogEntry) {
-    const prefix = `[${entry.timestamp}] ${entry.level.toUpperCase()}`
+    const prefix = `[${new Date(entry.timestamp).toISOString()}] ${entry.level.toUpperCase()}`
     const contextStr = entry.context ? ` [${entry.context}]` : ''
     const message = `${prefix}${contextStr}: ${entry.message}`
 
@@ -146,21 +322,18 @@ class Logger {
 
   // Métodos para recuperar logs
   getLogs(level?: LogLevel, context?: string, limit?: number): LogEntry[] {
-    let filteredLogs = this.logs
-
-    if (level) {
-      filteredLogs = filteredLogs.filter(log => log.level === level)
-    }
-
-    if (context) {
-      filteredLogs = filteredLogs.filter(log => log.context === context)
-    }
+    const filteredLogs: LogEntry[] = []
 
-    if (limit) {
-      filteredLogs = filteredLogs.slice(-limit)
+    // Percorrer das mais recentes para as mais antigas, parando no limite
+    for (let i = this.logs.size - 1; i >= 0; i--) {
+      const log = this.logs.at(i)
+      if (level && log.level !== level) continue
+      if (context && log.context !== context) continue
+      filteredLogs.push(log)
+      if (limit && filteredLogs.length >= limit) break
     }
 
-    return filteredLogs
+    return filteredLogs.reverse()
   }
 
   getErrorLogs(limit = 50): LogEntry[] {
@@ -168,40 +341,49 @@ class Logger {
   }
 
   getRecentLogs(minutes = 10): LogEntry[] {
-    const cutoff = new Date(Date.now() - minutes * 60 * 1000)
-    return this.logs.filter(log => new Date(log.timestamp) > cutoff)
+    const cutoff = Date.now() - minutes * 60 * 1000
+    // As entradas estão em ordem de chegada: basta achar a primeira recente
+    let first = this.logs.size
+    while (first > 0 && this.logs.at(first - 1).timestamp > cutoff) first--
+    const recent: LogEntry[] = []
+    for (let i = first; i < this.logs.size; i++) recent.push(this.logs.at(i))
+    return recent
   }
 
-  // Exportar logs para debugging
-  exportLogs(): string {
-    return JSON.stringify(this.logs, null, 2)
+  // Exportar logs para debugging ('ndjson': uma entrada por linha, como na ingestão)
+  exportLogs(format: 'json' | 'ndjson' = 'json'): string {
+    if (format === 'ndjson') {
+      return this.logs.toArray().map(serializeLogEntry).join('\n') + '\n'
+    }
+    return JSON.stringify(
+      this.logs.toArray().map(log => ({ ...log, timestamp: new Date(log.timestamp).toISOString() })),
+      null,
+      2
+    )
   }
 
   // Limpar logs
   clearLogs() {
-    this.logs = []
+    this.logs.clear()
+    for (const level of Object.values(LogLevel)) this.counts[level] = 0
   }
 
-  // Estatísticas dos logs
+  // Estatísticas dos logs (mantidas a cada inserção)
   getStats(): Record<LogLevel, number> {
-    const stats = {
-      [LogLevel.DEBUG]: 0,
-      [LogLevel.INFO]: 0,
-      [LogLevel.WARN]: 0,
-      [LogLevel.ERROR]: 0
-    }
-
-    this.logs.forEach(log => {
-      stats[log.level]++
-    })
-
-    return stats
+    return { ...this.counts }
   }
 }
 
 // Instância singleton
 export const logger = Logger.getInstance()
 
+// Em produção, avisos e erros do navegador seguem para a rota de ingestão
+// (POST /api/logs); NEXT_PUBLIC_LOG_ENDPOINT=off desliga o envio
+const logEndpoint = process.env.NEXT_PUBLIC_LOG_ENDPOINT || '/api/logs'
+if (process.env.NODE_ENV === 'production' && logEndpoint !== 'off') {
+  logger.enableShipping({ endpoint: logEndpoint })
+}
+
 // Funções de conveniência
 export const log = {
   debug: (message: string, context?: string, metadata?: Record<string, any>) => 
@@ -0,0 +1,43 @@
+/**
+ * Acesso do navegador ao snapshot do cardápio (GET /api/menu)
+ */
+
+import type { MenuSnapshot } from "./menu-snapshot"
+import { log } from "./logger"
+
+/**
+ * Busca o snapshot do cardápio. O navegador guarda a resposta e a revalida
+ * com If-None-Match, então visitas sem mudanças recebem apenas um 304.
+ */
+export async function fetchMenuSnapshot(): Promise<MenuSnapshot> {
+  const response = await fetch("/api/menu", { cache: "no-cache" })
+  if (!response.ok) {
+    throw new Error(`Erro ao carregar cardápio: ${response.status}`)
+  }
+  return response.json()
+}
+
+/**
+ * Invalida o snapshot do cardápio após uma alteração feita no admin (a rota
+ * exige a sessão de admin, enviada no cookie). Invalidações muito próximas
+ * recebem 429: a chamada espera o Retry-After e tenta uma vez mais, para a
+ * última alteração não ficar de fora. Outras falhas são apenas registradas:
+ * o snapshot expira sozinho em seguida.
+ */
+export async function invalidateMenuSnapshot(): Promise<void> {
+  try {
+    let response = await fetch("/api/menu/revalidate", { method: "POST" })
+    if (response.status === 429) {
+      const seconds = Number(response.headers.get("Retry-After")) || 1
+      await new Promise(resolve => setTimeout(resolve, seconds * 1000))
+      response = await fetch("/api/menu/revalidate", { method: "POST" })
+    }
+    if (!response.ok) {
+      throw new Error(`Status ${response.status}`)
+    }
+  } catch (error) {
+    log.warn("Não foi possível invalidar o snapshot do cardápio", 'MENU', {
+      error: error instanceof Error ? error.message : String(error)
+    })
+  }
+}
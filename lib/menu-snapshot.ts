@@ -0,0 +1,115 @@
+/**
+ * Snapshot do cardápio público montado no servidor
+ *
+ * Reúne em uma única resposta versionada tudo o que a página inicial precisa
+ * (configuração, produtos, categorias, opções de sabores e bordas ativas).
+ * O resultado fica no cache de dados do Next.js sob a tag MENU_CACHE_TAG e é
+ * invalidado pelo admin via POST /api/menu/revalidate.
+ *
+ * Uso exclusivo no servidor (route handlers e server components).
+ */
+
+import { createHash } from "crypto"
+import { unstable_cache } from "next/cache"
+import { supabase, isSupabaseConfigured } from "./supabase"
+import { supabaseOperation, fallbackData, createDeadline } from "./error-handler"
+import { log } from "./logger"
+
+export const MENU_CACHE_TAG = "menu"
+
+// Tempo máximo que um snapshot fica em cache sem ser invalidado pelo admin
+export const MENU_REVALIDATE_SECONDS = 60
+
+// Prazo total das consultas de um snapshot, novas tentativas incluídas
+const MENU_DEADLINE_MS = 3000
+
+export interface MenuSnapshot {
+  version: string
+  generatedAt: string
+  source: "supabase" | "fallback"
+  config: any
+  produtos: any[]
+  categorias: any[]
+  opcoesSabores: any[]
+  bordas: any[]
+}
+
+type MenuData = Omit<MenuSnapshot, "version" | "generatedAt">
+
+function withVersion(data: MenuData): MenuSnapshot {
+  // A versão depende só do conteúdo: o mesmo cardápio gera o mesmo ETag
+  const version = createHash("sha1").update(JSON.stringify(data)).digest("hex").slice(0, 16)
+  return { version, generatedAt: new Date().toISOString(), ...data }
+}
+
+function fallbackSnapshot(): MenuSnapshot {
+  return withVersion({
+    source: "fallback",
+    config: fallbackData.pizzariaConfig,
+    produtos: fallbackData.produtos,
+    categorias: fallbackData.categorias,
+    opcoesSabores: fallbackData.opcoesSabores,
+    bordas: [],
+  })
+}
+
+/**
+ * Consulta as cinco tabelas em paralelo e monta o snapshot.
+ * Lança erro quando configuração ou produtos falham, para que a falha não
+ * fique em cache.
+ */
+async function buildMenuSnapshot(): Promise<MenuSnapshot> {
+  const deadline = createDeadline(MENU_DEADLINE_MS)
+  const options = (table: string) => ({ deadline, table })
+  const [configResult, produtosResult, categoriasResult, opcoesResult, bordasResult] = await Promise.all([
+    supabaseOperation(() => supabase.from("pizzaria_config").select("*").maybeSingle(), undefined, options("pizzaria_config")),
+    supabaseOperation(() => supabase.from("produtos").select("*").eq("ativo", true).order("ordem"), undefined, options("produtos")),
+    supabaseOperation(() => supabase.from("categorias").select("*").eq("ativo", true).order("ordem"), undefined, options("categorias")),
+    supabaseOperation(() => supabase.from("opcoes_sabores").select("*").eq("ativo", true).order("ordem"), undefined, options("opcoes_sabores")),
+    supabaseOperation(() => supabase.from("bordas_recheadas").select("*").eq("ativo", true).order("ordem"), undefined, options("bordas_recheadas")),
+  ])
+
+  if (!configResult.success || !configResult.data || !produtosResult.success) {
+    throw new Error(configResult.error || produtosResult.error || "Configuração da pizzaria não encontrada")
+  }
+
+  // Categorias e opções de sabores são opcionais - usar fallback se não existir
+  const categorias = categoriasResult.success && categoriasResult.data?.length
+    ? categoriasResult.data
+    : fallbackData.categorias
+  const opcoesSabores = opcoesResult.success && opcoesResult.data?.length
+    ? opcoesResult.data
+    : fallbackData.opcoesSabores
+
+  return withVersion({
+    source: "supabase",
+    config: configResult.data,
+    produtos: produtosResult.data || [],
+    categorias,
+    opcoesSabores,
+    bordas: bordasResult.success ? bordasResult.data || [] : [],
+  })
+}
+
+const cachedMenuSnapshot = unstable_cache(buildMenuSnapshot, ["menu-snapshot"], {
+  tags: [MENU_CACHE_TAG],
+  revalidate: MENU_REVALIDATE_SECONDS,
+})
+
+/**
+ * Retorna o snapshot em cache, usando os dados de fallback quando o
+ * Supabase não está configurado ou não responde.
+ */
+export async function getMenuSnapshot(): Promise<MenuSnapshot> {
+  if (!isSupabaseConfigured()) {
+    log.warn("Supabase não configurado - snapshot do cardápio com dados de fallback", 'MENU')
+    return fallbackSnapshot()
+  }
+
+  try {
+    return await cachedMenuSnapshot()
+  } catch (error) {
+    log.error("Erro ao montar snapshot do cardápio - usando fallback", 'MENU', {}, error instanceof Error ? error : new Error(String(error)))
+    return fallbackSnapshot()
+  }
+}
@@ -0,0 +1,169 @@
+/**
+ * Métricas do servidor no formato de exposição de texto do Prometheus
+ *
+ * Contadores, gauges e histogramas com labels, mantidos em memória no
+ * processo do Next.js e expostos em GET /metrics. O registro fica em
+ * globalThis para sobreviver ao recarregamento de módulos em desenvolvimento.
+ */
+
+type Labels = Record<string, string>
+
+// Limites dos histogramas de latência, em segundos
+export const LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+const labelKey = (labels: Labels) =>
+  Object.keys(labels).sort().map(name => `${name}=${labels[name]}`).join(",")
+
+const escapeLabel = (value: string) => value.replace(/\\/g, "\\\\").replace(/\n/g, "\\n").replace(/"/g, '\\"')
+
+function formatLabels(labels: Labels, extra?: Labels): string {
+  const all = { ...labels, ...extra }
+  const names = Object.keys(all)
+  if (names.length === 0) return ""
+  return `{${names.map(name => `${name}="${escapeLabel(all[name])}"`).join(",")}}`
+}
+
+const formatValue = (value: number) =>
+  value === Infinity ? "+Inf" : value === -Infinity ? "-Inf" : Number.isNaN(value) ? "NaN" : String(value)
+
+abstract class Metric {
+  constructor(readonly name: string, readonly help: string) {}
+
+  abstract readonly type: "counter" | "gauge" | "histogram"
+
+  protected abstract samples(): string[]
+
+  render(): string {
+    return [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`, ...this.samples()].join("\n")
+  }
+}
+
+export class Counter extends Metric {
+  readonly type = "counter"
+  private values = new Map<string, { labels: Labels; value: number }>()
+
+  inc(labels: Labels = {}, amount = 1) {
+    const key = labelKey(labels)
+    const entry = this.values.get(key)
+    if (entry) entry.value += amount
+    else this.values.set(key, { labels, value: amount })
+  }
+
+  protected samples(): string[] {
+    return [...this.values.values()].map(({ labels, value }) => `${this.name}${formatLabels(labels)} ${formatValue(value)}`)
+  }
+}
+
+export class Gauge extends Metric {
+  readonly type = "gauge"
+  private values = new Map<string, { labels: Labels; value: number }>()
+
+  set(labels: Labels, value: number) {
+    this.values.set(labelKey(labels), { labels, value })
+  }
+
+  protected samples(): string[] {
+    return [...this.values.values()].map(({ labels, value }) => `${this.name}${formatLabels(labels)} ${formatValue(value)}`)
+  }
+}
+
+interface HistogramSeries {
+  labels: Labels
+  // Contagem por bucket (não acumulada); o último é o +Inf
+  counts: number[]
+  sum: number
+  count: number
+}
+
+export class Histogram extends Metric {
+  readonly type = "histogram"
+  private series = new Map<string, HistogramSeries>()
+
+  constructor(name: string, help: string, readonly buckets: number[] = LATENCY_BUCKETS) {
+    super(name, help)
+  }
+
+  observe(labels: Labels, value: number) {
+    const key = labelKey(labels)
+    let series = this.series.get(key)
+    if (!series) {
+      series = { labels, counts: new Array(this.buckets.length + 1).fill(0), sum: 0, count: 0 }
+      this.series.set(key, series)
+    }
+    let bucket = this.buckets.findIndex(bound => value <= bound)
+    if (bucket === -1) bucket = this.buckets.length
+    series.counts[bucket]++
+    series.sum += value
+    series.count++
+  }
+
+  protected samples(): string[] {
+    const lines: string[] = []
+    for (const { labels, counts, sum, count } of this.series.values()) {
+      let cumulative = 0
+      this.buckets.forEach((bound, i) => {
+        cumulative += counts[i]
+        lines.push(`${this.name}_bucket${formatLabels(labels, { le: formatValue(bound) })} ${cumulative}`)
+      })
+      lines.push(`${this.name}_bucket${formatLabels(labels, { le: "+Inf" })} ${count}`)
+      lines.push(`${this.name}_sum${formatLabels(labels)} ${formatValue(sum)}`)
+      lines.push(`${this.name}_count${formatLabels(labels)} ${count}`)
+    }
+    return lines
+  }
+}
+
+class Registry {
+  private metrics = new Map<string, Metric>()
+  // Atualizações feitas logo antes de cada coleta (ex.: estado dos circuitos)
+  private collectors: (() => void)[] = []
+
+  register<T extends Metric>(metric: T): T {
+    const existing = this.metrics.get(metric.name)
+    if (existing) return existing as T
+    this.metrics.set(metric.name, metric)
+    return metric
+  }
+
+  onCollect(collector: () => void) {
+    this.collectors.push(collector)
+  }
+
+  render(): string {
+    for (const collector of this.collectors) collector()
+    return [...this.metrics.values()].map(metric => metric.render()).join("\n") + "\n"
+  }
+}
+
+const globalForMetrics = globalThis as typeof globalThis & { __pizzariaMetrics?: Registry }
+export const registry = globalForMetrics.__pizzariaMetrics ?? (globalForMetrics.__pizzariaMetrics = new Registry())
+
+export const supabaseQueryDuration = registry.register(new Histogram(
+  "supabase_query_duration_seconds",
+  "Duração das operações do Supabase, novas tentativas incluídas"
+))
+export const retryAttempts = registry.register(new Counter(
+  "retry_attempts_total",
+  "Tentativas extras feitas por withRetry após uma falha"
+))
+export const fallbackActivations = registry.register(new Counter(
+  "supabase_fallback_total",
+  "Vezes em que supabaseOperation respondeu com dados de fallback"
+))
+export const apiHealthUp = registry.register(new Gauge(
+  "api_health_up",
+  "Saúde do endpoint segundo ApiHealthMonitor (1 saudável, 0 não)"
+))
+export const circuitState = registry.register(new Gauge(
+  "api_circuit_state",
+  "Estado do circuit breaker do endpoint (0 fechado, 1 meio aberto, 2 aberto)"
+))
+export const menuRequestDuration = registry.register(new Histogram(
+  "menu_request_duration_seconds",
+  "Tempo de resposta de GET /api/menu"
+))
+
+/**
+ * Texto de exposição de todas as métricas registradas
+ */
+export const renderMetrics = () => registry.render()
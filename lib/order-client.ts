@@ -0,0 +1,125 @@
+/**
+ * Envio do pedido do checkout para POST /api/pedidos e conferência de preços
+ *
+ * A chave de idempotência é guardada no sessionStorage junto com uma
+ * impressão do conteúdo do pedido: tocar duas vezes em "Finalizar", repetir
+ * após uma falha ou recarregar a página reaproveita a mesma chave enquanto o
+ * pedido não muda, e o servidor devolve o pedido já gravado. A chave é
+ * descartada quando o recibo chega: repetir de propósito o mesmo pedido
+ * depois disso cria um pedido novo.
+ */
+
+import { withRetry } from "./error-handler"
+import { cartLineKey, type CartItem } from "./cart-context"
+import type { OrderInput, OrderReceipt } from "./orders"
+import type { PricedCart } from "./pricing"
+
+const ORDER_KEY_STORAGE = "pizzaria-order-key"
+
+/**
+ * Resposta de erro de POST /api/pedidos. Com status 4xx o pedido foi recusado
+ * (``problems`` diz por quê) e não deve seguir para o WhatsApp.
+ */
+export class OrderRequestError extends Error {
+  constructor(readonly status: number, message: string, readonly problems: string[] = []) {
+    super(message)
+    this.name = "OrderRequestError"
+  }
+
+  get rejected(): boolean {
+    return this.status >= 400 && this.status < 500
+  }
+}
+
+// crypto.randomUUID só existe em contextos seguros (https ou localhost)
+function newKey(): string {
+  if (typeof crypto.randomUUID === "function") return crypto.randomUUID()
+  const bytes = crypto.getRandomValues(new Uint8Array(16))
+  bytes[6] = (bytes[6] & 0x0f) | 0x40
+  bytes[8] = (bytes[8] & 0x3f) | 0x80
+  const hex = Array.from(bytes, byte => byte.toString(16).padStart(2, "0")).join("")
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`
+}
+
+/**
+ * Chave do pedido: a mesma enquanto o conteúdo do pedido for o mesmo
+ */
+function idempotencyKeyFor(order: OrderInput): string {
+  const fingerprint = JSON.stringify(order)
+  try {
+    const saved = JSON.parse(sessionStorage.getItem(ORDER_KEY_STORAGE) || "null")
+    if (saved?.fingerprint === fingerprint) return saved.key
+    const key = newKey()
+    sessionStorage.setItem(ORDER_KEY_STORAGE, JSON.stringify({ key, fingerprint }))
+    return key
+  } catch {
+    return newKey()
+  }
+}
+
+/**
+ * Grava o pedido e retorna o recibo (id e número). Falhas de rede e erros
+ * 5xx são repetidos com a mesma chave; erros de validação não. Uma resposta
+ * de erro do servidor é lançada como OrderRequestError.
+ */
+export async function submitOrder(order: OrderInput): Promise<OrderReceipt> {
+  const key = idempotencyKeyFor(order)
+  let lastResponseError: OrderRequestError | null = null
+  const result = await withRetry(async () => {
+    lastResponseError = null
+    const response = await fetch("/api/pedidos", {
+      method: "POST",
+      headers: { "Content-Type": "application/json", "Idempotency-Key": key },
+      body: JSON.stringify(order),
+    })
+    const body = await response.json().catch(() => ({}))
+    if (!response.ok) {
+      lastResponseError = new OrderRequestError(
+        response.status,
+        body.error || `Erro ${response.status}`,
+        Array.isArray(body.problems) ? body.problems : []
+      )
+      throw lastResponseError
+    }
+    return body as OrderReceipt
+  }, {
+    maxRetries: 2,
+    delayMs: 300,
+    isRetryable: error => !(error instanceof OrderRequestError && error.status < 500),
+  })
+
+  if (!result.success || !result.data) throw lastResponseError ?? new Error(result.error || "Falha ao gravar pedido")
+  try {
+    sessionStorage.removeItem(ORDER_KEY_STORAGE)
+  } catch {
+    // armazenamento bloqueado: a chave também não foi gravada
+  }
+  return result.data
+}
+
+/**
+ * Confere o carrinho com os preços do servidor (POST /api/cart/price).
+ * Retorna o preço unitário válido por chave de linha, pronto para a ação
+ * REPRICE, e os problemas das linhas que não puderam ser precificadas, por
+ * chave de linha: o servidor recusaria um pedido com elas.
+ */
+export async function fetchCartPrices(
+  items: CartItem[]
+): Promise<{ precos: Record<string, number>; unavailable: Record<string, string[]> }> {
+  const response = await fetch("/api/cart/price", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ items }),
+  })
+  if (!response.ok) throw new Error(`Erro ao conferir preços: ${response.status}`)
+  const priced: PricedCart = await response.json()
+
+  const precos: Record<string, number> = {}
+  const unavailable: Record<string, string[]> = {}
+  priced.items.forEach((line, index) => {
+    const key = cartLineKey(items[index])
+    if (line.preco != null) precos[key] = line.preco
+    else unavailable[key] = line.problems.length > 0 ? line.problems : ["item indisponível"]
+  })
+  return { precos, unavailable }
+}
@@ -0,0 +1,284 @@
+/**
+ * Gravação de pedidos (tabelas pedidos e pedido_itens)
+ *
+ * O pedido e todos os itens vão ao banco numa única chamada à função
+ * criar_pedido (scripts/21-pedidos-idempotentes.sql), que grava tudo em uma
+ * transação. A chave de idempotência vem do navegador: novas tentativas com
+ * a mesma chave devolvem o pedido já gravado, então é seguro repetir a
+ * chamada em caso de timeout.
+ *
+ * Os preços enviados pelo navegador são só informativos: cada linha é
+ * precificada de novo com o cardápio atual (lib/pricing.ts) e o pedido é
+ * gravado com os preços do servidor. O mesmo vale para a entrega: a taxa e o
+ * pedido mínimo vêm da zona que atende o local informado (lib/delivery-zones.ts)
+ * ou, sem zonas cadastradas, da configuração da pizzaria.
+ *
+ * Uso exclusivo no servidor (POST /api/pedidos).
+ */
+
+import { supabase, isSupabaseConfigured } from "./supabase"
+import { supabaseOperation } from "./error-handler"
+import { getMenuSnapshot } from "./menu-snapshot"
+import { priceCart, priceTableFor } from "./pricing"
+import { compileDeliveryZones, findDeliveryZone, loadDeliveryZones, type DeliveryLocation } from "./delivery-zones"
+
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+
+export const IDEMPOTENCY_KEY_PATTERN = UUID_PATTERN
+
+const UUID_PREFIX = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}/i
+
+// Limites de um pedido de balcão ou delivery
+const MAX_ITEMS = 100
+const MAX_QUANTITY = 99
+const MAX_TEXT = 1000
+
+export type TipoEntrega = "delivery" | "balcao"
+
+export interface OrderItemInput {
+  // id da linha do carrinho; começa com o id do produto
+  id: string
+  nome: string
+  tamanho?: "broto" | "tradicional"
+  sabores?: string[]
+  quantidade: number
+  // Preço exibido no navegador; o gravado é o calculado no servidor
+  preco: number
+  tipo?: string
+  adicionais?: { sabor: string; itens: { nome: string; preco: number }[] }[]
+  bordaRecheada?: { id: string; nome: string; preco: number } | null
+}
+
+export interface OrderInput {
+  tipoEntrega: TipoEntrega
+  cliente: { nome: string; telefone: string }
+  endereco?: string | null
+  formaPagamento: string
+  observacoes?: string | null
+  // Taxa exibida no navegador; a gravada é a da zona calculada no servidor
+  taxaEntrega?: number
+  // Local de entrega usado para achar a zona (CEP, bairro, coordenadas)
+  local?: DeliveryLocation | null
+  items: OrderItemInput[]
+}
+
+export interface OrderReceipt {
+  id: string
+  numero: number
+  createdAt: string
+  // true quando a chave já tinha sido usada (o pedido não foi gravado de novo)
+  duplicado: boolean
+  // Preços calculados no servidor, na ordem dos itens enviados: são os que
+  // valem para a mensagem do WhatsApp, não os do carrinho no navegador
+  itens: { preco: number; total: number }[]
+  subtotal: number
+  taxaEntrega: number
+  total: number
+}
+
+export class OrderValidationError extends Error {
+  constructor(readonly problems: string[]) {
+    super(`Pedido inválido: ${problems.join("; ")}`)
+    this.name = "OrderValidationError"
+  }
+}
+
+const cents = (value: number) => Math.round(value * 100)
+const fromCents = (value: number) => value / 100
+const text = (value: unknown, max = MAX_TEXT) => (typeof value === "string" ? value.trim().slice(0, max) : "")
+
+/**
+ * Confere a estrutura do pedido e devolve a lista de problemas (vazia se ok)
+ */
+export function validateOrder(input: any): string[] {
+  const problems: string[] = []
+  if (!input || typeof input !== "object") return ["corpo do pedido ausente"]
+  if (input.tipoEntrega !== "delivery" && input.tipoEntrega !== "balcao") problems.push("tipoEntrega inválido")
+  if (!text(input.cliente?.nome)) problems.push("nome do cliente obrigatório")
+  if (text(input.cliente?.telefone).replace(/\D/g, "").length < 10) problems.push("telefone do cliente inválido")
+  if (input.tipoEntrega === "delivery" && !text(input.endereco)) problems.push("endereço obrigatório para delivery")
+  if (!text(input.formaPagamento, 50)) problems.push("forma de pagamento obrigatória")
+  if (input.local != null && typeof input.local !== "object") problems.push("local de entrega inválido")
+  if (!Array.isArray(input.items) || input.items.length === 0) {
+    problems.push("pedido sem itens")
+  } else if (input.items.length > MAX_ITEMS) {
+    problems.push(`no máximo ${MAX_ITEMS} itens por pedido`)
+  } else {
+    input.items.forEach((item: any, index: number) => {
+      if (!text(item?.nome)) problems.push(`item ${index + 1}: nome obrigatório`)
+      if (!Number.isInteger(item?.quantidade) || item.quantidade < 1 || item.quantidade > MAX_QUANTITY) {
+        problems.push(`item ${index + 1}: quantidade inválida`)
+      }
+    })
+  }
+  return problems
+}
+
+/**
+ * Taxa de entrega e pedido mínimo do pedido, calculados no servidor.
+ * Com zonas ativas, o local precisa cair em uma delas; sem zonas, vale a taxa
+ * única de ``config``. Balcão não paga taxa, mas respeita o valor mínimo.
+ */
+export async function resolveDelivery(
+  input: OrderInput,
+  config: { taxa_entrega?: number | null; valor_minimo?: number | null }
+): Promise<{ taxaEntrega: number; pedidoMinimo: number; problems: string[] }> {
+  const flat = { taxaEntrega: 0, pedidoMinimo: Number(config.valor_minimo) || 0, problems: [] as string[] }
+  if (input.tipoEntrega !== "delivery") return flat
+
+  const zones = await loadDeliveryZones()
+  if (zones.length === 0) return { ...flat, taxaEntrega: Number(config.taxa_entrega) || 0 }
+
+  const local = input.local || {}
+  const quote = findDeliveryZone(compileDeliveryZones(zones), {
+    cep: text(local.cep, 9) || undefined,
+    bairro: text(local.bairro, 255) || undefined,
+    latitude: Number.isFinite(local.latitude) ? local.latitude : undefined,
+    longitude: Number.isFinite(local.longitude) ? local.longitude : undefined,
+  })
+  if (!quote) return { ...flat, problems: ["endereço fora da área de entrega"] }
+  return { taxaEntrega: quote.taxa, pedidoMinimo: quote.pedidoMinimo, problems: [] }
+}
+
+/**
+ * Parâmetros da função criar_pedido: ``precos`` são os preços unitários do
+ * servidor, na ordem dos itens, e ``taxaEntrega`` a taxa calculada no
+ * servidor; valores em reais, totais somados em centavos para não acumular
+ * erro de ponto flutuante
+ */
+export function toOrderRows(input: OrderInput, precos: number[], taxaEntrega: number) {
+  const itens = input.items.map((item, index) => {
+    const produtoId = UUID_PREFIX.exec(item.id)?.[0] ?? null
+    return {
+      produto_id: produtoId,
+      nome_produto: text(item.nome, 255),
+      tamanho: item.tipo === "bebida" ? null : item.tamanho ?? null,
+      sabores: item.sabores?.length ? item.sabores : null,
+      quantidade: item.quantidade,
+      preco_unitario: precos[index],
+      preco_total: fromCents(cents(precos[index]) * item.quantidade),
+      adicionais: item.adicionais?.some(grupo => grupo.itens.length > 0) ? item.adicionais : null,
+      borda: item.bordaRecheada ?? null,
+    }
+  })
+  const subtotalCents = itens.reduce((sum, item) => sum + cents(item.preco_total), 0)
+  const pedido = {
+    tipo_entrega: input.tipoEntrega,
+    endereco_entrega: input.tipoEntrega === "delivery" ? text(input.endereco) : null,
+    forma_pagamento: text(input.formaPagamento, 50),
+    subtotal: fromCents(subtotalCents),
+    taxa_entrega: taxaEntrega,
+    total: fromCents(subtotalCents + cents(taxaEntrega)),
+    observacoes: text(input.observacoes) || null,
+    cliente_nome: text(input.cliente.nome, 255),
+    cliente_telefone: text(input.cliente.telefone, 20),
+  }
+  return { pedido, itens }
+}
+
+/**
+ * Grava o pedido; repetir com a mesma chave devolve o mesmo recibo
+ */
+export async function createOrder(input: OrderInput, idempotencyKey: string): Promise<OrderReceipt> {
+  const problems = validateOrder(input)
+  if (problems.length > 0) throw new OrderValidationError(problems)
+
+  const snapshot = await getMenuSnapshot()
+  if (isSupabaseConfigured() && snapshot.source === "fallback") {
+    throw new Error("Cardápio indisponível para conferir os preços")
+  }
+  const priced = priceCart(priceTableFor(snapshot), input.items)
+  if (priced.problems.length > 0) throw new OrderValidationError(priced.problems)
+
+  const entrega = await resolveDelivery(input, snapshot.config || {})
+  if (entrega.problems.length > 0) throw new OrderValidationError(entrega.problems)
+  if (priced.subtotal < entrega.pedidoMinimo) {
+    throw new OrderValidationError([`pedido mínimo de R$ ${entrega.pedidoMinimo.toFixed(2).replace(".", ",")}`])
+  }
+
+  const { pedido, itens } = toOrderRows(input, priced.items.map(line => line.preco!), entrega.taxaEntrega)
+  const result = await supabaseOperation(
+    () => supabase.rpc("criar_pedido", { p_idempotency_key: idempotencyKey, p_pedido: pedido, p_itens: itens }),
+    undefined,
+    // A chave de idempotência torna as novas tentativas seguras
+    { maxRetries: 2, table: "pedidos", operation: "rpc" }
+  )
+  if (!result.success || !result.data) throw new Error(result.error || "Falha ao gravar pedido")
+
+  const row = Array.isArray(result.data) ? result.data[0] : result.data
+  return {
+    id: row.id,
+    numero: Number(row.numero),
+    createdAt: row.created_at,
+    duplicado: Boolean(row.duplicado),
+    itens: itens.map(item => ({ preco: item.preco_unitario, total: item.preco_total })),
+    subtotal: pedido.subtotal,
+    taxaEntrega: pedido.taxa_entrega,
+    total: pedido.total,
+  }
+}
+
+export interface StoredOrderItem {
+  nome: string
+  tamanho: string | null
+  sabores: string[]
+  quantidade: number
+  precoTotal: number
+  adicionais: { sabor: string; itens: { nome: string; preco: number }[] }[]
+  borda: { nome: string; preco: number } | null
+}
+
+export interface StoredOrder {
+  id: string
+  numero: number
+  createdAt: string
+  tipoEntrega: TipoEntrega
+  cliente: { nome: string; telefone: string }
+  endereco: string | null
+  formaPagamento: string
+  observacoes: string | null
+  subtotal: number
+  taxaEntrega: number
+  total: number
+  itens: StoredOrderItem[]
+}
+
+/**
+ * Pedido gravado com os itens (página do link enviado no WhatsApp); null se
+ * não existir. A chave anon não lê a tabela pedidos: a função buscar_pedido
+ * devolve só o pedido do id pedido.
+ */
+export async function getOrder(id: string): Promise<StoredOrder | null> {
+  if (!UUID_PATTERN.test(id)) return null
+  const result = await supabaseOperation(
+    () => supabase.rpc("buscar_pedido", { p_id: id }),
+    undefined,
+    { table: "pedidos", operation: "rpc" }
+  )
+  if (!result.success) throw new Error(result.error || "Falha ao carregar pedido")
+  const row: any = result.data
+  if (!row) return null
+
+  return {
+    id: row.id,
+    numero: Number(row.numero),
+    createdAt: row.created_at,
+    tipoEntrega: row.tipo_entrega,
+    cliente: { nome: row.cliente_nome || "", telefone: row.cliente_telefone || "" },
+    endereco: row.endereco_entrega,
+    formaPagamento: row.forma_pagamento,
+    observacoes: row.observacoes,
+    subtotal: Number(row.subtotal),
+    taxaEntrega: Number(row.taxa_entrega),
+    total: Number(row.total),
+    itens: (row.pedido_itens || []).map((item: any) => ({
+      nome: item.nome_produto,
+      tamanho: item.tamanho,
+      sabores: item.sabores || [],
+      quantidade: item.quantidade,
+      precoTotal: Number(item.preco_total),
+      adicionais: item.adicionais || [],
+      borda: item.borda,
+    })),
+  }
+}
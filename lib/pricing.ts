@@ -0,0 +1,246 @@
+/**
+ * Precificação de carrinhos a partir do snapshot do cardápio
+ *
+ * O navegador calcula preços para exibir o carrinho, mas quem vale é o
+ * servidor: o pedido gravado e a conferência do checkout usam este módulo.
+ * Cada versão do cardápio vira uma tabela de preços pré-calculada (produto e
+ * tamanho, adicionais por produto, bordas por id) e um carrinho é
+ * precificado em uma única passada sobre as linhas, só com consultas a
+ * mapas. As linhas já precificadas ficam guardadas na própria tabela, então
+ * a mesma pizza (sabores, tamanho e borda) não é recalculada enquanto o
+ * cardápio não muda.
+ *
+ * Regras, as mesmas da página inicial e do checkout:
+ * - produto em promoção usa o preço promocional do tamanho (scripts/16);
+ * - broto só existe com habilitar_broto e preco_broto > 0;
+ * - pizza de vários sabores custa o maior preço entre os sabores, e só
+ *   aceita sabores de categorias com multi_sabores_habilitado (scripts/17),
+ *   até o maior maximo_sabores das opções ativas;
+ * - adicionais e borda somam ao preço unitário.
+ */
+
+import type { MenuSnapshot } from "./menu-snapshot"
+
+export type Tamanho = "broto" | "tradicional"
+
+// Linha do carrinho como o navegador envia (CartItem sem os campos de exibição)
+export interface PricingItem {
+  id: string
+  tamanho?: Tamanho
+  sabores?: string[]
+  quantidade: number
+  tipo?: string
+  adicionais?: { sabor: string; itens: { nome: string; preco?: number }[] }[]
+  bordaRecheada?: { id: string; nome?: string; preco?: number } | null
+}
+
+export interface PricedLine {
+  // Preço unitário em reais (null quando a linha não pôde ser precificada)
+  preco: number | null
+  total: number | null
+  problems: string[]
+}
+
+export interface PricedCart {
+  version: string
+  items: PricedLine[]
+  subtotal: number
+  problems: string[]
+}
+
+interface ProductPrices {
+  id: string
+  nome: string
+  tipo: string
+  // Centavos por tamanho; ausente quando o tamanho não é vendido
+  sizes: Partial<Record<Tamanho, number>>
+  multiSabores: boolean
+  adicionais: Map<string, number>
+}
+
+export interface PriceTable {
+  version: string
+  products: Map<string, ProductPrices>
+  bordas: Map<string, { nome: string; cents: number }>
+  bordasHabilitadas: boolean
+  maxSabores: number
+  // Preço base (centavos) por produtos+tamanho, preenchido sob demanda
+  basePrices: Map<string, { cents: number | null; problems: string[] }>
+}
+
+const SIZE_SUFFIX = /-(broto|tradicional)$/
+const MULTI_PREFIX = "multi-"
+// Limite de preços base guardados por versão (combinações de sabores)
+const MAX_CACHED_BASE_PRICES = 5000
+
+const toCents = (value: unknown) => Math.round(Number(value) * 100)
+const isPositive = (value: unknown) => typeof value === "number" ? value > 0 : Number(value) > 0
+
+/**
+ * Monta a tabela de preços de uma versão do cardápio
+ */
+export function buildPriceTable(snapshot: MenuSnapshot): PriceTable {
+  const config = snapshot.config || {}
+  const multiCategories = new Map<string, boolean>(
+    (snapshot.categorias || []).map((categoria: any) => [categoria.id, categoria.multi_sabores_habilitado !== false])
+  )
+
+  const products = new Map<string, ProductPrices>()
+  for (const produto of snapshot.produtos || []) {
+    const price = (size: Tamanho) => {
+      const regular = size === "broto" ? produto.preco_broto : produto.preco_tradicional
+      const promo = size === "broto" ? produto.preco_promocional_broto : produto.preco_promocional_tradicional
+      // Promoção sem preço promocional cadastrado mantém o preço normal
+      return produto.promocao && isPositive(promo) ? promo : regular
+    }
+    const sizes: Partial<Record<Tamanho, number>> = {}
+    if (produto.preco_tradicional != null) sizes.tradicional = toCents(price("tradicional"))
+    if (config.habilitar_broto && isPositive(produto.preco_broto)) sizes.broto = toCents(price("broto"))
+
+    const adicionais = new Map<string, number>()
+    for (const adicional of Array.isArray(produto.adicionais) ? produto.adicionais : []) {
+      if (adicional?.nome) adicionais.set(adicional.nome, toCents(adicional.preco || 0))
+    }
+
+    products.set(produto.id, {
+      id: produto.id,
+      nome: produto.nome,
+      tipo: produto.tipo,
+      sizes,
+      multiSabores: multiCategories.get(produto.categoria_id) ?? true,
+      adicionais,
+    })
+  }
+
+  const bordas = new Map<string, { nome: string; cents: number }>()
+  for (const borda of snapshot.bordas || []) {
+    bordas.set(borda.id, { nome: borda.nome, cents: toCents(borda.preco || 0) })
+  }
+
+  const maxSabores = Math.max(1, ...(snapshot.opcoesSabores || []).map((opcao: any) => Number(opcao.maximo_sabores) || 1))
+
+  return {
+    version: snapshot.version,
+    products,
+    bordas,
+    bordasHabilitadas: config.habilitar_bordas_recheadas !== false,
+    maxSabores,
+    basePrices: new Map(),
+  }
+}
+
+let cachedTable: PriceTable | null = null
+
+/**
+ * Tabela da versão do snapshot; só é remontada quando a versão muda
+ */
+export function priceTableFor(snapshot: MenuSnapshot): PriceTable {
+  if (cachedTable?.version !== snapshot.version) cachedTable = buildPriceTable(snapshot)
+  return cachedTable
+}
+
+/**
+ * Ids de produto de uma linha do carrinho: "<id>", "<id>-<tamanho>" ou
+ * "multi-<id>-<id>...-<tamanho>". Como os ids também têm hífens, os
+ * segmentos são agrupados no menor prefixo que seja um produto conhecido.
+ */
+function productIdsOf(table: PriceTable, itemId: string): string[] | null {
+  if (table.products.has(itemId)) return [itemId]
+  const withoutSize = itemId.replace(SIZE_SUFFIX, "")
+  if (!itemId.startsWith(MULTI_PREFIX)) return table.products.has(withoutSize) ? [withoutSize] : null
+
+  const segments = withoutSize.slice(MULTI_PREFIX.length).split("-")
+  const ids: string[] = []
+  let start = 0
+  while (start < segments.length) {
+    let end = start + 1
+    while (end <= segments.length && !table.products.has(segments.slice(start, end).join("-"))) end++
+    if (end > segments.length) return null
+    ids.push(segments.slice(start, end).join("-"))
+    start = end
+  }
+  return ids.length > 0 ? ids : null
+}
+
+// Preço base (sem adicionais e borda) de um conjunto de sabores em um tamanho
+function basePrice(table: PriceTable, ids: string[], tamanho: Tamanho) {
+  const key = `${[...ids].sort().join(",")}|${tamanho}`
+  const cached = table.basePrices.get(key)
+  if (cached) return cached
+
+  const problems: string[] = []
+  const products = ids.map(id => table.products.get(id)!)
+  if (products.length > table.maxSabores) problems.push(`no máximo ${table.maxSabores} sabores`)
+  if (products.length > 1) {
+    products.filter(produto => !produto.multiSabores)
+      .forEach(produto => problems.push(`${produto.nome} não pode ser combinado com outros sabores`))
+  }
+  const prices = products.map(produto => produto.sizes[tamanho])
+  products.forEach((produto, index) => {
+    if (prices[index] == null) problems.push(`${produto.nome} não disponível no tamanho ${tamanho}`)
+  })
+
+  const result = {
+    cents: problems.length > 0 ? null : Math.max(...(prices as number[])),
+    problems,
+  }
+  if (table.basePrices.size >= MAX_CACHED_BASE_PRICES) table.basePrices.clear()
+  table.basePrices.set(key, result)
+  return result
+}
+
+/**
+ * Preço unitário de uma linha em centavos, ou os motivos de recusa
+ */
+function priceLine(table: PriceTable, item: PricingItem): { cents: number | null; problems: string[] } {
+  const ids = productIdsOf(table, item.id)
+  if (!ids) return { cents: null, problems: ["produto indisponível no cardápio"] }
+
+  const sizeFromId = SIZE_SUFFIX.exec(item.id)?.[1] as Tamanho | undefined
+  const tamanho: Tamanho = sizeFromId || item.tamanho || "tradicional"
+  const base = basePrice(table, ids, tamanho)
+  if (base.cents == null) return base
+
+  const problems: string[] = []
+  let cents = base.cents
+
+  // Adicionais pertencem a um dos sabores da linha
+  const flavors = new Map(ids.map(id => [table.products.get(id)!.nome, table.products.get(id)!]))
+  for (const grupo of item.adicionais || []) {
+    const produto = flavors.get(grupo.sabor)
+    for (const adicional of grupo.itens || []) {
+      const adicionalCents = produto?.adicionais.get(adicional.nome)
+      if (adicionalCents == null) problems.push(`adicional ${adicional.nome} indisponível para ${grupo.sabor}`)
+      else cents += adicionalCents
+    }
+  }
+
+  if (item.bordaRecheada) {
+    const borda = table.bordas.get(item.bordaRecheada.id)
+    if (!borda || !table.bordasHabilitadas || item.tipo === "bebida") {
+      problems.push(`borda ${item.bordaRecheada.nome || item.bordaRecheada.id} indisponível`)
+    } else {
+      cents += borda.cents
+    }
+  }
+
+  return problems.length > 0 ? { cents: null, problems } : { cents, problems }
+}
+
+/**
+ * Precifica o carrinho inteiro. ``items`` mantém a ordem recebida; linhas
+ * com problemas ficam sem preço e não entram no subtotal.
+ */
+export function priceCart(table: PriceTable, items: PricingItem[]): PricedCart {
+  const problems: string[] = []
+  let subtotalCents = 0
+  const priced = items.map((item, index) => {
+    const { cents, problems: lineProblems } = priceLine(table, item)
+    lineProblems.forEach(problem => problems.push(`item ${index + 1}: ${problem}`))
+    if (cents == null) return { preco: null, total: null, problems: lineProblems }
+    const totalCents = cents * item.quantidade
+    subtotalCents += totalCents
+    return { preco: cents / 100, total: totalCents / 100, problems: lineProblems }
+  })
+  return { version: table.version, items: priced, subtotal: subtotalCents / 100, problems }
+}
@@ -0,0 +1,204 @@
+/**
+ * Consulta paginada de produtos para o admin
+ *
+ * Filtro, busca e ordenação rodam no banco; a página seguinte é pedida pela
+ * chave do último item recebido (keyset: "depois de (valor, id)"), e não por
+ * offset, então a centésima página custa o mesmo que a primeira e não pula
+ * nem repete itens quando o catálogo muda entre uma página e outra. Os
+ * índices usados estão em scripts/22-produtos-admin-indexes.sql.
+ */
+
+import { useCallback, useEffect, useRef, useState } from "react"
+import { supabase } from "./supabase"
+
+export const PRODUCT_PAGE_SIZE = 50
+
+// Colunas exibidas na lista e usadas pelo formulário de edição
+const PRODUCT_COLUMNS = [
+  "id", "categoria_id", "nome", "descricao", "preco_tradicional", "preco_broto",
+  "preco_promocional_tradicional", "preco_promocional_broto", "tipo", "ativo", "promocao",
+  "ordem", "adicionais", "imagem_url", "imagem_variantes", "created_at",
+].join(",")
+
+export type ProductSort = "ordem" | "nome" | "preco" | "recentes"
+
+export type ProductStatus = "todos" | "ativos" | "inativos" | "promocao"
+
+export interface ProductFilters {
+  search: string
+  // id da categoria, "sem-categoria" ou vazio para todas
+  categoriaId: string
+  status: ProductStatus
+  sort: ProductSort
+}
+
+export const DEFAULT_PRODUCT_FILTERS: ProductFilters = { search: "", categoriaId: "", status: "todos", sort: "ordem" }
+
+const SORTS: Record<ProductSort, { column: string; ascending: boolean }> = {
+  ordem: { column: "ordem", ascending: true },
+  nome: { column: "nome", ascending: true },
+  preco: { column: "preco_tradicional", ascending: true },
+  recentes: { column: "created_at", ascending: false },
+}
+
+// Posição do último item recebido na ordenação atual
+export interface ProductCursor {
+  value: string | number | null
+  id: string
+}
+
+export interface ProductPage<T> {
+  items: T[]
+  next: ProductCursor | null
+  // Total com os filtros atuais (só na primeira página)
+  total: number | null
+}
+
+// Valor literal dentro de or=(...): aspas protegem vírgulas, pontos e parênteses
+const literal = (value: string | number) => `"${String(value).replace(/\\/g, "\\\\").replace(/"/g, '\\"')}"`
+
+// Curingas digitados na busca são procurados como texto
+const escapeLike = (text: string) => text.replace(/[\\%_]/g, match => `\\${match}`)
+
+/**
+ * Condição "depois do cursor" para ``column`` com desempate por id.
+ * Nulos ficam no fim nas duas direções (NULLS LAST).
+ */
+function afterCursor(column: string, ascending: boolean, cursor: ProductCursor): string {
+  const op = ascending ? "gt" : "lt"
+  const id = literal(cursor.id)
+  if (cursor.value === null) return `and(${column}.is.null,id.${op}.${id})`
+  const value = literal(cursor.value)
+  return `${column}.${op}.${value},and(${column}.eq.${value},id.${op}.${id}),${column}.is.null`
+}
+
+/**
+ * Uma página de produtos com os filtros dados, começando depois de ``cursor``
+ */
+export async function fetchProductPage<T extends { id: string }>(
+  filters: ProductFilters,
+  cursor: ProductCursor | null = null,
+  limit = PRODUCT_PAGE_SIZE
+): Promise<ProductPage<T>> {
+  const { column, ascending } = SORTS[filters.sort]
+  let query = supabase
+    .from("produtos")
+    .select(PRODUCT_COLUMNS, cursor ? undefined : { count: "exact" })
+
+  const search = filters.search.trim()
+  if (search) query = query.ilike("nome", `%${escapeLike(search)}%`)
+  if (filters.categoriaId === "sem-categoria") query = query.is("categoria_id", null)
+  else if (filters.categoriaId) query = query.eq("categoria_id", filters.categoriaId)
+  if (filters.status === "ativos") query = query.eq("ativo", true)
+  else if (filters.status === "inativos") query = query.eq("ativo", false)
+  else if (filters.status === "promocao") query = query.eq("promocao", true)
+  if (cursor) query = query.or(afterCursor(column, ascending, cursor))
+
+  // Um item a mais diz se existe próxima página sem precisar contar
+  const { data, error, count } = await query
+    .order(column, { ascending, nullsFirst: false })
+    .order("id", { ascending })
+    .limit(limit + 1)
+  if (error) throw error
+
+  const rows = (data || []) as unknown as T[]
+  const items = rows.slice(0, limit)
+  const last = items[items.length - 1] as any
+  return {
+    items,
+    next: rows.length > limit && last ? { value: last[column] ?? null, id: last.id } : null,
+    total: cursor ? null : count ?? null,
+  }
+}
+
+/**
+ * Próximo valor de ``ordem`` para um produto novo (maior ordem + 1)
+ */
+export async function fetchNextProductOrder(): Promise<number> {
+  const { data, error } = await supabase
+    .from("produtos")
+    .select("ordem")
+    .not("ordem", "is", null)
+    .order("ordem", { ascending: false })
+    .limit(1)
+  if (error) throw error
+  const rows = (Array.isArray(data) ? data : data ? [data] : []) as { ordem: number }[]
+  return (rows[0]?.ordem || 0) + 1
+}
+
+/**
+ * Quantidade de produtos por categoria, sem trazer as linhas (uma contagem
+ * por categoria, coberta pelo índice de categoria_id)
+ */
+export async function fetchProductCountsByCategory(categoriaIds: string[]): Promise<Record<string, number>> {
+  const counts = await Promise.all(categoriaIds.map(async id => {
+    const { count, error } = await supabase
+      .from("produtos")
+      .select("id", { count: "exact", head: true })
+      .eq("categoria_id", id)
+    if (error) throw error
+    return [id, count || 0] as const
+  }))
+  return Object.fromEntries(counts)
+}
+
+/**
+ * Lista paginada com os filtros dados: recomeça da primeira página quando
+ * os filtros mudam e busca a próxima com ``loadMore``. Respostas de filtros
+ * antigos (digitação rápida na busca) são descartadas.
+ */
+export function useProductPages<T extends { id: string }>(filters: ProductFilters) {
+  const [items, setItems] = useState<T[]>([])
+  const [total, setTotal] = useState<number | null>(null)
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+  const next = useRef<ProductCursor | null>(null)
+  const hasMore = useRef(false)
+  const generation = useRef(0)
+  const inFlight = useRef(false)
+
+  const load = useCallback(async (reset: boolean) => {
+    if (!reset && (inFlight.current || !hasMore.current)) return
+    const current = reset ? ++generation.current : generation.current
+    inFlight.current = true
+    setLoading(true)
+    setError(null)
+    try {
+      const page = await fetchProductPage<T>(filters, reset ? null : next.current)
+      if (current !== generation.current) return
+      next.current = page.next
+      hasMore.current = page.next !== null
+      setItems(prev => (reset ? page.items : [...prev, ...page.items]))
+      if (reset) setTotal(page.total)
+    } catch (error: any) {
+      if (current !== generation.current) return
+      console.error("Erro ao carregar produtos:", error)
+      setError(error?.message || "Erro ao carregar produtos")
+    } finally {
+      if (current === generation.current) {
+        inFlight.current = false
+        setLoading(false)
+      }
+    }
+  }, [filters])
+
+  useEffect(() => {
+    load(true)
+  }, [load])
+
+  // Alteração local (toggle de disponibilidade, promoção) sem recarregar a lista
+  const patchItem = useCallback((id: string, changes: Partial<T>) => {
+    setItems(prev => prev.map(item => (item.id === id ? { ...item, ...changes } : item)))
+  }, [])
+
+  return {
+    items,
+    total,
+    loading,
+    error,
+    hasMore: hasMore.current,
+    loadMore: useCallback(() => load(false), [load]),
+    reload: useCallback(() => load(true), [load]),
+    patchItem,
+  }
+}
@@ -0,0 +1,49 @@
+/**
+ * Limites de taxa em memória, em janelas fixas por chave (uso no servidor)
+ *
+ * Cada chave (um IP, ou "*" para o total do servidor) tem um orçamento por
+ * janela: de requisições, de bytes ou do que a rota contar. Os contadores
+ * vivem no processo; com várias instâncias cada uma aplica o próprio limite.
+ */
+
+import type { NextRequest } from "next/server"
+
+// Acima disso as janelas vencidas são descartadas; se ainda sobrarem, todas
+const MAX_KEYS = 10_000
+
+export class RateLimiter {
+  private windows = new Map<string, { start: number; used: number }>()
+
+  constructor(readonly limit: number, readonly windowMs: number) {}
+
+  /**
+   * Consome ``cost`` do orçamento de ``key``. Devolve 0 quando permitido, ou
+   * os segundos até a janela reabrir (nada é consumido nesse caso).
+   */
+  take(key: string, cost = 1, now = Date.now()): number {
+    let window = this.windows.get(key)
+    if (!window || now - window.start >= this.windowMs) {
+      if (!window && this.windows.size >= MAX_KEYS) this.prune(now)
+      window = { start: now, used: 0 }
+      this.windows.set(key, window)
+    }
+    if (window.used + cost > this.limit) return Math.max(1, Math.ceil((window.start + this.windowMs - now) / 1000))
+    window.used += cost
+    return 0
+  }
+
+  private prune(now: number) {
+    this.windows.forEach((window, key) => {
+      if (now - window.start >= this.windowMs) this.windows.delete(key)
+    })
+    if (this.windows.size >= MAX_KEYS) this.windows.clear()
+  }
+}
+
+/**
+ * IP do cliente informado pelo proxy (x-forwarded-for, x-real-ip)
+ */
+export function clientIp(request: NextRequest): string {
+  const forwarded = request.headers.get("x-forwarded-for")?.split(",")[0]?.trim()
+  return forwarded || request.headers.get("x-real-ip") || "desconhecido"
+}
@@ -0,0 +1,331 @@
+/**
+ * Fila de uploads de imagens do admin
+ *
+ * Envia vários arquivos ao mesmo tempo (até ``concurrency``), cada um em
+ * pedaços para /api/images/uploads, com progresso por arquivo e cancelamento.
+ * Quando um pedaço falha, a fila espera (backoff com jitter), pergunta ao
+ * servidor quantos bytes chegaram e continua dali. O id da sessão fica no
+ * localStorage, então um upload interrompido por recarregar a página
+ * retoma do ponto em que parou quando o mesmo arquivo é escolhido de novo.
+ */
+
+import type { ImagePresetName, ImageVariants } from "./image-variants"
+
+export type UploadStatus = "queued" | "uploading" | "processing" | "done" | "error" | "cancelled"
+
+export interface UploadTask {
+  id: string
+  file: File
+  preset: ImagePresetName
+  status: UploadStatus
+  // Bytes confirmados pelo servidor mais os do pedaço em andamento
+  sent: number
+  total: number
+  error?: string
+  result?: { variants: ImageVariants; url: string }
+}
+
+export interface UploadQueueOptions {
+  concurrency?: number
+  // Falhas seguidas toleradas por arquivo antes de desistir
+  maxRetries?: number
+  // Chamado a cada mudança de estado ou progresso
+  onChange?: (tasks: UploadTask[]) => void
+}
+
+const UPLOADS_ENDPOINT = "/api/images/uploads"
+const RESUME_STORAGE_PREFIX = "pizzaria-upload:"
+const RETRY_DELAY_MS = 500
+const RETRY_MAX_DELAY_MS = 8000
+
+class HttpError extends Error {
+  constructor(readonly status: number, message: string, readonly body: any = {}) {
+    super(message)
+    this.name = "HttpError"
+  }
+}
+
+class CancelledError extends Error {
+  constructor() {
+    super("Upload cancelado")
+    this.name = "CancelledError"
+  }
+}
+
+// Erros que não melhoram com nova tentativa
+const isPermanent = (error: unknown) =>
+  error instanceof CancelledError ||
+  (error instanceof HttpError && error.status >= 400 && error.status < 500 && ![404, 408, 409, 429].includes(error.status))
+
+const resumeKey = (file: File, preset: ImagePresetName) =>
+  `${RESUME_STORAGE_PREFIX}${preset}:${file.name}:${file.size}:${file.lastModified}`
+
+const storage = {
+  get: (key: string) => (typeof localStorage === "undefined" ? null : localStorage.getItem(key)),
+  set: (key: string, value: string) => {
+    try { localStorage.setItem(key, value) } catch { /* armazenamento cheio ou bloqueado */ }
+  },
+  remove: (key: string) => {
+    try { localStorage.removeItem(key) } catch { /* idem */ }
+  },
+}
+
+function wait(ms: number, signal: AbortSignal): Promise<void> {
+  return new Promise((resolve, reject) => {
+    if (signal.aborted) return reject(new CancelledError())
+    const timer = setTimeout(resolve, ms)
+    signal.addEventListener("abort", () => {
+      clearTimeout(timer)
+      reject(new CancelledError())
+    }, { once: true })
+  })
+}
+
+async function requestJson(url: string, init: RequestInit, signal: AbortSignal): Promise<any> {
+  let response: Response
+  try {
+    response = await fetch(url, { ...init, signal })
+  } catch (error) {
+    if (signal.aborted) throw new CancelledError()
+    throw error
+  }
+  const body = await response.json().catch(() => ({}))
+  if (!response.ok) throw new HttpError(response.status, body.error || `HTTP ${response.status}`, body)
+  return body
+}
+
+// PATCH de um pedaço via XHR, que (ao contrário do fetch) informa o progresso do envio
+function sendChunk(
+  url: string,
+  offset: number,
+  chunk: Blob,
+  signal: AbortSignal,
+  onProgress: (loaded: number) => void
+): Promise<{ received: number }> {
+  return new Promise((resolve, reject) => {
+    const xhr = new XMLHttpRequest()
+    xhr.open("PATCH", url)
+    xhr.setRequestHeader("Upload-Offset", String(offset))
+    xhr.setRequestHeader("Content-Type", "application/octet-stream")
+    xhr.upload.onprogress = event => onProgress(event.loaded)
+    xhr.onload = () => {
+      let body: any = {}
+      try { body = JSON.parse(xhr.responseText) } catch { /* corpo vazio */ }
+      if (xhr.status >= 200 && xhr.status < 300) resolve(body)
+      else reject(new HttpError(xhr.status, body.error || `HTTP ${xhr.status}`, body))
+    }
+    xhr.onerror = () => reject(new Error("Falha de rede no envio"))
+    xhr.onabort = () => reject(new CancelledError())
+    signal.addEventListener("abort", () => xhr.abort(), { once: true })
+    xhr.send(chunk)
+  })
+}
+
+export class UploadQueue {
+  private tasks: UploadTask[] = []
+  private controllers = new Map<string, AbortController>()
+  private waiters = new Map<string, ((task: UploadTask) => void)[]>()
+  private active = 0
+  private sequence = 0
+  private readonly concurrency: number
+  private readonly maxRetries: number
+  private readonly onChange?: (tasks: UploadTask[]) => void
+
+  constructor({ concurrency = 3, maxRetries = 5, onChange }: UploadQueueOptions = {}) {
+    this.concurrency = concurrency
+    this.maxRetries = maxRetries
+    this.onChange = onChange
+  }
+
+  /**
+   * Enfileira os arquivos; as tarefas mantêm a ordem de ``files``
+   */
+  add(files: File[], preset: ImagePresetName): UploadTask[] {
+    const added = files.map(file => ({
+      id: `upload-${++this.sequence}`,
+      file,
+      preset,
+      status: "queued" as UploadStatus,
+      sent: 0,
+      total: file.size,
+    }))
+    this.tasks = [...this.tasks, ...added]
+    this.emit()
+    this.pump()
+    return added
+  }
+
+  /**
+   * Resolve quando todas as tarefas indicadas terminam (com sucesso ou não),
+   * na mesma ordem em que foram passadas
+   */
+  settled(tasks: UploadTask[]): Promise<UploadTask[]> {
+    return Promise.all(tasks.map(({ id }) => {
+      const task = this.find(id)
+      if (!task || ["done", "error", "cancelled"].includes(task.status)) return Promise.resolve(task ?? tasks.find(t => t.id === id)!)
+      return new Promise<UploadTask>(resolve => {
+        this.waiters.set(id, [...(this.waiters.get(id) || []), resolve])
+      })
+    }))
+  }
+
+  cancel(id: string) {
+    const task = this.find(id)
+    if (!task || ["done", "error", "cancelled"].includes(task.status)) return
+    const controller = this.controllers.get(id)
+    if (controller) {
+      controller.abort()
+    } else {
+      this.finish(id, { status: "cancelled" })
+    }
+  }
+
+  cancelAll() {
+    this.tasks.forEach(task => this.cancel(task.id))
+  }
+
+  /**
+   * Remove da lista as tarefas já encerradas
+   */
+  clearFinished() {
+    this.tasks = this.tasks.filter(task => !["done", "error", "cancelled"].includes(task.status))
+    this.emit()
+  }
+
+  getTasks(): UploadTask[] {
+    return this.tasks
+  }
+
+  private find(id: string) {
+    return this.tasks.find(task => task.id === id)
+  }
+
+  private update(id: string, changes: Partial<UploadTask>) {
+    this.tasks = this.tasks.map(task => (task.id === id ? { ...task, ...changes } : task))
+    this.emit()
+  }
+
+  private finish(id: string, changes: Partial<UploadTask>) {
+    this.update(id, changes)
+    const task = this.find(id)!
+    this.waiters.get(id)?.forEach(resolve => resolve(task))
+    this.waiters.delete(id)
+  }
+
+  private emit() {
+    this.onChange?.(this.tasks)
+  }
+
+  private pump() {
+    while (this.active < this.concurrency) {
+      const next = this.tasks.find(task => task.status === "queued")
+      if (!next) return
+      this.active++
+      this.update(next.id, { status: "uploading" })
+      this.run(next).finally(() => {
+        this.active--
+        this.pump()
+      })
+    }
+  }
+
+  private async run(task: UploadTask) {
+    const controller = new AbortController()
+    this.controllers.set(task.id, controller)
+    try {
+      const result = await this.upload(task, controller.signal)
+      this.finish(task.id, { status: "done", sent: task.total, result })
+    } catch (error) {
+      if (error instanceof CancelledError) {
+        this.finish(task.id, { status: "cancelled" })
+      } else {
+        console.error(`Erro no upload de ${task.file.name}:`, error)
+        this.finish(task.id, { status: "error", error: error instanceof Error ? error.message : String(error) })
+      }
+    } finally {
+      this.controllers.delete(task.id)
+    }
+  }
+
+  private async upload(task: UploadTask, signal: AbortSignal) {
+    const { file, preset } = task
+    const key = resumeKey(file, preset)
+    // Sessão salva para este arquivo: antes de enviar, perguntar o offset ao servidor
+    const savedId = storage.get(key)
+    let session: { id: string; received: number } | null = savedId ? { id: savedId, received: 0 } : null
+    let resync = session !== null
+    let chunkSize = 1024 * 1024
+    let failures = 0
+
+    const cancelSession = () => {
+      if (session) fetch(`${UPLOADS_ENDPOINT}/${session.id}`, { method: "DELETE" }).catch(() => {})
+      storage.remove(key)
+    }
+    signal.addEventListener("abort", cancelSession, { once: true })
+
+    while (true) {
+      try {
+        if (session && resync) {
+          const status = await requestJson(`${UPLOADS_ENDPOINT}/${session.id}`, { method: "GET" }, signal)
+          session.received = status.received
+          chunkSize = status.chunkSize || chunkSize
+          resync = false
+          this.update(task.id, { sent: session.received })
+        }
+
+        if (!session) {
+          const created = await requestJson(UPLOADS_ENDPOINT, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ size: file.size, type: file.type }),
+          }, signal)
+          session = { id: created.id, received: 0 }
+          chunkSize = created.chunkSize || chunkSize
+          storage.set(key, created.id)
+        }
+
+        const current = session
+        while (current.received < file.size) {
+          const chunk = file.slice(current.received, current.received + chunkSize)
+          const { received } = await sendChunk(
+            `${UPLOADS_ENDPOINT}/${current.id}`,
+            current.received,
+            chunk,
+            signal,
+            loaded => this.update(task.id, { sent: current.received + loaded })
+          )
+          current.received = received
+          failures = 0
+          this.update(task.id, { sent: received })
+        }
+
+        this.update(task.id, { status: "processing" })
+        const result = await requestJson(`${UPLOADS_ENDPOINT}/${current.id}`, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ preset }),
+        }, signal)
+        storage.remove(key)
+        signal.removeEventListener("abort", cancelSession)
+        return result
+      } catch (error) {
+        if (isPermanent(error) || ++failures > this.maxRetries) {
+          if (!(error instanceof CancelledError)) cancelSession()
+          throw error
+        }
+        if (error instanceof HttpError && error.status === 404) {
+          // Sessão expirou no servidor: recomeçar do zero
+          session = null
+          storage.remove(key)
+        } else if (error instanceof HttpError && error.status === 409 && session && error.body.received != null) {
+          // O servidor tem outro offset (ex.: resposta perdida de um pedaço gravado): continuar de lá
+          session.received = Number(error.body.received)
+        } else {
+          await wait(Math.random() * Math.min(RETRY_MAX_DELAY_MS, RETRY_DELAY_MS * 2 ** failures), signal)
+          resync = session !== null
+        }
+        this.update(task.id, { status: "uploading", sent: session?.received ?? 0 })
+      }
+    }
+  }
+}
@@ -0,0 +1,169 @@
+/**
+ * Sessões de upload em partes (uso exclusivo no servidor)
+ *
+ * O admin envia fotos grandes em pedaços sequenciais. Cada sessão guarda os
+ * bytes já recebidos em <UPLOAD_DIR>/<id>.part e os metadados em <id>.json;
+ * depois de uma falha de rede o cliente consulta o offset recebido e
+ * continua dali, em vez de reenviar o arquivo inteiro. Quando todos os
+ * bytes chegam, o arquivo montado segue para o pipeline de imagens.
+ *
+ * Cada sessão pertence ao admin que a abriu. O disco usado é limitado:
+ * cada admin mantém até MAX_SESSIONS_PER_OWNER sessões abertas e o servidor
+ * até MAX_OPEN_SESSIONS (10MB cada, no máximo); sessões sem atividade por
+ * UPLOAD_SESSION_TTL_MS são removidas.
+ */
+
+import { randomUUID } from "crypto"
+import { appendFile, mkdir, readFile, readdir, stat, unlink, writeFile } from "fs/promises"
+import os from "os"
+import path from "path"
+
+export const UPLOAD_DIR = process.env.UPLOAD_DIR || path.join(os.tmpdir(), "pizzaria-uploads")
+export const UPLOAD_CHUNK_BYTES = 1024 * 1024
+const UPLOAD_SESSION_TTL_MS = 2 * 60 * 60 * 1000
+// Folga sobre a concorrência da fila de upload (3) para sessões que aguardam retomada
+export const MAX_SESSIONS_PER_OWNER = 6
+export const MAX_OPEN_SESSIONS = 20
+
+const SESSION_ID = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/
+
+export interface UploadSession {
+  id: string
+  // Id do admin que abriu a sessão
+  owner: string
+  size: number
+  type: string
+  createdAt: string
+  // Bytes já gravados; o próximo pedaço deve começar aqui
+  received: number
+}
+
+/**
+ * Pedaço fora de ordem: ``received`` diz ao cliente de onde continuar
+ */
+export class UploadOffsetError extends Error {
+  constructor(readonly received: number) {
+    super(`Offset inválido; esperado ${received}`)
+    this.name = "UploadOffsetError"
+  }
+}
+
+export class UploadSessionNotFoundError extends Error {
+  constructor() {
+    super("Sessão de upload não encontrada ou expirada")
+    this.name = "UploadSessionNotFoundError"
+  }
+}
+
+/**
+ * Limite de sessões abertas atingido; o cliente pode tentar mais tarde
+ */
+export class UploadSessionLimitError extends Error {
+  constructor() {
+    super("Muitos uploads em andamento; aguarde os atuais terminarem")
+    this.name = "UploadSessionLimitError"
+  }
+}
+
+const partFile = (id: string) => path.join(UPLOAD_DIR, `${id}.part`)
+const metaFile = (id: string) => path.join(UPLOAD_DIR, `${id}.json`)
+
+// Gravações de uma mesma sessão em fila: dois pedaços não disputam o offset
+const queues = new Map<string, Promise<unknown>>()
+
+function serialized<T>(id: string, task: () => Promise<T>): Promise<T> {
+  const next = (queues.get(id) || Promise.resolve()).then(task)
+  const settled = next.catch(() => {})
+  queues.set(id, settled)
+  settled.then(() => {
+    if (queues.get(id) === settled) queues.delete(id)
+  })
+  return next
+}
+
+// Remove sessões abandonadas (chamada ao criar uma nova)
+async function pruneSessions(now: number) {
+  const names = await readdir(UPLOAD_DIR).catch(() => [] as string[])
+  for (const name of names) {
+    const file = path.join(UPLOAD_DIR, name)
+    const info = await stat(file).catch(() => null)
+    if (info && now - info.mtimeMs > UPLOAD_SESSION_TTL_MS) await unlink(file).catch(() => {})
+  }
+}
+
+// Donos das sessões abertas, um por sessão
+async function openSessionOwners(): Promise<string[]> {
+  const names = await readdir(UPLOAD_DIR).catch(() => [] as string[])
+  const owners: string[] = []
+  for (const name of names) {
+    if (!name.endsWith(".json")) continue
+    const meta = await readFile(path.join(UPLOAD_DIR, name), "utf8").then(JSON.parse).catch(() => null)
+    if (meta) owners.push(String(meta.owner))
+  }
+  return owners
+}
+
+export function createUploadSession(size: number, type: string, owner: string): Promise<UploadSession> {
+  // Criações em fila: duas requisições simultâneas não passam juntas pelo limite
+  return serialized("create", async () => {
+    await mkdir(UPLOAD_DIR, { recursive: true })
+    await pruneSessions(Date.now())
+    const owners = await openSessionOwners()
+    if (owners.length >= MAX_OPEN_SESSIONS || owners.filter(o => o === owner).length >= MAX_SESSIONS_PER_OWNER) {
+      throw new UploadSessionLimitError()
+    }
+    const session = { id: randomUUID(), owner, size, type, createdAt: new Date().toISOString() }
+    await writeFile(metaFile(session.id), JSON.stringify(session), "utf8")
+    await writeFile(partFile(session.id), "")
+    return { ...session, received: 0 }
+  })
+}
+
+/**
+ * Sessão ``id`` de ``owner``; a de outro admin é tratada como inexistente
+ */
+export async function getUploadSession(id: string, owner: string): Promise<UploadSession> {
+  if (!SESSION_ID.test(id)) throw new UploadSessionNotFoundError()
+  let session: UploadSession
+  try {
+    const meta = JSON.parse(await readFile(metaFile(id), "utf8"))
+    const { size: received } = await stat(partFile(id))
+    session = { ...meta, received }
+  } catch {
+    throw new UploadSessionNotFoundError()
+  }
+  if (session.owner !== owner) throw new UploadSessionNotFoundError()
+  return session
+}
+
+/**
+ * Grava ``chunk`` se ele começa exatamente no offset recebido até agora
+ */
+export function appendUploadChunk(id: string, owner: string, offset: number, chunk: Buffer): Promise<UploadSession> {
+  return serialized(id, async () => {
+    const session = await getUploadSession(id, owner)
+    if (offset !== session.received) throw new UploadOffsetError(session.received)
+    if (offset + chunk.length > session.size) throw new UploadOffsetError(session.received)
+    await appendFile(partFile(id), chunk)
+    return { ...session, received: session.received + chunk.length }
+  })
+}
+
+/**
+ * Conteúdo completo da sessão; lança UploadOffsetError se ainda faltam bytes
+ */
+export async function readUploadSession(id: string, owner: string): Promise<Buffer> {
+  const session = await getUploadSession(id, owner)
+  if (session.received !== session.size) throw new UploadOffsetError(session.received)
+  return readFile(partFile(id))
+}
+
+export function removeUploadSession(id: string, owner: string): Promise<void> {
+  if (!SESSION_ID.test(id)) return Promise.resolve()
+  return serialized(id, async () => {
+    const session = await getUploadSession(id, owner).catch(() => null)
+    if (!session) return
+    await unlink(partFile(id)).catch(() => {})
+    await unlink(metaFile(id)).catch(() => {})
+  })
+}
@@ -0,0 +1,313 @@
+/**
+ * Mensagem de pedido para o WhatsApp (link wa.me)
+ *
+ * O pedido vai inteiro na URL do wa.me, que deixa de abrir em alguns
+ * navegadores e aparelhos acima de ~2000 caracteres. Em vez de cortar a
+ * mensagem no meio, o layout é escolhido para caber no limite, do mais
+ * detalhado ao mais enxuto:
+ *
+ * 1. detalhado: o formato completo de sempre;
+ * 2. compacto: uma linha por item, itens iguais agrupados;
+ * 3. abreviado: nomes de sabores e adicionais repetidos viram códigos
+ *    (#1, #2...) explicados numa legenda;
+ * 4. link: os itens que couberem e o link para o pedido gravado completo;
+ * 5. resumido: sem link, os itens que couberem e a contagem dos demais.
+ *
+ * Cliente, endereço, pagamento e valores aparecem em todos os layouts. O
+ * tamanho é medido na URL final, já codificada (um emoji ocupa 12
+ * caracteres, uma letra acentuada 6).
+ */
+
+import { formatCurrency } from "./currency-utils"
+import type { CartItem } from "./cart-context"
+
+export const WHATSAPP_URL_LIMIT = 2000
+
+export type MessageLayout = "detalhado" | "compacto" | "abreviado" | "link" | "resumido"
+
+export interface WhatsAppOrder {
+  loja: string
+  numero?: number | null
+  // Página do pedido gravado, usada quando os itens não cabem na mensagem
+  pedidoUrl?: string | null
+  items: CartItem[]
+  entrega: "delivery" | "balcao"
+  cliente: { nome: string; telefone: string }
+  // Linhas do endereço de entrega, já formatadas (vazio na retirada)
+  endereco: string[]
+  observacoes?: string | null
+  pagamento: string
+  subtotal: number
+  taxaEntrega: number
+  total: number
+}
+
+export interface WhatsAppLink {
+  url: string
+  message: string
+  layout: MessageLayout
+}
+
+interface ItemGroup {
+  quantidade: number
+  descricao: string
+  // Nomes que podem ser abreviados (sabores e adicionais)
+  nomes: string[]
+  total: number
+}
+
+/**
+ * Remove caracteres invisíveis e de controle (exceto quebra de linha)
+ */
+export function sanitizeMessage(message: string): string {
+  return message
+    .replace(/[\u200B-\u200D\uFEFF]/g, "") // Remove zero-width characters
+    .replace(/[\uFFFD]/g, "") // Remove replacement characters
+    // Remove control characters, exceto \n (0x0A)
+    .replace(/[\u0000-\u0009\u000B-\u001F\u007F-\u009F]/g, "")
+    .trim()
+}
+
+const sizeLabel = (item: CartItem) => (item.tamanho === "broto" ? "Broto" : "Tradicional")
+
+// Layout completo, o mesmo usado antes do planejamento por tamanho
+function renderDetailed(order: WhatsAppOrder): string {
+  let message = `*NOVO PEDIDO - ${order.loja}*\n`
+  if (order.numero) message += `🧾 Pedido nº ${order.numero}\n`
+  message += `\n`
+
+  message += `📋 *ITENS DO PEDIDO:*\n\n`
+  order.items.forEach((item) => {
+    const emoji = item.tipo === "bebida" ? "🥤" : "🍕"
+    message += `${emoji} ${item.quantidade}x ${item.nome}`
+    if (item.tipo !== "bebida") message += ` - ${sizeLabel(item)}`
+    message += `\n`
+
+    if (item.sabores && item.sabores.length > 0 && item.tipo !== "bebida") {
+      if (item.sabores.length === 1) {
+        message += `  • Sabor: ${item.sabores[0]}\n`
+      } else if (item.sabores.length === 2) {
+        message += `  • Sabores:\n    1/2 ${item.sabores[0]}\n    1/2 ${item.sabores[1]}\n`
+      } else {
+        message += `  • Sabores: ${item.sabores.join(', ')}\n`
+      }
+    }
+
+    item.adicionais?.forEach((adicionalGrupo) => {
+      if (adicionalGrupo.itens.length > 0) {
+        message += `  • Adicionais (${adicionalGrupo.sabor}): ${adicionalGrupo.itens.map(adic => `${adic.nome} (+${formatCurrency(adic.preco)})`).join(', ')}\n`
+      }
+    })
+
+    if (item.bordaRecheada) {
+      message += `  • Borda Recheada: ${item.bordaRecheada.nome} (+${formatCurrency(item.bordaRecheada.preco)})\n`
+    }
+
+    message += `  • Total: ${formatCurrency(item.preco * item.quantidade)}\n\n`
+  })
+
+  message += `🚚 *ENTREGA:* ${order.entrega === "delivery" ? "Delivery" : "Retirada no Balcão"}\n\n`
+
+  message += `👤 *DADOS DO CLIENTE:*\n`
+  message += `Nome: ${order.cliente.nome}\n`
+  message += `Telefone: ${order.cliente.telefone}\n\n`
+
+  if (order.entrega === "delivery") {
+    message += `📍 *ENDEREÇO DE ENTREGA:*\n`
+    order.endereco.forEach(linha => { message += `${linha}\n` })
+    message += `\n`
+  }
+
+  if (order.observacoes) {
+    message += `📝 *OBSERVAÇÕES DO PEDIDO:*\n${order.observacoes}\n\n`
+  }
+
+  message += `💳 *FORMA DE PAGAMENTO:*\n${order.pagamento}\n\n`
+
+  message += `💰 *VALORES:*\n`
+  message += `Subtotal: ${formatCurrency(order.subtotal)}\n`
+  if (order.entrega === "delivery") {
+    message += `Taxa de entrega: ${formatCurrency(order.taxaEntrega)}\n`
+  }
+  message += `*TOTAL: ${formatCurrency(order.total)}*\n\n`
+
+  message += `⏳ Aguardando confirmação!`
+  return message
+}
+
+/**
+ * Uma linha por item; itens com a mesma descrição e o mesmo preço unitário
+ * são somados
+ */
+function groupItems(items: CartItem[]): ItemGroup[] {
+  const groups = new Map<string, ItemGroup>()
+  for (const item of items) {
+    const sabores = item.tipo !== "bebida" && item.sabores?.length ? item.sabores : []
+    const nomes = sabores.length > 1 ? [...sabores] : [item.nome]
+    let descricao = sabores.length === 2
+      ? `½ ${sabores[0]} + ½ ${sabores[1]}`
+      : sabores.length > 2 ? sabores.join(" + ") : item.nome
+    if (item.tipo !== "bebida") descricao += ` (${sizeLabel(item)})`
+
+    for (const grupo of item.adicionais || []) {
+      if (grupo.itens.length === 0) continue
+      const adicionais = grupo.itens.map(adicional => adicional.nome)
+      nomes.push(...adicionais)
+      descricao += sabores.length > 1
+        ? ` +${adicionais.join(", ")} em ${grupo.sabor}`
+        : ` +${adicionais.join(", ")}`
+    }
+    if (item.bordaRecheada) descricao += ` +Borda ${item.bordaRecheada.nome}`
+
+    const key = `${descricao}|${Math.round(item.preco * 100)}`
+    const existing = groups.get(key)
+    if (existing) {
+      existing.quantidade += item.quantidade
+      existing.total += item.preco * item.quantidade
+    } else {
+      groups.set(key, { quantidade: item.quantidade, descricao, nomes, total: item.preco * item.quantidade })
+    }
+  }
+  return Array.from(groups.values())
+}
+
+const encodedLength = (text: string) => encodeURIComponent(text).length
+const ENDS_IN_WORD = /[\p{L}\p{N}]$/u
+const STARTS_WITH_WORD = /^[\p{L}\p{N}]/u
+
+/**
+ * Trechos de ``text`` entre as ocorrências de ``nome`` que não fazem parte de
+ * uma palavra maior. Feito com split em vez de lookbehind na regex, que o
+ * Safari só aceita a partir do iOS 16.4.
+ */
+function splitWholeName(text: string, nome: string): string[] {
+  if (!nome) return [text]
+  const parts = text.split(nome)
+  const pieces = [parts[0]]
+  for (let index = 1; index < parts.length; index++) {
+    // Trecho vazio: o vizinho é outra ocorrência do próprio nome
+    const before = parts[index - 1] || (index > 1 ? nome : "")
+    const after = parts[index] || (index < parts.length - 1 ? nome : "")
+    if (ENDS_IN_WORD.test(before) || STARTS_WITH_WORD.test(after)) {
+      pieces[pieces.length - 1] += nome + parts[index]
+    } else {
+      pieces.push(parts[index])
+    }
+  }
+  return pieces
+}
+
+/**
+ * Códigos para os nomes repetidos, só quando o código mais a entrada na
+ * legenda saem mais curtos que repetir o nome
+ */
+function abbreviations(groups: ItemGroup[]): [string, string][] {
+  const counts = new Map<string, number>()
+  groups.forEach(group => new Set(group.nomes).forEach(nome => counts.set(nome, (counts.get(nome) || 0) + 1)))
+
+  const codes: [string, string][] = []
+  // Nomes longos primeiro, para "Frango com Catupiry" não virar "#1 com Catupiry"
+  const candidates = Array.from(counts.entries())
+    .filter(([, count]) => count > 1)
+    .sort(([a], [b]) => b.length - a.length)
+  for (const [nome, count] of candidates) {
+    const code = `#${codes.length + 1}`
+    const saving = (encodedLength(nome) - encodedLength(code)) * count
+    const legend = encodedLength(` ${code}=${nome}`)
+    if (saving > legend) codes.push([nome, code])
+  }
+  return codes
+}
+
+function abbreviate(groups: ItemGroup[], codes: [string, string][]): ItemGroup[] {
+  return groups.map(group => ({
+    ...group,
+    descricao: codes.reduce((text, [nome, code]) => splitWholeName(text, nome).join(code), group.descricao),
+  }))
+}
+
+interface CompactOptions {
+  codes: [string, string][]
+  // Quantos grupos de itens listar; os demais viram uma linha de resumo
+  limit: number
+  link: string | null
+}
+
+function renderCompact(order: WhatsAppOrder, groups: ItemGroup[], { codes, limit, link }: CompactOptions): string {
+  const lines = [`*NOVO PEDIDO - ${order.loja}*${order.numero ? ` nº ${order.numero}` : ""}`]
+
+  groups.slice(0, limit).forEach(group => {
+    lines.push(`${group.quantidade}x ${group.descricao} = ${formatCurrency(group.total)}`)
+  })
+  const hidden = groups.slice(limit)
+  if (hidden.length > 0) {
+    const quantidade = hidden.reduce((sum, group) => sum + group.quantidade, 0)
+    const total = hidden.reduce((sum, group) => sum + group.total, 0)
+    lines.push(`+${quantidade} ${quantidade === 1 ? "item" : "itens"} = ${formatCurrency(total)}`)
+  }
+  const usedCodes = codes.filter(([, code]) => groups.slice(0, limit).some(group => splitWholeName(group.descricao, code).length > 1))
+  if (usedCodes.length > 0) lines.push(`(${usedCodes.map(([nome, code]) => `${code}=${nome}`).join(" ")})`)
+  if (link) lines.push(`Pedido completo: ${link}`)
+
+  lines.push("")
+  lines.push(order.entrega === "delivery"
+    ? `🚚 Delivery: ${order.endereco.join(" - ")}`
+    : `🚚 Retirada no Balcão`)
+  lines.push(`👤 ${order.cliente.nome} - ${order.cliente.telefone}`)
+  if (order.observacoes) lines.push(`📝 ${order.observacoes}`)
+  lines.push(`💳 ${order.pagamento}`)
+  lines.push(order.entrega === "delivery"
+    ? `💰 ${formatCurrency(order.subtotal)} + entrega ${formatCurrency(order.taxaEntrega)} = *${formatCurrency(order.total)}*`
+    : `💰 *TOTAL: ${formatCurrency(order.total)}*`)
+  return lines.join("\n")
+}
+
+// Último recurso (endereço ou observação enormes): corta por caractere, sem quebrar emojis
+function cutToFit(message: string, fits: (text: string) => boolean): string {
+  const chars = Array.from(message)
+  let low = 0
+  let high = chars.length
+  while (low < high) {
+    const middle = Math.ceil((low + high) / 2)
+    if (fits(`${chars.slice(0, middle).join("")}…`)) low = middle
+    else high = middle - 1
+  }
+  return `${chars.slice(0, low).join("")}…`
+}
+
+/**
+ * Monta o link wa.me com o layout mais detalhado que cabe em ``limit``
+ * caracteres de URL
+ */
+export function buildWhatsAppLink(phone: string, order: WhatsAppOrder, limit = WHATSAPP_URL_LIMIT): WhatsAppLink {
+  const prefix = `https://wa.me/${phone}?text=`
+  const toLink = (message: string, layout: MessageLayout): WhatsAppLink => {
+    const clean = sanitizeMessage(message)
+    return { url: prefix + encodeURIComponent(clean), message: clean, layout }
+  }
+  const fits = (message: string) => prefix.length + encodedLength(sanitizeMessage(message)) <= limit
+
+  const detailed = renderDetailed(order)
+  if (fits(detailed)) return toLink(detailed, "detalhado")
+
+  const groups = groupItems(order.items)
+  const all = groups.length
+  const compact = renderCompact(order, groups, { codes: [], limit: all, link: null })
+  if (fits(compact)) return toLink(compact, "compacto")
+
+  const codes = abbreviations(groups)
+  const short = abbreviate(groups, codes)
+  const abbreviated = renderCompact(order, short, { codes, limit: all, link: null })
+  if (fits(abbreviated)) return toLink(abbreviated, "abreviado")
+
+  // Listar o máximo de itens que couber, com o link (se houver) para o restante
+  const link = order.pedidoUrl || null
+  const layout: MessageLayout = link ? "link" : "resumido"
+  for (let count = all - 1; count >= 0; count--) {
+    const message = renderCompact(order, short, { codes, limit: count, link })
+    if (fits(message)) return toLink(message, layout)
+  }
+
+  const minimal = renderCompact(order, short, { codes, limit: 0, link })
+  return toLink(cutToFit(minimal, fits), layout)
+}
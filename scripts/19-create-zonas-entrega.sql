@@ -0,0 +1,62 @@
+-- Script para criar tabela de zonas de entrega
+-- Cada zona define sua própria taxa e pedido mínimo, substituindo a taxa única
+-- de pizzaria_config quando houver ao menos uma zona ativa
+
+-- Tabela de zonas de entrega
+CREATE TABLE IF NOT EXISTS zonas_entrega (
+  id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+  nome VARCHAR(255) NOT NULL,
+  tipo VARCHAR(10) NOT NULL DEFAULT 'cep' CHECK (tipo IN ('cep', 'bairro', 'raio')),
+  cep_inicio VARCHAR(8),
+  cep_fim VARCHAR(8),
+  bairros JSONB DEFAULT '[]',
+  centro_latitude DECIMAL(9,6),
+  centro_longitude DECIMAL(9,6),
+  raio_min_km DECIMAL(6,2) DEFAULT 0,
+  raio_max_km DECIMAL(6,2),
+  taxa DECIMAL(10,2) NOT NULL DEFAULT 0,
+  pedido_minimo DECIMAL(10,2) DEFAULT 0,
+  ativo BOOLEAN DEFAULT true,
+  ordem INTEGER DEFAULT 0,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_zonas_entrega_ativo ON zonas_entrega(ativo, ordem);
+
+-- Habilitar RLS (Row Level Security)
+ALTER TABLE zonas_entrega ENABLE ROW LEVEL SECURITY;
+
+-- Leitura pública (o checkout mostra a taxa; o servidor a recalcula ao gravar o pedido)
+DROP POLICY IF EXISTS "Public read zonas_entrega" ON zonas_entrega;
+CREATE POLICY "Public read zonas_entrega" ON zonas_entrega
+  FOR SELECT
+  USING (true);
+
+-- Acesso total do admin, como nas demais tabelas do cardápio (scripts/02): o
+-- login do painel é feito sobre a chave anon, sem sessão do Supabase Auth
+DROP POLICY IF EXISTS "Admin write zonas_entrega" ON zonas_entrega;
+DROP POLICY IF EXISTS "Admin full access zonas_entrega" ON zonas_entrega;
+CREATE POLICY "Admin full access zonas_entrega" ON zonas_entrega
+  FOR ALL
+  USING (true)
+  WITH CHECK (true);
+
+-- Trigger para atualizar updated_at automaticamente
+DROP TRIGGER IF EXISTS update_zonas_entrega_updated_at ON zonas_entrega;
+CREATE TRIGGER update_zonas_entrega_updated_at
+  BEFORE UPDATE ON zonas_entrega
+  FOR EACH ROW
+  EXECUTE FUNCTION update_updated_at_column();
+
+-- Comentários para documentação
+COMMENT ON TABLE zonas_entrega IS 'Zonas de entrega com taxa e pedido mínimo próprios';
+COMMENT ON COLUMN zonas_entrega.tipo IS 'cep: faixa de CEPs; bairro: lista de bairros; raio: anel em km a partir de um centro';
+COMMENT ON COLUMN zonas_entrega.cep_inicio IS 'Primeiro CEP da faixa (8 dígitos), para tipo cep';
+COMMENT ON COLUMN zonas_entrega.cep_fim IS 'Último CEP da faixa (8 dígitos), para tipo cep';
+COMMENT ON COLUMN zonas_entrega.bairros IS 'Nomes dos bairros atendidos, para tipo bairro';
+COMMENT ON COLUMN zonas_entrega.raio_min_km IS 'Distância inicial do anel em km, para tipo raio';
+COMMENT ON COLUMN zonas_entrega.raio_max_km IS 'Distância final do anel em km, para tipo raio';
+COMMENT ON COLUMN zonas_entrega.taxa IS 'Taxa de entrega da zona';
+COMMENT ON COLUMN zonas_entrega.pedido_minimo IS 'Valor mínimo do pedido na zona';
+COMMENT ON COLUMN zonas_entrega.ordem IS 'Prioridade quando zonas do mesmo tipo se sobrepõem (menor vence)';
@@ -0,0 +1,22 @@
+-- Variantes responsivas das imagens (AVIF/WebP em várias larguras)
+-- Execute este script no SQL Editor do Supabase
+--
+-- POST /api/images grava as variantes em images/<pasta>/<hash>/<largura>.<formato>
+-- e retorna um descritor JSON (base, hash, width, height, widths, formats,
+-- placeholder), salvo nas colunas abaixo. As colunas de URL continuam
+-- preenchidas com a maior variante WebP para telas antigas.
+
+ALTER TABLE carousel_images
+ADD COLUMN IF NOT EXISTS variantes JSONB;
+
+ALTER TABLE produtos
+ADD COLUMN IF NOT EXISTS imagem_url TEXT,
+ADD COLUMN IF NOT EXISTS imagem_variantes JSONB;
+
+-- O bucket passa a aceitar AVIF
+UPDATE storage.buckets
+SET allowed_mime_types = ARRAY['image/jpeg', 'image/png', 'image/webp', 'image/avif', 'image/gif']
+WHERE id = 'images';
+
+COMMENT ON COLUMN carousel_images.variantes IS 'Descritor das variantes responsivas (lib/image-variants.ts)';
+COMMENT ON COLUMN produtos.imagem_variantes IS 'Descritor das variantes responsivas (lib/image-variants.ts)';
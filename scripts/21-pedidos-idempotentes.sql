@@ -0,0 +1,151 @@
+-- Gravação de pedidos no servidor (POST /api/pedidos)
+-- Execute este script no SQL Editor do Supabase
+--
+-- O checkout grava o pedido e todos os itens numa única chamada à função
+-- criar_pedido, que roda em uma transação: ou tudo é gravado, ou nada.
+-- Cada envio carrega uma chave de idempotência gerada no navegador; repetir
+-- a chamada com a mesma chave (toque duplo, nova tentativa após timeout)
+-- devolve o pedido já gravado em vez de criar outro.
+--
+-- Os pedidos guardam nome, telefone e endereço do cliente, então a chave
+-- anon deixa de ler pedidos e pedido_itens: a página do pedido busca um
+-- único pedido pelo id (UUID) com a função buscar_pedido.
+
+-- 1. Colunas novas em pedidos
+ALTER TABLE pedidos
+ADD COLUMN IF NOT EXISTS idempotency_key UUID,
+ADD COLUMN IF NOT EXISTS numero BIGSERIAL,
+ADD COLUMN IF NOT EXISTS cliente_nome VARCHAR(255),
+ADD COLUMN IF NOT EXISTS cliente_telefone VARCHAR(20);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pedidos_idempotency_key ON pedidos(idempotency_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pedidos_numero ON pedidos(numero);
+-- Histórico por período (relatórios do admin)
+CREATE INDEX IF NOT EXISTS idx_pedidos_created_at ON pedidos(created_at);
+
+-- 2. Detalhes dos itens
+ALTER TABLE pedido_itens
+ADD COLUMN IF NOT EXISTS adicionais JSONB,
+ADD COLUMN IF NOT EXISTS borda JSONB;
+
+CREATE INDEX IF NOT EXISTS idx_pedido_itens_pedido_id ON pedido_itens(pedido_id);
+
+-- 3. Função de gravação
+CREATE OR REPLACE FUNCTION criar_pedido(p_idempotency_key uuid, p_pedido jsonb, p_itens jsonb)
+RETURNS TABLE (id uuid, numero bigint, created_at timestamptz, duplicado boolean)
+LANGUAGE plpgsql
+SECURITY DEFINER
+-- Sem search_path fixo quem chama poderia sombrear pedidos/produtos com tabelas próprias
+SET search_path = public
+AS $$
+DECLARE
+    v_id uuid;
+    v_numero bigint;
+    v_created_at timestamptz;
+BEGIN
+    IF p_itens IS NULL OR jsonb_array_length(p_itens) = 0 THEN
+        RAISE EXCEPTION 'Pedido sem itens' USING ERRCODE = '22023';
+    END IF;
+
+    -- Um envio concorrente com a mesma chave espera o primeiro terminar e não insere nada
+    INSERT INTO pedidos AS p (
+        idempotency_key, tipo_entrega, endereco_entrega, forma_pagamento,
+        subtotal, taxa_entrega, total, observacoes, cliente_nome, cliente_telefone, enviado_whatsapp
+    )
+    VALUES (
+        p_idempotency_key,
+        p_pedido->>'tipo_entrega',
+        p_pedido->>'endereco_entrega',
+        p_pedido->>'forma_pagamento',
+        (p_pedido->>'subtotal')::numeric,
+        COALESCE((p_pedido->>'taxa_entrega')::numeric, 0),
+        (p_pedido->>'total')::numeric,
+        p_pedido->>'observacoes',
+        p_pedido->>'cliente_nome',
+        p_pedido->>'cliente_telefone',
+        true
+    )
+    ON CONFLICT (idempotency_key) DO NOTHING
+    RETURNING p.id, p.numero, p.created_at INTO v_id, v_numero, v_created_at;
+
+    IF v_id IS NULL THEN
+        RETURN QUERY
+        SELECT p.id, p.numero, p.created_at, true
+        FROM pedidos p
+        WHERE p.idempotency_key = p_idempotency_key;
+        RETURN;
+    END IF;
+
+    -- Todos os itens em um único INSERT; produto_id desconhecido vira NULL em vez de violar a FK
+    INSERT INTO pedido_itens (
+        pedido_id, produto_id, nome_produto, tamanho, sabores, quantidade,
+        preco_unitario, preco_total, adicionais, borda
+    )
+    SELECT
+        v_id,
+        (SELECT pr.id FROM produtos pr WHERE pr.id = i.produto_id),
+        i.nome_produto,
+        i.tamanho,
+        i.sabores,
+        i.quantidade,
+        i.preco_unitario,
+        i.preco_total,
+        i.adicionais,
+        i.borda
+    FROM jsonb_to_recordset(p_itens) AS i(
+        produto_id uuid,
+        nome_produto text,
+        tamanho text,
+        sabores jsonb,
+        quantidade integer,
+        preco_unitario numeric,
+        preco_total numeric,
+        adicionais jsonb,
+        borda jsonb
+    );
+
+    RETURN QUERY SELECT v_id, v_numero, v_created_at, false;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION criar_pedido(uuid, jsonb, jsonb) TO anon, authenticated;
+
+-- 4. Dados dos clientes fora do alcance da chave anon
+-- As políticas de scripts/02 liberavam SELECT (e UPDATE/DELETE) para todos
+DROP POLICY IF EXISTS "Admin full access pedidos" ON pedidos;
+DROP POLICY IF EXISTS "Admin read pedido_itens" ON pedido_itens;
+REVOKE SELECT, UPDATE, DELETE ON pedidos, pedido_itens FROM anon;
+
+-- 5. Leitura de um pedido pelo id, com os itens (página /pedido/<id>)
+CREATE OR REPLACE FUNCTION buscar_pedido(p_id uuid)
+RETURNS jsonb
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT to_jsonb(p) || jsonb_build_object(
+        'pedido_itens',
+        COALESCE(
+            (SELECT jsonb_agg(to_jsonb(i) ORDER BY i.created_at, i.id) FROM pedido_itens i WHERE i.pedido_id = p.id),
+            '[]'::jsonb
+        )
+    )
+    FROM pedidos p
+    WHERE p.id = p_id;
+$$;
+
+GRANT EXECUTE ON FUNCTION buscar_pedido(uuid) TO anon, authenticated;
+
+-- 6. Verificar
+SELECT
+    CASE
+        WHEN EXISTS (SELECT 1 FROM information_schema.routines WHERE routine_name = 'criar_pedido')
+        THEN 'OK: criar_pedido criada'
+        ELSE 'ERRO: criar_pedido não encontrada'
+    END AS verify_function,
+    CASE
+        WHEN EXISTS (SELECT 1 FROM pg_policies WHERE tablename IN ('pedidos', 'pedido_itens') AND cmd IN ('SELECT', 'ALL'))
+        THEN 'ERRO: pedidos ainda legíveis por políticas públicas'
+        ELSE 'OK: pedidos protegidos'
+    END AS verify_policies;
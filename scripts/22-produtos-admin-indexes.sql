@@ -0,0 +1,26 @@
+-- Índices da lista paginada de produtos do admin (lib/product-query.ts)
+-- Execute este script no SQL Editor do Supabase
+--
+-- A lista pede páginas de 50 produtos "depois de (valor, id)" em uma das
+-- ordenações abaixo, opcionalmente filtrada por categoria e situação. Com
+-- estes índices cada página é uma leitura curta do índice, em vez de ler e
+-- ordenar o catálogo inteiro a cada visita.
+
+-- 1. Ordenações (o id desempata valores iguais)
+CREATE INDEX IF NOT EXISTS idx_produtos_ordem_id ON produtos(ordem, id);
+CREATE INDEX IF NOT EXISTS idx_produtos_nome_id ON produtos(nome, id);
+CREATE INDEX IF NOT EXISTS idx_produtos_preco_id ON produtos(preco_tradicional, id);
+CREATE INDEX IF NOT EXISTS idx_produtos_created_at_id ON produtos(created_at DESC, id DESC);
+
+-- 2. Filtro por categoria na ordem do cardápio
+CREATE INDEX IF NOT EXISTS idx_produtos_categoria_ordem_id ON produtos(categoria_id, ordem, id);
+
+-- 3. Busca por parte do nome (ILIKE '%texto%')
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_produtos_nome_trgm ON produtos USING gin (nome gin_trgm_ops);
+
+-- 4. Verificar
+SELECT indexname
+FROM pg_indexes
+WHERE tablename = 'produtos' AND indexname LIKE 'idx_produtos_%'
+ORDER BY indexname;
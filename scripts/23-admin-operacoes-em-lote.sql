@@ -0,0 +1,97 @@
+-- Operações em lote do admin (lib/admin-batch.ts)
+-- Execute este script no SQL Editor do Supabase
+--
+-- Ligar/desligar vários itens, reajustar preços por percentual e reescrever
+-- a ordem de uma lista passam a ser uma única chamada, executada em uma
+-- transação, em vez de um UPDATE por item. As funções rodam com as
+-- permissões de quem chama (SECURITY INVOKER), então as políticas de RLS
+-- valem exatamente como nos UPDATEs que elas substituem (o painel usa a
+-- mesma chave anon das telas de admin).
+
+-- 1. Liga/desliga uma coluna booleana em várias linhas
+-- p_valores: {"<id>": true, "<id>": false, ...}
+CREATE OR REPLACE FUNCTION atualizar_flags_em_lote(p_tabela text, p_coluna text, p_valores jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_total integer;
+BEGIN
+    -- Nomes de tabela e coluna vão para SQL dinâmico: só os pares conhecidos
+    IF (p_tabela, p_coluna) NOT IN (
+        ('produtos', 'ativo'),
+        ('produtos', 'promocao'),
+        ('categorias', 'ativo'),
+        ('opcoes_sabores', 'ativo'),
+        ('bordas_recheadas', 'ativo'),
+        ('carousel_images', 'ativo')
+    ) THEN
+        RAISE EXCEPTION 'Coluna %.% não pode ser alterada em lote', p_tabela, p_coluna USING ERRCODE = '22023';
+    END IF;
+
+    EXECUTE format(
+        'UPDATE %I AS t SET %I = v.valor::boolean FROM jsonb_each_text($1) AS v(id, valor) WHERE t.id = v.id::uuid',
+        p_tabela, p_coluna
+    ) USING p_valores;
+    GET DIAGNOSTICS v_total = ROW_COUNT;
+    RETURN v_total;
+END;
+$$;
+
+-- 2. Reescreve a ordem: o primeiro id recebe ordem 1, o segundo 2, ...
+CREATE OR REPLACE FUNCTION reordenar_em_lote(p_tabela text, p_ids uuid[])
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_total integer;
+BEGIN
+    IF p_tabela NOT IN ('produtos', 'categorias', 'opcoes_sabores', 'bordas_recheadas', 'carousel_images') THEN
+        RAISE EXCEPTION 'Tabela % não pode ser reordenada em lote', p_tabela USING ERRCODE = '22023';
+    END IF;
+
+    EXECUTE format(
+        'UPDATE %I AS t SET ordem = o.posicao::integer FROM unnest($1) WITH ORDINALITY AS o(id, posicao) WHERE t.id = o.id',
+        p_tabela
+    ) USING p_ids;
+    GET DIAGNOSTICS v_total = ROW_COUNT;
+    RETURN v_total;
+END;
+$$;
+
+-- 3. Reajuste percentual de todos os preços de produtos (10 = +10%, -5 = -5%)
+-- Sem p_ids e sem p_categoria_id o reajuste vale para o cardápio inteiro.
+CREATE OR REPLACE FUNCTION reajustar_precos(p_percentual numeric, p_ids uuid[] DEFAULT NULL, p_categoria_id uuid DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_fator numeric;
+    v_total integer;
+BEGIN
+    IF p_percentual IS NULL OR p_percentual <= -100 THEN
+        RAISE EXCEPTION 'Percentual inválido: %', p_percentual USING ERRCODE = '22023';
+    END IF;
+    v_fator := 1 + p_percentual / 100;
+
+    -- Preços ausentes (NULL) continuam ausentes
+    UPDATE produtos
+    SET preco_tradicional = ROUND(preco_tradicional * v_fator, 2),
+        preco_broto = ROUND(preco_broto * v_fator, 2),
+        preco_promocional_tradicional = ROUND(preco_promocional_tradicional * v_fator, 2),
+        preco_promocional_broto = ROUND(preco_promocional_broto * v_fator, 2)
+    WHERE (p_ids IS NULL OR id = ANY(p_ids))
+      AND (p_categoria_id IS NULL OR categoria_id = p_categoria_id);
+    GET DIAGNOSTICS v_total = ROW_COUNT;
+    RETURN v_total;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION atualizar_flags_em_lote(text, text, jsonb) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION reordenar_em_lote(text, uuid[]) TO anon, authenticated;
+GRANT EXECUTE ON FUNCTION reajustar_precos(numeric, uuid[], uuid) TO anon, authenticated;
+
+-- 4. Verificar
+SELECT routine_name AS funcao_criada
+FROM information_schema.routines
+WHERE routine_name IN ('atualizar_flags_em_lote', 'reordenar_em_lote', 'reajustar_precos');
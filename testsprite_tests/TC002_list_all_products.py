@@ -1,19 +1,12 @@
-import requests
-from requests.auth import HTTPBasicAuth
+import httpx
 
-def test_list_all_products():
-    base_url = "http://localhost:3000"
-    endpoint = "/api/products"
-    url = base_url + endpoint
-    auth = HTTPBasicAuth("admin@pizzaria.com", "admin123")
-    headers = {
-        "Accept": "application/json"
-    }
-    timeout = 30
+from api_client import ADMIN_AUTH, run_standalone
 
+
+async def run_test(api):
     response = None
     try:
-        response = requests.get(url, headers=headers, auth=auth, timeout=timeout)
+        response = await api.get("/api/products", auth=ADMIN_AUTH)
         assert response.status_code == 200, f"Expected status code 200 but got {response.status_code}"
         json_data = response.json()
         assert isinstance(json_data, list), "Response JSON is not a list"
@@ -25,7 +18,9 @@ def test_list_all_products():
             assert "categoria_id" in product, "Product missing 'categoria_id'"
             assert "preco" in product, "Product missing 'preco'"
             assert "descricao" in product, "Product missing 'descricao'"
-    except (requests.RequestException, AssertionError) as e:
+    except (httpx.HTTPError, AssertionError) as e:
         raise AssertionError(f"Test failed: {e}")
 
-test_list_all_products()
\ No newline at end of file
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,26 +1,18 @@
-import requests
+from api_client import run_standalone
+from isolation import scoped
 
-BASE_URL = "http://localhost:3000"
-HEADERS = {"Content-Type": "application/json"}
-TIMEOUT = 30
 
-
-def test_update_existing_product():
+async def run_test(api):
     # Step 1: Create a new product first to update it later
     new_product_data = {
-        "nome": "Test Pizza Update",
+        "nome": scoped("Test Pizza Update"),
         "categoria_id": 1,
         "preco": 20.0,
         "descricao": "Pizza criada para teste de atualização"
     }
     created_product_id = None
     try:
-        create_resp = requests.post(
-            f"{BASE_URL}/api/products",
-            headers=HEADERS,
-            json=new_product_data,
-            timeout=TIMEOUT,
-        )
+        create_resp = await api.post("/api/products", json=new_product_data)
         assert create_resp.status_code == 201, f"Expected 201 on product creation, got {create_resp.status_code}"
         product_created = create_resp.json()
         assert "id" in product_created, "Created product response missing 'id'"
@@ -28,27 +20,18 @@ def test_update_existing_product():
 
         # Step 2: Prepare updated product details
         updated_product_data = {
-            "nome": "Test Pizza Updated",
+            "nome": scoped("Test Pizza Updated"),
             "categoria_id": 1,
             "preco": 25.5,
             "descricao": "Descrição atualizada da pizza para teste"
         }
 
         # Step 3: Update the created product
-        update_resp = requests.put(
-            f"{BASE_URL}/api/products/{created_product_id}",
-            headers=HEADERS,
-            json=updated_product_data,
-            timeout=TIMEOUT,
-        )
+        update_resp = await api.put(f"/api/products/{created_product_id}", json=updated_product_data)
         assert update_resp.status_code == 200, f"Expected 200 on product update, got {update_resp.status_code}"
 
         # Step 4: Retrieve the updated product to verify changes
-        get_resp = requests.get(
-            f"{BASE_URL}/api/products",
-            headers=HEADERS,
-            timeout=TIMEOUT,
-        )
+        get_resp = await api.get("/api/products")
         assert get_resp.status_code == 200, f"Expected 200 on get products, got {get_resp.status_code}"
         products_list = get_resp.json()
 
@@ -63,11 +46,8 @@ def test_update_existing_product():
     finally:
         # Cleanup: Delete the created product to maintain test environment
         if created_product_id is not None:
-            requests.delete(
-                f"{BASE_URL}/api/products/{created_product_id}",
-                headers=HEADERS,
-                timeout=TIMEOUT,
-            )
+            await api.delete(f"/api/products/{created_product_id}")
 
 
-test_update_existing_product()
+if __name__ == "__main__":
+    run_standalone(run_test)
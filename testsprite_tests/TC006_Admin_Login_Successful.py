@@ -1,85 +1,33 @@
-import asyncio
-from playwright import async_api
+from harness import open_page, run_standalone
+from waits import ready
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Find and navigate to the admin login page.
-        await page.mouse.wheel(0, window.innerHeight)
-        
 
-        # Try to find admin login page by other means, possibly by direct URL navigation or searching for admin login link.
-        await page.goto('http://localhost:3000/admin/login', timeout=10000)
-        
+async def run_test(context):
+    page = await open_page(context)
 
-        # Enter valid administrator username and password, then click the login button.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@example.com')
-        
+    # Interact with the page elements to simulate user flow
+    # Find and navigate to the admin login page.
+    await page.mouse.wheel(0, await page.evaluate("window.innerHeight"))
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('correct_password')
-        
+    # Try to find admin login page by other means, possibly by direct URL navigation or searching for admin login link.
+    await page.goto('http://localhost:3000/admin/login', timeout=10000)
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Enter valid administrator username and password, then click the login button.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div/input').nth(0)
+    await ready(elem); await elem.fill('admin@example.com')
 
-        # Generic failing assertion since expected result is unknown
-        assert False, 'Test failed as expected due to unknown expected result'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[2]/input').nth(0)
+    await ready(elem); await elem.fill('correct_password')
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[3]/button').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    # Generic failing assertion since expected result is unknown
+    assert False, 'Test failed as expected due to unknown expected result'
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,17 +1,13 @@
-import requests
-from requests.auth import HTTPBasicAuth
+import httpx
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
-USERNAME = "admin@pizzaria.com"
-PASSWORD = "admin123"
+from api_client import ADMIN_AUTH, run_standalone
 
-def test_list_all_categories():
-    url = f"{BASE_URL}/api/categories"
+
+async def run_test(api):
     try:
-        response = requests.get(url, auth=HTTPBasicAuth(USERNAME, PASSWORD), timeout=TIMEOUT)
+        response = await api.get("/api/categories", auth=ADMIN_AUTH)
         response.raise_for_status()
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         assert False, f"Request failed: {e}"
 
     assert response.status_code == 200, f"Expected status code 200 but got {response.status_code}"
@@ -26,4 +22,6 @@ def test_list_all_categories():
         assert isinstance(category, dict), "Category item is not a JSON object"
         assert "nome" in category or "descricao" in category or len(category) > 0, "Category item missing expected fields"
 
-test_list_all_categories()
\ No newline at end of file
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,27 +1,22 @@
-import requests
+import httpx
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import run_standalone
+from isolation import scoped
 
-def test_create_new_category():
-    url = f"{BASE_URL}/api/categories"
-    headers = {"Content-Type": "application/json"}
+
+async def run_test(api):
     payload = {
-        "nome": "Categoria Teste",
+        "nome": scoped("Categoria Teste"),
         "descricao": "Descrição da Categoria Teste"
     }
 
     try:
-        response = requests.post(
-            url,
-            json=payload,
-            headers=headers,
-            timeout=TIMEOUT
-        )
-    except requests.RequestException as e:
+        response = await api.post("/api/categories", json=payload)
+    except httpx.HTTPError as e:
         assert False, f"Request to create category failed: {str(e)}"
 
     assert response.status_code == 201, f"Expected status 201, got {response.status_code}"
 
 
-test_create_new_category()
+if __name__ == "__main__":
+    run_standalone(run_test)
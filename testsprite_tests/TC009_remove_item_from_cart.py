@@ -1,19 +1,11 @@
-import requests
-from requests.auth import HTTPBasicAuth
+from api_client import ADMIN_AUTH, run_standalone
 
-BASE_URL = "http://localhost:3000"
-AUTH = HTTPBasicAuth('admin@pizzaria.com', 'admin123')
-TIMEOUT = 30
-
-def test_remove_item_from_cart():
-    headers = {
-        "Content-Type": "application/json"
-    }
 
+async def run_test(api):
     # Step 1: Get list of products to find a product_id to add to cart
     product_id = None
     try:
-        resp_products = requests.get(f"{BASE_URL}/api/products", auth=AUTH, headers=headers, timeout=TIMEOUT)
+        resp_products = await api.get("/api/products", auth=ADMIN_AUTH)
         assert resp_products.status_code == 200, f"Failed to list products: {resp_products.status_code}"
         products = resp_products.json()
         assert isinstance(products, list) and len(products) > 0, "Products list is empty or invalid"
@@ -29,7 +21,7 @@ def test_remove_item_from_cart():
         "customizations": {}
     }
     try:
-        resp_add = requests.post(f"{BASE_URL}/api/cart/add", json=add_payload, auth=AUTH, headers=headers, timeout=TIMEOUT)
+        resp_add = await api.post("/api/cart/add", json=add_payload, auth=ADMIN_AUTH)
         assert resp_add.status_code == 200, f"Failed to add item to cart: {resp_add.status_code}"
     except Exception as e:
         raise AssertionError(f"Failed adding item to cart: {e}")
@@ -39,14 +31,14 @@ def test_remove_item_from_cart():
         "product_id": product_id
     }
     try:
-        resp_remove = requests.post(f"{BASE_URL}/api/cart/remove", json=remove_payload, auth=AUTH, headers=headers, timeout=TIMEOUT)
+        resp_remove = await api.post("/api/cart/remove", json=remove_payload, auth=ADMIN_AUTH)
         assert resp_remove.status_code == 200, f"Failed to remove item from cart: {resp_remove.status_code}"
     except Exception as e:
         raise AssertionError(f"Failed removing item from cart: {e}")
 
     # Step 4: Verify cart is updated (Assuming GET /api/cart returns current cart)
     try:
-        resp_cart = requests.get(f"{BASE_URL}/api/cart", auth=AUTH, headers=headers, timeout=TIMEOUT)
+        resp_cart = await api.get("/api/cart", auth=ADMIN_AUTH)
         # It is not explicitly in PRD but logically we verify cart state after removal.
         assert resp_cart.status_code == 200, f"Failed to get cart: {resp_cart.status_code}"
         cart = resp_cart.json()
@@ -60,4 +52,6 @@ def test_remove_item_from_cart():
     except Exception as e:
         raise AssertionError(f"Failed verifying cart update: {e}")
 
-test_remove_item_from_cart()
\ No newline at end of file
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,14 +1,9 @@
-import requests
-from requests.auth import HTTPBasicAuth
+import httpx
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
-AUTH = HTTPBasicAuth("admin@pizzaria.com", "admin123")
-HEADERS = {"Content-Type": "application/json"}
+from api_client import ADMIN_AUTH, run_standalone
 
 
-def test_TC010_process_order_checkout():
-    url = f"{BASE_URL}/api/checkout"
+async def run_test(api):
     payload = {
         "customer_info": {
             "name": "João Silva",
@@ -41,13 +36,14 @@ def test_TC010_process_order_checkout():
     }
 
     try:
-        response = requests.post(url, auth=AUTH, headers=HEADERS, json=payload, timeout=TIMEOUT)
+        response = await api.post("/api/checkout", auth=ADMIN_AUTH, json=payload)
         assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
         json_response = response.json()
         assert "message" in json_response or "order_id" in json_response or "whatsapp" in json_response, \
             "Response missing expected keys indicating order processing"
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         assert False, f"Request failed: {e}"
 
 
-test_TC010_process_order_checkout()
\ No newline at end of file
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,67 +1,18 @@
-import asyncio
-from playwright import async_api
+from harness import open_page, run_standalone
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Open an admin route URL in a new browser session without logging in to verify redirection to login page.
-        await page.goto('http://localhost:3000/admin', timeout=10000)
-        
 
-        assert 'Painel Administrativo' in await page.text_content('body'), 'Admin login page title not found'
-        assert await page.get_by_label('Email').is_visible(), 'Email input field not visible on login page'
-        assert await page.get_by_label('Senha').is_visible(), 'Password input field not visible on login page'
-        assert await page.get_by_role('button', { 'name': 'Entrar' }).is_visible(), 'Entrar button not visible on login page'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+async def run_test(context):
+    page = await open_page(context)
+
+    # Interact with the page elements to simulate user flow
+    # Open an admin route URL in a new browser session without logging in to verify redirection to login page.
+    await page.goto('http://localhost:3000/admin', timeout=10000)
+
+    assert 'Painel Administrativo' in await page.text_content('body'), 'Admin login page title not found'
+    assert await page.get_by_label('Email').is_visible(), 'Email input field not visible on login page'
+    assert await page.get_by_label('Senha').is_visible(), 'Password input field not visible on login page'
+    assert await page.get_by_role('button', { 'name': 'Entrar' }).is_visible(), 'Entrar button not visible on login page'
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,116 +1,58 @@
-import asyncio
-from playwright import async_api
-
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Try to access the debug page URL directly to verify access control without login.
-        await page.goto('http://localhost:3000/debug', timeout=10000)
-        
-
-        # Navigate to login page and log in as administrator.
-        await page.goto('http://localhost:3000/login', timeout=10000)
-        
-
-        # Look for any navigation or links on the main page or other pages to find the login page or admin login.
-        await page.goto('http://localhost:3000', timeout=10000)
-        
-
-        # Click the 'Open Next.js Dev Tools' button to check for admin login or debug page access.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=div/div/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on the 'Preferences' menu item in the dev tools panel to check for any login or admin settings.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=div/div[2]/div[2]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Close the Preferences menu by clicking the 'Close' button to explore other dev tools options.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=div/div[2]/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Click on the 'Issues' menu item in the dev tools panel to check for any relevant debug or log information.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=div/div[2]/div/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # Attempt to find or trigger administrator login to verify access control for debug and logs page.
-        await page.goto('http://localhost:3000/admin/login', timeout=10000)
-        
-
-        # Input administrator email and password, then click the 'Entrar' button to log in.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@example.com')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('adminpassword')
-        
-
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        assert False, 'Test failed: Expected result unknown, forcing failure.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+from harness import open_page, run_standalone
+from waits import ready
+
+
+async def run_test(context):
+    page = await open_page(context)
+
+    # Interact with the page elements to simulate user flow
+    # Try to access the debug page URL directly to verify access control without login.
+    await page.goto('http://localhost:3000/debug', timeout=10000)
+
+    # Navigate to login page and log in as administrator.
+    await page.goto('http://localhost:3000/login', timeout=10000)
+
+    # Look for any navigation or links on the main page or other pages to find the login page or admin login.
+    await page.goto('http://localhost:3000', timeout=10000)
+
+    # Click the 'Open Next.js Dev Tools' button to check for admin login or debug page access.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=div/div/div/div/button').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    # Click on the 'Preferences' menu item in the dev tools panel to check for any login or admin settings.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=div/div[2]/div[2]/div').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    # Close the Preferences menu by clicking the 'Close' button to explore other dev tools options.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=div/div[2]/div/div[2]/button').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    # Click on the 'Issues' menu item in the dev tools panel to check for any relevant debug or log information.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=div/div[2]/div/div').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    # Attempt to find or trigger administrator login to verify access control for debug and logs page.
+    await page.goto('http://localhost:3000/admin/login', timeout=10000)
+
+    # Input administrator email and password, then click the 'Entrar' button to log in.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div/input').nth(0)
+    await ready(elem); await elem.fill('admin@example.com')
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[2]/input').nth(0)
+    await ready(elem); await elem.fill('adminpassword')
+
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[3]/button').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    assert False, 'Test failed: Expected result unknown, forcing failure.'
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
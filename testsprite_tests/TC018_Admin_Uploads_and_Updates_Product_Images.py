@@ -1,115 +1,59 @@
-import asyncio
-from playwright import async_api
+from harness import open_page, run_standalone
+from waits import ready
+from isolation import scoped
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # Try to navigate to admin login or product management page by URL or find any other navigation element.
-        await page.goto('http://localhost:3000/admin', timeout=10000)
-        
 
-        # Input admin email and password, then click login button.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@pizzaria.com')
-        
+async def run_test(context):
+    page = await open_page(context)
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
+    # Interact with the page elements to simulate user flow
+    # Try to navigate to admin login or product management page by URL or find any other navigation element.
+    await page.goto('http://localhost:3000/admin', timeout=10000)
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Input admin email and password, then click login button.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div/input').nth(0)
+    await ready(elem); await elem.fill('admin@pizzaria.com')
 
-        # Click on 'Produtos' link to access product management page.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/header/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[2]/input').nth(0)
+    await ready(elem); await elem.fill('admin123')
 
-        # Click on 'Novo Produto' button to start adding a new product.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/div/div[2]/form/div[3]/button').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
 
-        # Fill in product name, select a category, fill description and prices, then save the product.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Pizza de Calabresa')
-        
+    # Click on 'Produtos' link to access product management page.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/header/div/div/nav/a[2]').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
 
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[3]/form/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Click on 'Novo Produto' button to start adding a new product.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div/main/div/div[2]/div/div/div[2]/button').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
 
-        # Select a category from the dropdown, fill description and prices, then save the product.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Fill in product name, select a category, fill description and prices, then save the product.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div[3]/form/div/div/input').nth(0)
+    await ready(elem); await elem.fill(scoped('Pizza de Calabresa'))
 
-        # Select a category from the dropdown list.
-        frame = context.pages[-1]
-        elem = frame.locator('xpath=html/body/div[4]/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div[3]/form/div/div[2]/button').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
 
-        assert False, 'Test plan execution failed: generic failure assertion.'
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+    # Select a category from the dropdown, fill description and prices, then save the product.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div[4]/div').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    # Select a category from the dropdown list.
+    frame = context.pages[-1]
+    elem = frame.locator('xpath=html/body/div[4]/div').nth(0)
+    await ready(elem); await elem.click(timeout=5000)
+
+    assert False, 'Test plan execution failed: generic failure assertion.'
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -0,0 +1,144 @@
+"""Shared async HTTP client for the TestSprite API cases.
+
+Every backend script exposes ``async def run_test(api)`` and talks to the app
+through one ``ApiClient``. Under pytest each case gets its own client, and so
+its own cookie jar: a case that checks unauthenticated access never inherits
+another case's admin login. The clients share one ``SharedTransport``, so the
+connection pool stays warm across cases, and one login cache, so the admin
+login is posted once per session and later ``login()`` calls copy its cookies. Independent requests can be fired
+concurrently with ``asyncio.gather``. Every call's latency is recorded in
+``api.calls``. ``run_standalone`` keeps ``python TCxxx.py`` working.
+"""
+
+import asyncio
+import time
+from collections import namedtuple
+
+import httpx
+
+BASE_URL = "http://localhost:3000"
+USERNAME = "admin@pizzaria.com"
+PASSWORD = "admin123"
+ADMIN_AUTH = (USERNAME, PASSWORD)
+
+TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+Call = namedtuple("Call", "method path status seconds")
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """Connection pool lent to several clients; closing a client leaves it open.
+
+    Call ``close`` once every client is done with it.
+    """
+
+    def __init__(self, limits=LIMITS):
+        self._transport = httpx.AsyncHTTPTransport(limits=limits)
+
+    async def handle_async_request(self, request):
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+    async def close(self):
+        await self._transport.aclose()
+
+
+def latency_summary(calls):
+    """Return ``{"METHOD path": (count, p50, p95)}`` in seconds."""
+    grouped = {}
+    for call in calls:
+        grouped.setdefault(f"{call.method} {call.path}", []).append(call.seconds)
+    summary = {}
+    for endpoint, samples in sorted(grouped.items()):
+        samples.sort()
+        p95_index = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+        summary[endpoint] = (len(samples), samples[len(samples) // 2], samples[p95_index])
+    return summary
+
+
+class ApiClient:
+    """Keep-alive client with a cached admin login and per-call timings."""
+
+    def __init__(self, base_url=BASE_URL, timeout=TIMEOUT, limits=LIMITS, transport=None, login_cache=None):
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=limits,
+            transport=transport,
+            headers={"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        self._login = None
+        self._login_lock = asyncio.Lock()
+        # {(email, password): cookies} shared by clients; None keeps logins per client
+        self._login_cache = login_cache
+        self.calls = []
+
+    async def request(self, method, path, **kwargs):
+        started = time.perf_counter()
+        status = None
+        try:
+            response = await self._client.request(method, path, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            self.calls.append(Call(method, path, status, time.perf_counter() - started))
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.request("PUT", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+    async def login(self, email=USERNAME, password=PASSWORD):
+        """Log in as admin once; later calls return the cached cookies.
+
+        With a shared ``login_cache`` the login is posted once for all clients
+        and the others copy its cookies. The session cookies live in the
+        client's cookie jar, so every request made after ``login()`` is
+        authenticated.
+        """
+        async with self._login_lock:
+            if self._login is None:
+                cached = self._login_cache.get((email, password)) if self._login_cache is not None else None
+                if cached is None:
+                    response = await self.post("/api/auth/login", json={"email": email, "password": password})
+                    assert response.status_code == 200, f"Login failed with status code {response.status_code}"
+                    cached = response.cookies
+                    if self._login_cache is not None:
+                        self._login_cache[(email, password)] = cached
+                else:
+                    self._client.cookies.update(cached)
+                self._login = cached
+            return self._login
+
+    def latency_summary(self):
+        """Return ``{"METHOD path": (count, p50, p95)}`` in seconds."""
+        return latency_summary(self.calls)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+async def _run_once(run_test):
+    async with ApiClient() as api:
+        await run_test(api)
+
+
+def run_standalone(run_test):
+    """Run a single API case outside pytest with its own client."""
+    asyncio.run(_run_once(run_test))
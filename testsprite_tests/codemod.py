@@ -0,0 +1,116 @@
+"""Rewrite TestSprite-generated UI scripts to use the shared harness and waits.
+
+TestSprite regenerates the TCxxx scripts with a private browser launch and a
+fixed ``page.wait_for_timeout(3000)`` before every interaction. This codemod
+turns such a script into the ``run_test(context)`` form collected by
+conftest.py and swaps each fixed sleep for the matching event-driven wait
+from waits.py. Already rewritten scripts are left untouched.
+
+Usage:
+    python codemod.py                 # rewrite every TC*.py next to this file
+    python codemod.py --check         # exit 1 if any script still needs rewriting
+    python codemod.py TC018_*.py      # rewrite selected scripts
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+# Everything between ``async def run_test():`` and the iframe wait loop is
+# the generated launch/navigation boilerplate that harness.open_page replaces.
+GENERATED_HEADER = re.compile(
+    r"^import asyncio\nfrom playwright import async_api\n\nasync def run_test\(\):\n"
+    r".*?# Iterate through all iframes and wait for them to load as well\n"
+    r"\s*for frame in page\.frames:\n.*?pass\n",
+    re.DOTALL,
+)
+GENERATED_FOOTER = re.compile(r"\n\s*finally:\n.*?asyncio\.run\(run_test\(\)\)\s*$", re.DOTALL)
+
+SLEEP_BEFORE_ACTION = re.compile(r"await page\.wait_for_timeout\(\d+\); await (\w+)\.")
+BARE_SLEEP = re.compile(r"^(\s*)await page\.wait_for_timeout\(\d+\)\s*$", re.MULTILINE)
+TRAILING_SLEEP = re.compile(r"\n\s*await asyncio\.sleep\(\d+\)\n")
+WINDOW_HEIGHT = re.compile(r"(?<!\")\bwindow\.innerHeight\b")
+
+
+def _to_harness_form(source):
+    header = GENERATED_HEADER.search(source)
+    footer = GENERATED_FOOTER.search(source)
+    if not header or not footer:
+        return source
+
+    body = []
+    for line in source[header.end():footer.start()].split("\n"):
+        # The generated body lives inside ``try:``; drop one indentation level.
+        body.append(line[4:] if line.strip() else "")
+    while body and not body[0]:
+        body.pop(0)
+
+    return "\n".join(
+        ["import asyncio", "", "from harness import open_page, run_standalone", "", "",
+         "async def run_test(context):", "    page = await open_page(context)", ""]
+        + body
+        + ["", "", 'if __name__ == "__main__":', "    run_standalone(run_test)", ""]
+    )
+
+
+def _replace_sleeps(source):
+    source = SLEEP_BEFORE_ACTION.sub(r"await ready(\1); await \1.", source)
+    source = BARE_SLEEP.sub(r"\1await settle(page)", source)
+    source = TRAILING_SLEEP.sub("\n", source)
+    source = WINDOW_HEIGHT.sub('await page.evaluate("window.innerHeight")', source)
+    return source
+
+
+def _fix_imports(source):
+    lines = source.split("\n")
+    code = "\n".join(line for line in lines if not line.startswith(("import ", "from ")))
+
+    helpers = [name for name in ("ready", "settle") if re.search(rf"\b{name}\(", code)]
+    if helpers and "from waits import" not in source:
+        harness_import = lines.index("from harness import open_page, run_standalone")
+        lines.insert(harness_import + 1, f"from waits import {', '.join(helpers)}")
+    if "import asyncio" in lines and "asyncio." not in code:
+        lines.remove("import asyncio")
+        if lines and not lines[0]:
+            lines.pop(0)
+    return "\n".join(lines)
+
+
+def rewrite(source):
+    """Return ``source`` rewritten to the harness/waits form."""
+    if "from playwright import" not in source and "from harness import" not in source:
+        return source  # API script, nothing to do
+    source = _to_harness_form(source)
+    source = _replace_sleeps(source)
+    source = re.sub(r"\n{3,}(?=\s+\S)", "\n\n", source)
+    return _fix_imports(source)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", type=Path)
+    parser.add_argument("--check", action="store_true", help="only report scripts that need rewriting")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(HERE.glob("TC*.py"))
+    pending = []
+    for path in paths:
+        source = path.read_text(encoding="utf-8")
+        rewritten = rewrite(source)
+        if rewritten == source:
+            continue
+        pending.append(path)
+        if not args.check:
+            path.write_text(rewritten, encoding="utf-8")
+
+    verb = "needs rewriting" if args.check else "rewritten"
+    for path in pending:
+        print(f"{path.name}: {verb}")
+    return 1 if args.check and pending else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Pytest harness for the TestSprite cases.
+
+The TCxxx_*.py scripts are collected as test modules, each contributing its
+``run_test`` coroutine. UI scripts take ``run_test(context)``: all of them
+share one Chromium launched once per session, each with its own fresh
+BrowserContext. API scripts take ``run_test(api)``: each gets a fresh
+ApiClient, so cookies never leak between cases (an "unauthenticated" case
+must not run with another case's admin login), over one connection pool
+shared by the session. The admin login is posted once per session and only
+copied into the cookie jars of cases that call ``api.login()``.
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import re
+
+import pytest
+
+TESTSPRITE_FILE = re.compile(r"^TC\d+_.+\.py$")
+
+# Third-party packages the scripts import at module level. When one of them
+# is missing the script is reported as skipped instead of a collection error.
+OPTIONAL_DEPENDENCIES = {"playwright", "httpx"}
+
+# run_parallel.py points each worker at its own JSON-lines results file.
+RESULTS_FILE = os.environ.get("TESTSPRITE_RESULTS_FILE")
+
+# Calls made by every API case, for the latency summary.
+_API_CALLS = []
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--local-supabase",
+        action="store_true",
+        help="serve the Supabase REST API from local_supabase.py on its default port for the session; "
+             "start the app with NEXT_PUBLIC_SUPABASE_URL pointing at it",
+    )
+
+
+def pytest_collect_file(file_path, parent):
+    # Files passed explicitly on the command line are already collected by
+    # pytest's python plugin, which builds them via pytest_pycollect_makemodule.
+    if TESTSPRITE_FILE.match(file_path.name) and not parent.session.isinitpath(file_path):
+        return TestSpriteModule.from_parent(parent, path=file_path)
+    return None
+
+
+def pytest_pycollect_makemodule(module_path, parent):
+    if TESTSPRITE_FILE.match(module_path.name):
+        return TestSpriteModule.from_parent(parent, path=module_path)
+    return None
+
+
+class TestSpriteModule(pytest.Module):
+    """A TCxxx script, with ``run_test`` exposed as a pytest case."""
+
+    def collect(self):
+        try:
+            module = self.obj
+        except self.CollectError as exc:
+            missing = exc.__cause__
+            if isinstance(missing, ModuleNotFoundError) and missing.name in OPTIONAL_DEPENDENCIES:
+                pytest.skip(f"{missing.name} is not installed", allow_module_level=True)
+            raise
+
+        items = list(super().collect())
+        run_test = getattr(module, "run_test", None)
+        if inspect.iscoroutinefunction(run_test):
+            items.append(pytest.Function.from_parent(self, name="run_test", callobj=_sync_case(run_test)))
+        return items
+
+
+def _sync_case(run_test):
+    """Wrap ``run_test`` so pytest injects its fixtures and runs it on the session loop."""
+    parameters = inspect.signature(run_test).parameters
+
+    def test_case(session_loop, **fixtures):
+        session_loop.run_until_complete(run_test(**fixtures))
+
+    test_case.__signature__ = inspect.Signature(
+        [inspect.Parameter("session_loop", inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+        + [parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY) for parameter in parameters.values()]
+    )
+    return test_case
+
+
+@pytest.fixture(scope="session", autouse=True)
+def local_supabase(request):
+    """The in-process PostgREST stand-in, when --local-supabase is given."""
+    if not request.config.getoption("--local-supabase"):
+        yield None
+        return
+    import local_supabase
+
+    server = local_supabase.serve(port=local_supabase.DEFAULT_PORT)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture(scope="session")
+def session_loop():
+    """Event loop that owns the session browser, the API client and every case."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def browser(session_loop):
+    """One Chromium shared by every UI case in the session."""
+    async_api = pytest.importorskip("playwright.async_api")
+    import harness
+
+    pw = session_loop.run_until_complete(async_api.async_playwright().start())
+    browser = session_loop.run_until_complete(harness.launch_browser(pw))
+    yield browser
+    session_loop.run_until_complete(browser.close())
+    session_loop.run_until_complete(pw.stop())
+
+
+@pytest.fixture
+def context(request, session_loop, browser):
+    """Fresh BrowserContext per case, so cookies and storage never leak.
+
+    The performance metrics of every page the case loaded are attached to the
+    case as the ``web_vitals`` user property (see vitals.py).
+    """
+    import harness
+    import vitals
+
+    context = session_loop.run_until_complete(harness.new_context(browser))
+    yield context
+    request.node.user_properties.append(("web_vitals", session_loop.run_until_complete(vitals.collect(context))))
+    session_loop.run_until_complete(context.close())
+
+
+@pytest.fixture(scope="session")
+def api_transport(session_loop):
+    """Connection pool shared by the API clients of the session."""
+    import api_client
+
+    transport = api_client.SharedTransport()
+    yield transport
+    session_loop.run_until_complete(transport.close())
+
+
+@pytest.fixture(scope="session")
+def api_logins():
+    """Admin login cookies, posted once per session and copied by ``api.login()``."""
+    return {}
+
+
+@pytest.fixture
+def api(session_loop, api_transport, api_logins):
+    """Fresh API client per case, with its own cookie jar, on the shared pool."""
+    import api_client
+
+    client = api_client.ApiClient(transport=api_transport, login_cache=api_logins)
+    yield client
+    session_loop.run_until_complete(client.aclose())
+    _API_CALLS.extend(client.calls)
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _API_CALLS:
+        return
+    import api_client
+
+    terminalreporter.section("API latency")
+    for endpoint, (count, p50, p95) in api_client.latency_summary(_API_CALLS).items():
+        terminalreporter.write_line(f"{endpoint}: {count} calls, p50 {p50 * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms")
+
+
+def _write(record):
+    with open(RESULTS_FILE, "a", encoding="utf-8") as results:
+        results.write(json.dumps(record) + "\n")
+
+
+def _record(path, outcome, duration, error):
+    _write({"file": os.path.basename(str(path)), "outcome": outcome, "duration": duration, "error": error})
+
+
+def pytest_collectreport(report):
+    if RESULTS_FILE and TESTSPRITE_FILE.match(os.path.basename(report.nodeid)):
+        if report.failed or report.skipped:
+            _record(report.nodeid, report.outcome, 0.0, report.longreprtext)
+
+
+def pytest_runtest_logreport(report):
+    if not RESULTS_FILE:
+        return
+    if report.when == "call" or report.failed or report.skipped:
+        _record(report.fspath, report.outcome, report.duration, report.longreprtext)
+    if report.when == "teardown":
+        web_vitals = dict(report.user_properties).get("web_vitals")
+        if web_vitals:
+            _write({"file": os.path.basename(str(report.fspath)), "webVitals": web_vitals})
@@ -0,0 +1,84 @@
+"""Shared Playwright plumbing for the TestSprite UI cases.
+
+Every UI script exposes ``async def run_test(context)`` and receives a fresh
+BrowserContext. Under pytest the context comes from one browser shared by the
+whole session (see conftest.py); ``run_standalone`` keeps ``python TCxxx.py``
+working on its own by launching a private browser for a single run.
+"""
+
+import asyncio
+
+from playwright import async_api
+
+import vitals
+import waits
+
+BASE_URL = "http://localhost:3000"
+
+# --single-process is deliberately absent: a single-process Chromium cannot
+# host the many contexts a shared session browser hands out.
+BROWSER_ARGS = [
+    "--window-size=1280,720",         # Set the browser window size
+    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+    "--ipc=host",                     # Use host-level IPC for better stability
+]
+
+DEFAULT_TIMEOUT_MS = 5000
+
+
+async def launch_browser(pw):
+    """Launch the headless Chromium used by the UI cases."""
+    return await pw.chromium.launch(headless=True, args=BROWSER_ARGS)
+
+
+async def new_context(browser):
+    """Create an isolated context (like an incognito window) for one case."""
+    context = await browser.new_context()
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    waits.track_context(context)
+    await vitals.track_context(context)
+    return context
+
+
+async def open_page(context, url=BASE_URL):
+    """Open a page on ``url`` and wait until its initial data has rendered."""
+    page = await context.new_page()
+
+    # Navigate to the target URL and wait until the network request is committed
+    await page.goto(url, wait_until="commit", timeout=10000)
+
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
+        try:
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
+        except async_api.Error:
+            pass
+
+    # Wait for the Supabase queries fired on mount and the render they trigger
+    await waits.settle(page)
+
+    return page
+
+
+async def _run_once(run_test):
+    async with async_api.async_playwright() as pw:
+        browser = await launch_browser(pw)
+        try:
+            context = await new_context(browser)
+            try:
+                await run_test(context)
+            finally:
+                await context.close()
+        finally:
+            await browser.close()
+
+
+def run_standalone(run_test):
+    """Run a single UI case outside pytest with its own browser."""
+    asyncio.run(_run_once(run_test))
@@ -0,0 +1,18 @@
+"""Per-worker isolation for TestSprite cases run in parallel.
+
+run_parallel.py starts each worker with TESTSPRITE_WORKER and
+TESTSPRITE_DATA_PREFIX set. Cases that create rows wrap the names they
+create with ``scoped`` so concurrent workers never collide on the same
+product or category. Outside the parallel runner the prefix is empty and
+names are left as generated.
+"""
+
+import os
+
+WORKER_ID = os.environ.get("TESTSPRITE_WORKER", "0")
+DATA_PREFIX = os.environ.get("TESTSPRITE_DATA_PREFIX", "")
+
+
+def scoped(name):
+    """Return ``name`` prefixed with this worker's data prefix."""
+    return f"{DATA_PREFIX}{name}"
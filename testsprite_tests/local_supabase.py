@@ -0,0 +1,721 @@
+"""Local stand-in for the Supabase REST API (PostgREST) used by the app.
+
+Serves ``/rest/v1/<table>`` from an in-memory database so the app and the
+TestSprite suite can run offline with deterministic, sub-millisecond backend
+latency. Column types and defaults are read from the migrations in
+``scripts/*.sql`` and the tables are seeded from the dumps in
+``sql/*_rows.sql``.
+
+Only the PostgREST subset that supabase-js issues for this app is covered:
+``select`` with column lists, the ``eq/neq/gt/gte/lt/lte/like/ilike/is/in``
+filters (optionally negated with ``not.``), ``or``/``and`` logic trees with
+quoted values, ``order``, ``limit``/``offset``,
+``Prefer: count=exact``, single-object responses (``.single()`` /
+``.maybeSingle()``), ``insert``/``upsert``, ``update`` and ``delete``.
+Tables without a migration are served as empty schemaless tables.
+``/rest/v1/rpc/<function>`` answers the SQL functions the server calls
+(``criar_pedido`` and the admin batch functions of scripts/23), each
+reimplemented as one atomic ``Database`` method.
+
+It also answers ViaCEP lookups on ``/ws/<cep>/json/`` from ``CEP_FIXTURES``
+(unknown CEPs get ViaCEP's ``{"erro": true}``), so CEP searches stay offline
+too when the app runs with ``NEXT_PUBLIC_CEP_API_URL=<url>/ws``.
+
+Usage:
+    python local_supabase.py --port 54321
+
+then start the app against it:
+    NEXT_PUBLIC_SUPABASE_URL=http://127.0.0.1:54321 \\
+    NEXT_PUBLIC_SUPABASE_ANON_KEY=local-standin \\
+    NEXT_PUBLIC_CEP_API_URL=http://127.0.0.1:54321/ws npm run dev
+"""
+
+import argparse
+import copy
+import datetime
+import json
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = REPO_ROOT / "scripts"
+DUMPS_DIR = REPO_ROOT / "sql"
+
+DEFAULT_PORT = 54321
+# Any key is accepted; this is the one printed for the app and used by menu_load.py
+ANON_KEY = "local-standin"
+SINGLE_OBJECT = "application/vnd.pgrst.object+json"
+ID_NAMESPACE = uuid.UUID("6f1c7d2e-9b1a-4c59-8f5e-2d1f0a7c3b10")
+
+# Addresses served by the ViaCEP stand-in, keyed by the 8-digit CEP
+CEP_FIXTURES = {
+    "01001000": {"logradouro": "Praça da Sé", "bairro": "Sé", "localidade": "São Paulo", "uf": "SP",
+                 "ibge": "3550308", "ddd": "11"},
+    "12243000": {"logradouro": "Avenida São João", "bairro": "Jardim Esplanada",
+                 "localidade": "São José dos Campos", "uf": "SP", "ibge": "3549904", "ddd": "12"},
+    "12245000": {"logradouro": "Avenida Nelson D'Ávila", "bairro": "Centro",
+                 "localidade": "São José dos Campos", "uf": "SP", "ibge": "3549904", "ddd": "12"},
+    "20040002": {"logradouro": "Rua da Assembleia", "bairro": "Centro", "localidade": "Rio de Janeiro",
+                 "uf": "RJ", "ibge": "3304557", "ddd": "21"},
+}
+
+_TYPE_WORDS = {
+    "uuid": "text", "varchar": "text", "text": "text", "char": "text", "character": "text",
+    "timestamp": "text", "timestamptz": "text", "date": "text", "time": "text",
+    "decimal": "float", "numeric": "float", "real": "float", "double": "float", "float": "float",
+    "integer": "int", "int": "int", "bigint": "int", "smallint": "int", "serial": "serial", "bigserial": "serial",
+    "boolean": "bool", "bool": "bool",
+    "json": "json", "jsonb": "json",
+}
+_COLUMN = re.compile(r"^\s*(\w+)\s+(\w+)(.*)$", re.MULTILINE)
+_DEFAULT = re.compile(r"DEFAULT\s+('(?:[^']|'')*'|[\w.()-]+)", re.IGNORECASE)
+_ADD_COLUMN = re.compile(r"ADD\s+COLUMN\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s+(\w+)([^,;]*)", re.IGNORECASE)
+
+
+class PostgrestError(Exception):
+    """Error rendered as a PostgREST JSON error body."""
+
+    def __init__(self, status, code, message, details=None):
+        super().__init__(message)
+        self.status = status
+        self.body = {"code": code, "message": message, "details": details, "hint": None}
+
+
+# --------------------------------------------------------------------------
+# Schema and seed data
+# --------------------------------------------------------------------------
+
+def _read_sql(path):
+    raw = Path(path).read_bytes()
+    # Some migrations were saved from Windows tools as UTF-16 with a BOM.
+    encoding = "utf-16" if raw[:2] in (b"\xff\xfe", b"\xfe\xff") else "utf-8-sig"
+    return raw.decode(encoding)
+
+
+def _strip_comments(sql):
+    return re.sub(r"--[^\n]*", "", sql)
+
+
+def _parse_default(rest):
+    match = _DEFAULT.search(rest)
+    if not match:
+        return None
+    raw = match.group(1)
+    lowered = raw.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("now()", "gen_random_uuid()", "null"):
+        return lowered
+    if raw.startswith("'"):
+        literal = raw[1:raw.rindex("'")].replace("''", "'")
+        return literal
+    try:
+        return float(raw) if "." in raw else int(raw)
+    except ValueError:
+        return None
+
+
+def _column(type_word, rest):
+    kind = _TYPE_WORDS.get(type_word.lower())
+    if kind is None:
+        return None
+    default = _parse_default(rest)
+    if kind == "json" and isinstance(default, str) and default[:1] in "[{":
+        default = json.loads(default)
+    return {"type": kind, "default": default}
+
+
+def load_schema(scripts_dir=SCRIPTS_DIR):
+    """Replay the migrations and return ``{table: {column: {type, default}}}``."""
+    schema = {}
+    for path in sorted(Path(scripts_dir).glob("*.sql")):
+        for statement in _strip_comments(_read_sql(path)).split(";"):
+            create = re.search(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s*\((.*)\)", statement, re.IGNORECASE | re.DOTALL)
+            if create:
+                table, body = create.groups()
+                if table in schema:
+                    continue  # CREATE TABLE IF NOT EXISTS on an existing table is a no-op
+                columns = {}
+                for name, type_word, rest in _COLUMN.findall(body):
+                    column = _column(type_word, rest)
+                    if column and name.upper() not in ("PRIMARY", "UNIQUE", "CONSTRAINT", "CHECK", "FOREIGN"):
+                        columns[name] = column
+                schema[table] = columns
+                continue
+            drop = re.search(r"DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(\w+)", statement, re.IGNORECASE)
+            if drop:
+                schema.pop(drop.group(1), None)
+                continue
+            alter = re.search(r"ALTER\s+TABLE\s+(\w+)", statement, re.IGNORECASE)
+            if alter and alter.group(1) in schema:
+                for name, type_word, rest in _ADD_COLUMN.findall(statement):
+                    column = _column(type_word, rest)
+                    if column:
+                        schema[alter.group(1)].setdefault(name, column)
+    return schema
+
+
+def _split_tuples(values_sql):
+    """Yield the raw value lists of ``(...), (...)`` honouring quoted strings."""
+    depth, start, quoted, index = 0, None, False, 0
+    while index < len(values_sql):
+        char = values_sql[index]
+        if quoted:
+            if char == "'":
+                if values_sql[index + 1:index + 2] == "'":
+                    index += 1
+                else:
+                    quoted = False
+        elif char == "'":
+            quoted = True
+        elif char == "(":
+            depth += 1
+            if depth == 1:
+                start = index + 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                yield values_sql[start:index]
+        index += 1
+
+
+def _split_values(tuple_sql):
+    values = re.findall(r"\s*('(?:[^']|'')*'|[^,]+)\s*(?:,|$)", tuple_sql)
+    return [None if value.strip().lower() == "null" else
+            value[1:-1].replace("''", "'") if value.startswith("'") else value.strip()
+            for value in values]
+
+
+def _convert(raw, column):
+    if raw is None:
+        return None
+    kind = column["type"] if column else None
+    if kind == "bool" or (kind is None and raw in ("true", "false")):
+        return raw.lower() in ("true", "t")
+    if kind in ("int", "serial"):
+        return int(raw)
+    if kind == "float":
+        return float(raw)
+    if kind == "json" or (kind is None and raw[:1] in "[{"):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def load_rows(dumps_dir=DUMPS_DIR, schema=None):
+    """Parse the ``INSERT INTO`` dumps into typed rows per table."""
+    schema = schema or {}
+    rows = {}
+    for path in sorted(Path(dumps_dir).glob("*_rows.sql")):
+        sql = _read_sql(path)
+        for match in re.finditer(r'INSERT INTO\s+(?:"\w+"\.)?"?(\w+)"?\s*\(([^)]*)\)\s*VALUES\s*', sql):
+            table = match.group(1)
+            columns = [name.strip().strip('"') for name in match.group(2).split(",")]
+            types = schema.get(table, {})
+            end = sql.find(";\n", match.end())
+            for tuple_sql in _split_tuples(sql[match.end():end if end != -1 else len(sql)]):
+                values = _split_values(tuple_sql)
+                rows.setdefault(table, []).append(
+                    {name: _convert(value, types.get(name)) for name, value in zip(columns, values)}
+                )
+    return rows
+
+
+# --------------------------------------------------------------------------
+# Query evaluation
+# --------------------------------------------------------------------------
+
+def _coerce_like(raw, sample):
+    """Convert a filter literal to the type of the value it is compared with."""
+    if isinstance(sample, bool):
+        return raw.lower() in ("true", "t")
+    if isinstance(sample, (int, float)):
+        try:
+            return float(raw)
+        except ValueError:
+            return raw
+    return raw
+
+
+def _like(pattern, value, flags=0):
+    regex = "^" + ".*".join(re.escape(part) for part in pattern.replace("*", "%").split("%")) + "$"
+    return value is not None and re.match(regex, str(value), flags | re.DOTALL) is not None
+
+
+def _parse_in(raw):
+    inner = raw.strip()[1:-1]
+    return [item.strip().strip('"') for item in re.findall(r'"[^"]*"|[^,]+', inner)]
+
+
+def _matches(row, column, expression):
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, raw = expression.partition(".")
+    value = row.get(column)
+
+    if operator == "is":
+        literal = {"null": None, "true": True, "false": False}.get(raw.lower(), raw)
+        result = value is literal if literal is None or isinstance(literal, bool) else value == literal
+    elif operator == "in":
+        result = value in [_coerce_like(item, value) for item in _parse_in(raw)]
+    elif operator == "like":
+        result = _like(raw, value)
+    elif operator == "ilike":
+        result = _like(raw, value, re.IGNORECASE)
+    elif operator in ("eq", "neq", "gt", "gte", "lt", "lte"):
+        if value is None:
+            result = False
+        else:
+            other = _coerce_like(raw, value)
+            try:
+                result = {
+                    "eq": value == other, "neq": value != other,
+                    "gt": value > other, "gte": value >= other,
+                    "lt": value < other, "lte": value <= other,
+                }[operator]
+            except TypeError:
+                result = False
+    else:
+        raise PostgrestError(400, "PGRST100", f'"failed to parse filter ({operator}.{raw})"')
+    return not result if negate else result
+
+
+def _split_terms(text):
+    """Split a logic tree body on the commas that are not nested or quoted."""
+    terms, depth, quoted, start, index = [], 0, False, 0, 0
+    while index < len(text):
+        char = text[index]
+        if quoted and char == "\\":
+            index += 1
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            terms.append(text[start:index])
+            start = index + 1
+        index += 1
+    terms.append(text[start:])
+    return [term for term in terms if term]
+
+
+def _unquote(raw):
+    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", raw[1:-1])
+    return raw
+
+
+def _matches_logic(row, operator, tree):
+    """Evaluate ``or=(...)``/``and=(...)``, e.g. ``(a.gt.1,and(a.eq.1,id.gt."x"))``."""
+    if not (tree.startswith("(") and tree.endswith(")")):
+        raise PostgrestError(400, "PGRST100", f'"failed to parse logic tree ({tree})"')
+    results = []
+    for term in _split_terms(tree[1:-1]):
+        negate = term.startswith("not.")
+        body = term[4:] if negate else term
+        nested = re.match(r"(and|or)(\(.*\))$", body)
+        if nested:
+            result = _matches_logic(row, nested.group(1), nested.group(2))
+        else:
+            column, _, expression = body.partition(".")
+            operator_name, _, raw = expression.partition(".")
+            result = _matches(row, column, f"{operator_name}.{_unquote(raw)}")
+        results.append(not result if negate else result)
+    return any(results) if operator == "or" else all(results)
+
+
+def _apply_order(rows, order):
+    # Stable sorts applied from the last term to the first give multi-column order.
+    for term in reversed([term for term in order.split(",") if term]):
+        column, *modifiers = term.split(".")
+        descending = "desc" in modifiers
+        # Postgres defaults: NULLS LAST for ASC, NULLS FIRST for DESC.
+        nulls_first = "nullsfirst" in modifiers or (descending and "nullslast" not in modifiers)
+        nulls = [row for row in rows if row.get(column) is None]
+        values = sorted((row for row in rows if row.get(column) is not None),
+                        key=lambda row: row[column], reverse=descending)
+        rows = nulls + values if nulls_first else values + nulls
+    return rows
+
+
+def _project(row, columns):
+    if columns == ["*"]:
+        return dict(row)
+    return {column: row.get(column) for column in columns}
+
+
+class Database:
+    """Thread-safe in-memory tables seeded from the SQL dumps."""
+
+    def __init__(self, schema=None, seed=None):
+        self.schema = load_schema() if schema is None else schema
+        self._seed = load_rows(schema=self.schema) if seed is None else seed
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Restore the seeded rows, dropping everything written since."""
+        with self._lock:
+            self.tables = copy.deepcopy(self._seed)
+            self._ids = 0
+
+    def _table(self, name):
+        return self.tables.setdefault(name, [])
+
+    def _filtered(self, table, filters):
+        def matches(row, column, expr):
+            if column in ("or", "and"):
+                return _matches_logic(row, column, expr)
+            return _matches(row, column, expr)
+        return [row for row in self._table(table) if all(matches(row, column, expr) for column, expr in filters)]
+
+    def select(self, table, filters=(), columns=("*",), order="", limit=None, offset=0):
+        """Return ``(rows, total)`` where ``total`` ignores limit/offset."""
+        with self._lock:
+            rows = self._filtered(table, filters)
+            total = len(rows)
+            if order:
+                rows = _apply_order(rows, order)
+            rows = rows[offset:offset + limit if limit is not None else None]
+            return [_project(row, list(columns)) for row in rows], total
+
+    def _new_row(self, table, values):
+        row = {}
+        for name, column in self.schema.get(table, {}).items():
+            default = column["default"]
+            if column["type"] == "serial":
+                default = max((r.get(name) or 0 for r in self._table(table)), default=0) + 1
+            elif default == "gen_random_uuid()":
+                self._ids += 1
+                default = str(uuid.uuid5(ID_NAMESPACE, f"{table}:{self._ids}"))
+            elif default == "now()":
+                default = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            elif default == "null":
+                default = None
+            row[name] = copy.deepcopy(default)
+        row.update(values)
+        return row
+
+    def insert(self, table, records, on_conflict=None, merge=False, ignore=False):
+        with self._lock:
+            created = []
+            key = on_conflict or "id"
+            for values in records:
+                existing = next((row for row in self._table(table)
+                                 if key in values and row.get(key) == values[key]), None)
+                if existing is not None:
+                    if ignore:
+                        continue
+                    if not merge:
+                        raise PostgrestError(409, "23505", f'duplicate key value violates unique constraint "{table}_pkey"')
+                    existing.update(values)
+                    created.append(dict(existing))
+                    continue
+                row = self._new_row(table, values)
+                self._table(table).append(row)
+                created.append(dict(row))
+            return created
+
+    def update(self, table, filters, values):
+        with self._lock:
+            updated = []
+            for row in self._filtered(table, filters):
+                row.update(values)
+                if "updated_at" in self.schema.get(table, {}):
+                    row["updated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+                updated.append(dict(row))
+            return updated
+
+    def delete(self, table, filters):
+        with self._lock:
+            doomed = self._filtered(table, filters)
+            self.tables[table] = [row for row in self._table(table) if row not in doomed]
+            return [dict(row) for row in doomed]
+
+    def rpc(self, name, args):
+        """Run ``rpc_<name>`` with the JSON arguments under the lock; returns rows."""
+        function = getattr(self, f"rpc_{name}", None)
+        if function is None:
+            raise PostgrestError(404, "PGRST202", f"Could not find the function public.{name}")
+        with self._lock:
+            return function(**(args or {}))
+
+    def rpc_criar_pedido(self, p_idempotency_key, p_pedido, p_itens):
+        """Mirror of ``criar_pedido`` (scripts/21): order and items in one
+        write, replaying the stored order when the key was already used."""
+        if not p_itens:
+            raise PostgrestError(400, "22023", "Pedido sem itens")
+        receipt = lambda row, duplicate: [{"id": row["id"], "numero": row["numero"],
+                                           "created_at": row["created_at"], "duplicado": duplicate}]
+        for row in self._table("pedidos"):
+            if row.get("idempotency_key") == p_idempotency_key:
+                return receipt(row, True)
+
+        fields = ("tipo_entrega", "endereco_entrega", "forma_pagamento", "subtotal", "taxa_entrega",
+                  "total", "observacoes", "cliente_nome", "cliente_telefone")
+        order = self._new_row("pedidos", {**{name: p_pedido.get(name) for name in fields if name in p_pedido},
+                                          "idempotency_key": p_idempotency_key, "enviado_whatsapp": True})
+        self._table("pedidos").append(order)
+        product_ids = {row["id"] for row in self._table("produtos")}
+        for item in p_itens:
+            values = {name: item.get(name) for name in ("nome_produto", "tamanho", "sabores", "quantidade",
+                                                        "preco_unitario", "preco_total", "adicionais", "borda")}
+            values["pedido_id"] = order["id"]
+            values["produto_id"] = item.get("produto_id") if item.get("produto_id") in product_ids else None
+            self._table("pedido_itens").append(self._new_row("pedido_itens", values))
+        return receipt(order, False)
+
+    def rpc_buscar_pedido(self, p_id):
+        """Mirror of ``buscar_pedido`` (scripts/21): one order with its items, or null."""
+        for row in self._table("pedidos"):
+            if row["id"] == p_id:
+                items = [dict(item) for item in self._table("pedido_itens") if item.get("pedido_id") == p_id]
+                return {**row, "pedido_itens": items}
+        return None
+
+    # Whitelists of the batch functions in scripts/23
+    _BATCH_FLAGS = {("produtos", "ativo"), ("produtos", "promocao"), ("categorias", "ativo"),
+                    ("opcoes_sabores", "ativo"), ("bordas_recheadas", "ativo"), ("carousel_images", "ativo")}
+    _BATCH_ORDERED = {"produtos", "categorias", "opcoes_sabores", "bordas_recheadas", "carousel_images"}
+    _PRICE_COLUMNS = ("preco_tradicional", "preco_broto", "preco_promocional_tradicional", "preco_promocional_broto")
+
+    def _batch_update(self, table, changes):
+        """Apply ``{id: {column: value}}`` to ``table``; returns the row count."""
+        total = 0
+        for row in self._table(table):
+            if row.get("id") in changes:
+                row.update(changes[row["id"]])
+                if "updated_at" in self.schema.get(table, {}):
+                    row["updated_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+                total += 1
+        return total
+
+    def rpc_atualizar_flags_em_lote(self, p_tabela, p_coluna, p_valores):
+        """Mirror of ``atualizar_flags_em_lote`` (scripts/23)."""
+        if (p_tabela, p_coluna) not in self._BATCH_FLAGS:
+            raise PostgrestError(400, "22023", f"Coluna {p_tabela}.{p_coluna} não pode ser alterada em lote")
+        return self._batch_update(p_tabela, {id_: {p_coluna: bool(value)} for id_, value in (p_valores or {}).items()})
+
+    def rpc_reordenar_em_lote(self, p_tabela, p_ids):
+        """Mirror of ``reordenar_em_lote`` (scripts/23): ``ordem`` = position, from 1."""
+        if p_tabela not in self._BATCH_ORDERED:
+            raise PostgrestError(400, "22023", f"Tabela {p_tabela} não pode ser reordenada em lote")
+        return self._batch_update(p_tabela, {id_: {"ordem": position} for position, id_ in enumerate(p_ids or [], 1)})
+
+    def rpc_reajustar_precos(self, p_percentual, p_ids=None, p_categoria_id=None):
+        """Mirror of ``reajustar_precos`` (scripts/23)."""
+        if p_percentual is None or p_percentual <= -100:
+            raise PostgrestError(400, "22023", f"Percentual inválido: {p_percentual}")
+        factor = 1 + p_percentual / 100
+        changes = {
+            row["id"]: {column: None if row.get(column) is None else round(row[column] * factor, 2)
+                        for column in self._PRICE_COLUMNS}
+            for row in self._table("produtos")
+            if (p_ids is None or row["id"] in p_ids)
+            and (p_categoria_id is None or row.get("categoria_id") == p_categoria_id)
+        }
+        return self._batch_update("produtos", changes)
+
+
+# --------------------------------------------------------------------------
+# HTTP layer
+# --------------------------------------------------------------------------
+
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    database = None  # set by serve()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # keep test output clean
+
+    def _send(self, status, body=None, headers=None):
+        payload = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Expose-Headers", "Content-Range")
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(0 if self.command == "HEAD" else len(payload)))
+        self.end_headers()
+        if self.command != "HEAD" and payload:
+            self.wfile.write(payload)
+
+    def _route(self):
+        url = urlsplit(self.path)
+        match = re.fullmatch(r"/rest/v1/(\w+)/?", url.path)
+        if not match:
+            raise PostgrestError(404, "PGRST125", f"Invalid path specified in request URL: {url.path}")
+        params = parse_qsl(url.query, keep_blank_values=True)
+        filters = [(key, value) for key, value in params if key not in _RESERVED_PARAMS]
+        return match.group(1), dict(params), filters
+
+    def _prefer(self):
+        return {item.strip() for item in self.headers.get("Prefer", "").split(",") if item.strip()}
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = json.loads(self.rfile.read(length) or b"null") if length else None
+        return data
+
+    def _respond_rows(self, status, rows, total=None, offset=0):
+        prefer = self._prefer()
+        headers = {}
+        if total is not None:
+            last = offset + len(rows) - 1
+            span = f"{offset}-{last}" if rows else "*"
+            headers["Content-Range"] = f"{span}/{total if 'count=exact' in prefer else '*'}"
+        if SINGLE_OBJECT in self.headers.get("Accept", ""):
+            if len(rows) != 1:
+                raise PostgrestError(
+                    406, "PGRST116", "JSON object requested, multiple (or no) rows returned",
+                    f"The result contains {len(rows)} rows",
+                )
+            return self._send(status, rows[0], headers)
+        return self._send(status, rows, headers)
+
+    def _handle(self, action):
+        try:
+            action()
+        except PostgrestError as error:
+            self._send(error.status, error.body)
+        except (ValueError, TypeError) as error:
+            self._send(400, PostgrestError(400, "PGRST102", str(error)).body)
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, POST, PATCH, DELETE, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", self.headers.get("Access-Control-Request-Headers") or "*")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _viacep(self):
+        """Answer ``/ws/<cep>/json/`` like ViaCEP; return False for other paths."""
+        match = re.fullmatch(r"/ws/(\d{8})/json/?", urlsplit(self.path).path)
+        if not match:
+            return False
+        cep = match.group(1)
+        address = CEP_FIXTURES.get(cep)
+        if address is None:
+            self._send(200, {"erro": True})
+        else:
+            self._send(200, {"cep": f"{cep[:5]}-{cep[5:]}", "complemento": "", **address})
+        return True
+
+    def do_GET(self):
+        if self._viacep():
+            return
+
+        def action():
+            table, params, filters = self._route()
+            columns = [column.strip() for column in params.get("select", "*").split(",") if column.strip()]
+            offset = int(params.get("offset", 0))
+            limit = int(params["limit"]) if "limit" in params else None
+            rows, total = self.database.select(table, filters, columns or ["*"], params.get("order", ""), limit, offset)
+            self._respond_rows(200, rows, total, offset)
+        self._handle(action)
+
+    do_HEAD = do_GET
+
+    def _write_response(self, rows, status):
+        if "return=representation" in self._prefer():
+            params = self._route()[1]
+            columns = [column.strip() for column in params.get("select", "*").split(",") if column.strip()]
+            return self._respond_rows(status, [_project(row, columns or ["*"]) for row in rows])
+        return self._send(204 if status == 200 else status)
+
+    def _rpc(self):
+        """Answer ``POST /rest/v1/rpc/<function>``; return False for other paths."""
+        match = re.fullmatch(r"/rest/v1/rpc/(\w+)/?", urlsplit(self.path).path)
+        if not match:
+            return False
+        def respond():
+            result = self.database.rpc(match.group(1), self._body())
+            # Set-returning functions answer rows; scalar ones (integer, jsonb) their value as is
+            if isinstance(result, list):
+                self._respond_rows(200, result)
+            else:
+                self._send(200, result)
+        self._handle(respond)
+        return True
+
+    def do_POST(self):
+        if self._rpc():
+            return
+
+        def action():
+            table, params, _ = self._route()
+            body = self._body()
+            records = body if isinstance(body, list) else [body]
+            prefer = self._prefer()
+            rows = self.database.insert(
+                table, records,
+                on_conflict=params.get("on_conflict"),
+                merge="resolution=merge-duplicates" in prefer,
+                ignore="resolution=ignore-duplicates" in prefer,
+            )
+            self._write_response(rows, 201)
+        self._handle(action)
+
+    def do_PATCH(self):
+        def action():
+            table, _, filters = self._route()
+            self._write_response(self.database.update(table, filters, self._body() or {}), 200)
+        self._handle(action)
+
+    def do_DELETE(self):
+        def action():
+            table, _, filters = self._route()
+            self._write_response(self.database.delete(table, filters), 200)
+        self._handle(action)
+
+
+def serve(port=DEFAULT_PORT, host="127.0.0.1", database=None):
+    """Start the stand-in on a background thread and return the HTTP server.
+
+    Pass ``port=0`` to pick a free port; the chosen URL is ``server.url``.
+    Call ``server.shutdown()`` to stop it.
+    """
+    handler = type("BoundPostgrestHandler", (PostgrestHandler,), {"database": database or Database()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.database = handler.database
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, name="local-supabase", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    server = serve(args.port, args.host)
+    counts = ", ".join(f"{table}={len(rows)}" for table, rows in sorted(server.database.tables.items()))
+    print(f"Local Supabase stand-in on {server.url} ({counts})")
+    print(f"NEXT_PUBLIC_SUPABASE_URL={server.url}")
+    print(f"NEXT_PUBLIC_SUPABASE_ANON_KEY={ANON_KEY}")
+    print(f"NEXT_PUBLIC_CEP_API_URL={server.url}/ws")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Streaming analyzer for the app's NDJSON log segments.
+
+Reads the segments written by ``POST /api/logs`` (``.logs/logs-*.ndjson``,
+optionally gzipped) or ``logger.exportLogs('ndjson')`` one line at a time, so
+gigabytes of logs are aggregated in constant memory. The report covers:
+
+- entries and error rate per context, SUPABASE, AUTH, RETRY and HEALTH first;
+- the histogram of ``withRetry`` attempt numbers from the RETRY warnings,
+  plus how many runs used their last attempt;
+- fallback-data usage (``metadata.fallbackUsed``) per time window.
+
+Usage:
+    python log_analyzer.py ../.logs                       # every segment in the directory
+    python log_analyzer.py ../.logs --window 15m          # coarser fallback windows
+    python log_analyzer.py segment.ndjson.gz --json       # machine-readable report
+    zcat old/*.gz | python log_analyzer.py -              # stdin
+"""
+
+import argparse
+import datetime
+import gzip
+import json
+import re
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+
+KEY_CONTEXTS = ("SUPABASE", "AUTH", "RETRY", "HEALTH")
+NO_CONTEXT = "-"
+DEFAULT_WINDOW = 300
+
+_DURATION = re.compile(r"^(\d+)([smhd]?)$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_window(text):
+    """``"300"``, ``"90s"``, ``"5m"``, ``"1h"`` or ``"1d"`` in seconds."""
+    match = _DURATION.match(text.strip())
+    if not match or int(match.group(1)) == 0:
+        raise argparse.ArgumentTypeError(f"invalid window: {text!r}")
+    return int(match.group(1)) * _UNITS[match.group(2)]
+
+
+def parse_timestamp(value):
+    """Epoch seconds of an ISO timestamp or an epoch-milliseconds number, or None."""
+    if isinstance(value, (int, float)):
+        return value / 1000
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def iter_lines(paths):
+    """Yield raw lines from files, directories of segments, or ``-`` (stdin)."""
+    for path in paths:
+        if path == "-":
+            yield from sys.stdin.buffer
+            continue
+        path = Path(path)
+        files = sorted(path.glob("*.ndjson*")) if path.is_dir() else [path]
+        for file in files:
+            opener = gzip.open if file.suffix == ".gz" else open
+            with opener(file, "rb") as handle:
+                yield from handle
+
+
+class LogStats:
+    """Aggregates entries one at a time; memory grows only with the number
+    of contexts, attempt numbers and time windows."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.entries = 0
+        self.malformed = 0
+        self.first = None
+        self.last = None
+        self.levels = Counter()
+        self.by_context = defaultdict(Counter)
+        self.retry_attempts = Counter()
+        self.retry_exhausted = 0
+        self.fallbacks = Counter()
+
+    def add_line(self, line):
+        line = line.strip()
+        if not line:
+            return
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            self.malformed += 1
+            return
+        if not isinstance(entry, dict):
+            self.malformed += 1
+            return
+        self.add(entry)
+
+    def add(self, entry):
+        self.entries += 1
+        level = entry.get("level") or "unknown"
+        context = entry.get("context") or NO_CONTEXT
+        metadata = entry.get("metadata") if isinstance(entry.get("metadata"), dict) else {}
+        when = parse_timestamp(entry.get("timestamp"))
+
+        self.levels[level] += 1
+        self.by_context[context][level] += 1
+        if when is not None:
+            self.first = when if self.first is None else min(self.first, when)
+            self.last = when if self.last is None else max(self.last, when)
+
+        if context == "RETRY" and isinstance(metadata.get("attempt"), int):
+            self.retry_attempts[metadata["attempt"]] += 1
+            if metadata["attempt"] == metadata.get("maxRetries"):
+                self.retry_exhausted += 1
+
+        if metadata.get("fallbackUsed") and when is not None:
+            self.fallbacks[int(when // self.window) * self.window] += 1
+
+    def consume(self, lines):
+        for line in lines:
+            self.add_line(line)
+        return self
+
+    def contexts(self):
+        """Contexts in report order: the key ones first, then by volume."""
+        others = sorted((c for c in self.by_context if c not in KEY_CONTEXTS),
+                        key=lambda c: (-sum(self.by_context[c].values()), c))
+        return [c for c in KEY_CONTEXTS if c in self.by_context] + others
+
+    def error_rate(self, context):
+        counts = self.by_context[context]
+        total = sum(counts.values())
+        return counts["error"] / total if total else 0.0
+
+    def to_dict(self):
+        iso = lambda seconds: datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc).isoformat()
+        return {
+            "entries": self.entries,
+            "malformed": self.malformed,
+            "first": iso(self.first) if self.first is not None else None,
+            "last": iso(self.last) if self.last is not None else None,
+            "levels": dict(self.levels),
+            "contexts": {
+                context: {
+                    "entries": sum(self.by_context[context].values()),
+                    "errors": self.by_context[context]["error"],
+                    "warnings": self.by_context[context]["warn"],
+                    "error_rate": round(self.error_rate(context), 4),
+                }
+                for context in self.contexts()
+            },
+            "retry_attempts": {str(attempt): count for attempt, count in sorted(self.retry_attempts.items())},
+            "retry_exhausted": self.retry_exhausted,
+            "window_seconds": self.window,
+            "fallbacks": {iso(start): count for start, count in sorted(self.fallbacks.items())},
+        }
+
+    def format(self):
+        data = self.to_dict()
+        lines = [
+            f"{data['entries']} entries ({data['malformed']} malformed lines)"
+            + (f", {data['first']} .. {data['last']}" if data["first"] else ""),
+            "levels: " + ", ".join(f"{level} {count}" for level, count in sorted(self.levels.items())),
+            "",
+            f"{'context':<12} {'entries':>9} {'errors':>8} {'warns':>8} {'error rate':>11}",
+        ]
+        for context, row in data["contexts"].items():
+            lines.append(f"{context:<12} {row['entries']:>9} {row['errors']:>8} {row['warnings']:>8} "
+                         f"{row['error_rate']:>10.2%}")
+
+        lines += ["", "withRetry attempts (RETRY warnings):"]
+        if self.retry_attempts:
+            peak = max(self.retry_attempts.values())
+            for attempt, count in sorted(self.retry_attempts.items()):
+                bar = "#" * max(1, round(40 * count / peak))
+                lines.append(f"  attempt {attempt:>2}: {count:>8} {bar}")
+            lines.append(f"  runs that used every attempt: {self.retry_exhausted}")
+        else:
+            lines.append("  none")
+
+        lines += ["", f"fallback data used per {self.window}s window:"]
+        if data["fallbacks"]:
+            lines += [f"  {start}: {count}" for start, count in data["fallbacks"].items()]
+        else:
+            lines.append("  none")
+        return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="segment files, directories of segments, or - for stdin")
+    parser.add_argument("--window", type=parse_window, default=DEFAULT_WINDOW,
+                        help="fallback-usage window, e.g. 300, 5m, 1h (default: 5m)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    stats = LogStats(window=args.window).consume(iter_lines(args.paths))
+    print(json.dumps(stats.to_dict(), indent=2) if args.json else stats.format())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Load test for the homepage menu fetch path.
+
+Each virtual customer repeats what a visit to ``/`` costs the backend: the
+homepage HTML from the app, then the menu data. By default that is the four
+Supabase REST queries ``loadData`` in app/page.tsx used to fire with
+``Promise.all``. With ``--snapshot`` it is the single cached ``/api/menu``
+snapshot that replaced them, so the two paths can be compared. All customers share
+one pooled ``httpx.AsyncClient``, and every request is timed. The report has
+p50/p95/p99 latency per query and per whole visit, throughput and error rate,
+and it is checked against configurable SLOs.
+
+Usage:
+    python menu_load.py                               # 20 customers for 30s
+    python menu_load.py -u 50 -d 60 --p95-ms 1500     # tighter SLO, more load
+    python menu_load.py --no-html                     # only the REST queries
+    python menu_load.py --snapshot                    # HTML plus /api/menu
+    python local_supabase.py & python menu_load.py --no-html   # hermetic run
+
+The Supabase URL and anon key come from NEXT_PUBLIC_SUPABASE_URL and
+NEXT_PUBLIC_SUPABASE_ANON_KEY, the same variables the app reads. Without them
+the load goes to local_supabase.py on its default port.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+
+import httpx
+
+import local_supabase
+
+APP_URL = "http://localhost:3000"
+SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL", f"http://127.0.0.1:{local_supabase.DEFAULT_PORT}")
+SUPABASE_ANON_KEY = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY", local_supabase.ANON_KEY)
+
+# The queries loadData ran in parallel before /api/menu, in PostgREST form.
+MENU_QUERIES = (
+    ("pizzaria_config", "/rest/v1/pizzaria_config?select=*"),
+    ("produtos", "/rest/v1/produtos?select=*&ativo=eq.true&order=ordem.asc"),
+    ("categorias", "/rest/v1/categorias?select=*&ativo=eq.true&order=ordem.asc"),
+    ("opcoes_sabores", "/rest/v1/opcoes_sabores?select=*&ativo=eq.true&order=ordem.asc"),
+)
+SNAPSHOT_PATH = "/api/menu"
+VISIT = "visit"
+HOMEPAGE = "homepage"
+SNAPSHOT = "snapshot"
+
+Sample = namedtuple("Sample", "name ok seconds")
+Stats = namedtuple("Stats", "count errors p50 p95 p99")
+Slo = namedtuple("Slo", "p50_ms p95_ms p99_ms error_rate min_throughput")
+
+# A visit should render within TC015's 3s budget even at the tail.
+DEFAULT_SLO = Slo(p50_ms=1000.0, p95_ms=3000.0, p99_ms=5000.0, error_rate=0.01, min_throughput=0.0)
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, math.ceil(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def stats_for(samples):
+    seconds = sorted(sample.seconds for sample in samples)
+    errors = sum(1 for sample in samples if not sample.ok)
+    return Stats(len(samples), errors, percentile(seconds, 0.50), percentile(seconds, 0.95), percentile(seconds, 0.99))
+
+
+class LoadReport:
+    """Samples from one run, grouped per request name plus one ``visit`` group."""
+
+    def __init__(self, samples, elapsed, users):
+        self.samples = samples
+        self.elapsed = elapsed
+        self.users = users
+        grouped = {}
+        for sample in samples:
+            grouped.setdefault(sample.name, []).append(sample)
+        self.stats = {name: stats_for(group) for name, group in sorted(grouped.items())}
+
+    @property
+    def visits(self):
+        return self.stats.get(VISIT, Stats(0, 0, 0.0, 0.0, 0.0))
+
+    @property
+    def throughput(self):
+        """Completed visits per second."""
+        return self.visits.count / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self):
+        """Share of visits in which at least one request failed."""
+        return self.visits.errors / self.visits.count if self.visits.count else 1.0
+
+    def breaches(self, slo=DEFAULT_SLO):
+        """Return one message per SLO the run missed; empty when all are met."""
+        visits = self.visits
+        found = []
+        for label, observed, limit in (
+            ("p50", visits.p50 * 1000, slo.p50_ms),
+            ("p95", visits.p95 * 1000, slo.p95_ms),
+            ("p99", visits.p99 * 1000, slo.p99_ms),
+        ):
+            if limit is not None and observed > limit:
+                found.append(f"visit {label} {observed:.0f}ms > {limit:.0f}ms")
+        if slo.error_rate is not None and self.error_rate > slo.error_rate:
+            found.append(f"error rate {self.error_rate:.2%} > {slo.error_rate:.2%}")
+        if slo.min_throughput and self.throughput < slo.min_throughput:
+            found.append(f"throughput {self.throughput:.1f}/s < {slo.min_throughput:.1f}/s")
+        return found
+
+    def format(self):
+        lines = [f"{self.users} customers, {self.elapsed:.1f}s, {self.throughput:.1f} visits/s, "
+                 f"{self.error_rate:.2%} failed visits"]
+        for name, stats in self.stats.items():
+            lines.append(
+                f"{name:>16}: {stats.count:6d} req {stats.errors:5d} err  p50 {stats.p50 * 1000:7.1f}ms"
+                f"  p95 {stats.p95 * 1000:7.1f}ms  p99 {stats.p99 * 1000:7.1f}ms"
+            )
+        return "\n".join(lines)
+
+
+async def _timed(client, name, url, headers, samples):
+    started = time.perf_counter()
+    ok = False
+    try:
+        response = await client.get(url, headers=headers)
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        pass
+    samples.append(Sample(name, ok, time.perf_counter() - started))
+    return ok
+
+
+async def visit(client, samples, app_url=APP_URL, supabase_url=SUPABASE_URL, anon_key=SUPABASE_ANON_KEY,
+                include_html=True, snapshot=False):
+    """One homepage visit: the HTML, then the menu snapshot or the four menu queries at once."""
+    rest_headers = {"apikey": anon_key, "Authorization": f"Bearer {anon_key}", "Accept": "application/json"}
+    started = time.perf_counter()
+    ok = True
+    if include_html:
+        ok = await _timed(client, HOMEPAGE, app_url + "/", {"Accept": "text/html"}, samples)
+    if snapshot:
+        results = [await _timed(client, SNAPSHOT, app_url + SNAPSHOT_PATH, {"Accept": "application/json"}, samples)]
+    else:
+        results = await asyncio.gather(*(
+            _timed(client, name, supabase_url + path, rest_headers, samples) for name, path in MENU_QUERIES
+        ))
+    samples.append(Sample(VISIT, ok and all(results), time.perf_counter() - started))
+
+
+async def run(users=20, duration=30.0, visits_per_user=None, ramp_up=0.0, think_time=0.0, **visit_options):
+    """Drive ``users`` concurrent customers and return a LoadReport.
+
+    Each customer visits repeatedly until ``duration`` seconds have passed or,
+    when given, ``visits_per_user`` visits are done. Starts are spread evenly
+    over ``ramp_up`` seconds and customers pause ``think_time`` between visits.
+    """
+    samples = []
+    limits = httpx.Limits(max_connections=users * (len(MENU_QUERIES) + 1), max_keepalive_connections=users)
+    async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, connect=5.0), limits=limits) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def customer(index):
+            if ramp_up and users > 1:
+                await asyncio.sleep(ramp_up * index / (users - 1))
+            done = 0
+            while time.perf_counter() < deadline and (visits_per_user is None or done < visits_per_user):
+                await visit(client, samples, **visit_options)
+                done += 1
+                if think_time:
+                    await asyncio.sleep(think_time)
+
+        await asyncio.gather(*(customer(index) for index in range(users)))
+        elapsed = time.perf_counter() - started
+    return LoadReport(samples, elapsed, users)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-u", "--users", type=int, default=20, help="concurrent virtual customers")
+    parser.add_argument("-d", "--duration", type=float, default=30.0, help="seconds to keep the load on")
+    parser.add_argument("--visits", type=int, help="stop each customer after this many visits")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which customers start")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds between a customer's visits")
+    parser.add_argument("--app-url", default=APP_URL)
+    parser.add_argument("--supabase-url", default=SUPABASE_URL)
+    parser.add_argument("--anon-key", default=SUPABASE_ANON_KEY)
+    parser.add_argument("--no-html", action="store_true", help="skip the homepage HTML, load only Supabase")
+    parser.add_argument("--snapshot", action="store_true", help="load the menu from the app's /api/menu snapshot")
+    parser.add_argument("--p50-ms", type=float, default=DEFAULT_SLO.p50_ms)
+    parser.add_argument("--p95-ms", type=float, default=DEFAULT_SLO.p95_ms)
+    parser.add_argument("--p99-ms", type=float, default=DEFAULT_SLO.p99_ms)
+    parser.add_argument("--max-error-rate", type=float, default=DEFAULT_SLO.error_rate)
+    parser.add_argument("--min-throughput", type=float, default=DEFAULT_SLO.min_throughput,
+                        help="minimum visits per second")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(
+        users=args.users,
+        duration=args.duration,
+        visits_per_user=args.visits,
+        ramp_up=args.ramp_up,
+        think_time=args.think_time,
+        app_url=args.app_url.rstrip("/"),
+        supabase_url=args.supabase_url.rstrip("/"),
+        anon_key=args.anon_key,
+        include_html=not args.no_html,
+        snapshot=args.snapshot,
+    ))
+    print(report.format())
+    breaches = report.breaches(Slo(args.p50_ms, args.p95_ms, args.p99_ms, args.max_error_rate, args.min_throughput))
+    for breach in breaches:
+        print(f"SLO breach: {breach}")
+    return 1 if breaches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Parser and validator for the Prometheus text exposition format.
+
+Checks what ``GET /metrics`` serves (``lib/metrics.ts``) the way a scraper
+would read it:
+
+- every family has ``# HELP`` and ``# TYPE`` before its samples, once;
+- sample lines are ``name{label="value",...} value`` with valid names,
+  escaped label values and numeric (or ``+Inf``/``-Inf``/``NaN``) values;
+- histogram ``_bucket`` series are cumulative, non-decreasing in ``le``,
+  end at ``le="+Inf"``, and the ``+Inf`` bucket equals ``_count``.
+
+Usage:
+    python metrics_format.py http://localhost:3000/metrics
+    curl -s localhost:3000/metrics | python metrics_format.py -
+"""
+
+import math
+import re
+import sys
+import urllib.request
+from collections import defaultdict
+
+METRIC_NAME = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+LABEL_NAME = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+SAMPLE = re.compile(r"^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(?P<labels>.*)\})?\s+(?P<value>\S+)(?:\s+-?\d+)?$")
+LABEL = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"\s*(?:,|$)')
+TYPES = {"counter", "gauge", "histogram", "summary", "untyped"}
+HISTOGRAM_SUFFIXES = ("_bucket", "_sum", "_count")
+
+
+class FormatError(ValueError):
+    """The exposition text breaks the format; ``line`` is 1-based."""
+
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+def parse_value(text):
+    if text in ("+Inf", "Inf"):
+        return math.inf
+    if text == "-Inf":
+        return -math.inf
+    if text == "NaN":
+        return math.nan
+    return float(text)
+
+
+def parse_labels(text, lineno):
+    labels = {}
+    position = 0
+    while position < len(text):
+        match = LABEL.match(text, position)
+        if not match:
+            raise FormatError(lineno, f"malformed labels: {text!r}")
+        name, value = match.groups()
+        if name in labels:
+            raise FormatError(lineno, f"duplicate label {name!r}")
+        labels[name] = re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+        position = match.end()
+    return labels
+
+
+def family_of(name, types):
+    """Family a sample belongs to: histogram samples carry a suffix."""
+    for suffix in HISTOGRAM_SUFFIXES:
+        base = name[: -len(suffix)]
+        if name.endswith(suffix) and types.get(base) in ("histogram", "summary"):
+            return base
+    return name
+
+
+def parse(text):
+    """Families as ``{name: {"help", "type", "samples": [(name, labels, value)]}}``.
+
+    Raises FormatError on the first violation.
+    """
+    families = {}
+    types = {}
+    closed = set()
+    current = None
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        if line.startswith("#"):
+            parts = line.split(None, 3)
+            if len(parts) < 3 or parts[1] not in ("HELP", "TYPE"):
+                continue  # plain comment
+            name = parts[2]
+            if not METRIC_NAME.match(name):
+                raise FormatError(lineno, f"invalid metric name {name!r}")
+            family = families.setdefault(name, {"help": None, "type": None, "samples": []})
+            if family["samples"] or name in closed:
+                raise FormatError(lineno, f"{parts[1]} for {name} after its samples")
+            key = parts[1].lower()
+            if family[key] is not None:
+                raise FormatError(lineno, f"duplicate {parts[1]} for {name}")
+            if key == "type":
+                if len(parts) < 4 or parts[3] not in TYPES:
+                    raise FormatError(lineno, f"invalid type for {name}")
+                family["type"] = types[name] = parts[3]
+            else:
+                family["help"] = parts[3] if len(parts) > 3 else ""
+            if current and current != name:
+                closed.add(current)
+            current = name
+            continue
+
+        match = SAMPLE.match(line)
+        if not match:
+            raise FormatError(lineno, f"malformed sample: {line!r}")
+        labels = parse_labels(match.group("labels") or "", lineno)
+        try:
+            value = parse_value(match.group("value"))
+        except ValueError:
+            raise FormatError(lineno, f"invalid value {match.group('value')!r}") from None
+        name = family_of(match.group("name"), types)
+        if name in closed:
+            raise FormatError(lineno, f"samples of {name} are not contiguous")
+        if current and current != name:
+            closed.add(current)
+        current = name
+        families.setdefault(name, {"help": None, "type": None, "samples": []})["samples"].append(
+            (match.group("name"), labels, value)
+        )
+    return families
+
+
+def check_histogram(name, samples):
+    """Problems found in one histogram family, as strings."""
+    problems = []
+    series = defaultdict(lambda: {"buckets": [], "count": None, "sum": None})
+    for sample, labels, value in samples:
+        key = tuple(sorted((k, v) for k, v in labels.items() if k != "le"))
+        if sample == name + "_bucket":
+            if "le" not in labels:
+                problems.append(f"{name}{dict(key)}: bucket without le")
+                continue
+            series[key]["buckets"].append((parse_value(labels["le"]), value))
+        elif sample == name + "_count":
+            series[key]["count"] = value
+        elif sample == name + "_sum":
+            series[key]["sum"] = value
+
+    for key, data in series.items():
+        where = f"{name}{dict(key)}"
+        buckets = data["buckets"]
+        if not buckets or buckets[-1][0] != math.inf:
+            problems.append(f"{where}: missing le=\"+Inf\" bucket")
+            continue
+        bounds = [bound for bound, _ in buckets]
+        if bounds != sorted(bounds) or len(set(bounds)) != len(bounds):
+            problems.append(f"{where}: le bounds not increasing")
+        counts = [count for _, count in buckets]
+        if any(later < earlier for earlier, later in zip(counts, counts[1:])):
+            problems.append(f"{where}: bucket counts not cumulative")
+        if data["count"] is None or data["sum"] is None:
+            problems.append(f"{where}: missing _count or _sum")
+        elif counts[-1] != data["count"]:
+            problems.append(f"{where}: +Inf bucket {counts[-1]} != _count {data['count']}")
+    return problems
+
+
+def validate(text):
+    """Every problem in an exposition, as strings; empty when valid."""
+    try:
+        families = parse(text)
+    except FormatError as error:
+        return [str(error)]
+    problems = []
+    for name, family in families.items():
+        if family["type"] is None:
+            problems.append(f"{name}: missing # TYPE")
+        if family["help"] is None:
+            problems.append(f"{name}: missing # HELP")
+        if family["type"] == "counter" and any(value < 0 for _, _, value in family["samples"]):
+            problems.append(f"{name}: negative counter")
+        if family["type"] == "histogram":
+            problems += check_histogram(name, family["samples"])
+    return problems
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: metrics_format.py URL|-", file=sys.stderr)
+        return 2
+    if argv[0] == "-":
+        text = sys.stdin.read()
+    else:
+        with urllib.request.urlopen(argv[0], timeout=10) as response:
+            text = response.read().decode("utf-8")
+    problems = validate(text)
+    for problem in problems:
+        print(problem)
+    print("INVALID" if problems else f"OK: {len(parse(text))} families")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
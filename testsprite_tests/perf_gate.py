@@ -0,0 +1,285 @@
+"""Performance regression gate with stored baselines.
+
+A single timing is too noisy to gate on, so every scenario is run several
+times and each run contributes one value per metric. ``record`` stores those
+samples in perf_baselines.json. ``compare`` takes a fresh set of samples and
+checks each metric against its baseline two ways:
+
+- a one-sided Mann-Whitney U test, which asks whether the new samples are
+  stochastically slower than the baseline;
+- a bootstrap confidence interval for the ratio of the medians, which asks
+  whether the slowdown is larger than the tolerance.
+
+A metric regresses only when the test is significant and the whole interval
+lies above ``1 + tolerance``. Noise and small but real drifts pass. A scenario
+or metric with no stored baseline fails the gate too, unless ``--allow-missing``
+is given, so a lost perf_baselines.json can't silently turn the gate off.
+
+Scenarios:
+    menu_fetch       menu_load.py's homepage fetch path under concurrent customers
+    homepage_render  TC015's Navigation Timing for ``/`` in headless Chromium
+
+Usage:
+    python perf_gate.py record                       # store a baseline for every scenario
+    python perf_gate.py compare                      # exit 1 on a significant regression or a missing baseline
+    python perf_gate.py compare --allow-missing      # only report scenarios with no baseline yet
+    python perf_gate.py compare -s menu_fetch --runs 20 --tolerance 0.05
+    python perf_gate.py compare --local-supabase     # hermetic menu_fetch run
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import random
+import statistics
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+BASELINE_PATH = HERE / "perf_baselines.json"
+
+DEFAULT_RUNS = 10
+DEFAULT_ALPHA = 0.05
+DEFAULT_TOLERANCE = 0.10
+BOOTSTRAP_RESAMPLES = 2000
+
+Comparison = namedtuple("Comparison", "scenario metric baseline current ratio ci_low ci_high p_value regressed")
+
+
+# --------------------------------------------------------------------------
+# Statistics
+# --------------------------------------------------------------------------
+
+def _ranks(values):
+    """Average ranks (1-based) of ``values``, ties sharing their mean rank."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for position in range(start, end + 1):
+            ranks[order[position]] = (start + end) / 2 + 1
+        start = end + 1
+    return ranks
+
+
+def mann_whitney_greater(current, baseline):
+    """One-sided Mann-Whitney U test that ``current`` tends to be larger.
+
+    Returns ``(u, p_value)``, where ``u`` counts the pairs in which the current
+    sample is larger. The p-value uses the normal approximation with tie and
+    continuity corrections, which is adequate from about eight runs per side.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    combined = list(current) + list(baseline)
+    ranks = _ranks(combined)
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    tie_term = 0.0
+    for value in set(combined):
+        count = combined.count(value)
+        tie_term += count ** 3 - count
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def bootstrap_ratio_ci(current, baseline, confidence=0.95, resamples=BOOTSTRAP_RESAMPLES, seed=0):
+    """Percentile bootstrap interval for ``median(current) / median(baseline)``."""
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        base = statistics.median(rng.choices(baseline, k=len(baseline)))
+        if base > 0:
+            ratios.append(statistics.median(rng.choices(current, k=len(current))) / base)
+    if not ratios:
+        return math.inf, math.inf
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (len(ratios) - 1))]
+    high = ratios[int(math.ceil((1 - tail) * (len(ratios) - 1)))]
+    return low, high
+
+
+def compare_samples(scenario, metric, baseline, current, alpha=DEFAULT_ALPHA, tolerance=DEFAULT_TOLERANCE):
+    """Compare one metric's samples, where lower values are better."""
+    _, p_value = mann_whitney_greater(current, baseline)
+    ci_low, ci_high = bootstrap_ratio_ci(current, baseline, confidence=1 - alpha)
+    base_median = statistics.median(baseline)
+    current_median = statistics.median(current)
+    ratio = current_median / base_median if base_median else math.inf
+    regressed = p_value < alpha and ci_low > 1 + tolerance
+    return Comparison(scenario, metric, base_median, current_median, ratio, ci_low, ci_high, p_value, regressed)
+
+
+def format_comparison(comparison):
+    verdict = "REGRESSION" if comparison.regressed else "ok"
+    return (
+        f"{comparison.scenario}.{comparison.metric}: {comparison.baseline:.1f} -> {comparison.current:.1f} "
+        f"(x{comparison.ratio:.2f}, CI x{comparison.ci_low:.2f}-x{comparison.ci_high:.2f}, "
+        f"p={comparison.p_value:.3f}) {verdict}"
+    )
+
+
+# --------------------------------------------------------------------------
+# Baseline store
+# --------------------------------------------------------------------------
+
+def load_baselines(path=BASELINE_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(scenario, samples, path=BASELINE_PATH):
+    """Replace the stored samples of ``scenario``, keeping the other scenarios."""
+    baselines = load_baselines(path)
+    baselines[scenario] = {
+        "recorded": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "runs": max((len(values) for values in samples.values()), default=0),
+        "metrics": {metric: [round(value, 3) for value in values] for metric, values in sorted(samples.items())},
+    }
+    Path(path).write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+# --------------------------------------------------------------------------
+# Scenarios
+# --------------------------------------------------------------------------
+
+async def _menu_fetch(runs, options):
+    """Visit p50/p95 of a short menu_load run, one value of each per run."""
+    import menu_load
+
+    visit_options = {"include_html": not options.no_html, "app_url": options.app_url, "snapshot": options.snapshot}
+    if options.supabase_url:
+        visit_options["supabase_url"] = options.supabase_url
+
+    async def once():
+        report = await menu_load.run(users=10, visits_per_user=5, **visit_options)
+        if report.error_rate:
+            raise RuntimeError(f"menu_fetch: {report.error_rate:.0%} of visits failed\n{report.format()}")
+        return {"visit_p50_ms": report.visits.p50 * 1000, "visit_p95_ms": report.visits.p95 * 1000}
+
+    await once()  # warm up connections, caches and the dev server's compiler
+    return [await once() for _ in range(runs)]
+
+
+async def _homepage_render(runs, options):
+    """Load event and data-rendered time of ``/``, each run in a fresh context."""
+    from playwright import async_api
+
+    import harness
+
+    async def once(browser):
+        context = await harness.new_context(browser)
+        try:
+            page = await harness.open_page(context, options.app_url)
+            timing = await page.evaluate(
+                "() => { const [nav] = performance.getEntriesByType('navigation');"
+                " return { load: nav.loadEventEnd, settled: performance.now() }; }"
+            )
+        finally:
+            await context.close()
+        return {"load_ms": timing["load"], "settled_ms": timing["settled"]}
+
+    async with async_api.async_playwright() as pw:
+        browser = await harness.launch_browser(pw)
+        try:
+            await once(browser)
+            return [await once(browser) for _ in range(runs)]
+        finally:
+            await browser.close()
+
+
+SCENARIOS = {
+    "menu_fetch": _menu_fetch,
+    "homepage_render": _homepage_render,
+}
+
+
+def measure(scenario, runs, options):
+    """Run ``scenario`` ``runs`` times and return ``{metric: [value per run]}``."""
+    samples = {}
+    for run in asyncio.run(SCENARIOS[scenario](runs, options)):
+        for metric, value in run.items():
+            samples.setdefault(metric, []).append(value)
+    return samples
+
+
+# --------------------------------------------------------------------------
+# Command line
+# --------------------------------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("record", "compare"))
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run; repeat for several (default: all)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="measured runs per scenario")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="significance level")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="slowdown of the median tolerated even when significant (0.10 = 10%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="compare passes for scenarios and metrics with no stored baseline")
+    parser.add_argument("--app-url", default="http://localhost:3000")
+    parser.add_argument("--supabase-url", help="Supabase URL for menu_fetch (default: menu_load's)")
+    parser.add_argument("--no-html", action="store_true", help="menu_fetch loads only the Supabase queries")
+    parser.add_argument("--snapshot", action="store_true", help="menu_fetch loads the app's /api/menu snapshot")
+    parser.add_argument("--local-supabase", action="store_true",
+                        help="serve the Supabase REST API from local_supabase.py for menu_fetch")
+    args = parser.parse_args(argv)
+    args.app_url = args.app_url.rstrip("/")
+
+    server = None
+    if args.local_supabase:
+        import local_supabase
+
+        server = local_supabase.serve(port=0)
+        args.supabase_url = server.url
+    try:
+        return _run(args)
+    finally:
+        if server:
+            server.shutdown()
+
+
+def _run(args):
+    baselines = load_baselines(args.baseline)
+    regressions = missing = 0
+    missing_label = "skipped" if args.allow_missing else "FAILED"
+    for scenario in args.scenario or sorted(SCENARIOS):
+        stored = baselines.get(scenario)
+        if args.command == "compare" and not stored:
+            print(f"{scenario}: no baseline in {args.baseline.name}, run 'perf_gate.py record' first ({missing_label})")
+            missing += 1
+            continue
+        samples = measure(scenario, args.runs, args)
+        if args.command == "record":
+            save_baseline(scenario, samples, args.baseline)
+            medians = ", ".join(f"{metric} {statistics.median(values):.1f}" for metric, values in sorted(samples.items()))
+            print(f"{scenario}: recorded {args.runs} runs ({medians})")
+            continue
+        for metric, values in sorted(samples.items()):
+            if metric not in stored["metrics"]:
+                print(f"{scenario}.{metric}: not in the baseline ({missing_label})")
+                missing += 1
+                continue
+            comparison = compare_samples(scenario, metric, stored["metrics"][metric], values, args.alpha, args.tolerance)
+            print(format_comparison(comparison))
+            regressions += comparison.regressed
+    return 1 if regressions or (missing and not args.allow_missing) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
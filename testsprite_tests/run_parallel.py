@@ -0,0 +1,228 @@
+"""Run the TestSprite cases sharded across parallel pytest workers.
+
+Each worker is a separate ``python -m pytest`` process, so it owns its own
+session browser (see conftest.py) and gets its own TESTSPRITE_DATA_PREFIX
+for the rows it creates (see isolation.py). Shards are balanced with the
+durations recorded by the previous run, and the per-worker results are
+merged into tmp/test_results.json using the TestSprite schema, with each UI
+case's page performance metrics (see vitals.py) under ``webVitals``.
+
+Usage:
+    python run_parallel.py                    # one worker per CPU
+    python run_parallel.py -n 4 --ui          # only UI cases, 4 workers
+    python run_parallel.py --local-supabase   # serve the REST API from local_supabase.py
+    python run_parallel.py -- -x              # extra arguments go to pytest
+"""
+
+import argparse
+import datetime
+import heapq
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+RESULTS_PATH = HERE / "tmp" / "test_results.json"
+DURATIONS_PATH = HERE / "tmp" / "durations.json"
+PLAN_PATHS = {
+    "FRONTEND": HERE / "testsprite_frontend_test_plan.json",
+    "BACKEND": HERE / "testsprite_backend_test_plan.json",
+}
+
+# Estimated seconds per case when no previous duration is known.
+DEFAULT_DURATION = {"FRONTEND": 10.0, "BACKEND": 1.0}
+
+
+def case_type(path):
+    source = path.read_text(encoding="utf-8")
+    return "FRONTEND" if "run_test(context)" in source else "BACKEND"
+
+
+def title_for(path):
+    """TC013_Security___Access_Control.py -> 'TC013-Security - Access Control'."""
+    case_id, _, name = path.stem.partition("_")
+    return f"{case_id}-{name.replace('___', ' - ').replace('_', ' ')}"
+
+
+def _load_json(path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def shard(paths, workers, durations):
+    """Greedy longest-first assignment of cases to the least loaded worker."""
+    weighted = sorted(
+        paths,
+        key=lambda path: durations.get(path.name, DEFAULT_DURATION[case_type(path)]),
+        reverse=True,
+    )
+    heap = [(0.0, index, []) for index in range(workers)]
+    for path in weighted:
+        load, index, assigned = heapq.heappop(heap)
+        assigned.append(path)
+        heapq.heappush(heap, (load + durations.get(path.name, DEFAULT_DURATION[case_type(path)]), index, assigned))
+    return [assigned for _, _, assigned in sorted(heap, key=lambda entry: entry[1]) if assigned]
+
+
+def run_shards(shards, pytest_args, workdir):
+    """Start one pytest process per shard and wait for all of them.
+
+    Returns the merged result records and a list of crashed workers: a worker
+    that exits non-zero or writes no results file (import error, pytest usage
+    error, browser launch failure) may not have reported anything at all.
+    Exit code 1 only means some case failed, which the records already say.
+    """
+    run_id = uuid.uuid4().hex[:6]
+    processes = []
+    for index, paths in enumerate(shards):
+        results_file = Path(workdir) / f"worker-{index}.jsonl"
+        env = dict(
+            os.environ,
+            TESTSPRITE_WORKER=str(index),
+            TESTSPRITE_DATA_PREFIX=f"[t{run_id}w{index}] ",
+            TESTSPRITE_RESULTS_FILE=str(results_file),
+        )
+        command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *pytest_args, *map(str, paths)]
+        processes.append((subprocess.Popen(command, cwd=HERE, env=env), results_file))
+
+    records = []
+    crashed = []
+    for index, (process, results_file) in enumerate(processes):
+        returncode = process.wait()
+        if results_file.exists():
+            records.extend(json.loads(line) for line in results_file.read_text(encoding="utf-8").splitlines())
+        else:
+            crashed.append(f"worker {index}: no results file (exit code {returncode})")
+            continue
+        if returncode not in (0, 1):
+            crashed.append(f"worker {index}: exit code {returncode}")
+    return records, crashed
+
+
+def summarize(records):
+    """Collapse per-test records into one status, duration, error and vitals list per file."""
+    summary = {}
+    for record in records:
+        entry = summary.setdefault(record["file"], {"outcomes": set(), "duration": 0.0, "errors": [], "webVitals": []})
+        if "webVitals" in record:
+            entry["webVitals"].extend(record["webVitals"])
+            continue
+        entry["outcomes"].add(record["outcome"])
+        entry["duration"] += record["duration"]
+        if record["outcome"] != "passed" and record["error"]:
+            entry["errors"].append(record["error"])
+    for entry in summary.values():
+        outcomes = entry.pop("outcomes")
+        if "failed" in outcomes:
+            entry["status"] = "FAILED"
+        elif "passed" in outcomes:
+            entry["status"] = "PASSED"
+        else:
+            entry["status"] = "SKIPPED"
+    return summary
+
+
+def merge_results(paths, summary):
+    """Update tmp/test_results.json in place, keeping TestSprite's own fields."""
+    existing = _load_json(RESULTS_PATH, [])
+    by_title = {entry["title"]: entry for entry in existing}
+    template = existing[0] if existing else {}
+    descriptions = {
+        (kind, entry["id"]): entry.get("description", "")
+        for kind, plan_path in PLAN_PATHS.items()
+        for entry in _load_json(plan_path, [])
+    }
+    now = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+    for path in paths:
+        result = summary.get(path.name)
+        if result is None:
+            continue
+        kind = case_type(path)
+        title = title_for(path)
+        entry = by_title.get(title)
+        if entry is None:
+            entry = {
+                "projectId": template.get("projectId"),
+                "testId": str(uuid.uuid4()),
+                "userId": template.get("userId"),
+                "title": title,
+                "description": descriptions.get((kind, path.stem.split("_")[0]), ""),
+                "testVisualization": None,
+                "createFrom": "local",
+                "created": now,
+            }
+            by_title[title] = entry
+            existing.append(entry)
+        entry.update(
+            code=path.read_text(encoding="utf-8"),
+            testStatus=result["status"],
+            testError="\n\n".join(result["errors"]),
+            testType=kind,
+            webVitals=result["webVitals"],
+            modified=now,
+        )
+
+    RESULTS_PATH.parent.mkdir(exist_ok=True)
+    RESULTS_PATH.write_text(json.dumps(existing, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1)
+    kind = parser.add_mutually_exclusive_group()
+    kind.add_argument("--ui", action="store_true", help="run only the UI (FRONTEND) cases")
+    kind.add_argument("--backend", action="store_true", help="run only the API (BACKEND) cases")
+    parser.add_argument(
+        "--local-supabase",
+        action="store_true",
+        help="serve the Supabase REST API from local_supabase.py, shared by all workers",
+    )
+    parser.add_argument("pytest_args", nargs="*", help="extra arguments passed to every pytest worker")
+    args = parser.parse_args(argv)
+
+    paths = sorted(HERE.glob("TC*.py"))
+    if args.ui:
+        paths = [path for path in paths if case_type(path) == "FRONTEND"]
+    elif args.backend:
+        paths = [path for path in paths if case_type(path) == "BACKEND"]
+
+    durations = _load_json(DURATIONS_PATH, {})
+    shards = shard(paths, max(1, min(args.workers, len(paths))), durations)
+    print(f"Running {len(paths)} cases on {len(shards)} workers")
+
+    server = None
+    if args.local_supabase:
+        import local_supabase
+
+        server = local_supabase.serve(port=local_supabase.DEFAULT_PORT)
+        print(f"Local Supabase stand-in on {server.url}")
+    try:
+        with tempfile.TemporaryDirectory(prefix="testsprite-") as workdir:
+            records, crashed = run_shards(shards, args.pytest_args, workdir)
+            summary = summarize(records)
+    finally:
+        if server:
+            server.shutdown()
+
+    merge_results(paths, summary)
+    durations.update({name: result["duration"] for name, result in summary.items() if result["status"] != "SKIPPED"})
+    DURATIONS_PATH.write_text(json.dumps(durations, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    counts = {}
+    for result in summary.values():
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    print(", ".join(f"{count} {status.lower()}" for status, count in sorted(counts.items())))
+    for problem in crashed:
+        print(f"CRASHED {problem}", file=sys.stderr)
+    return 1 if counts.get("FAILED") or crashed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import json
+
+import ts_modules
+
+MODULES = ["error-handler", "logger", "metrics"]
+
+
+def run(body):
+    script = (
+        "import { ApiHealthMonitor, createDeadline, withRetry, SupabaseOperationError } from './error-handler.ts'\n"
+        "const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))\n"
+        "const hang = () => new Promise<never>(() => {})\n"
+        "const breaker = ApiHealthMonitor.getInstance().breaker('teste', { failureThreshold: 1, cooldownMs: 30 })\n"
+        "const states: string[] = []\n"
+        "const attempt = async (operation: () => Promise<unknown>) => {\n"
+        "  const result = await withRetry(operation, { endpoint: 'teste', maxRetries: 0, deadline: createDeadline(20) })\n"
+        "  states.push(`${result.success ? 'ok' : result.error}:${breaker.getState()}`)\n"
+        "}\n"
+        f"{body}\n"
+        "console.log(JSON.stringify(states))\n"
+        "process.exit(0)\n"
+    )
+    return json.loads(ts_modules.run(script, MODULES))
+
+
+def test_deadline_opens_the_circuit_and_a_timed_out_trial_recovers():
+    states = run(
+        "await attempt(hang)\n"
+        "await attempt(async () => 1)\n"
+        "await sleep(40)\n"
+        "await attempt(hang)\n"
+        "await sleep(40)\n"
+        "await attempt(async () => 1)\n"
+    )
+    assert states == [
+        "Prazo da operação esgotado:open",
+        "Circuito aberto para teste:open",
+        # The half-open trial timed out: the circuit reopens instead of sticking
+        "Prazo da operação esgotado:open",
+        "ok:closed",
+    ]
+
+
+def test_permanent_error_in_a_trial_closes_the_circuit():
+    states = run(
+        "await attempt(hang)\n"
+        "await sleep(40)\n"
+        "await attempt(async () => { throw new SupabaseOperationError('not found', 'PGRST116', 406) })\n"
+        "await attempt(async () => 1)\n"
+    )
+    assert states == ["Prazo da operação esgotado:open", "not found:closed", "ok:closed"]
@@ -0,0 +1,267 @@
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pytest
+
+import local_supabase
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = local_supabase.serve(port=0)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def fresh_data(server):
+    server.database.reset()
+
+
+def call(server, method, path, body=None, headers=None):
+    data = None if body is None else json.dumps(body).encode("utf-8")
+    request = urllib.request.Request(server.url + path, data=data, method=method, headers=headers or {})
+    if data is not None:
+        request.add_header("Content-Type", "application/json")
+    try:
+        with urllib.request.urlopen(request) as response:
+            raw = response.read()
+            return response.status, dict(response.headers), json.loads(raw) if raw else None
+    except urllib.error.HTTPError as error:
+        raw = error.read()
+        return error.code, dict(error.headers), json.loads(raw) if raw else None
+
+
+def test_seed_rows_are_typed_from_migrations(server):
+    status, _, rows = call(server, "GET", "/rest/v1/pizzaria_config?select=*")
+    assert status == 200
+    config = rows[0]
+    assert config["taxa_entrega"] == 10.0
+    assert config["tempo_entrega_min"] == 40
+    assert config["aceita_dinheiro"] is True
+    assert config["whatsapp"] == "12996367326"
+    assert isinstance(config["horario_funcionamento"], dict)
+
+
+def test_select_filters_order_and_columns(server):
+    status, _, rows = call(server, "GET", "/rest/v1/produtos?select=id,nome,ordem&ativo=eq.true&order=ordem.desc&limit=3")
+    assert status == 200
+    assert len(rows) == 3
+    assert set(rows[0]) == {"id", "nome", "ordem"}
+    assert [row["ordem"] for row in rows] == sorted((row["ordem"] for row in rows), reverse=True)
+
+
+def test_in_and_negated_filters(server):
+    _, _, sizes = call(server, "GET", "/rest/v1/tamanhos_pizza?nome=in.(Tradicional,Broto)")
+    assert {row["nome"] for row in sizes} == {"Tradicional", "Broto"}
+    _, _, others = call(server, "GET", "/rest/v1/tamanhos_pizza?nome=not.eq.Broto")
+    assert [row["nome"] for row in others] == ["Tradicional"]
+
+
+def test_keyset_pages_with_logic_tree(server):
+    # Nome repetido (desempate por id) e nome com vírgula e aspas (literal entre aspas)
+    for nome in ('Calabresa', 'Pizza "A, B" (especial)', None):
+        call(server, "POST", "/rest/v1/produtos", {"nome": nome, "preco_tradicional": 40})
+    _, _, expected = call(server, "GET", "/rest/v1/produtos?select=id,nome&order=nome.asc.nullslast,id.asc")
+
+    def literal(value):
+        return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    seen, cursor = [], None
+    while True:
+        path = "/rest/v1/produtos?select=id,nome&order=nome.asc.nullslast,id.asc&limit=4"
+        if cursor:
+            nome, id_ = cursor
+            if nome is None:
+                tree = f"(and(nome.is.null,id.gt.{literal(id_)}))"
+            else:
+                tree = f"(nome.gt.{literal(nome)},and(nome.eq.{literal(nome)},id.gt.{literal(id_)}),nome.is.null)"
+            path += "&or=" + urllib.parse.quote(tree)
+        status, _, page = call(server, "GET", path)
+        assert status == 200
+        if not page:
+            break
+        seen.extend(page)
+        cursor = (page[-1]["nome"], page[-1]["id"])
+
+    assert seen == expected
+    assert len({row["id"] for row in seen}) == len(expected)
+
+
+def test_single_object_requires_exactly_one_row(server):
+    accept = {"Accept": local_supabase.SINGLE_OBJECT}
+    status, _, admin = call(server, "GET", "/rest/v1/admins?email=eq.admin@pizzaria.com", headers=accept)
+    assert status == 200
+    assert admin["nome"].startswith("Administrador")
+
+    status, _, error = call(server, "GET", "/rest/v1/produtos", headers=accept)
+    assert status == 406
+    assert error["code"] == "PGRST116"
+
+
+def test_count_exact_sets_content_range(server):
+    status, headers, _ = call(server, "HEAD", "/rest/v1/categorias?select=id", headers={"Prefer": "count=exact"})
+    assert status == 200
+    assert headers["Content-Range"].endswith("/5")
+
+
+def test_insert_applies_defaults_and_returns_representation(server):
+    status, _, rows = call(
+        server, "POST", "/rest/v1/categorias", {"nome": "Calzones"},
+        headers={"Prefer": "return=representation"},
+    )
+    assert status == 201
+    created = rows[0]
+    assert created["ativo"] is True
+    assert created["ordem"] == 0
+    assert created["id"]
+
+
+def test_upsert_merges_on_conflict(server):
+    _, _, rows = call(server, "GET", "/rest/v1/pizzaria_config?select=id")
+    config_id = rows[0]["id"]
+    status, _, _ = call(
+        server, "POST", "/rest/v1/pizzaria_config", {"id": config_id, "taxa_entrega": 7.5},
+        headers={"Prefer": "resolution=merge-duplicates"},
+    )
+    assert status == 201
+    _, _, rows = call(server, "GET", "/rest/v1/pizzaria_config?select=taxa_entrega,nome")
+    assert rows == [{"taxa_entrega": 7.5, "nome": "William Disk Pizza"}]
+
+
+def test_update_and_delete_with_filters(server):
+    status, _, _ = call(server, "PATCH", "/rest/v1/bordas_recheadas?nome=eq.Catupiry", {"preco": 9.5})
+    assert status == 204
+    _, _, rows = call(server, "GET", "/rest/v1/bordas_recheadas?nome=eq.Catupiry")
+    assert rows[0]["preco"] == 9.5
+
+    status, _, deleted = call(
+        server, "DELETE", "/rest/v1/bordas_recheadas?nome=eq.Catupiry",
+        headers={"Prefer": "return=representation"},
+    )
+    assert status == 200
+    assert [row["nome"] for row in deleted] == ["Catupiry"]
+    _, _, rows = call(server, "GET", "/rest/v1/bordas_recheadas?nome=eq.Catupiry")
+    assert rows == []
+
+
+def test_cors_preflight(server):
+    status, headers, _ = call(
+        server, "OPTIONS", "/rest/v1/produtos",
+        headers={"Origin": "http://localhost:3000", "Access-Control-Request-Headers": "apikey, authorization"},
+    )
+    assert status == 200
+    assert headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+    assert headers["Access-Control-Allow-Headers"] == "apikey, authorization"
+
+
+def test_viacep_stand_in(server):
+    status, _, address = call(server, "GET", "/ws/01001000/json/")
+    assert status == 200
+    assert address["cep"] == "01001-000"
+    assert (address["localidade"], address["uf"]) == ("São Paulo", "SP")
+
+    status, _, address = call(server, "GET", "/ws/99999999/json/")
+    assert status == 200
+    assert address == {"erro": True}
+
+
+def test_delivery_zones_table_from_migration(server):
+    status, _, rows = call(
+        server, "POST", "/rest/v1/zonas_entrega?select=*",
+        body={"nome": "Centro", "cep_inicio": "12240000", "cep_fim": "12245999", "taxa": 6.5},
+        headers={"Prefer": "return=representation"},
+    )
+    assert status == 201
+    zone = rows[0]
+    assert (zone["tipo"], zone["bairros"], zone["ativo"]) == ("cep", [], True)
+    assert zone["pedido_minimo"] == 0
+
+
+def test_criar_pedido_rpc_is_idempotent(server):
+    _, _, produtos = call(server, "GET", "/rest/v1/produtos?select=id&limit=1")
+    key = "0b6f8a52-3f0e-4c0e-9f43-5b7c1d2e3f40"
+    args = {
+        "p_idempotency_key": key,
+        "p_pedido": {"tipo_entrega": "balcao", "forma_pagamento": "pix", "subtotal": 95.0,
+                     "taxa_entrega": 0, "total": 95.0, "cliente_nome": "Ana", "cliente_telefone": "(12) 99999-0000"},
+        "p_itens": [
+            {"produto_id": produtos[0]["id"], "nome_produto": "Calabresa", "tamanho": "tradicional",
+             "sabores": ["Calabresa"], "quantidade": 2, "preco_unitario": 40.0, "preco_total": 80.0},
+            {"produto_id": "00000000-0000-4000-8000-000000000000", "nome_produto": "Refrigerante",
+             "quantidade": 1, "preco_unitario": 15.0, "preco_total": 15.0},
+        ],
+    }
+    status, _, first = call(server, "POST", "/rest/v1/rpc/criar_pedido", args)
+    assert status == 200 and first[0]["duplicado"] is False
+    _, _, again = call(server, "POST", "/rest/v1/rpc/criar_pedido", args,
+                       {"Accept": "application/vnd.pgrst.object+json"})
+    assert again["duplicado"] is True
+    assert (again["id"], again["numero"]) == (first[0]["id"], first[0]["numero"])
+
+    _, _, pedidos = call(server, "GET", f"/rest/v1/pedidos?idempotency_key=eq.{key}")
+    assert len(pedidos) == 1 and pedidos[0]["total"] == 95.0 and pedidos[0]["numero"] == first[0]["numero"]
+    _, _, itens = call(server, "GET", f"/rest/v1/pedido_itens?pedido_id=eq.{first[0]['id']}&order=preco_total.desc")
+    assert [item["quantidade"] for item in itens] == [2, 1]
+    assert itens[1]["produto_id"] is None  # produto desconhecido não viola a FK
+
+    status, _, error = call(server, "POST", "/rest/v1/rpc/criar_pedido", {**args, "p_itens": []})
+    assert status == 400 and error["code"] == "22023"
+
+
+def test_buscar_pedido_returns_one_order_with_items(server):
+    args = {
+        "p_idempotency_key": "5d0c7a4e-8b1f-4e2a-9c3d-1a2b3c4d5e6f",
+        "p_pedido": {"tipo_entrega": "balcao", "forma_pagamento": "pix", "subtotal": 40.0, "total": 40.0},
+        "p_itens": [{"nome_produto": "Calabresa", "quantidade": 1, "preco_unitario": 40.0, "preco_total": 40.0}],
+    }
+    _, _, receipt = call(server, "POST", "/rest/v1/rpc/criar_pedido", args)
+    accept = {"Accept": local_supabase.SINGLE_OBJECT}
+    status, _, pedido = call(server, "POST", "/rest/v1/rpc/buscar_pedido", {"p_id": receipt[0]["id"]}, accept)
+    assert status == 200
+    assert pedido["numero"] == receipt[0]["numero"]
+    assert [item["nome_produto"] for item in pedido["pedido_itens"]] == ["Calabresa"]
+
+    status, _, missing = call(server, "POST", "/rest/v1/rpc/buscar_pedido",
+                              {"p_id": "00000000-0000-4000-8000-000000000000"}, accept)
+    assert status == 200 and missing is None
+
+
+def test_admin_batch_rpcs_update_many_rows(server):
+    _, _, produtos = call(server, "GET", "/rest/v1/produtos?select=id,ativo&order=ordem.asc,id.asc&limit=3")
+    ids = [produto["id"] for produto in produtos]
+
+    status, _, total = call(server, "POST", "/rest/v1/rpc/atualizar_flags_em_lote",
+                            {"p_tabela": "produtos", "p_coluna": "ativo", "p_valores": {ids[0]: False, ids[1]: True}})
+    assert status == 200 and total == 2
+    _, _, rows = call(server, "GET", f"/rest/v1/produtos?select=id,ativo&id=in.({ids[0]},{ids[1]})")
+    assert {row["id"]: row["ativo"] for row in rows} == {ids[0]: False, ids[1]: True}
+
+    status, _, total = call(server, "POST", "/rest/v1/rpc/reordenar_em_lote",
+                            {"p_tabela": "produtos", "p_ids": list(reversed(ids))})
+    assert status == 200 and total == 3
+    _, _, rows = call(server, "GET", f"/rest/v1/produtos?select=id,ordem&id=in.({','.join(ids)})&order=ordem.asc")
+    assert [(row["id"], row["ordem"]) for row in rows] == [(ids[2], 1), (ids[1], 2), (ids[0], 3)]
+
+    status, _, error = call(server, "POST", "/rest/v1/rpc/atualizar_flags_em_lote",
+                            {"p_tabela": "admins", "p_coluna": "ativo", "p_valores": {}})
+    assert status == 400 and error["code"] == "22023"
+
+
+def test_reajustar_precos_rounds_and_keeps_missing_prices(server):
+    _, _, created = call(
+        server, "POST", "/rest/v1/produtos",
+        {"nome": "Margherita", "preco_tradicional": 45.9, "preco_broto": None},
+        headers={"Prefer": "return=representation"},
+    )
+    produto_id = created[0]["id"]
+    status, _, total = call(server, "POST", "/rest/v1/rpc/reajustar_precos",
+                            {"p_percentual": 10, "p_ids": [produto_id]})
+    assert status == 200 and total == 1
+    _, _, rows = call(server, "GET", f"/rest/v1/produtos?select=preco_tradicional,preco_broto&id=eq.{produto_id}")
+    assert rows == [{"preco_tradicional": 50.49, "preco_broto": None}]
+
+    status, _, error = call(server, "POST", "/rest/v1/rpc/reajustar_precos", {"p_percentual": -100})
+    assert status == 400 and error["code"] == "22023"
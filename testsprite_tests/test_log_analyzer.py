@@ -0,0 +1,57 @@
+import gzip
+import json
+
+import pytest
+
+import log_analyzer
+
+
+def entry(level, context, timestamp="2025-01-01T12:00:00.000Z", **metadata):
+    line = {"timestamp": timestamp, "level": level, "context": context, "message": "m"}
+    if metadata:
+        line["metadata"] = metadata
+    return json.dumps(line)
+
+
+def test_parse_window():
+    assert log_analyzer.parse_window("300") == 300
+    assert log_analyzer.parse_window("5m") == 300
+    assert log_analyzer.parse_window("1h") == 3600
+    with pytest.raises(Exception):
+        log_analyzer.parse_window("0")
+
+
+def test_error_rates_retries_and_fallback_windows():
+    lines = [
+        entry("info", "SUPABASE"),
+        entry("error", "SUPABASE"),
+        entry("warn", "RETRY", attempt=1, maxRetries=4),
+        entry("warn", "RETRY", attempt=2, maxRetries=4),
+        entry("warn", "RETRY", attempt=4, maxRetries=4),
+        entry("warn", "SUPABASE", "2025-01-01T12:01:00.000Z", fallbackUsed=True),
+        entry("warn", "SUPABASE", "2025-01-01T12:07:00.000Z", fallbackUsed=True),
+        entry("info", "MENU"),
+        "not json",
+        "",
+    ]
+    stats = log_analyzer.LogStats(window=300).consume(lines)
+    report = stats.to_dict()
+
+    assert report["entries"] == 8
+    assert report["malformed"] == 1
+    assert stats.contexts() == ["SUPABASE", "RETRY", "MENU"]
+    assert report["contexts"]["SUPABASE"]["error_rate"] == 0.25
+    assert report["retry_attempts"] == {"1": 1, "2": 1, "4": 1}
+    assert report["retry_exhausted"] == 1
+    assert list(report["fallbacks"].values()) == [1, 1]
+    assert "attempt  4" in stats.format()
+
+
+def test_reads_plain_and_gzipped_segments(tmp_path, capsys):
+    (tmp_path / "logs-20250101-120000-000.ndjson").write_text(entry("error", "AUTH") + "\n", encoding="utf-8")
+    with gzip.open(tmp_path / "logs-20250101-130000-000.ndjson.gz", "wt", encoding="utf-8") as handle:
+        handle.write(entry("info", "AUTH") + "\n")
+
+    assert log_analyzer.main([str(tmp_path), "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["contexts"]["AUTH"] == {"entries": 2, "errors": 1, "warnings": 0, "error_rate": 0.5}
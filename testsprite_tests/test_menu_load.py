@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+import local_supabase
+import menu_load
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = local_supabase.serve(port=0)
+    yield server
+    server.shutdown()
+
+
+def test_percentile_is_nearest_rank():
+    samples = [float(value) for value in range(1, 101)]
+    assert menu_load.percentile(samples, 0.50) == 50.0
+    assert menu_load.percentile(samples, 0.95) == 95.0
+    assert menu_load.percentile(samples, 0.99) == 99.0
+    assert menu_load.percentile([0.2], 0.99) == 0.2
+    assert menu_load.percentile([], 0.5) == 0.0
+
+
+def test_breaches_compare_visits_against_slo():
+    samples = [menu_load.Sample(menu_load.VISIT, True, 0.1)] * 98 + [menu_load.Sample(menu_load.VISIT, False, 4.0)] * 2
+    report = menu_load.LoadReport(samples, elapsed=10.0, users=5)
+    assert report.throughput == 10.0
+    assert report.error_rate == 0.02
+    assert report.breaches(menu_load.DEFAULT_SLO) == ["error rate 2.00% > 1.00%"]
+
+    strict = menu_load.Slo(p50_ms=50.0, p95_ms=None, p99_ms=3000.0, error_rate=None, min_throughput=20.0)
+    assert report.breaches(strict) == [
+        "visit p50 100ms > 50ms",
+        "visit p99 4000ms > 3000ms",
+        "throughput 10.0/s < 20.0/s",
+    ]
+
+
+def test_run_drives_the_menu_queries(server):
+    report = asyncio.run(menu_load.run(
+        users=4, duration=30.0, visits_per_user=3, supabase_url=server.url, include_html=False,
+    ))
+    assert report.visits.count == 12
+    assert set(report.stats) == {name for name, _ in menu_load.MENU_QUERIES} | {menu_load.VISIT}
+    assert all(stats.count == 12 and stats.errors == 0 for stats in report.stats.values())
+    assert report.breaches() == []
+
+
+def test_unreachable_backend_counts_as_errors():
+    report = asyncio.run(menu_load.run(
+        users=1, duration=30.0, visits_per_user=1, supabase_url="http://127.0.0.1:9", include_html=False,
+    ))
+    assert report.error_rate == 1.0
+    assert report.breaches()[0].startswith("error rate")
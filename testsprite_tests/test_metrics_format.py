@@ -0,0 +1,88 @@
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+import metrics_format
+import ts_modules
+
+VALID = """\
+# HELP retry_attempts_total Tentativas extras
+# TYPE retry_attempts_total counter
+retry_attempts_total{endpoint="supabase"} 3
+# HELP api_health_up Saúde do endpoint
+# TYPE api_health_up gauge
+api_health_up{endpoint="supabase"} 1
+# HELP supabase_query_duration_seconds Duração
+# TYPE supabase_query_duration_seconds histogram
+supabase_query_duration_seconds_bucket{table="produtos",le="0.1"} 1
+supabase_query_duration_seconds_bucket{table="produtos",le="1"} 2
+supabase_query_duration_seconds_bucket{table="produtos",le="+Inf"} 3
+supabase_query_duration_seconds_sum{table="produtos"} 2.75
+supabase_query_duration_seconds_count{table="produtos"} 3
+"""
+
+
+def test_valid_exposition_parses():
+    assert metrics_format.validate(VALID) == []
+    families = metrics_format.parse(VALID)
+    assert families["retry_attempts_total"]["type"] == "counter"
+    assert families["retry_attempts_total"]["samples"] == [("retry_attempts_total", {"endpoint": "supabase"}, 3.0)]
+    assert len(families["supabase_query_duration_seconds"]["samples"]) == 5
+
+
+def test_escaped_label_values():
+    text = '# HELP m x\n# TYPE m gauge\nm{path="a\\"b\\\\c\\nd"} 1\n'
+    assert metrics_format.validate(text) == []
+    assert metrics_format.parse(text)["m"]["samples"][0][1] == {"path": 'a"b\\c\nd'}
+
+
+def test_histogram_problems_are_reported():
+    broken = VALID.replace('le="1"} 2', 'le="1"} 0').replace("_count{table=\"produtos\"} 3", "_count{table=\"produtos\"} 4")
+    problems = metrics_format.validate(broken)
+    assert any("not cumulative" in problem for problem in problems)
+    assert any("!= _count" in problem for problem in problems)
+
+    no_inf = "\n".join(line for line in VALID.splitlines() if "+Inf" not in line)
+    assert any("+Inf" in problem for problem in metrics_format.validate(no_inf))
+
+
+def test_format_violations():
+    assert metrics_format.validate("# TYPE m gauge\nm 1\n") == ["m: missing # HELP"]
+    assert "malformed labels" in metrics_format.validate("# HELP m x\n# TYPE m gauge\nm{a=1} 1\n")[0]
+    assert "invalid value" in metrics_format.validate("# HELP m x\n# TYPE m gauge\nm abc\n")[0]
+    assert "not contiguous" in metrics_format.validate(
+        "# HELP a x\n# TYPE a gauge\na 1\n# HELP b x\n# TYPE b gauge\nb 1\na 2\n"
+    )[0]
+
+
+def test_rendered_metrics_are_valid():
+    # The real lib/metrics.ts output after the retry path recorded every kind of metric
+    text = ts_modules.run(
+        "import { supabaseOperation } from './error-handler.ts'\n"
+        "import { renderMetrics } from './metrics.ts'\n"
+        "await supabaseOperation(async () => ({ data: [1], error: null }), undefined, { table: 'produtos' })\n"
+        "await supabaseOperation(async () => ({ data: null, error: { message: 'x' }, status: 503 }), [],\n"
+        "  { table: 'categorias', maxRetries: 1, delayMs: 1 })\n"
+        "process.stdout.write(renderMetrics())\n"
+        "process.exit(0)\n",
+        ["error-handler", "logger", "metrics"],
+    )
+    assert metrics_format.validate(text) == []
+    families = metrics_format.parse(text)
+    assert families["retry_attempts_total"]["samples"]
+    assert families["supabase_query_duration_seconds"]["samples"]
+
+
+def test_live_metrics_endpoint_is_valid():
+    base_url = os.environ.get("BASE_URL", "http://localhost:3000")
+    request = urllib.request.Request(f"{base_url}/metrics")
+    if os.environ.get("METRICS_TOKEN"):
+        request.add_header("Authorization", f"Bearer {os.environ['METRICS_TOKEN']}")
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            text = response.read().decode("utf-8")
+    except (urllib.error.URLError, OSError) as error:
+        pytest.skip(f"app not reachable at {base_url}: {error}")
+    assert metrics_format.validate(text) == []
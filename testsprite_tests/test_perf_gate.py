@@ -0,0 +1,105 @@
+import random
+
+import perf_gate
+
+
+def test_ranks_share_ties():
+    assert perf_gate._ranks([3.0, 1.0, 3.0, 2.0]) == [3.5, 1.0, 3.5, 2.0]
+
+
+def test_mann_whitney_detects_a_shift_only_in_the_slower_direction():
+    baseline = [100.0 + value for value in range(10)]
+    slower = [130.0 + value for value in range(10)]
+    u, p_value = perf_gate.mann_whitney_greater(slower, baseline)
+    assert u == 100.0
+    assert p_value < 0.001
+    _, p_value = perf_gate.mann_whitney_greater(baseline, slower)
+    assert p_value > 0.99
+    _, p_value = perf_gate.mann_whitney_greater(baseline, baseline)
+    assert 0.4 < p_value < 0.6
+    assert perf_gate.mann_whitney_greater([], baseline) == (0.0, 1.0)
+
+
+def test_bootstrap_interval_brackets_the_median_ratio():
+    rng = random.Random(1)
+    baseline = [rng.gauss(100, 5) for _ in range(15)]
+    current = [value * 1.5 for value in baseline]
+    low, high = perf_gate.bootstrap_ratio_ci(current, baseline)
+    assert low < 1.5 < high
+    assert low > 1.2
+
+
+def test_regression_needs_significance_and_a_slowdown_beyond_tolerance():
+    rng = random.Random(2)
+    baseline = [rng.gauss(200, 10) for _ in range(12)]
+
+    noisy = [rng.gauss(200, 10) for _ in range(12)]
+    assert not perf_gate.compare_samples("s", "m", baseline, noisy).regressed
+
+    # Significant, but only about 3% slower
+    drift = [value * 1.03 for value in baseline]
+    assert not perf_gate.compare_samples("s", "m", baseline, drift).regressed
+
+    slow = [value * 1.4 for value in baseline]
+    comparison = perf_gate.compare_samples("s", "m", baseline, slow)
+    assert comparison.regressed
+    assert "REGRESSION" in perf_gate.format_comparison(comparison)
+
+    faster = [value * 0.6 for value in baseline]
+    assert not perf_gate.compare_samples("s", "m", baseline, faster).regressed
+
+
+def test_baselines_are_stored_per_scenario(tmp_path):
+    path = tmp_path / "baselines.json"
+    assert perf_gate.load_baselines(path) == {}
+    perf_gate.save_baseline("menu_fetch", {"visit_p50_ms": [10.12345, 11.0]}, path)
+    perf_gate.save_baseline("homepage_render", {"load_ms": [900.0]}, path)
+
+    baselines = perf_gate.load_baselines(path)
+    assert set(baselines) == {"menu_fetch", "homepage_render"}
+    assert baselines["menu_fetch"]["runs"] == 2
+    assert baselines["menu_fetch"]["metrics"] == {"visit_p50_ms": [10.123, 11.0]}
+
+
+def test_compare_without_baseline_fails_unless_allowed(tmp_path, monkeypatch, capsys):
+    measured = []
+
+    async def fake(runs, options):
+        measured.append(runs)
+        return [{"latency_ms": 1.0}] * runs
+
+    monkeypatch.setitem(perf_gate.SCENARIOS, "fake", fake)
+    arguments = ["compare", "-s", "fake", "--baseline", str(tmp_path / "baselines.json"), "--runs", "3"]
+    assert perf_gate.main(arguments) == 1
+    assert "no baseline" in capsys.readouterr().out
+    assert perf_gate.main([*arguments, "--allow-missing"]) == 0
+    assert measured == []
+
+
+def test_compare_fails_on_a_metric_missing_from_the_baseline(tmp_path, monkeypatch, capsys):
+    metrics = {"latency_ms": 1.0}
+
+    async def fake(runs, options):
+        return [dict(metrics)] * runs
+
+    monkeypatch.setitem(perf_gate.SCENARIOS, "fake", fake)
+    arguments = ["-s", "fake", "--baseline", str(tmp_path / "baselines.json"), "--runs", "3"]
+    assert perf_gate.main(["record", *arguments]) == 0
+    metrics["ttfb_ms"] = 1.0
+    assert perf_gate.main(["compare", *arguments]) == 1
+    assert "fake.ttfb_ms: not in the baseline" in capsys.readouterr().out
+    assert perf_gate.main(["compare", *arguments, "--allow-missing"]) == 0
+
+
+def test_record_then_compare_flags_a_slowdown(tmp_path, monkeypatch):
+    latency = {"value": 100.0}
+
+    async def fake(runs, options):
+        return [{"latency_ms": latency["value"] + index} for index in range(runs)]
+
+    monkeypatch.setitem(perf_gate.SCENARIOS, "fake", fake)
+    arguments = ["-s", "fake", "--baseline", str(tmp_path / "baselines.json"), "--runs", "10"]
+    assert perf_gate.main(["record", *arguments]) == 0
+    assert perf_gate.main(["compare", *arguments]) == 0
+    latency["value"] = 150.0
+    assert perf_gate.main(["compare", *arguments]) == 1
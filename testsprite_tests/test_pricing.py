@@ -0,0 +1,130 @@
+import json
+
+import ts_modules
+
+SNAPSHOT = {
+    "version": "v1",
+    "config": {"habilitar_broto": True, "habilitar_bordas_recheadas": True},
+    "categorias": [
+        {"id": "cat-tradicionais", "multi_sabores_habilitado": True},
+        {"id": "cat-doces", "multi_sabores_habilitado": False},
+    ],
+    "produtos": [
+        {"id": "frango-catupiry", "nome": "Frango com Catupiry", "categoria_id": "cat-tradicionais", "tipo": "salgada",
+         "preco_tradicional": 50, "preco_broto": 30,
+         "adicionais": [{"nome": "Bacon", "preco": 4.5}]},
+        {"id": "mussarela", "nome": "Mussarela", "categoria_id": "cat-tradicionais", "tipo": "salgada",
+         "preco_tradicional": 40, "preco_broto": 25, "promocao": True,
+         "preco_promocional_tradicional": 35, "preco_promocional_broto": None},
+        {"id": "portuguesa", "nome": "Portuguesa", "categoria_id": "cat-tradicionais", "tipo": "salgada",
+         "preco_tradicional": 45, "preco_broto": 0},
+        {"id": "chocolate", "nome": "Chocolate", "categoria_id": "cat-doces", "tipo": "doce",
+         "preco_tradicional": 55, "preco_broto": 35},
+        {"id": "coca-lata", "nome": "Coca-Cola Lata", "categoria_id": None, "tipo": "bebida",
+         "preco_tradicional": 6},
+    ],
+    "bordas": [{"id": "borda-cheddar", "nome": "Cheddar", "preco": 8}],
+    "opcoesSabores": [{"maximo_sabores": 1}, {"maximo_sabores": 2}],
+}
+
+
+def price(items, snapshot=SNAPSHOT, extra=""):
+    script = (
+        "import { buildPriceTable, priceCart } from './pricing.ts'\n"
+        f"const table = buildPriceTable({json.dumps(snapshot)})\n"
+        f"const result: any = priceCart(table, {json.dumps(items)})\n"
+        f"{extra}\n"
+        "console.log(JSON.stringify(result))\n"
+    )
+    return json.loads(ts_modules.run(script, ["pricing"]))
+
+
+def line(item_id, quantidade=1, **fields):
+    return {"id": item_id, "quantidade": quantidade, **fields}
+
+
+def test_regular_promo_and_size_prices():
+    cart = price([
+        line("frango-catupiry-tradicional", 2),
+        line("frango-catupiry-broto"),
+        line("mussarela-tradicional"),
+        # Promotion without a broto promo price keeps the regular broto price
+        line("mussarela-broto"),
+        line("coca-lata", 3),
+    ])
+    assert [item["preco"] for item in cart["items"]] == [50, 30, 35, 25, 6]
+    assert cart["items"][0]["total"] == 100
+    assert cart["subtotal"] == 100 + 30 + 35 + 25 + 18
+    assert cart["problems"] == []
+
+
+def test_broto_requires_flag_and_positive_price():
+    cart = price([line("portuguesa-broto")])
+    assert cart["items"][0]["preco"] is None
+    assert cart["problems"] == ["item 1: Portuguesa não disponível no tamanho broto"]
+
+    disabled = dict(SNAPSHOT, version="v2", config={"habilitar_broto": False})
+    assert price([line("frango-catupiry-broto")], disabled)["items"][0]["preco"] is None
+
+
+def test_multi_flavour_ids_with_hyphens_take_the_highest_price():
+    cart = price([line("multi-frango-catupiry-mussarela-tradicional")])
+    assert cart["items"][0]["preco"] == 50
+    assert cart["problems"] == []
+
+
+def test_multi_flavour_rules():
+    cart = price([
+        line("multi-frango-catupiry-chocolate-tradicional"),
+        line("multi-frango-catupiry-mussarela-portuguesa-tradicional"),
+        line("multi-frango-catupiry-desconhecido-tradicional"),
+    ])
+    assert [item["preco"] for item in cart["items"]] == [None, None, None]
+    assert cart["problems"] == [
+        "item 1: Chocolate não pode ser combinado com outros sabores",
+        "item 2: no máximo 2 sabores",
+        "item 3: produto indisponível no cardápio",
+    ]
+
+
+def test_adicionais_and_borda():
+    cart = price([
+        line("frango-catupiry-tradicional", 2,
+             adicionais=[{"sabor": "Frango com Catupiry", "itens": [{"nome": "Bacon", "preco": 1}]}],
+             bordaRecheada={"id": "borda-cheddar", "nome": "Cheddar", "preco": 1}),
+        line("mussarela-tradicional", adicionais=[{"sabor": "Mussarela", "itens": [{"nome": "Bacon"}]}]),
+        line("coca-lata", tipo="bebida", bordaRecheada={"id": "borda-cheddar", "nome": "Cheddar"}),
+        line("mussarela-tradicional", bordaRecheada={"id": "borda-sumiu", "nome": "Catupiry"}),
+    ])
+    # Client-sent prices are ignored: 50 + 4.50 + 8
+    assert cart["items"][0]["preco"] == 62.5
+    assert cart["items"][0]["total"] == 125
+    assert [item["preco"] for item in cart["items"][1:]] == [None, None, None]
+    assert cart["problems"] == [
+        "item 2: adicional Bacon indisponível para Mussarela",
+        "item 3: borda Cheddar indisponível",
+        "item 4: borda Catupiry indisponível",
+    ]
+    assert cart["subtotal"] == 125
+
+
+def test_base_prices_are_cached_per_flavour_set():
+    result = price(
+        [line("multi-frango-catupiry-mussarela-tradicional"), line("multi-mussarela-frango-catupiry-tradicional")],
+        extra="result.cached = Array.from(table.basePrices.keys())",
+    )
+    # Same flavours in another order share one cached base price
+    assert result["cached"] == ["frango-catupiry,mussarela|tradicional"]
+    assert [item["preco"] for item in result["items"]] == [50, 50]
+
+
+def test_price_table_is_rebuilt_only_when_the_version_changes():
+    script = (
+        "import { priceTableFor } from './pricing.ts'\n"
+        f"const snapshot = {json.dumps(SNAPSHOT)}\n"
+        "const first = priceTableFor(snapshot)\n"
+        "const same = priceTableFor({ ...snapshot })\n"
+        "const next = priceTableFor({ ...snapshot, version: 'v2' })\n"
+        "console.log(JSON.stringify([first === same, first === next]))\n"
+    )
+    assert json.loads(ts_modules.run(script, ["pricing"])) == [True, False]
@@ -0,0 +1,24 @@
+import json
+
+import ts_modules
+
+
+def run(body):
+    script = (
+        "import { RateLimiter } from './rate-limit.ts'\n"
+        "const results: number[] = []\n"
+        f"{body}\n"
+        "console.log(JSON.stringify(results))\n"
+    )
+    return json.loads(ts_modules.run(script, ["rate-limit"]))
+
+
+def test_budget_per_key_and_window():
+    results = run(
+        "const limiter = new RateLimiter(3, 60000)\n"
+        "results.push(limiter.take('a', 2, 0), limiter.take('a', 1, 1000), limiter.take('a', 1, 15000))\n"
+        # Another key has its own budget; a refused take consumes nothing
+        "results.push(limiter.take('b', 3, 15000), limiter.take('a', 5, 20000))\n"
+        "results.push(limiter.take('a', 1, 60000))\n"
+    )
+    assert results == [0, 0, 45, 0, 40, 0]
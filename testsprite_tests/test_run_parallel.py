@@ -0,0 +1,15 @@
+import run_parallel
+
+
+def test_crashed_worker_is_reported(tmp_path):
+    # pytest exits with a usage error and never writes the results file
+    records, crashed = run_parallel.run_shards([[tmp_path / "TC999_missing.py"]], [], tmp_path)
+    assert records == []
+    assert crashed == ["worker 0: no results file (exit code 4)"]
+
+
+def test_main_fails_when_a_worker_crashes(monkeypatch, tmp_path):
+    monkeypatch.setattr(run_parallel, "run_shards", lambda shards, args, workdir: ([], ["worker 0: exit code 3"]))
+    monkeypatch.setattr(run_parallel, "RESULTS_PATH", tmp_path / "test_results.json")
+    monkeypatch.setattr(run_parallel, "DURATIONS_PATH", tmp_path / "durations.json")
+    assert run_parallel.main(["--backend", "-n", "1"]) == 1
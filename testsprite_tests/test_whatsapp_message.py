@@ -0,0 +1,108 @@
+import json
+
+import ts_modules
+
+MODULES = ["whatsapp-message", "currency-utils"]
+LAYOUTS = ["detalhado", "compacto", "abreviado", "link", "resumido"]
+
+# Builds an order with ``n`` two-flavour pizzas drawn from a few long,
+# accented names, each with the same add-ons, plus ``extra`` order fields
+HELPERS = """
+import { buildWhatsAppLink, WHATSAPP_URL_LIMIT } from './whatsapp-message.ts'
+const SABORES = ['Frango com Catupiry', 'Calabresa Acebolada', 'Quatro Queijos Especial', 'Portuguesa à Moda da Casa',
+  'Margherita Napolitana', 'Lombo Canadense com Abacaxi', 'Strogonoff de Carne', 'Moda do Pizzaiolo']
+const pizza = (index: number) => {
+  const a = SABORES[index % SABORES.length]
+  const b = SABORES[(index * 3 + 1) % SABORES.length]
+  return {
+    id: `multi-${index}`, nome: `Pizza ${a} / ${b}`, tamanho: 'tradicional', sabores: [a, b],
+    preco: 50 + index, quantidade: 1, tipo: 'pizza',
+    adicionais: [{ sabor: a, itens: [{ nome: 'Bacon Crocante', preco: 4 }, { nome: 'Cheddar Cremoso', preco: 3 }] }],
+  }
+}
+const order = (items: any[], extra: any = {}) => ({
+  loja: 'Pizzaria Açaí & Cia 🍕', numero: 42, items, entrega: 'delivery',
+  cliente: { nome: 'João Conceição', telefone: '(12) 99999-0000' },
+  endereco: ['Rua São João, 123', 'Jardim Esplanada - São José dos Campos/SP'],
+  pagamento: 'Pix', subtotal: 100, taxaEntrega: 8, total: 108, ...extra,
+})
+const link = (o: any) => buildWhatsAppLink('5512999990000', o)
+const results: any[] = []
+"""
+
+
+def run(body):
+    script = HELPERS + body + "\nconsole.log(JSON.stringify(results))\n"
+    return json.loads(ts_modules.run(script, MODULES))
+
+
+def test_layout_steps_down_as_the_order_grows():
+    sizes = [1, 4, 8, 12, 30, 150]
+    results = run(
+        f"for (const n of {json.dumps(sizes)}) {{\n"
+        "  const items = Array.from({ length: n }, (_, index) => pizza(index))\n"
+        "  for (const pedidoUrl of [null, 'https://pizzaria.example/pedido/abc']) {\n"
+        "    const result = link(order(items, { pedidoUrl }))\n"
+        "    results.push({ n, withLink: pedidoUrl != null, layout: result.layout, length: result.url.length,\n"
+        "      limit: WHATSAPP_URL_LIMIT, message: result.message })\n"
+        "  }\n"
+        "}\n"
+    )
+    for result in results:
+        assert result["length"] <= result["limit"], result["n"]
+        # Customer, address and totals survive every layout
+        assert "João Conceição" in result["message"] and "R$\u00a0108,00" in result["message"]
+
+    for with_link in (False, True):
+        layouts = [LAYOUTS.index(r["layout"]) for r in results if r["withLink"] == with_link]
+        assert layouts == sorted(layouts), "a bigger order never gets a more detailed layout"
+        reached = {LAYOUTS[index] for index in layouts}
+        assert {"detalhado", "compacto", "abreviado"} <= reached
+        assert ("link" if with_link else "resumido") in reached
+        assert ("resumido" if with_link else "link") not in reached
+
+    largest = [r for r in results if r["n"] == sizes[-1] and r["withLink"]][0]
+    assert "Pedido completo: https://pizzaria.example/pedido/abc" in largest["message"]
+
+
+def test_identical_lines_are_grouped():
+    [result] = run(
+        "const items = Array.from({ length: 4 }, (_, index) => pizza(index))\n"
+        "items.push({ ...pizza(0), id: 'again' }, { ...pizza(0), id: 'again-2', quantidade: 2 })\n"
+        "const result = link(order(items))\n"
+        "results.push({ layout: result.layout, message: result.message })\n"
+    )
+    assert result["layout"] in ("compacto", "abreviado")
+    first = [line for line in result["message"].splitlines() if line.startswith("4x ")]
+    assert len(first) == 1 and first[0].endswith("R$\u00a0200,00")
+
+
+def test_abbreviation_only_replaces_whole_names():
+    [result] = run(
+        "const drink = (nome: string, index: number) => ({ id: `d${index}`, nome, tamanho: 'tradicional', sabores: [nome],\n"
+        "  preco: 5 + index, quantidade: 1, tipo: 'bebida' })\n"
+        "const items = [drink('Limãozinho Especial', 99), drink('Água Limão', 98),\n"
+        "  ...Array.from({ length: 30 }, (_, index) => drink(index % 2 ? 'Limão' : 'Água Tônica Premium Importada', index))]\n"
+        "const result = buildWhatsAppLink('5512999990000', order(items), 1200)\n"
+        "results.push({ layout: result.layout, message: result.message })\n"
+    )
+    assert result["layout"] == "resumido"
+    lines = result["message"].splitlines()
+    assert "(#1=Água Tônica Premium Importada #2=Limão)" in lines
+    # "Limão" is coded as a whole word, never inside "Limãozinho"
+    assert "1x Limãozinho Especial = R$\u00a0104,00" in lines
+    assert "1x Água #2 = R$\u00a0103,00" in lines
+    assert "1x #2 = R$\u00a06,00" in lines
+
+
+def test_huge_address_is_cut_to_fit():
+    [result] = run(
+        "const endereco = ['Rua ' + 'Conceição 🏠 '.repeat(400), 'Bairro São João']\n"
+        "const result = link(order([pizza(0)], { endereco }))\n"
+        "results.push({ layout: result.layout, length: result.url.length, message: result.message,\n"
+        "  limit: WHATSAPP_URL_LIMIT })\n"
+    )
+    assert result["length"] <= result["limit"]
+    assert result["message"].endswith("…")
+    # Cut on whole characters: no lone surrogate halves of the emoji
+    result["message"].encode("utf-8")
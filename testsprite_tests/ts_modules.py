@@ -0,0 +1,56 @@
+"""Run the app's plain TypeScript modules under Node for unit tests.
+
+Modules in ``lib/`` that do not depend on React or Next.js can be exercised
+directly: they are copied to a temporary directory with their relative
+imports rewritten to ``./name.ts`` and executed with Node's built-in type
+stripping (``--experimental-transform-types``, Node 22.7+), so no build step
+or npm install is needed. Set ``NODE`` to pick the binary; tests are skipped
+when no suitable Node is available.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+LIB = Path(__file__).resolve().parent.parent / "lib"
+MIN_NODE = (22, 7)
+
+_RELATIVE_IMPORT = re.compile(r"""(from\s+['"])(\./[\w-]+)(['"])""")
+
+
+def node_binary():
+    """Path of a Node able to run TypeScript, or ``None``."""
+    node = os.environ.get("NODE") or shutil.which("node")
+    if not node:
+        return None
+    try:
+        version = subprocess.run([node, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.match(r"v(\d+)\.(\d+)", version.strip())
+    return node if match and (int(match.group(1)), int(match.group(2))) >= MIN_NODE else None
+
+
+def run(script, modules, timeout=30):
+    """Run ``script`` (TypeScript, importing ``./<module>.ts``) next to copies
+    of ``lib/<module>.ts``; returns stdout, failing the test on a non-zero exit."""
+    node = node_binary()
+    if node is None:
+        pytest.skip(f"Node {'.'.join(map(str, MIN_NODE))}+ is required to run lib/*.ts")
+    with tempfile.TemporaryDirectory() as workdir:
+        for module in modules:
+            source = (LIB / f"{module}.ts").read_text(encoding="utf-8")
+            Path(workdir, f"{module}.ts").write_text(_RELATIVE_IMPORT.sub(r"\1\2.ts\3", source), encoding="utf-8")
+        Path(workdir, "package.json").write_text('{"type": "module"}', encoding="utf-8")
+        Path(workdir, "main.ts").write_text(script, encoding="utf-8")
+        result = subprocess.run(
+            [node, "--experimental-transform-types", "--no-warnings", "main.ts"],
+            cwd=workdir, capture_output=True, text=True, timeout=timeout,
+        )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
@@ -0,0 +1,120 @@
+"""Browser performance metrics for the TestSprite UI cases.
+
+Every context created by harness.new_context gets an init script that
+observes LCP, layout shifts and long tasks in each top-level document. For
+each document a page loads (/, /checkout, /admin/produtos, /admin/config, ...)
+one snapshot is kept with its Navigation Timing, FCP, LCP, CLS, TBT, JS heap
+size and the per-request waterfall. Documents that are left by a full
+navigation report on ``pagehide``. Documents still open are read by
+``collect`` when the case ends. conftest.py writes the snapshots next to the
+case's result, and run_parallel.py stores them as ``webVitals`` in
+test_results.json.
+"""
+
+import weakref
+
+from playwright import async_api
+
+# Long tasks count towards TBT only for their part beyond this budget.
+LONG_TASK_BUDGET_MS = 50
+
+_snapshots = weakref.WeakKeyDictionary()
+
+_INIT_JS = """
+(() => {
+  if (window !== window.top || window.__testspriteSnapshot) return
+  const vitals = { lcp: null, cls: 0, longTasks: [] }
+  const observe = (type, callback) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(callback)).observe({ type, buffered: true })
+    } catch (error) {
+      // Entry type not supported by this browser
+    }
+  }
+  observe('largest-contentful-paint', (entry) => { vitals.lcp = entry.startTime })
+  observe('layout-shift', (entry) => { if (!entry.hadRecentInput) vitals.cls += entry.value })
+  observe('longtask', (entry) => { vitals.longTasks.push([entry.startTime, entry.duration]) })
+
+  window.__testspriteSnapshot = () => {
+    const [nav] = performance.getEntriesByType('navigation')
+    const [fcp] = performance.getEntriesByName('first-contentful-paint')
+    const fcpTime = fcp ? fcp.startTime : 0
+    const tbt = vitals.longTasks.reduce(
+      (total, [start, duration]) => start >= fcpTime ? total + Math.max(0, duration - %(budget)d) : total, 0)
+    return {
+      url: location.href,
+      path: location.pathname,
+      timeOrigin: performance.timeOrigin,
+      navigation: nav ? {
+        ttfb: nav.responseStart,
+        domContentLoaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd,
+        transferSize: nav.transferSize,
+      } : null,
+      fcp: fcp ? fcp.startTime : null,
+      lcp: vitals.lcp,
+      cls: vitals.cls,
+      tbt,
+      jsHeap: performance.memory ? performance.memory.usedJSHeapSize : null,
+      requests: performance.getEntriesByType('resource').map((entry) => ({
+        url: entry.name,
+        type: entry.initiatorType,
+        start: entry.startTime,
+        duration: entry.duration,
+        size: entry.transferSize,
+        status: entry.responseStatus ?? null,
+      })),
+    }
+  }
+  addEventListener('pagehide', () => {
+    if (window.__testspriteReport) window.__testspriteReport(window.__testspriteSnapshot())
+  })
+})()
+""" % {"budget": LONG_TASK_BUDGET_MS}
+
+_SNAPSHOT_JS = "() => window.__testspriteSnapshot ? window.__testspriteSnapshot() : null"
+
+
+def _round(value):
+    return round(value, 1) if isinstance(value, float) else value
+
+
+def _compact(snapshot):
+    """Round the millisecond floats so results stay readable in test_results.json."""
+    compact = {key: _round(value) for key, value in snapshot.items() if key not in ("navigation", "requests")}
+    compact["cls"] = round(snapshot["cls"], 4)
+    if snapshot["navigation"]:
+        compact["navigation"] = {key: _round(value) for key, value in snapshot["navigation"].items()}
+    else:
+        compact["navigation"] = None
+    compact["requests"] = [
+        {key: _round(value) for key, value in request.items()}
+        for request in sorted(snapshot["requests"], key=lambda request: request["start"])
+    ]
+    return compact
+
+
+def _store(context, snapshot):
+    # A document is identified by its timeOrigin; a later snapshot of the
+    # same document supersedes the earlier one.
+    if snapshot:
+        _snapshots.setdefault(context, {})[snapshot["timeOrigin"]] = _compact(snapshot)
+
+
+async def track_context(context):
+    """Observe every top-level document the context loads from now on."""
+    _snapshots.setdefault(context, {})
+    await context.expose_binding("__testspriteReport", lambda source, snapshot: _store(context, snapshot))
+    await context.add_init_script(_INIT_JS)
+
+
+async def collect(context):
+    """Return one snapshot per document loaded in ``context``, oldest first."""
+    for page in context.pages:
+        try:
+            _store(context, await page.evaluate(_SNAPSHOT_JS))
+        except async_api.Error:
+            # Page closed or mid-navigation; its pagehide report is all we get.
+            pass
+    snapshots = _snapshots.get(context, {})
+    return [snapshots[origin] for origin in sorted(snapshots)]
@@ -0,0 +1,113 @@
+"""Event-driven waits for the TestSprite UI cases.
+
+The generated scripts used to sleep a fixed 3s before every interaction.
+These helpers wait on concrete conditions instead: no Supabase request in
+flight (the queries issued by loadData in app/page.tsx), no DOM mutation for
+a short quiet window, and the target locator being visible. Each condition
+is bounded, so a page that never settles only costs its timeout and the
+following Playwright action reports the real failure.
+"""
+
+import asyncio
+import weakref
+
+from playwright import async_api
+
+# Requests that feed the UI: Supabase REST, storage and the app's own API routes.
+BACKEND_PATHS = ("/rest/v1/", "/storage/v1/", "/api/")
+
+NETWORK_IDLE_TIMEOUT_MS = 5000
+DOM_QUIET_MS = 150
+DOM_SETTLE_TIMEOUT_MS = 3000
+
+_trackers = weakref.WeakKeyDictionary()
+
+_DOM_SETTLED_JS = """
+([quietMs, timeoutMs]) => new Promise((resolve) => {
+  let quiet
+  const done = (settled) => {
+    observer.disconnect()
+    clearTimeout(quiet)
+    clearTimeout(cap)
+    resolve(settled)
+  }
+  const observer = new MutationObserver(() => {
+    clearTimeout(quiet)
+    quiet = setTimeout(() => done(true), quietMs)
+  })
+  observer.observe(document, { childList: true, subtree: true, attributes: true, characterData: true })
+  quiet = setTimeout(() => done(true), quietMs)
+  const cap = setTimeout(() => done(false), timeoutMs)
+})
+"""
+
+
+class _NetworkTracker:
+    """Counts in-flight backend requests for one page."""
+
+    def __init__(self):
+        self.inflight = set()
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def started(self, request):
+        if any(path in request.url for path in BACKEND_PATHS):
+            self.inflight.add(request)
+            self.idle.clear()
+
+    def finished(self, request):
+        self.inflight.discard(request)
+        if not self.inflight:
+            self.idle.set()
+
+
+def track_page(page):
+    """Start counting backend requests on ``page``; safe to call twice."""
+    if page in _trackers:
+        return _trackers[page]
+    tracker = _NetworkTracker()
+    page.on("request", tracker.started)
+    page.on("requestfinished", tracker.finished)
+    page.on("requestfailed", tracker.finished)
+    _trackers[page] = tracker
+    return tracker
+
+
+def track_context(context):
+    """Track every page the context opens, including popups and new tabs."""
+    context.on("page", track_page)
+
+
+async def wait_for_network_idle(page, timeout_ms=NETWORK_IDLE_TIMEOUT_MS):
+    """Wait until no backend request is in flight. Returns False on timeout."""
+    tracker = track_page(page)
+    try:
+        await asyncio.wait_for(tracker.idle.wait(), timeout_ms / 1000)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def wait_for_dom_settled(page, quiet_ms=DOM_QUIET_MS, timeout_ms=DOM_SETTLE_TIMEOUT_MS):
+    """Wait until the DOM has not mutated for ``quiet_ms``. Returns False on timeout."""
+    try:
+        return await page.evaluate(_DOM_SETTLED_JS, [quiet_ms, timeout_ms])
+    except async_api.Error:
+        # The page navigated while we were observing; wait for the new document instead.
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+        except async_api.Error:
+            return False
+        return True
+
+
+async def settle(page):
+    """Wait for backend data to arrive and the resulting render to finish."""
+    await wait_for_network_idle(page)
+    await wait_for_dom_settled(page)
+
+
+async def ready(locator):
+    """Settle the locator's page, then wait for the locator to be visible."""
+    await settle(locator.page)
+    await locator.wait_for(state="visible")